@@ -0,0 +1,54 @@
+"""
+Benchmark `import langswarm` start-up cost.
+
+Runs ``python -X importtime -c "import langswarm"`` in fresh interpreters and
+reports the cumulative import time of the package plus its slowest
+dependencies.
+
+    python benchmarks/bench_import_time.py --runs 5 --top 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def import_profile(module):
+    """Return {module: cumulative_us} parsed from a single -X importtime run"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, cwd=ROOT,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="langswarm")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    totals = [profile[args.module] / 1000 for profile in profiles]
+    best = min(profiles, key=lambda profile: profile[args.module])
+
+    print(f"import {args.module}: median {statistics.median(totals):.1f} ms, "
+          f"min {min(totals):.1f} ms over {args.runs} runs, {len(best)} modules imported")
+    print(f"\nslowest imports (cumulative, fastest run):")
+    for name, micros in sorted(best.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark LineageGraph impact analysis.
+
+Builds a synthetic provenance DAG (100k nodes by default, each with up to
+three parents drawn from a recent window) and reports insertion time plus
+downstream_of / upstream_of latency, cold and memoized. With --db the graph
+is persisted to SQLite and the reload time is reported too.
+
+    python benchmarks/bench_lineage.py --nodes 100000 [--db]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langswarm.core.planning.lineage import LineageGraph
+from langswarm.core.planning.models import Provenance
+
+
+def build(graph: LineageGraph, n_nodes: int, window: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(n_nodes):
+        parents = []
+        if i:
+            low = max(0, i - window)
+            parents = [f"artifact-{rng.randrange(low, i)}" for _ in range(rng.randint(1, 3))]
+        graph.add_node(Provenance(
+            artifact_id=f"artifact-{i}", from_step=f"step-{i}", inputs=parents,
+            tool={"name": "synthetic"}, params_hash="", metrics={}
+        ))
+
+
+def latencies(fn, ids):
+    timings = []
+    for artifact_id in ids:
+        start = time.perf_counter()
+        fn(artifact_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--window", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--db", action="store_true", help="persist the graph to SQLite")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lineage_bench_")
+    db_path = os.path.join(workdir, "lineage.db") if args.db else None
+    try:
+        graph = LineageGraph(db_path=db_path)
+        start = time.perf_counter()
+        build(graph, args.nodes, args.window)
+        build_time = time.perf_counter() - start
+
+        rng = random.Random(1)
+        # Late nodes have small downstream sets, early nodes small upstream sets
+        late = [f"artifact-{rng.randrange(args.nodes * 9 // 10, args.nodes)}" for _ in range(args.queries)]
+        early = [f"artifact-{rng.randrange(0, args.nodes // 10)}" for _ in range(args.queries)]
+
+        print(f"nodes:                      {args.nodes} ({graph.get_stats()['edges']} edges)")
+        print(f"build:                      {build_time:8.3f}s")
+        for label, fn, ids in (
+            ("downstream_of (late)", graph.downstream_of, late),
+            ("upstream_of (early)", graph.upstream_of, early),
+            ("downstream_of (early)", graph.downstream_of, early[:10]),
+            ("upstream_of (late)", graph.upstream_of, late[:10]),
+        ):
+            cold = latencies(fn, ids)
+            warm = latencies(fn, ids)
+            print(f"{label:<27} cold median {cold[0]:8.3f}ms max {cold[1]:8.3f}ms | "
+                  f"memoized median {warm[0]:8.3f}ms")
+
+        if db_path:
+            graph.close()
+            start = time.perf_counter()
+            LineageGraph(db_path=db_path).close()
+            print(f"reload from SQLite:         {time.perf_counter() - start:8.3f}s "
+                  f"({os.path.getsize(db_path) / 1e6:.1f} MB)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
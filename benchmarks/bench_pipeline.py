@@ -0,0 +1,107 @@
+"""
+Benchmark middleware Pipeline per-request overhead.
+
+Runs requests through a pipeline of no-op interceptors and compares the
+cached, precompiled chain with the previous behaviour of filtering and
+rebuilding the recursive closure chain on every request.
+
+    python benchmarks/bench_pipeline.py --interceptors 10 --requests 20000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langswarm.core.middleware import Pipeline, RequestContext
+from langswarm.core.middleware.context import ResponseContext
+from langswarm.core.middleware.interfaces import IMiddlewareInterceptor
+
+
+class NoOpInterceptor(IMiddlewareInterceptor):
+    def __init__(self, index: int):
+        self._name = f"noop-{index}"
+        self._priority = index
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def priority(self):
+        return self._priority
+
+    async def intercept(self, context, next_interceptor):
+        return await next_interceptor(context)
+
+    def can_handle(self, context):
+        return True
+
+
+class RebuildingPipeline(Pipeline):
+    """Filters and rebuilds the closure chain per request, as before caching"""
+
+    async def process(self, context):
+        applicable = [i for i in self._interceptors if i.can_handle(context)]
+
+        def build_chain(index):
+            if index >= len(applicable):
+                async def end_chain(ctx):
+                    return ResponseContext.success(ctx.request_id, None, end_of_chain=True)
+                return end_chain
+
+            interceptor = applicable[index]
+            next_chain = build_chain(index + 1)
+
+            async def interceptor_chain(ctx):
+                try:
+                    return await interceptor.intercept(ctx, next_chain)
+                except Exception as e:
+                    return interceptor.on_error(ctx, e)
+            return interceptor_chain
+
+        start_time = time.time()
+        response = await build_chain(0)(context)
+        return response.with_metadata(
+            pipeline_processing_time=time.time() - start_time,
+            pipeline_interceptors=len(applicable),
+            interceptor_chain=[i.name for i in applicable]
+        )
+
+
+async def per_request_us(pipeline: Pipeline, context: RequestContext, n_requests: int, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(n_requests):
+            await pipeline.process(context)
+        timings.append((time.perf_counter() - start) / n_requests)
+    return min(timings) * 1e6
+
+
+async def run(args):
+    interceptors = [NoOpInterceptor(i) for i in range(args.interceptors)]
+    context = RequestContext(action_id="bench", method="call")
+
+    before = await per_request_us(RebuildingPipeline(interceptors), context, args.requests, args.repeat)
+    after = await per_request_us(Pipeline(interceptors), context, args.requests, args.repeat)
+
+    print(f"interceptors:           {args.interceptors}")
+    print(f"rebuilt chain:          {before:8.2f} us/request")
+    print(f"cached chain:           {after:8.2f} us/request")
+    print(f"speedup:                {before / after:8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--interceptors", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
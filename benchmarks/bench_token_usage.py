@@ -0,0 +1,75 @@
+"""
+Load test for TokenUsageAggregator.
+
+Records a stream of token usage events (10M by default) spread over
+sessions, users and models with advancing timestamps, and reports the
+per-event cost and peak RSS for every million events. With bucketed
+rollups both should stay flat once every key's bucket rings are warm.
+
+    python benchmarks/bench_token_usage.py --events 10000000 --sqlite /tmp/usage.db
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langswarm.core.observability.token_tracking import (
+    SQLiteTokenEventSink, TokenUsageAggregator, TokenUsageEvent,
+)
+
+
+def make_pool(size, sessions, users, models):
+    start = datetime(2025, 1, 1)
+    return [
+        TokenUsageEvent(
+            event_id=f"e{i}", session_id=f"s{i % sessions}", user_id=f"u{i % users}",
+            model=f"model-{i % models}", provider="openai", input_tokens=300, output_tokens=200,
+            total_tokens=500, cost_estimate=0.002, timestamp=start + timedelta(seconds=i)
+        )
+        for i in range(size)
+    ]
+
+
+async def run(args):
+    sink = SQLiteTokenEventSink(args.sqlite, batch_size=10_000) if args.sqlite else None
+    aggregator = TokenUsageAggregator(event_sink=sink)
+    pool = make_pool(args.pool, args.sessions, args.users, args.models)
+    shift = timedelta(seconds=args.pool)
+    report_every = 1_000_000
+
+    recorded = 0
+    window_start = time.perf_counter()
+    print(f"{'events':>12} {'us/event':>10} {'peak RSS MB':>12}")
+    while recorded < args.events:
+        for event in pool:
+            await aggregator.record_usage(event)
+            event.timestamp += shift
+        recorded += len(pool)
+        if recorded % report_every == 0:
+            elapsed = time.perf_counter() - window_start
+            rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(f"{recorded:>12,} {elapsed / report_every * 1e6:>10.2f} {rss_mb:>12.1f}")
+            window_start = time.perf_counter()
+    aggregator.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--pool", type=int, default=100_000, help="distinct event objects reused with shifted timestamps")
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--models", type=int, default=8)
+    parser.add_argument("--sqlite", default=None, help="spill raw events to this SQLite file")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
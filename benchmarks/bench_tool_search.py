@@ -0,0 +1,109 @@
+"""
+Benchmark ToolRegistry.search_tools.
+
+Registers synthetic tools (5,000 by default, each with a few methods) and
+reports query latency for the indexed BM25 search alongside the previous
+substring scan over every tool's metadata.
+
+    python benchmarks/bench_tool_search.py --tools 5000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langswarm.tools.interfaces import ToolType
+from langswarm.tools.registry import ToolRegistry
+
+WORDS = (
+    "search query index vector store fetch http request file read write bucket "
+    "table sql bigquery calendar email message queue weather forecast translate "
+    "summarize image audio transcribe workflow schedule notify slack github issue "
+    "deploy build test lint metrics trace log alert payment invoice customer"
+).split()
+
+
+def synthetic_tool(i: int, rng: random.Random):
+    def phrase(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n))
+
+    methods = {
+        f"method_{i}_{m}": SimpleNamespace(name=f"{rng.choice(WORDS)}_{rng.choice(WORDS)}", description=phrase(8))
+        for m in range(3)
+    }
+    return SimpleNamespace(metadata=SimpleNamespace(
+        id=f"tool_{i}", name=f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}", description=phrase(20),
+        tags=rng.sample(WORDS, 3), tool_type=ToolType.UTILITY, capabilities=[], methods=methods,
+        version="1.0"
+    ))
+
+
+def substring_scan(tools, query):
+    """The pre-index search_tools implementation"""
+    query_lower = query.lower()
+    matches = []
+    for tool in tools:
+        metadata = tool.metadata
+        if query_lower in metadata.name.lower() or query_lower in metadata.description.lower():
+            matches.append(tool)
+            continue
+        if any(query_lower in tag.lower() for tag in metadata.tags):
+            matches.append(tool)
+            continue
+        for schema in metadata.methods.values():
+            if query_lower in schema.name.lower() or query_lower in schema.description.lower():
+                matches.append(tool)
+                break
+    return matches
+
+
+def latency_ms(fn, queries, repeat):
+    timings = []
+    for query in queries:
+        best = min(_timed(fn, query) for _ in range(repeat))
+        timings.append(best * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def _timed(fn, query):
+    start = time.perf_counter()
+    fn(query)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    tools = [synthetic_tool(i, rng) for i in range(args.tools)]
+    registry = ToolRegistry()
+    registry.clear()
+
+    start = time.perf_counter()
+    for tool in tools:
+        registry.register(tool)
+    register_time = time.perf_counter() - start
+
+    queries = ["weather forecast", "sql", "transcribe audio", "github issue deploy", "zzz-no-match", "invo"]
+    scan = latency_ms(lambda q: substring_scan(tools, q), queries, args.repeat)
+    indexed = latency_ms(lambda q: registry.search_tools(q, limit=args.limit), queries, args.repeat)
+
+    print(f"tools:                        {args.tools}")
+    print(f"register (with indexing):     {register_time:8.3f}s")
+    print(f"substring scan   median/max:  {scan[0]:8.2f} / {scan[1]:8.2f} ms (unranked)")
+    print(f"indexed BM25     median/max:  {indexed[0]:8.2f} / {indexed[1]:8.2f} ms (top {args.limit})")
+    registry.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark AgentMemoryManager embedding storage and retrieval.
+
+Builds a database in the legacy layout (JSON-encoded embeddings, one
+embedding lookup per retrieved row), measures it, then lets
+AgentMemoryManager migrate it to packed float32 blobs and measures the
+joined retrieval path on the same data.
+
+    python benchmarks/bench_agent_memory.py --memories 100000 --dim 128
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langswarm_memory.agent_memory_impl import AgentMemoryManager
+
+AGENT_ID = "bench-agent"
+
+
+async def open_manager(db_path: str) -> AgentMemoryManager:
+    manager = AgentMemoryManager(AGENT_ID, {"db_path": db_path})
+    await asyncio.sleep(0)
+    return manager
+
+
+def populate_legacy(db_path: str, n_memories: int, dim: int):
+    """Fill the schema with JSON embeddings and mark it as pre-migration"""
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc).isoformat()
+    conn = sqlite3.connect(db_path)
+    batch = 5000
+    for start in range(0, n_memories, batch):
+        ids = [f"mem-{i}" for i in range(start, min(start + batch, n_memories))]
+        conn.executemany(
+            "INSERT INTO memory_records (memory_id, memory_type, content, created_at, updated_at, "
+            "accessed_at, agent_id, importance_score) VALUES (?, 'semantic', ?, ?, ?, ?, ?, ?)",
+            [(mid, f"memory {mid}", now, now, now, AGENT_ID, rng.random()) for mid in ids]
+        )
+        conn.executemany(
+            "INSERT INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
+            [(mid, json.dumps([rng.uniform(-1, 1) for _ in range(dim)]).encode("utf-8")) for mid in ids]
+        )
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def legacy_retrieve(db_path: str, limit: int):
+    """The pre-migration read path: one query for rows, then one per embedding"""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT memory_id, memory_type, content, metadata, created_at, updated_at, accessed_at, "
+        "expires_at, session_id, user_id, agent_id, message_id, importance_score, access_count, "
+        "tags, categories FROM memory_records WHERE agent_id = ? "
+        "ORDER BY importance_score DESC, accessed_at DESC LIMIT ?",
+        (AGENT_ID, limit)
+    ).fetchall()
+    embeddings = []
+    for memory_id, *_ in rows:
+        blob = conn.execute(
+            "SELECT embedding FROM memory_embeddings WHERE memory_id = ?", (memory_id,)
+        ).fetchone()[0]
+        embeddings.append(json.loads(blob.decode("utf-8")))
+    conn.close()
+    return embeddings
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def run(args):
+    workdir = tempfile.mkdtemp(prefix="agent_memory_bench_")
+    db_path = os.path.join(workdir, "memory.db")
+    try:
+        manager = await open_manager(db_path)
+        manager._conn.close()
+        populate_legacy(db_path, args.memories, args.dim)
+
+        legacy_size = os.path.getsize(db_path)
+        legacy_time = best_of(lambda: legacy_retrieve(db_path, args.limit), args.repeat)
+
+        start = time.perf_counter()
+        manager = await open_manager(db_path)
+        migration_time = time.perf_counter() - start
+        manager._conn.execute("VACUUM")
+        packed_size = os.path.getsize(db_path)
+
+        loop_timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            records = await manager.retrieve_memories(limit=args.limit)
+            loop_timings.append(time.perf_counter() - start)
+        assert len(records) == args.limit and len(records[0].embedding) == args.dim
+
+        print(f"memories:                 {args.memories} x {args.dim} dims")
+        print(f"db size (JSON):           {legacy_size / 1e6:10.1f} MB")
+        print(f"db size (float32):        {packed_size / 1e6:10.1f} MB")
+        print(f"migration:                {migration_time:10.3f}s")
+        print(f"retrieve {args.limit} (N+1 JSON):  {legacy_time * 1000:10.1f} ms")
+        print(f"retrieve {args.limit} (joined):    {min(loop_timings) * 1000:10.1f} ms")
+        manager._conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--memories", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
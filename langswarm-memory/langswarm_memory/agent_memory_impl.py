@@ -12,9 +12,13 @@ Concrete implementations of the memory and context interfaces providing:
 import asyncio
 import json
 import logging
+import math
+import re
 import sqlite3
 import statistics
-from collections import defaultdict, deque
+import sys
+from array import array
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional, Tuple, Union
 
@@ -29,8 +33,76 @@ from .agent_memory_interfaces import (
 # Import langswarm_memory error handling
 from .errors import LangSwarmMemoryError, MemoryBackendError
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 logger = logging.getLogger(__name__)
 
+# PRAGMA user_version of the agent memory database.
+# 1: embeddings stored as packed little-endian float32 instead of JSON text
+# 2: memory_fts full-text index over content, tags and metadata
+MEMORY_SCHEMA_VERSION = 2
+
+_MIGRATION_BATCH_SIZE = 1000
+
+# bm25() column weights for memory_fts (content, tags, metadata)
+FTS_COLUMN_WEIGHTS = (1.0, 0.5, 0.25)
+
+# Default blend for search_memories; vector similarity only counts when a
+# query embedding is supplied
+DEFAULT_SEARCH_WEIGHTS = {
+    "text": 1.0,
+    "vector": 0.0,
+    "importance": 0.0,
+    "recency": 0.0,
+}
+
+_FTS_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_match_expression(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 MATCH expression that ORs quoted terms"""
+    terms = _FTS_TOKEN.findall(query.lower())
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    if np is not None:
+        va, vb = np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)
+        denom = float(np.linalg.norm(va) * np.linalg.norm(vb))
+        return float(va @ vb) / denom if denom else 0.0
+    dot = sum(x * y for x, y in zip(a, b))
+    denom = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / denom if denom else 0.0
+
+
+def _encode_embedding(embedding: List[float]) -> bytes:
+    """Pack an embedding as little-endian float32 bytes"""
+    if np is not None:
+        return np.asarray(embedding, dtype='<f4').tobytes()
+    packed = array('f', embedding)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _decode_embedding(blob: Optional[bytes]) -> Optional[List[float]]:
+    """Unpack an embedding blob written by _encode_embedding"""
+    if not blob:
+        return None
+    if np is not None:
+        return np.frombuffer(blob, dtype='<f4').tolist()
+    unpacked = array('f')
+    unpacked.frombytes(blob)
+    if sys.byteorder != 'little':
+        unpacked.byteswap()
+    return unpacked.tolist()
+
+
 
 class AgentMemoryManager(IAgentMemory):
     """
@@ -44,10 +116,14 @@ class AgentMemoryManager(IAgentMemory):
         self._max_memory_records = backend_config.get('max_records', 10000)
         self._embedding_dim = backend_config.get('embedding_dim', 1536)
         
-        # In-memory caches for performance
-        self._memory_cache: Dict[str, MemoryRecord] = {}
-        self._cache_max_size = 1000
-        self._cache_access_order = deque()
+        # Search ranking: weights for blending bm25 with vector/importance/recency
+        self._search_weights = {**DEFAULT_SEARCH_WEIGHTS, **backend_config.get('search_weights', {})}
+        self._recency_half_life_hours = backend_config.get('recency_half_life_hours', 24 * 7)
+        self._fts_enabled = False
+        
+        # In-memory LRU cache for performance (ordered oldest -> most recent)
+        self._memory_cache: "OrderedDict[str, MemoryRecord]" = OrderedDict()
+        self._cache_max_size = backend_config.get('cache_size', 1000)
         
         # Initialize database
         asyncio.create_task(self._initialize_db())
@@ -60,6 +136,8 @@ class AgentMemoryManager(IAgentMemory):
         """Initialize SQLite database with vector extension if available"""
         try:
             self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            # INSERT OR REPLACE must fire the delete trigger that keeps memory_fts in sync
+            self._conn.execute('PRAGMA recursive_triggers = ON')
             
             # Create tables
             await self._create_tables()
@@ -67,6 +145,9 @@ class AgentMemoryManager(IAgentMemory):
             # Create indices for performance
             await self._create_indices()
             
+            # Bring databases written by older versions up to date
+            await self._migrate_schema()
+            
             logger.info(f"Initialized agent memory database for {self._agent_id}")
             
         except Exception as e:
@@ -95,7 +176,7 @@ class AgentMemoryManager(IAgentMemory):
                 
                 session_id TEXT,
                 user_id TEXT,
-                agent_id TEXT DEFAULT ?,
+                agent_id TEXT,
                 message_id TEXT,
                 
                 importance_score REAL DEFAULT 0.5,
@@ -104,7 +185,7 @@ class AgentMemoryManager(IAgentMemory):
                 tags TEXT DEFAULT '[]',
                 categories TEXT DEFAULT '[]'
             )
-        ''', (self._agent_id,))
+        ''')
         
         # Vector embeddings table (if vector support available)
         cursor.execute('''
@@ -130,6 +211,42 @@ class AgentMemoryManager(IAgentMemory):
         ''')
         
         self._conn.commit()
+        await self._create_fts()
+    
+    async def _create_fts(self) -> None:
+        """Create the FTS5 index over memory_records and the triggers that maintain it"""
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
+                    content, tags, metadata,
+                    content='memory_records', content_rowid='rowid',
+                    tokenize='porter unicode61'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable, falling back to LIKE matching: {e}")
+            return
+        
+        cursor.executescript('''
+            CREATE TRIGGER IF NOT EXISTS memory_fts_insert AFTER INSERT ON memory_records BEGIN
+                INSERT INTO memory_fts (rowid, content, tags, metadata)
+                VALUES (new.rowid, new.content, new.tags, new.metadata);
+            END;
+            CREATE TRIGGER IF NOT EXISTS memory_fts_delete AFTER DELETE ON memory_records BEGIN
+                INSERT INTO memory_fts (memory_fts, rowid, content, tags, metadata)
+                VALUES ('delete', old.rowid, old.content, old.tags, old.metadata);
+            END;
+            CREATE TRIGGER IF NOT EXISTS memory_fts_update
+            AFTER UPDATE OF content, tags, metadata ON memory_records BEGIN
+                INSERT INTO memory_fts (memory_fts, rowid, content, tags, metadata)
+                VALUES ('delete', old.rowid, old.content, old.tags, old.metadata);
+                INSERT INTO memory_fts (rowid, content, tags, metadata)
+                VALUES (new.rowid, new.content, new.tags, new.metadata);
+            END;
+        ''')
+        self._conn.commit()
+        self._fts_enabled = True
     
     async def _create_indices(self) -> None:
         """Create database indices for performance"""
@@ -151,25 +268,74 @@ class AgentMemoryManager(IAgentMemory):
         
         self._conn.commit()
     
+    async def _migrate_schema(self) -> None:
+        """Upgrade an existing database to MEMORY_SCHEMA_VERSION"""
+        cursor = self._conn.cursor()
+        version = cursor.execute('PRAGMA user_version').fetchone()[0]
+        
+        if version < 1:
+            converted = self._migrate_json_embeddings()
+            if converted:
+                logger.info(f"Converted {converted} JSON embeddings to float32 for agent {self._agent_id}")
+        
+        if version < 2 and self._fts_enabled:
+            # Index rows written before the FTS table and its triggers existed
+            cursor.execute("INSERT INTO memory_fts (memory_fts) VALUES ('rebuild')")
+        
+        if version < MEMORY_SCHEMA_VERSION:
+            cursor.execute(f'PRAGMA user_version = {MEMORY_SCHEMA_VERSION}')
+            self._conn.commit()
+    
+    def _migrate_json_embeddings(self) -> int:
+        """Rewrite JSON-encoded embedding rows as packed float32 blobs"""
+        read_cursor = self._conn.cursor()
+        write_cursor = self._conn.cursor()
+        converted = 0
+        
+        # Page by rowid so the rewrite never holds the whole table in memory
+        last_rowid = 0
+        while True:
+            rows = read_cursor.execute(
+                'SELECT rowid, memory_id, embedding FROM memory_embeddings '
+                'WHERE rowid > ? ORDER BY rowid LIMIT ?',
+                (last_rowid, _MIGRATION_BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                break
+            last_rowid = rows[-1][0]
+            
+            updates = []
+            for _, memory_id, blob in rows:
+                if not blob:
+                    continue
+                raw = blob.encode('utf-8') if isinstance(blob, str) else bytes(blob)
+                if not raw.lstrip().startswith(b'['):
+                    continue
+                try:
+                    updates.append((_encode_embedding(json.loads(raw)), memory_id))
+                except ValueError:
+                    logger.warning(f"Skipping unreadable embedding for memory {memory_id}")
+            
+            if updates:
+                write_cursor.executemany(
+                    'UPDATE memory_embeddings SET embedding = ? WHERE memory_id = ?', updates
+                )
+                converted += len(updates)
+        
+        self._conn.commit()
+        return converted
+    
     def _manage_cache(self, memory_id: str, record: Optional[MemoryRecord] = None) -> None:
         """Manage in-memory cache with LRU eviction"""
         if record:
-            # Add to cache
-            if memory_id in self._memory_cache:
-                # Move to end (most recent)
-                self._cache_access_order.remove(memory_id)
-            elif len(self._memory_cache) >= self._cache_max_size:
-                # Evict least recently used
-                lru_id = self._cache_access_order.popleft()
-                del self._memory_cache[lru_id]
-            
             self._memory_cache[memory_id] = record
-            self._cache_access_order.append(memory_id)
-        else:
+            self._memory_cache.move_to_end(memory_id)
+            if len(self._memory_cache) > self._cache_max_size:
+                # Evict least recently used
+                self._memory_cache.popitem(last=False)
+        elif memory_id in self._memory_cache:
             # Just update access order
-            if memory_id in self._cache_access_order:
-                self._cache_access_order.remove(memory_id)
-                self._cache_access_order.append(memory_id)
+            self._memory_cache.move_to_end(memory_id)
     
     async def store_memory(self, record: MemoryRecord) -> bool:
         """Store a memory record with full metadata and optional embedding"""
@@ -193,13 +359,13 @@ class AgentMemoryManager(IAgentMemory):
                 record.created_at.isoformat(), record.updated_at.isoformat(),
                 record.accessed_at.isoformat(), 
                 record.expires_at.isoformat() if record.expires_at else None,
-                record.session_id, record.user_id, record.agent_id, record.message_id,
+                record.session_id, record.user_id, record.agent_id or self._agent_id, record.message_id,
                 record.importance_score, record.access_count, tags_json, categories_json
             ))
             
             # Store embedding if available
             if record.embedding:
-                embedding_blob = json.dumps(record.embedding).encode('utf-8')
+                embedding_blob = _encode_embedding(record.embedding)
                 cursor.execute('''
                     INSERT OR REPLACE INTO memory_embeddings (memory_id, embedding)
                     VALUES (?, ?)
@@ -228,56 +394,11 @@ class AgentMemoryManager(IAgentMemory):
     ) -> List[MemoryRecord]:
         """Retrieve memory records based on various criteria"""
         try:
-            cursor = self._conn.cursor()
-            
-            # Build query conditions
-            conditions = ["agent_id = ?"]
-            params = [self._agent_id]
-            
-            if memory_types:
-                type_conditions = " OR ".join(["memory_type = ?"] * len(memory_types))
-                conditions.append(f"({type_conditions})")
-                params.extend([mt.value for mt in memory_types])
-            
-            if session_id:
-                conditions.append("session_id = ?")
-                params.append(session_id)
-            
-            if user_id:
-                conditions.append("user_id = ?")
-                params.append(user_id)
-            
-            if query:
-                conditions.append("(content LIKE ? OR metadata LIKE ?)")
-                query_pattern = f"%{query}%"
-                params.extend([query_pattern, query_pattern])
-            
-            # Add ordering based on strategy
-            if strategy == RetrievalStrategy.RECENCY:
-                order_by = "ORDER BY accessed_at DESC"
-            elif strategy == RetrievalStrategy.IMPORTANCE:
-                order_by = "ORDER BY importance_score DESC, access_count DESC"
-            else:  # RELEVANCE or HYBRID
-                order_by = "ORDER BY importance_score DESC, accessed_at DESC"
-            
-            where_clause = " AND ".join(conditions)
-            sql = f'''
-                SELECT memory_id, memory_type, content, metadata,
-                       created_at, updated_at, accessed_at, expires_at,
-                       session_id, user_id, agent_id, message_id,
-                       importance_score, access_count, tags, categories
-                FROM memory_records
-                WHERE {where_clause}
-                {order_by}
-                LIMIT ?
-            '''
-            
-            params.append(limit)
-            cursor.execute(sql, params)
+            ranked = self._query_memories(query, memory_types, session_id, user_id, limit, strategy)
             
             records = []
-            for row in cursor.fetchall():
-                record = await self._row_to_memory_record(row)
+            for row, embedding_blob, _ in ranked:
+                record = await self._row_to_memory_record(row, embedding_blob)
                 if record and not record.is_expired():
                     records.append(record)
                     # Update access statistics
@@ -290,8 +411,97 @@ class AgentMemoryManager(IAgentMemory):
             logger.error(f"Failed to retrieve memories: {e}")
             return []
     
-    async def _row_to_memory_record(self, row: Tuple) -> Optional[MemoryRecord]:
-        """Convert database row to MemoryRecord object"""
+    def _query_memories(
+        self,
+        query: Optional[str],
+        memory_types: Optional[List[MemoryType]],
+        session_id: Optional[str],
+        user_id: Optional[str],
+        limit: int,
+        strategy: RetrievalStrategy
+    ) -> List[Tuple[Tuple, Optional[bytes], float]]:
+        """
+        Run the retrieval query and return (row, embedding blob, text score) tuples.
+        
+        With a query and FTS5 available, matching goes through memory_fts and
+        RELEVANCE/HYBRID results are ordered by bm25(); the text score is the
+        negated bm25 value (higher is better). Otherwise it is 0.0.
+        """
+        cursor = self._conn.cursor()
+        
+        # Build query conditions
+        conditions = ["r.agent_id = ?"]
+        params: List[Any] = [self._agent_id]
+        
+        if memory_types:
+            type_conditions = " OR ".join(["r.memory_type = ?"] * len(memory_types))
+            conditions.append(f"({type_conditions})")
+            params.extend([mt.value for mt in memory_types])
+        
+        if session_id:
+            conditions.append("r.session_id = ?")
+            params.append(session_id)
+        
+        if user_id:
+            conditions.append("r.user_id = ?")
+            params.append(user_id)
+        
+        source = "memory_records r"
+        score_expr = "0.0"
+        match_expression = _fts_match_expression(query) if query else None
+        if query and self._fts_enabled:
+            if match_expression is None:
+                return []
+            source = "memory_fts JOIN memory_records r ON r.rowid = memory_fts.rowid"
+            conditions.append("memory_fts MATCH ?")
+            params.append(match_expression)
+            weights = ", ".join(str(w) for w in FTS_COLUMN_WEIGHTS)
+            score_expr = f"-bm25(memory_fts, {weights})"
+        elif query:
+            conditions.append("(r.content LIKE ? OR r.metadata LIKE ?)")
+            query_pattern = f"%{query}%"
+            params.extend([query_pattern, query_pattern])
+        
+        # Add ordering based on strategy
+        if strategy == RetrievalStrategy.RECENCY:
+            order_by = "ORDER BY accessed_at DESC"
+        elif strategy == RetrievalStrategy.IMPORTANCE:
+            order_by = "ORDER BY importance_score DESC, access_count DESC"
+        elif score_expr != "0.0":  # RELEVANCE or HYBRID with full-text ranking
+            order_by = "ORDER BY text_score DESC, importance_score DESC"
+        else:
+            order_by = "ORDER BY importance_score DESC, accessed_at DESC"
+        
+        where_clause = " AND ".join(conditions)
+        # Embeddings come back in the same query rather than one lookup per row.
+        # The join runs after LIMIT so the sort never carries the vector blobs.
+        sql = f'''
+            SELECT m.*, e.embedding
+            FROM (
+                SELECT r.memory_id, r.memory_type, r.content, r.metadata,
+                       r.created_at, r.updated_at, r.accessed_at, r.expires_at,
+                       r.session_id, r.user_id, r.agent_id, r.message_id,
+                       r.importance_score, r.access_count, r.tags, r.categories,
+                       {score_expr} AS text_score
+                FROM {source}
+                WHERE {where_clause}
+                {order_by}
+                LIMIT ?
+            ) m
+            LEFT JOIN memory_embeddings e ON e.memory_id = m.memory_id
+            {order_by}
+        '''
+        
+        params.append(limit)
+        cursor.execute(sql, params)
+        return [(row[:16], row[17], row[16]) for row in cursor.fetchall()]
+    
+    async def _row_to_memory_record(
+        self,
+        row: Tuple,
+        embedding_blob: Optional[bytes] = None
+    ) -> Optional[MemoryRecord]:
+        """Convert database row (and its joined embedding blob) to MemoryRecord object"""
         try:
             (memory_id, memory_type, content, metadata_json,
              created_at, updated_at, accessed_at, expires_at,
@@ -309,8 +519,7 @@ class AgentMemoryManager(IAgentMemory):
             accessed_at_dt = datetime.fromisoformat(accessed_at)
             expires_at_dt = datetime.fromisoformat(expires_at) if expires_at else None
             
-            # Get embedding if available
-            embedding = await self._get_embedding(memory_id)
+            embedding = _decode_embedding(embedding_blob)
             
             return MemoryRecord(
                 memory_id=memory_id,
@@ -343,9 +552,7 @@ class AgentMemoryManager(IAgentMemory):
             cursor.execute('SELECT embedding FROM memory_embeddings WHERE memory_id = ?', (memory_id,))
             row = cursor.fetchone()
             
-            if row and row[0]:
-                return json.loads(row[0].decode('utf-8'))
-            return None
+            return _decode_embedding(row[0]) if row else None
             
         except Exception as e:
             logger.debug(f"No embedding found for memory {memory_id}: {e}")
@@ -415,9 +622,7 @@ class AgentMemoryManager(IAgentMemory):
             self._conn.commit()
             
             # Remove from cache
-            if memory_id in self._memory_cache:
-                del self._memory_cache[memory_id]
-                self._cache_access_order.remove(memory_id)
+            self._memory_cache.pop(memory_id, None)
             
             return cursor.rowcount > 0
             
@@ -429,37 +634,82 @@ class AgentMemoryManager(IAgentMemory):
         self,
         query: str,
         memory_types: Optional[List[MemoryType]] = None,
-        limit: int = 20
+        limit: int = 20,
+        query_embedding: Optional[List[float]] = None,
+        weights: Optional[Dict[str, float]] = None
     ) -> List[Tuple[MemoryRecord, float]]:
-        """Search memories with relevance scores using text search"""
-        # This is a simplified text-based search
-        # In production, would use vector similarity search
-        memories = await self.retrieve_memories(
-            query=query,
-            memory_types=memory_types,
-            limit=limit,
-            strategy=RetrievalStrategy.RELEVANCE
-        )
+        """
+        Search memories with relevance scores in [0, 1].
+        
+        Candidates come from the FTS5 index ranked by bm25(). The text score is
+        blended with cosine similarity to ``query_embedding``, importance and
+        recency according to ``weights`` (defaults from the ``search_weights``
+        backend option; text only unless configured).
+        """
+        weights = {**self._search_weights, **(weights or {})}
+        if query_embedding is None:
+            weights['vector'] = 0.0
+        active = {name: w for name, w in weights.items() if w > 0}
+        total_weight = sum(active.values())
+        if not total_weight:
+            return []
         
-        # Calculate simple relevance scores based on text matching
-        scored_memories = []
-        query_lower = query.lower()
+        # Over-fetch when other signals may reorder the bm25 ranking
+        pool = limit if set(active) <= {'text'} else limit * 5
+        try:
+            ranked = self._query_memories(
+                query, memory_types, None, None, pool, RetrievalStrategy.RELEVANCE
+            )
+        except Exception as e:
+            logger.error(f"Failed to search memories: {e}")
+            return []
         
-        for memory in memories:
-            content_lower = memory.content.lower()
-            
-            # Simple scoring based on keyword matches and importance
-            keyword_score = 0.0
-            for word in query_lower.split():
-                if word in content_lower:
-                    keyword_score += 1.0
+        candidates = []
+        for row, embedding_blob, text_score in ranked:
+            record = await self._row_to_memory_record(row, embedding_blob)
+            if record and not record.is_expired():
+                candidates.append((record, text_score))
+        if not candidates:
+            return []
+        
+        if not self._fts_enabled:
+            # LIKE fallback has no ranking: use the fraction of query terms present
+            terms = _FTS_TOKEN.findall(query.lower())
+            candidates = [
+                (record, sum(term in record.content.lower() for term in terms) / max(len(terms), 1))
+                for record, _ in candidates
+            ]
+        
+        best_text = max(score for _, score in candidates) or 1.0
+        now = datetime.now(timezone.utc)
+        decay = math.log(2) / (self._recency_half_life_hours * 3600)
+        
+        scored_memories = []
+        for record, text_score in candidates:
+            signals = {
+                'text': max(text_score, 0.0) / best_text,
+                'importance': min(max(record.importance_score, 0.0), 1.0),
+            }
+            if 'recency' in active:
+                accessed = record.accessed_at
+                if accessed.tzinfo is None:
+                    accessed = accessed.replace(tzinfo=timezone.utc)
+                signals['recency'] = math.exp(-decay * max((now - accessed).total_seconds(), 0.0))
+            if 'vector' in active:
+                signals['vector'] = (
+                    max(_cosine_similarity(query_embedding, record.embedding), 0.0)
+                    if record.embedding else 0.0
+                )
             
-            # Normalize by query length
-            relevance_score = (keyword_score / len(query_lower.split())) * memory.importance_score
-            scored_memories.append((memory, min(relevance_score, 1.0)))
+            score = sum(w * signals.get(name, 0.0) for name, w in active.items()) / total_weight
+            scored_memories.append((record, min(score, 1.0)))
         
         # Sort by relevance score
         scored_memories.sort(key=lambda x: x[1], reverse=True)
+        scored_memories = scored_memories[:limit]
+        for record, _ in scored_memories:
+            record.update_access()
+            self._manage_cache(record.memory_id)
         return scored_memories
     
     async def get_memory_stats(self) -> Dict[str, Any]:
@@ -530,9 +780,7 @@ class AgentMemoryManager(IAgentMemory):
             expired_ids = [mid for mid, record in self._memory_cache.items() 
                           if record.is_expired()]
             for mid in expired_ids:
-                del self._memory_cache[mid]
-                if mid in self._cache_access_order:
-                    self._cache_access_order.remove(mid)
+                self._memory_cache.pop(mid, None)
             
             if deleted_count > 0:
                 logger.info(f"Cleaned up {deleted_count} expired memory records for agent {self._agent_id}")
@@ -0,0 +1,173 @@
+"""
+Tests for the SQLite-backed AgentMemoryManager
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+
+import pytest
+
+from langswarm_memory.agent_memory_impl import AgentMemoryManager, MEMORY_SCHEMA_VERSION
+from langswarm_memory.agent_memory_interfaces import MemoryRecord, MemoryType
+
+
+async def _manager(db_path, agent_id="agent"):
+    manager = AgentMemoryManager(agent_id, {"db_path": str(db_path)})
+    # The constructor schedules database setup; let it run
+    await asyncio.sleep(0)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_retrieval_loads_embeddings_in_one_query(tmp_path):
+    manager = await _manager(tmp_path / "memory.db")
+    for i in range(200):
+        await manager.store_memory(MemoryRecord(
+            memory_id=f"m{i}", memory_type=MemoryType.SEMANTIC, content=f"fact {i}",
+            agent_id="agent", embedding=[i * 0.5, -1.0, 0.25]
+        ))
+
+    statements = []
+    manager._conn.set_trace_callback(statements.append)
+    records = await manager.retrieve_memories(limit=200)
+    manager._conn.set_trace_callback(None)
+
+    assert len(records) == 200
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+    by_id = {r.memory_id: r for r in records}
+    assert by_id["m7"].embedding == [3.5, -1.0, 0.25]
+
+    # Vectors are stored as packed float32, not JSON text
+    blob = manager._conn.execute(
+        "SELECT embedding FROM memory_embeddings WHERE memory_id = 'm7'"
+    ).fetchone()[0]
+    assert len(blob) == 3 * 4
+
+
+@pytest.mark.asyncio
+async def test_json_embeddings_are_migrated(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    manager = await _manager(db_path)
+    await manager.store_memory(MemoryRecord(
+        memory_id="old", content="legacy row", agent_id="agent", embedding=[0.0]
+    ))
+    manager._conn.close()
+
+    # Rewrite the row the way earlier versions stored it
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "UPDATE memory_embeddings SET embedding = ? WHERE memory_id = 'old'",
+        (json.dumps([1.5, 2.0, -0.5]).encode("utf-8"),)
+    )
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+
+    manager = await _manager(db_path)
+    assert manager._conn.execute("PRAGMA user_version").fetchone()[0] == MEMORY_SCHEMA_VERSION
+    assert await manager._get_embedding("old") == [1.5, 2.0, -0.5]
+    records = await manager.retrieve_memories()
+    assert records[0].embedding == [1.5, 2.0, -0.5]
+
+
+@pytest.mark.asyncio
+async def test_fts_index_follows_inserts_updates_and_deletes(tmp_path):
+    manager = await _manager(tmp_path / "memory.db")
+    await manager.store_memory(MemoryRecord(memory_id="a", content="The user prefers dark roast coffee"))
+    await manager.store_memory(MemoryRecord(memory_id="b", content="Coffee meeting on Tuesday about coffee budgets"))
+    await manager.store_memory(MemoryRecord(memory_id="c", content="Quarterly report deadline"))
+
+    results = await manager.search_memories("coffee budget")
+    assert [r.memory_id for r, _ in results] == ["b", "a"]
+    assert results[0][1] == 1.0
+
+    # Replacing a record must not leave its old text searchable
+    await manager.store_memory(MemoryRecord(memory_id="a", content="The user prefers green tea"))
+    assert [r.memory_id for r, _ in await manager.search_memories("coffee")] == ["b"]
+
+    await manager.update_memory("c", {"content": "Quarterly coffee report"})
+    assert {r.memory_id for r, _ in await manager.search_memories("coffee")} == {"b", "c"}
+
+    await manager.delete_memory("b")
+    assert [r.memory_id for r, _ in await manager.search_memories("coffee")] == ["c"]
+    assert [r.memory_id for r in await manager.retrieve_memories(query="tea")] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_existing_rows_are_indexed_on_upgrade(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    manager = await _manager(db_path)
+    await manager.store_memory(MemoryRecord(memory_id="old", content="archived onboarding notes"))
+    manager._conn.executescript(
+        "DROP TABLE memory_fts; DROP TRIGGER IF EXISTS memory_fts_insert; PRAGMA user_version = 1;"
+    )
+    manager._conn.close()
+
+    manager = await _manager(db_path)
+    assert [r.memory_id for r, _ in await manager.search_memories("onboarding")] == ["old"]
+
+
+@pytest.mark.asyncio
+async def test_search_blends_vector_similarity_and_importance(tmp_path):
+    manager = await _manager(tmp_path / "memory.db")
+    await manager.store_memory(MemoryRecord(
+        memory_id="text", content="deploy deploy deploy pipeline", importance_score=0.1, embedding=[0.0, 1.0]
+    ))
+    await manager.store_memory(MemoryRecord(
+        memory_id="vector", content="deploy notes", importance_score=0.9, embedding=[1.0, 0.0]
+    ))
+
+    text_only = await manager.search_memories("deploy pipeline")
+    assert text_only[0][0].memory_id == "text"
+
+    blended = await manager.search_memories(
+        "deploy pipeline", query_embedding=[1.0, 0.0],
+        weights={"text": 0.2, "vector": 0.6, "importance": 0.2}
+    )
+    assert blended[0][0].memory_id == "vector"
+    assert all(0.0 <= score <= 1.0 for _, score in blended)
+
+
+@pytest.mark.asyncio
+async def test_search_over_100k_memories(tmp_path):
+    manager = await _manager(tmp_path / "memory.db")
+    words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel"]
+    now = "2025-01-01T00:00:00+00:00"
+    # Bulk insert straight into SQLite; the triggers index every row
+    manager._conn.executemany(
+        "INSERT INTO memory_records (memory_id, memory_type, content, created_at, updated_at, "
+        "accessed_at, agent_id) VALUES (?, 'semantic', ?, ?, ?, ?, 'agent')",
+        (
+            (f"m{i}", f"{words[i % 8]} {words[(i * 7) % 8]} note {i}", now, now, now)
+            for i in range(100_000)
+        )
+    )
+    manager._conn.commit()
+    await manager.store_memory(MemoryRecord(memory_id="needle", content="the zanzibar itinerary for alpha"))
+
+    start = time.perf_counter()
+    results = await manager.search_memories("zanzibar itinerary", limit=5)
+    elapsed = time.perf_counter() - start
+
+    assert [r.memory_id for r, _ in results] == ["needle"]
+    assert elapsed < 0.5
+
+    results = await manager.search_memories("zanzibar alpha", limit=10)
+    assert results[0][0].memory_id == "needle"
+    assert len(results) == 10
+
+
+def test_lru_cache_moves_and_evicts_in_constant_time():
+    async def scenario():
+        manager = AgentMemoryManager("agent", {"db_path": ":memory:", "cache_size": 3})
+        await asyncio.sleep(0)
+        for memory_id in ["a", "b", "c"]:
+            await manager.store_memory(MemoryRecord(memory_id=memory_id, content=memory_id))
+        manager._manage_cache("a")
+        await manager.store_memory(MemoryRecord(memory_id="d", content="d"))
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert list(manager._memory_cache) == ["c", "a", "d"]
@@ -16,6 +16,12 @@ class Settings(BaseSettings):
     # Scheduler
     SCHEDULER_ENABLED: bool = True
     
+    # Ingestion
+    INGESTION_MAX_WORKERS: int = 4
+    INGESTION_MAX_JOBS_PER_USER: int = 1
+    # Directory /ingest may read from; when unset only admins may ingest
+    INGESTION_ROOT: Optional[str] = None
+    
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -1,8 +1,25 @@
-import json
+import asyncio
+import contextlib
+import logging
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any
+from datetime import datetime, timedelta
+from typing import Callable, Optional, List, Dict, Any
 from .models import ApprovalRequest, ApprovalStatus
 
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _ts(value: Optional[datetime]) -> Optional[float]:
+    return None if value is None else (value - _EPOCH).total_seconds()
+
+class RequestAlreadyDecided(ValueError):
+    """Raised when deciding a request that was already approved, rejected or expired"""
+
+
 class PersistenceLayer(ABC):
     @abstractmethod
     async def save_request(self, request: ApprovalRequest) -> None:
@@ -20,28 +37,146 @@ class PersistenceLayer(ABC):
     async def list_pending_requests(self) -> List[ApprovalRequest]:
         pass
 
+    async def list_expired_requests(self, now: datetime) -> List[ApprovalRequest]:
+        """Pending requests whose expiry time has passed"""
+        return [
+            req for req in await self.list_pending_requests()
+            if req.expires_at is not None and req.expires_at <= now
+        ]
+
+    async def update_requests(self, requests: List[ApprovalRequest]) -> None:
+        for request in requests:
+            await self.update_request(request)
+
 class InMemoryPersistence(PersistenceLayer):
     def __init__(self):
         self._storage: Dict[str, ApprovalRequest] = {}
+        # Pending requests by id, in creation order, so listing them doesn't
+        # scan every request ever stored
+        self._pending: Dict[str, ApprovalRequest] = {}
         
     async def save_request(self, request: ApprovalRequest) -> None:
         self._storage[request.id] = request
+        self._track(request)
         
     async def get_request(self, request_id: str) -> Optional[ApprovalRequest]:
         return self._storage.get(request_id)
         
     async def update_request(self, request: ApprovalRequest) -> None:
         self._storage[request.id] = request
+        self._track(request)
         
     async def list_pending_requests(self) -> List[ApprovalRequest]:
-        return [
-            req for req in self._storage.values() 
-            if req.status == ApprovalStatus.PENDING
-        ]
+        return list(self._pending.values())
+
+    def _track(self, request: ApprovalRequest) -> None:
+        if request.status == ApprovalStatus.PENDING:
+            self._pending[request.id] = request
+        else:
+            self._pending.pop(request.id, None)
+
+class SQLitePersistence(PersistenceLayer):
+    """
+    Approval requests stored in a local SQLite database.
+
+    Status, creation and expiry times are indexed columns next to the
+    JSON-serialized request, so pending and expired lookups are index range
+    scans rather than full table scans.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS approval_requests (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL,
+                payload TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_approvals_status_created ON approval_requests (status, created_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_approvals_status_expires ON approval_requests (status, expires_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _row(request: ApprovalRequest) -> tuple:
+        return (
+            request.id, request.status.value, _ts(request.created_at),
+            _ts(request.expires_at), request.model_dump_json(),
+        )
+
+    def _write(self, requests: List[ApprovalRequest]) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO approval_requests VALUES (?, ?, ?, ?, ?)",
+                    [self._row(request) for request in requests],
+                )
+
+    def _select(self, where: str, params: tuple) -> List[ApprovalRequest]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT payload FROM approval_requests WHERE {where}", params).fetchall()
+        return [ApprovalRequest.model_validate_json(row[0]) for row in rows]
+
+    async def save_request(self, request: ApprovalRequest) -> None:
+        self._write([request])
+
+    async def get_request(self, request_id: str) -> Optional[ApprovalRequest]:
+        found = self._select("id = ?", (request_id,))
+        return found[0] if found else None
+
+    async def update_request(self, request: ApprovalRequest) -> None:
+        self._write([request])
+
+    async def update_requests(self, requests: List[ApprovalRequest]) -> None:
+        self._write(requests)
+
+    async def list_pending_requests(self) -> List[ApprovalRequest]:
+        return self._select("status = ? ORDER BY created_at", (ApprovalStatus.PENDING.value,))
+
+    async def list_expired_requests(self, now: datetime) -> List[ApprovalRequest]:
+        return self._select(
+            "status = ? AND expires_at <= ? ORDER BY expires_at", (ApprovalStatus.PENDING.value, _ts(now))
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
 
 class ApprovalQueue:
-    def __init__(self, persistence: PersistenceLayer = None):
+    """
+    Queue of tool calls awaiting a human decision.
+
+    Agents can ``await wait_for_decision(request_id)`` instead of polling;
+    approving, rejecting or expiring a request resolves every waiter on it.
+    Requests older than ``default_ttl`` expire, either when ``expire_stale``
+    runs (periodically, once ``start_sweeper`` is called) or when a decision
+    arrives too late.
+    """
+    def __init__(
+        self,
+        persistence: PersistenceLayer = None,
+        default_ttl: Optional[timedelta] = None,
+        sweep_interval: float = 60.0,
+        clock: Callable[[], datetime] = datetime.utcnow
+    ):
         self.persistence = persistence or InMemoryPersistence()
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._sweeper: Optional[asyncio.Task] = None
         
     async def create_request(self, agent_id: str, tool_name: str, tool_args: Dict[str, Any], **kwargs) -> ApprovalRequest:
         request = ApprovalRequest(
@@ -50,32 +185,102 @@ class ApprovalQueue:
             tool_args=tool_args,
             **kwargs
         )
+        if request.expires_at is None and self.default_ttl is not None:
+            request.expires_at = request.created_at + self.default_ttl
         await self.persistence.save_request(request)
         return request
         
     async def approve_request(self, request_id: str, approver_id: str, notes: str = None) -> ApprovalRequest:
-        request = await self.persistence.get_request(request_id)
-        if not request:
-            raise ValueError(f"Request {request_id} not found")
-            
-        request.status = ApprovalStatus.APPROVED
-        request.approved_by = approver_id
-        request.approval_notes = notes
-        
-        await self.persistence.update_request(request)
-        return request
+        return await self._decide(request_id, ApprovalStatus.APPROVED, approver_id, notes)
         
     async def reject_request(self, request_id: str, rejector_id: str, notes: str = None) -> ApprovalRequest:
+        # approved_by is overloaded as the field for the decision maker
+        return await self._decide(request_id, ApprovalStatus.REJECTED, rejector_id, notes)
+
+    async def _decide(
+        self, request_id: str, status: ApprovalStatus, decided_by: str, notes: Optional[str]
+    ) -> ApprovalRequest:
         request = await self.persistence.get_request(request_id)
         if not request:
             raise ValueError(f"Request {request_id} not found")
-            
-        request.status = ApprovalStatus.REJECTED
-        request.approved_by = rejector_id # overloaded field for decision maker
+
+        now = self.clock()
+        if request.status == ApprovalStatus.PENDING and request.expires_at is not None and request.expires_at <= now:
+            await self._expire([request])
+        if request.status != ApprovalStatus.PENDING:
+            raise RequestAlreadyDecided(f"Request {request_id} is already {request.status.value}")
+
+        request.status = status
+        request.approved_by = decided_by
         request.approval_notes = notes
+        request.approved_at = now
         
         await self.persistence.update_request(request)
+        self._resolve(request)
         return request
 
     async def get_pending_requests(self) -> List[ApprovalRequest]:
         return await self.persistence.list_pending_requests()
+
+    async def wait_for_decision(self, request_id: str, timeout: Optional[float] = None) -> ApprovalRequest:
+        """
+        Wait until a request is approved, rejected or expired and return it.
+
+        Raises ``ValueError`` for unknown requests and ``asyncio.TimeoutError``
+        if no decision arrives within ``timeout`` seconds.
+        """
+        # Register before reading, so a decision made while we read isn't missed
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(request_id, []).append(future)
+        try:
+            request = await self.persistence.get_request(request_id)
+            if not request:
+                raise ValueError(f"Request {request_id} not found")
+            if request.status != ApprovalStatus.PENDING:
+                return request
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            waiters = self._waiters.get(request_id)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[request_id]
+
+    def _resolve(self, request: ApprovalRequest) -> None:
+        for future in self._waiters.pop(request.id, []):
+            if not future.done():
+                future.set_result(request)
+
+    async def _expire(self, requests: List[ApprovalRequest]) -> None:
+        for request in requests:
+            request.status = ApprovalStatus.EXPIRED
+        await self.persistence.update_requests(requests)
+        for request in requests:
+            self._resolve(request)
+
+    async def expire_stale(self) -> List[ApprovalRequest]:
+        """Mark pending requests past their expiry time as expired"""
+        expired = await self.persistence.list_expired_requests(self.clock())
+        if expired:
+            await self._expire(expired)
+        return expired
+
+    def start_sweeper(self) -> None:
+        """Expire stale requests every ``sweep_interval`` seconds in the background"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep())
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.expire_stale()
+            except Exception:
+                logger.exception("Failed to expire stale approval requests")
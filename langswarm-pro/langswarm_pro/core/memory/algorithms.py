@@ -1,29 +1,103 @@
-from typing import List
+from dataclasses import dataclass
+from typing import List, Optional
 from datetime import datetime, timezone
+
+import numpy as np
+
 from .models import ProMemoryRecord, PriorityTier
 
+
+def _timestamp(value: datetime) -> float:
+    # Naive datetimes are treated as UTC, like the rest of the memory store
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@dataclass
+class MemoryScoreArrays:
+    """
+    Column-oriented view of a batch of memory records.
+
+    Holds the inputs of ``ProMemoryRecord.calculate_current_importance`` as
+    NumPy arrays, so a whole store is scored against one clock reading with a
+    handful of vectorized operations instead of a Python call per record.
+    """
+    importance: np.ndarray
+    fading_rate: np.ndarray
+    last_accessed: np.ndarray  # POSIX seconds
+    pinned: np.ndarray  # critical tier or protected: never decays
+    protected: np.ndarray
+
+    @classmethod
+    def from_records(cls, memories: List[ProMemoryRecord]) -> "MemoryScoreArrays":
+        count = len(memories)
+        protected = np.fromiter((m.is_protected for m in memories), dtype=bool, count=count)
+        critical = np.fromiter((m.priority_tier == PriorityTier.CRITICAL for m in memories), dtype=bool, count=count)
+        return cls(
+            importance=np.fromiter((m.importance_score for m in memories), dtype=np.float64, count=count),
+            fading_rate=np.fromiter((m.fading_rate for m in memories), dtype=np.float64, count=count),
+            last_accessed=np.fromiter((_timestamp(m.last_accessed) for m in memories), dtype=np.float64, count=count),
+            pinned=critical | protected,
+            protected=protected,
+        )
+
+    def current_importance(self, now: Optional[datetime] = None) -> np.ndarray:
+        """Importance of every record at ``now`` (default: a single read of the clock)"""
+        now_ts = _timestamp(now or datetime.now(timezone.utc))
+        days_since_access = (now_ts - self.last_accessed) / 86400.0
+        scores = np.clip(self.importance * np.power(1.0 - self.fading_rate, days_since_access), 0.0, 1.0)
+        scores[self.pinned] = 1.0
+        return scores
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """
+    Indices of the ``k`` highest scores, best first; ties keep input order.
+
+    Finds the k-th best score with a linear-time partition and only sorts
+    the records above it, instead of sorting every score.
+    """
+    if k is None or k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    # The k-th best score; of the records tied with it, the earliest are kept
+    kth = -np.partition(-scores, k - 1)[k - 1]
+    above = np.flatnonzero(scores > kth)
+    tied = np.flatnonzero(scores == kth)[:k - len(above)]
+    selected = np.sort(np.concatenate((above, tied)))
+    return selected[np.argsort(-scores[selected], kind="stable")]
+
+
 class MemoryPrioritizer:
     @staticmethod
-    def rank_memories(memories: List[ProMemoryRecord]) -> List[ProMemoryRecord]:
-        """Rank memories by current calculated importance"""
-        return sorted(
-            memories, 
-            key=lambda m: m.calculate_current_importance(), 
-            reverse=True
-        )
+    def rank_memories(
+        memories: List[ProMemoryRecord],
+        top_k: Optional[int] = None,
+        now: Optional[datetime] = None,
+        arrays: Optional[MemoryScoreArrays] = None
+    ) -> List[ProMemoryRecord]:
+        """
+        Rank memories by current calculated importance.
+
+        Pass ``top_k`` to get only the most important memories, and
+        ``arrays`` to reuse columns already built for ``memories``.
+        """
+        arrays = arrays or MemoryScoreArrays.from_records(memories)
+        return [memories[i] for i in top_k_indices(arrays.current_importance(now), top_k)]
 
 class MemoryFader:
     def __init__(self, threshold: float = 0.2):
         self.threshold = threshold
 
-    def identify_fading_memories(self, memories: List[ProMemoryRecord]) -> List[ProMemoryRecord]:
-        """Identify memories that have faded below threshold"""
-        candidates = []
-        for mem in memories:
-            if mem.is_protected:
-                continue
-                
-            current_score = mem.calculate_current_importance()
-            if current_score < self.threshold:
-                candidates.append(mem)
-        return candidates
+    def identify_fading_memories(
+        self,
+        memories: List[ProMemoryRecord],
+        now: Optional[datetime] = None,
+        arrays: Optional[MemoryScoreArrays] = None
+    ) -> List[ProMemoryRecord]:
+        """Identify unprotected memories that have faded below threshold"""
+        arrays = arrays or MemoryScoreArrays.from_records(memories)
+        fading = (arrays.current_importance(now) < self.threshold) & ~arrays.protected
+        return [memories[i] for i in np.flatnonzero(fading)]
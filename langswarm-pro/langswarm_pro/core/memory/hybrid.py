@@ -1,88 +1,187 @@
 import asyncio
-from typing import List, Dict, Any, Optional
+import logging
+import threading
+import uuid
+from enum import Enum
+from typing import Coroutine, List, Dict, Any, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class FusionMethod(str, Enum):
+    RRF = "rrf"            # Reciprocal rank fusion: uses ranks only
+    MIN_MAX = "min_max"    # Weighted sum of per-adapter min-max normalized scores
+
 
 class HybridMemoryManager:
     """
     Orchestrates multiple memory adapters (e.g., Vector Store + Keyword Search)
     to provide a unified memory interface.
+
+    Adapter methods may be sync or async; sync ones run in a worker thread.
+    Each adapter call can be bounded by a timeout: a query returns the fused
+    results of the adapters that answered in time. Scores from different
+    adapters are not comparable (cosine vs BM25), so results are combined
+    by rank (RRF) or after per-adapter min-max normalization.
     """
-    def __init__(self, adapters: List[Any]):
+    def __init__(
+        self,
+        adapters: List[Any],
+        fusion: FusionMethod = FusionMethod.RRF,
+        weights: Optional[Sequence[float]] = None,
+        rrf_k: int = 60,
+        timeout: Optional[float] = None,
+        adapter_timeouts: Optional[Sequence[Optional[float]]] = None
+    ):
+        """
+        Args:
+            adapters: Memory adapters exposing add_documents/query/delete
+            fusion: How to merge per-adapter result lists
+            weights: Per-adapter weight, aligned with ``adapters`` (default 1.0)
+            rrf_k: RRF damping constant; larger values flatten rank differences
+            timeout: Default seconds to wait for each adapter call (None waits forever)
+            adapter_timeouts: Per-adapter overrides of ``timeout``, aligned with ``adapters``
+        """
         self.adapters = adapters
+        self.fusion = FusionMethod(fusion)
+        self.weights = list(weights) if weights is not None else [1.0] * len(adapters)
+        self.rrf_k = rrf_k
+        self.timeout = timeout
+        self.adapter_timeouts = list(adapter_timeouts) if adapter_timeouts is not None else [None] * len(adapters)
+        if len(self.weights) != len(adapters) or len(self.adapter_timeouts) != len(adapters):
+            raise ValueError("weights and adapter_timeouts must align with adapters")
+
+    def _timeout_for(self, index: int) -> Optional[float]:
+        override = self.adapter_timeouts[index]
+        return self.timeout if override is None else override
+
+    async def _call(self, adapter: Any, method_name: str, *args, **kwargs) -> Any:
+        method = getattr(adapter, method_name)
+        if asyncio.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+        # Sync adapters must not block the event loop. A timed-out call keeps
+        # running in its thread, but its result is ignored.
+        result = await asyncio.to_thread(method, *args, **kwargs)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    async def _fan_out(self, method_name: str, *args, **kwargs) -> List[Tuple[int, Any]]:
+        """Call ``method_name`` on every adapter that has it, concurrently.
 
-    async def add_documents(self, documents: List[Dict[str, Any]]):
+        Returns ``(adapter_index, result_or_exception)`` pairs; a timed out
+        call yields an ``asyncio.TimeoutError``.
+        """
+        indices = [i for i, adapter in enumerate(self.adapters) if hasattr(adapter, method_name)]
+        outcomes = await asyncio.gather(
+            *(
+                asyncio.wait_for(self._call(self.adapters[i], method_name, *args, **kwargs), self._timeout_for(i))
+                for i in indices
+            ),
+            return_exceptions=True
+        )
+        return list(zip(indices, outcomes))
+
+    async def _fan_out_write(self, method_name: str, *args) -> None:
+        """Apply a write to every adapter; raise the first failure once all have run."""
+        errors = []
+        for index, outcome in await self._fan_out(method_name, *args):
+            if isinstance(outcome, BaseException):
+                logger.error(f"{method_name} failed on adapter {self.adapters[index]!r}: {outcome!r}")
+                errors.append(outcome)
+        if errors:
+            raise errors[0]
+
+    async def add_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
         """
         Add documents to all registered adapters.
+
+        Documents without an ``id`` get a generated one, so every adapter
+        stores them under the same ID. Returns the document IDs.
         """
-        tasks = []
-        for adapter in self.adapters:
-            if hasattr(adapter, "add_documents"):
-                # Check if async capable, otherwise run in executor if needed
-                # For this implementation, we assume adapters have async methods or we await them directly
-                # If synchronous, we'd wrap in run_in_executor
-                if asyncio.iscoroutinefunction(adapter.add_documents):
-                    tasks.append(adapter.add_documents(documents))
-                else:
-                    # Sync adapter fallback
-                    adapter.add_documents(documents)
-        
-        if tasks:
-            await asyncio.gather(*tasks)
+        documents = [doc if doc.get("id") else {**doc, "id": str(uuid.uuid4())} for doc in documents]
+        await self._fan_out_write("add_documents", documents)
+        return [doc["id"] for doc in documents]
 
     async def query(self, query: str, top_k: int = 5, **kwargs) -> List[Dict[str, Any]]:
         """
         Query all adapters and aggregate results.
+
+        Adapters that fail or time out are skipped; the returned ``score`` is
+        the fused score.
         """
-        tasks = []
-        for adapter in self.adapters:
-            # Check availability of query method
-            if hasattr(adapter, "query"):
-                if asyncio.iscoroutinefunction(adapter.query):
-                    tasks.append(adapter.query(query, top_k=top_k, **kwargs))
-                else:
-                    # Mock result for sync adapter or call it
-                    # In a real scenario, correct async wrapping is needed
-                    pass
-
-        if not tasks:
+        ranked_lists = []
+        for index, outcome in await self._fan_out("query", query, top_k=top_k, **kwargs):
+            if isinstance(outcome, asyncio.TimeoutError):
+                logger.warning(f"Adapter {self.adapters[index]!r} timed out; returning partial results")
+            elif isinstance(outcome, BaseException):
+                logger.warning(f"Adapter {self.adapters[index]!r} query failed: {outcome!r}")
+            elif outcome:
+                ranked_lists.append((index, list(outcome)))
+
+        if not ranked_lists:
             return []
 
-        results_list = await asyncio.gather(*tasks)
-        
-        # Flatten and Deduplicate
-        all_results = []
-        seen_ids = set()
-        
-        for results in results_list:
-            for res in results:
-                # Assume result has 'id' or use text hash
-                doc_id = res.get("id") or hash(res.get("text", ""))
-                if doc_id not in seen_ids:
-                    seen_ids.add(doc_id)
-                    all_results.append(res)
-        
-        # Sort by score if available
-        all_results.sort(key=lambda x: x.get("score", 0), reverse=True)
-        
-        return all_results[:top_k]
+        if self.fusion == FusionMethod.RRF:
+            fused = self._reciprocal_rank_fusion(ranked_lists)
+        else:
+            fused = self._min_max_fusion(ranked_lists)
+
+        results = sorted(fused.values(), key=lambda item: item[0], reverse=True)[:top_k]
+        return [{**doc, "score": score} for score, doc in results]
+
+    @staticmethod
+    def _doc_key(result: Dict[str, Any]) -> Any:
+        # Assume result has 'id' or fall back to its text
+        return result.get("id") or result.get("text", "")
+
+    def _reciprocal_rank_fusion(self, ranked_lists: List[Tuple[int, List[Dict[str, Any]]]]) -> Dict[Any, list]:
+        fused: Dict[Any, list] = {}
+        for index, results in ranked_lists:
+            weight = self.weights[index]
+            seen = set()
+            for rank, result in enumerate(results, start=1):
+                key = self._doc_key(result)
+                if key in seen:
+                    continue
+                seen.add(key)
+                entry = fused.setdefault(key, [0.0, result])
+                entry[0] += weight / (self.rrf_k + rank)
+        return fused
+
+    def _min_max_fusion(self, ranked_lists: List[Tuple[int, List[Dict[str, Any]]]]) -> Dict[Any, list]:
+        fused: Dict[Any, list] = {}
+        for index, results in ranked_lists:
+            weight = self.weights[index]
+            best: Dict[Any, Tuple[float, Dict[str, Any]]] = {}
+            for result in results:
+                key = self._doc_key(result)
+                score = float(result.get("score", 0.0))
+                if key not in best or score > best[key][0]:
+                    best[key] = (score, result)
+            low = min(score for score, _ in best.values())
+            high = max(score for score, _ in best.values())
+            span = high - low
+            for key, (score, result) in best.items():
+                normalized = (score - low) / span if span > 0 else 1.0
+                entry = fused.setdefault(key, [0.0, result])
+                entry[0] += weight * normalized
+        return fused
 
     async def delete(self, document_ids: List[str]):
         """
         Delete documents from all adapters.
         """
-        tasks = []
-        for adapter in self.adapters:
-             if hasattr(adapter, "delete"):
-                if asyncio.iscoroutinefunction(adapter.delete):
-                    tasks.append(adapter.delete(document_ids))
-                else:
-                    adapter.delete(document_ids)
-        
-        if tasks:
-            await asyncio.gather(*tasks)
+        await self._fan_out_write("delete", document_ids)
 
     def to_framework(self, framework: str = "langchain") -> Any:
         """
         Convert the workflow into a format compatible with LangChain or LlamaIndex.
+
+        The wrappers' async methods await the manager directly. Their sync
+        methods run it on a shared background event loop thread, so they also
+        work when called from inside a running loop (FastAPI, Jupyter).
+
         Args:
             framework (str): The target framework, either "langchain" or "llamaindex".
         Returns:
@@ -99,32 +198,36 @@ class HybridMemoryManager:
                 """LangChain-compatible wrapper for HybridMemoryManager."""
                 def __init__(self, manager):
                     self.manager = manager
-                    self.embeddings = None # Required abstract property
 
-                def add_texts(self, texts, metadatas=None, **kwargs):
+                async def aadd_texts(self, texts, metadatas=None, *, ids=None, **kwargs):
                     docs = []
                     for i, text in enumerate(texts):
-                        meta = metadatas[i] if metadatas else {}
-                        docs.append({"text": text, "metadata": meta})
-                    # Use run_until_complete since VectorStore API is sync usually
-                    # Or users should use aarch? For now blocking for compatibility
-                    try:
-                        loop = asyncio.get_event_loop()
-                    except RuntimeError:
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                    loop.run_until_complete(self.manager.add_documents(docs))
-                    return [str(i) for i in range(len(texts))]
+                        doc = {"text": text, "metadata": metadatas[i] if metadatas else {}}
+                        if ids:
+                            doc["id"] = ids[i]
+                        docs.append(doc)
+                    return await self.manager.add_documents(docs)
 
-                def similarity_search(self, query, k=10, **kwargs):
-                    try:
-                        loop = asyncio.get_event_loop()
-                    except RuntimeError:
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                    results = loop.run_until_complete(self.manager.query(query, top_k=k))
+                def add_texts(self, texts, metadatas=None, *, ids=None, **kwargs):
+                    return run_in_background_loop(self.aadd_texts(list(texts), metadatas, ids=ids, **kwargs))
+
+                async def asimilarity_search(self, query, k=10, **kwargs):
+                    results = await self.manager.query(query, top_k=k)
                     # Convert to LangChain Documents
-                    return [Document(page_content=r.get("text", ""), metadata=r.get("metadata", {})) for r in results]
+                    return [
+                        Document(page_content=r.get("text", ""), metadata=r.get("metadata", {}), id=r.get("id"))
+                        for r in results
+                    ]
+
+                def similarity_search(self, query, k=10, **kwargs):
+                    return run_in_background_loop(self.asimilarity_search(query, k=k, **kwargs))
+
+                async def adelete(self, ids=None, **kwargs):
+                    await self.manager.delete(list(ids or []))
+                    return True
+
+                def delete(self, ids=None, **kwargs):
+                    return run_in_background_loop(self.adelete(ids, **kwargs))
                 
                 @classmethod
                 def from_texts(cls, *args, **kwargs):
@@ -145,34 +248,55 @@ class HybridMemoryManager:
                     super().__init__(callback_manager=None)
                     self.manager = manager
 
+                def _get_prompt_modules(self):
+                    return {}
+
                 def _query(self, query_bundle) -> Response:
-                    query_str = query_bundle.query_str
-                    try:
-                        loop = asyncio.get_event_loop()
-                    except RuntimeError:
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                    results = loop.run_until_complete(self.manager.query(query_str))
-                    
-                    # Convert to Response
-                    nodes = []
-                    for res in results:
-                        node = NodeWithScore(node=TextNode(text=res.get("text", "")), score=res.get("score", 0.0))
-                        nodes.append(node)
-                        
-                    return Response(response=str(results), source_nodes=nodes)
+                    return run_in_background_loop(self._aquery(query_bundle))
                 
-                async def aquery(self, query_bundle) -> Response:
-                    query_str = query_bundle.query_str
-                    results = await self.manager.query(query_str)
-                     # Convert to Response
-                    nodes = []
-                    for res in results:
-                         node = NodeWithScore(node=TextNode(text=res.get("text", "")), score=res.get("score", 0.0))
-                         nodes.append(node)
+                async def _aquery(self, query_bundle) -> Response:
+                    results = await self.manager.query(query_bundle.query_str)
+                    # Convert to Response
+                    nodes = [
+                        NodeWithScore(
+                            node=TextNode(id_=res.get("id"), text=res.get("text", ""), metadata=res.get("metadata", {})),
+                            score=res.get("score", 0.0)
+                        )
+                        for res in results
+                    ]
                     return Response(response=str(results), source_nodes=nodes)
 
             return MultiSourceLlamaIndex(self)
 
         else:
             raise ValueError(f"Unsupported framework: {framework}")
+
+
+class _BackgroundLoop:
+    """An event loop running forever in a daemon thread, shared by sync callers."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="hybrid-memory-loop", daemon=True)
+        self.thread.start()
+
+
+_background: Optional[_BackgroundLoop] = None
+_background_lock = threading.Lock()
+
+
+def run_in_background_loop(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine to completion on the shared background loop and return its result.
+
+    Unlike ``run_until_complete`` this is safe to call from a thread that is
+    already running an event loop, and it reuses one loop for every call.
+    """
+    global _background
+    with _background_lock:
+        if _background is None:
+            _background = _BackgroundLoop()
+    if threading.current_thread() is _background.thread:
+        coro.close()
+        raise RuntimeError("run_in_background_loop would deadlock when called from the background loop")
+    return asyncio.run_coroutine_threadsafe(coro, _background.loop).result()
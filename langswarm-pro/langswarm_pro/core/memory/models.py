@@ -19,7 +19,7 @@ class ProMemoryRecord(EnhancedMemoryRecord):
     fading_rate: float = 0.1  # Default decay rate
     is_protected: bool = False # If true, never deleted by cleanup
     
-    def calculate_current_importance(self) -> float:
+    def calculate_current_importance(self, now: Optional[datetime] = None) -> float:
         """Calculate importance based on tier and decay"""
         if self.priority_tier == PriorityTier.CRITICAL or self.is_protected:
             return 1.0
@@ -27,7 +27,7 @@ class ProMemoryRecord(EnhancedMemoryRecord):
         base_score = self.importance_score
         
         # Recency boost
-        now = datetime.now(timezone.utc)
+        now = now or datetime.now(timezone.utc)
         hours_since_access = (now - self.last_accessed).total_seconds() / 3600
         
         # Simple decay formula: score * (1 - rate)^hours
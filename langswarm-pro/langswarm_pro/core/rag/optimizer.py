@@ -1,12 +1,47 @@
-from typing import List, Dict, Any, Optional
+import asyncio
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Callable, List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN = re.compile(r"\w+")
+
+# Scores (query, document text) pairs, e.g. ``CrossEncoder(...).predict`` from sentence-transformers
+CrossEncoder = Callable[[List[Tuple[str, str]]], Sequence[float]]
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _doc_text(doc: Dict[str, Any]) -> str:
+    return str(doc.get("content") or doc.get("text") or "")
+
 
 class RAGOptimizer:
     """
     Optimizer for RAG pipelines.
     Provides methods for summarization, reranking, and query expansion.
+
+    Reranking scores candidates with ``cross_encoder`` when one is given,
+    otherwise with BM25 against the query (statistics taken over the
+    candidate set, so no index or model is needed).
     """
-    def __init__(self):
-        pass
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, cross_encoder: Optional[CrossEncoder] = None, mmr_lambda: Optional[float] = None):
+        """
+        Args:
+            cross_encoder: Optional callable scoring (query, text) pairs
+            mmr_lambda: Default relevance/diversity trade-off for MMR
+                (1.0 = relevance only); None disables MMR
+        """
+        self.cross_encoder = cross_encoder
+        self.mmr_lambda = mmr_lambda
 
     async def summarize(self, documents: List[str]) -> List[str]:
         """
@@ -22,20 +57,90 @@ class RAGOptimizer:
         # For now, return a truncated version or placeholder
         return [f"Summary of: {doc[:50]}..." for doc in documents]
 
-    async def rerank(self, query: str, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def rerank(
+        self,
+        query: str,
+        documents: List[Dict[str, Any]],
+        top_k: Optional[int] = None,
+        mmr_lambda: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
         """
         Rerank documents based on relevance to the query.
         
         Args:
             query: Searching query.
             documents: List of document dictionaries (must contain 'content' or 'text').
+            top_k: Number of documents to return (default: all).
+            mmr_lambda: Apply maximal marginal relevance with this trade-off;
+                only used when every document carries an 'embedding'.
             
         Returns:
-            Reranked list of documents.
+            Reranked list of documents, each with a 'rerank_score'.
         """
-        # TODO: Integrate with cross-encoder or LLM for reranking
-        # For now, return as is (could implement simple keyword match scoring here)
-        return documents
+        if not documents:
+            return []
+        top_k = len(documents) if top_k is None else min(top_k, len(documents))
+        mmr_lambda = self.mmr_lambda if mmr_lambda is None else mmr_lambda
+
+        if self.cross_encoder is not None:
+            pairs = [(query, _doc_text(doc)) for doc in documents]
+            # Model inference is blocking; keep it off the event loop
+            scores = [float(s) for s in await asyncio.to_thread(self.cross_encoder, pairs)]
+        else:
+            scores = self._bm25_scores(query, [_doc_text(doc) for doc in documents])
+
+        if mmr_lambda is not None and all(doc.get("embedding") is not None for doc in documents):
+            order = self._mmr(scores, [doc["embedding"] for doc in documents], top_k, mmr_lambda)
+        else:
+            # Negated index keeps the input order for ties
+            order = [i for _, _, i in heapq.nlargest(
+                top_k, ((score, -i, i) for i, score in enumerate(scores))
+            )]
+
+        return [{**documents[i], "rerank_score": scores[i]} for i in order]
+
+    def _bm25_scores(self, query: str, texts: List[str]) -> List[float]:
+        query_terms = set(_tokenize(query))
+        docs = [Counter(_tokenize(text)) for text in texts]
+        lengths = [sum(tf.values()) for tf in docs]
+        avg_length = (sum(lengths) / len(lengths)) or 1.0
+
+        idf = {}
+        for term in query_terms:
+            df = sum(1 for tf in docs if term in tf)
+            idf[term] = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+
+        scores = []
+        for tf, length in zip(docs, lengths):
+            norm = self.K1 * (1 - self.B + self.B * length / avg_length)
+            scores.append(sum(
+                idf[term] * tf[term] * (self.K1 + 1) / (tf[term] + norm)
+                for term in query_terms if term in tf
+            ))
+        return scores
+
+    @staticmethod
+    def _mmr(scores: List[float], embeddings: List[Sequence[float]], top_k: int, mmr_lambda: float) -> List[int]:
+        """Greedy maximal marginal relevance over min-max normalized scores and cosine similarity"""
+        relevance = np.asarray(scores, dtype=np.float64)
+        spread = relevance.max() - relevance.min()
+        relevance = (relevance - relevance.min()) / spread if spread > 0 else np.ones_like(relevance)
+
+        vectors = np.asarray(embeddings, dtype=np.float64)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        selected: List[int] = []
+        max_similarity = np.full(len(scores), -np.inf)
+        available = np.ones(len(scores), dtype=bool)
+        for _ in range(top_k):
+            redundancy = np.where(np.isfinite(max_similarity), max_similarity, 0.0)
+            marginal = mmr_lambda * relevance - (1 - mmr_lambda) * redundancy
+            marginal[~available] = -np.inf
+            best = int(np.argmax(marginal))
+            selected.append(best)
+            available[best] = False
+            max_similarity = np.maximum(max_similarity, vectors @ vectors[best])
+        return selected
 
     async def expand_query(self, query: str) -> List[str]:
         """
@@ -1,62 +1,354 @@
+import asyncio
+import codecs
+import hashlib
+import logging
 import os
-from typing import Optional, Dict, List, Any
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Optional, Dict, List, Any, Set, Tuple
 
 # Assuming langswarm imports will be available
-# In a real implementation, we would import specific chunkers/loaders
-# For now, we mock the internal logic to establish the structure
+# In a real implementation, we would import specific loaders (PDF, HTML, ...)
+
+logger = logging.getLogger(__name__)
+
+_PARAGRAPH_BREAK = re.compile(r"\n(?:[ \t\r]*\n)+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _word_count(text: str) -> int:
+    return len(text.split())
+
+
+def resolve_within(path: str, root: str) -> Optional[str]:
+    """
+    Resolve ``path`` (relative paths against ``root``), following symlinks.
+
+    Returns the real path, or None if it lies outside ``root``.
+    """
+    real_root = os.path.realpath(root)
+    real_path = os.path.realpath(os.path.join(real_root, path))
+    if os.path.commonpath([real_path, real_root]) != real_root:
+        return None
+    return real_path
+
+
+@dataclass
+class IngestionProgress:
+    """Counters updated while a pipeline run is in progress."""
+    files_total: int = 0
+    files_done: int = 0
+    chunks_written: int = 0
+    chunks_skipped: int = 0
+    bytes_read: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class ChunkHashStore:
+    """Remembers content hashes of ingested chunks so re-ingestion can skip them."""
+
+    def __init__(self):
+        self._hashes: Set[bytes] = set()
+
+    def filter_new(self, hashes: List[bytes]) -> List[bool]:
+        return [digest not in self._hashes for digest in hashes]
+
+    def add(self, hashes: Iterable[bytes]) -> None:
+        self._hashes.update(hashes)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+class SQLiteChunkHashStore(ChunkHashStore):
+    """Chunk hashes kept in a local SQLite file, so dedupe survives restarts."""
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS chunk_hashes (digest BLOB PRIMARY KEY) WITHOUT ROWID")
+        self._conn.commit()
+
+    def filter_new(self, hashes: List[bytes]) -> List[bool]:
+        if not hashes:
+            return []
+        with self._lock:
+            placeholders = ",".join("?" for _ in hashes)
+            seen = {
+                row[0] for row in self._conn.execute(
+                    f"SELECT digest FROM chunk_hashes WHERE digest IN ({placeholders})", hashes
+                )
+            }
+        return [digest not in seen for digest in hashes]
+
+    def add(self, hashes: Iterable[bytes]) -> None:
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO chunk_hashes VALUES (?)", [(d,) for d in hashes])
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunk_hashes").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
 
 class IngestionPipeline:
     """
     AutoRAG Pipeline for ingesting, chunking, enriching, and indexing documents.
+
+    Files are read in blocks and split on paragraph and sentence boundaries
+    into chunks of at most ``chunk_tokens`` tokens, with ``overlap_tokens``
+    of trailing sentences repeated at the start of the next chunk. Chunks
+    whose content hash was ingested before are skipped, and the rest are
+    written in ``add_documents`` calls of ``batch_size`` documents.
     """
-    def __init__(self, memory_manager, optimizer=None):
+    def __init__(
+        self,
+        memory_manager,
+        optimizer=None,
+        chunk_tokens: int = 256,
+        overlap_tokens: int = 32,
+        batch_size: int = 64,
+        max_concurrency: int = 4,
+        read_block_size: int = 1 << 20,
+        token_counter: Callable[[str], int] = _word_count,
+        hash_store: Optional[ChunkHashStore] = None,
+        allowed_root: Optional[str] = None
+    ):
+        """
+        Args:
+            memory_manager: Destination exposing ``add_documents(documents)``
+            optimizer: Optional RAGOptimizer used for enrichment
+            chunk_tokens: Maximum tokens per chunk
+            overlap_tokens: Tokens of trailing context carried into the next chunk
+            batch_size: Documents per ``add_documents`` call
+            max_concurrency: Files ingested at once when given a directory
+            read_block_size: Bytes read from a file at a time
+            token_counter: Counts tokens in a piece of text (default: words)
+            hash_store: Where ingested chunk hashes are remembered
+            allowed_root: If set, files that resolve outside this directory
+                (e.g. through symlinks) are refused with PermissionError
+        """
+        if overlap_tokens >= chunk_tokens:
+            raise ValueError("overlap_tokens must be smaller than chunk_tokens")
         self.memory_manager = memory_manager
         self.optimizer = optimizer
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.read_block_size = read_block_size
+        self.token_counter = token_counter
+        self.hash_store = hash_store if hash_store is not None else ChunkHashStore()
+        self.allowed_root = allowed_root
 
-    async def run(self, input_path: str, metadata: Optional[Dict[str, Any]] = None):
+    async def run(
+        self,
+        input_path: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        progress: Optional[IngestionProgress] = None
+    ) -> int:
         """
         Run the ingestion pipeline on a file or directory.
+
+        Returns the number of chunks written; unchanged chunks are not counted.
+        When ``progress`` is given it is updated as files are read, and a file
+        that fails is recorded in ``progress.errors`` instead of aborting the run.
         """
-        print(f"🔍 Step 1: Loading {input_path}...")
-        # TODO: Implement loaders (PDF, txt, etc.)
-        content = self._load_content(input_path)
-
-        print(f"✂️ Step 2: Chunking content...")
-        # TODO: Implement smart chunking strategies
-        chunks = self._chunk_content(content)
-
-        print(f"🧠 Step 3: Enriching metadata...")
-        enriched_docs = []
-        base_meta = metadata or {}
-        
-        for i, chunk in enumerate(chunks):
-            doc = {
-                "text": chunk,
-                "metadata": {
-                    **base_meta,
-                    "source": input_path,
-                    "chunk_index": i
-                }
+        if not os.path.isdir(input_path):
+            if progress is not None:
+                progress.files_total += 1
+            return await self._ingest_file(input_path, metadata or {}, progress)
+
+        paths = sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(input_path)
+            for name in names
+        )
+        if progress is not None:
+            progress.files_total += len(paths)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def ingest(path: str) -> int:
+            async with semaphore:
+                return await self._ingest_file(path, metadata or {}, progress)
+
+        counts = await asyncio.gather(*(ingest(path) for path in paths))
+        logger.info(f"Stored {sum(counts)} chunks from {len(paths)} files in {input_path}")
+        return sum(counts)
+
+    async def _ingest_file(
+        self, path: str, base_meta: Dict[str, Any], progress: Optional[IngestionProgress] = None
+    ) -> int:
+        if progress is None:
+            return await self._ingest_chunks(path, base_meta, None)
+        try:
+            return await self._ingest_chunks(path, base_meta, progress)
+        except Exception as e:
+            progress.errors.append(f"{path}: {e}")
+            return 0
+        finally:
+            progress.files_done += 1
+
+    async def _ingest_chunks(
+        self, path: str, base_meta: Dict[str, Any], progress: Optional[IngestionProgress]
+    ) -> int:
+        if self.allowed_root is not None and resolve_within(path, self.allowed_root) is None:
+            raise PermissionError(f"{path} is outside the ingestion root")
+        logger.debug(f"Ingesting {path}")
+        chunks = self._chunk_content(self._iter_units(path, progress))
+        chunk_index = 0
+        written = 0
+
+        while True:
+            # Reading and chunking are CPU-bound; keep them off the event loop
+            batch = await asyncio.to_thread(self._next_batch, chunks)
+            if not batch:
+                break
+
+            hashes = [hashlib.blake2b(chunk.encode("utf-8"), digest_size=16).digest() for chunk in batch]
+            fresh = self.hash_store.filter_new(hashes)
+
+            documents, new_hashes = [], []
+            for chunk, digest, is_new in zip(batch, hashes, fresh):
+                if is_new and digest not in new_hashes:
+                    documents.append(self._enrich(chunk, digest, path, chunk_index, base_meta))
+                    new_hashes.append(digest)
+                chunk_index += 1
+
+            if documents:
+                await self.memory_manager.add_documents(documents)
+                self.hash_store.add(new_hashes)
+                written += len(documents)
+            if progress is not None:
+                progress.chunks_written += len(documents)
+                progress.chunks_skipped += len(batch) - len(documents)
+
+        logger.debug(f"Stored {written} new chunks ({chunk_index} total) from {path}")
+        return written
+
+    def _enrich(self, chunk: str, digest: bytes, path: str, chunk_index: int, base_meta: Dict[str, Any]):
+        doc = {
+            "id": digest.hex(),
+            "text": chunk,
+            "metadata": {
+                **base_meta,
+                "source": path,
+                "chunk_index": chunk_index,
             }
-            
-            # Apply optimization if available
-            if self.optimizer:
-                # e.g., generate a title or questions for this chunk
-                # doc["metadata"]["generated_questions"] = await self.optimizer.generate_questions(chunk)
-                pass
-                
-            enriched_docs.append(doc)
-
-        print(f"📥 Step 4: Storing to Memory Manager...")
-        await self.memory_manager.add_documents(enriched_docs)
-        print(f"✅ Stored {len(enriched_docs)} chunks from {input_path}")
-        return len(enriched_docs)
-
-    def _load_content(self, path: str) -> str:
-        # Placeholder for loader logic
-        with open(path, 'r') as f:
-            return f.read()
-
-    def _chunk_content(self, content: str, chunk_size: int = 1000) -> List[str]:
-        # Placeholder for chunking logic
-        return [content[i:i+chunk_size] for i in range(0, len(content), chunk_size)]
+        }
+
+        # Apply optimization if available
+        if self.optimizer:
+            # e.g., generate a title or questions for this chunk
+            # doc["metadata"]["generated_questions"] = await self.optimizer.generate_questions(chunk)
+            pass
+
+        return doc
+
+    def _next_batch(self, chunks: Iterator[str]) -> List[str]:
+        batch = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= self.batch_size:
+                break
+        return batch
+
+    def _iter_units(self, path: str, progress: Optional[IngestionProgress] = None) -> Iterator[Tuple[str, bool]]:
+        """Stream ``(sentence, ends_paragraph)`` pairs from a text file."""
+        buffer = ""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        with open(path, "rb") as f:
+            while True:
+                raw = f.read(self.read_block_size)
+                if not raw:
+                    break
+                if progress is not None:
+                    progress.bytes_read += len(raw)
+                buffer += decoder.decode(raw)
+
+                paragraphs = _PARAGRAPH_BREAK.split(buffer)
+                buffer = paragraphs.pop()
+                for paragraph in paragraphs:
+                    yield from self._split_sentences(paragraph, ends_paragraph=True)
+
+                if len(buffer) > self.read_block_size:
+                    # A very long paragraph: emit its complete sentences now
+                    sentences = _SENTENCE_END.split(buffer)
+                    buffer = sentences.pop()
+                    for sentence in sentences:
+                        yield sentence, False
+                if len(buffer) > 2 * self.read_block_size:
+                    # No sentence boundary either; cut at the last whitespace
+                    cut = buffer.rfind(" ", 0, len(buffer) - 1)
+                    cut = cut if cut > 0 else self.read_block_size
+                    yield buffer[:cut], False
+                    buffer = buffer[cut:]
+
+        buffer += decoder.decode(b"", final=True)
+        yield from self._split_sentences(buffer, ends_paragraph=True)
+
+    @staticmethod
+    def _split_sentences(paragraph: str, ends_paragraph: bool) -> Iterator[Tuple[str, bool]]:
+        sentences = [s for s in _SENTENCE_END.split(paragraph.strip()) if s]
+        for i, sentence in enumerate(sentences):
+            yield sentence, ends_paragraph and i == len(sentences) - 1
+
+    def _chunk_content(self, units: Iterable[Tuple[str, bool]]) -> Iterator[str]:
+        """
+        Pack sentences into chunks of at most ``chunk_tokens`` tokens.
+
+        Chunks close early at a paragraph end once they are half full, and a
+        sentence longer than a whole chunk is split on words.
+        """
+        current: List[Tuple[str, int, bool]] = []  # (sentence, tokens, ends_paragraph)
+        current_tokens = 0
+        pending = 0  # sentences added since the last emitted chunk
+
+        def emit() -> str:
+            nonlocal current, current_tokens, pending
+            text = "".join(
+                sentence + ("\n\n" if ends_paragraph else " ")
+                for sentence, _, ends_paragraph in current
+            ).strip()
+            # Carry trailing sentences into the next chunk as overlap
+            overlap, overlap_tokens = [], 0
+            for unit in reversed(current):
+                if overlap_tokens + unit[1] > self.overlap_tokens:
+                    break
+                overlap.insert(0, unit)
+                overlap_tokens += unit[1]
+            current, current_tokens, pending = overlap, overlap_tokens, 0
+            return text
+
+        for sentence, ends_paragraph in units:
+            tokens = self.token_counter(sentence)
+            if tokens > self.chunk_tokens:
+                if pending:
+                    yield emit()
+                words = sentence.split()
+                step = self.chunk_tokens - self.overlap_tokens
+                for start in range(0, len(words), step):
+                    yield " ".join(words[start:start + self.chunk_tokens])
+                current, current_tokens, pending = [], 0, 0
+                continue
+
+            if pending and current_tokens + tokens > self.chunk_tokens:
+                yield emit()
+
+            if current_tokens + tokens > self.chunk_tokens:
+                current, current_tokens = [], 0
+            current.append((sentence, tokens, ends_paragraph))
+            current_tokens += tokens
+            pending += 1
+            if ends_paragraph and current_tokens * 2 >= self.chunk_tokens:
+                yield emit()
+
+        if pending:
+            yield emit()
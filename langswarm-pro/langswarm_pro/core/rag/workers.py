@@ -0,0 +1,149 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections import Counter
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from ..scheduler.manager import JobManager
+from ..scheduler.models import Job, JobType
+from .pipeline import IngestionPipeline, IngestionProgress
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionWorkerPool:
+    """
+    Runs INGESTION jobs from a JobManager through an IngestionPipeline.
+
+    At most ``max_workers`` ingestions run at once, and at most
+    ``max_per_user`` for any one user (the job's ``agent_id``); a user's
+    further jobs stay queued in the JobManager, so other users' jobs are not
+    stuck behind them. Live progress is kept per job and stored as the job's
+    ``result`` when it finishes. Leases on running jobs are renewed while
+    they run, so long imports are not reclaimed by another worker.
+    """
+
+    def __init__(
+        self,
+        job_manager: JobManager,
+        pipeline: IngestionPipeline,
+        max_workers: int = 4,
+        max_per_user: int = 1,
+        poll_interval: float = 1.0
+    ):
+        self.job_manager = job_manager
+        self.pipeline = pipeline
+        self.max_workers = max_workers
+        self.max_per_user = max_per_user
+        self.poll_interval = poll_interval
+        self.progress: Dict[str, IngestionProgress] = {}
+        self._active: Dict[str, asyncio.Task] = {}
+        self._per_user: Counter = Counter()
+        self._wake: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start dispatching on the running event loop; a no-op if already running."""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wake = asyncio.Event()
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        """Stop dispatching and cancel running ingestions; their leases expire and they are retried."""
+        # Stop claiming first so no new job starts while the running ones are cancelled
+        tasks = [self._dispatcher] if self._dispatcher else []
+        tasks += self._active.values()
+        for task in tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._dispatcher = None
+
+    async def submit(self, user_id: str, path: str, metadata: Optional[Dict[str, Any]] = None) -> Job:
+        """Enqueue an ingestion of ``path`` (a file or directory) on behalf of ``user_id``."""
+        job = Job(
+            agent_id=user_id,
+            task_name=f"ingest:{path}",
+            job_type=JobType.INGESTION,
+            arguments={"path": path, "metadata": metadata or {}},
+            next_run_at=self.job_manager.clock()
+        )
+        await self.job_manager.schedule_job(job)
+        self.progress[job.id] = IngestionProgress()
+        if self._wake is not None:
+            self._wake.set()
+        return job
+
+    async def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job state plus chunk, byte and error counters (live while running)."""
+        job = await self.job_manager.get_job(job_id)
+        if job is None or job.job_type != JobType.INGESTION:
+            return None
+        progress = self.progress.get(job_id)
+        counters = asdict(progress) if progress is not None else (job.result or asdict(IngestionProgress()))
+        return {
+            "job_id": job.id,
+            "user_id": job.agent_id,
+            "path": job.arguments.get("path"),
+            "status": job.status.value,
+            "failure_reason": job.failure_reason,
+            **counters,
+        }
+
+    async def _dispatch(self) -> None:
+        lease_refresh = self.job_manager.lease_duration.total_seconds() / 3
+        last_refresh = time.monotonic()
+        while True:
+            self._wake.clear()
+            try:
+                await self._fill()
+                if self._active and time.monotonic() - last_refresh >= lease_refresh:
+                    for job_id in list(self._active):
+                        await self.job_manager.extend_lease(job_id)
+                    last_refresh = time.monotonic()
+            except Exception:
+                logger.exception("Failed to dispatch ingestion jobs")
+            # asyncio.wait, unlike wait_for on 3.11, never swallows a cancel that
+            # races with the wake-up (finishing jobs set it while stop() cancels)
+            waiter = asyncio.ensure_future(self._wake.wait())
+            try:
+                await asyncio.wait({waiter}, timeout=self.poll_interval)
+            finally:
+                waiter.cancel()
+
+    async def _fill(self) -> None:
+        # Claim one job at a time so a single user can't take every free slot
+        while len(self._active) < self.max_workers:
+            capped = [user for user, count in self._per_user.items() if count >= self.max_per_user]
+            claimed = await self.job_manager.claim_due_jobs(
+                limit=1, job_type=JobType.INGESTION, exclude_agents=capped
+            )
+            if not claimed:
+                return
+            job = claimed[0]
+            self._per_user[job.agent_id] += 1
+            task = asyncio.get_running_loop().create_task(self._run(job))
+            self._active[job.id] = task
+
+    async def _run(self, job: Job) -> None:
+        progress = self.progress.setdefault(job.id, IngestionProgress())
+        try:
+            await self.pipeline.run(job.arguments["path"], job.arguments.get("metadata"), progress=progress)
+        except Exception as e:
+            progress.errors.append(str(e))
+            await self.job_manager.mark_failed(job.id, str(e), result=asdict(progress))
+        else:
+            if progress.errors and len(progress.errors) >= progress.files_total:
+                await self.job_manager.mark_failed(job.id, "Every file failed to ingest", result=asdict(progress))
+            else:
+                await self.job_manager.mark_completed(job.id, result=asdict(progress))
+        finally:
+            self.progress.pop(job.id, None)
+            self._active.pop(job.id, None)
+            self._per_user[job.agent_id] -= 1
+            if self._per_user[job.agent_id] <= 0:
+                del self._per_user[job.agent_id]
+            if self._wake is not None:
+                self._wake.set()
@@ -1,44 +1,266 @@
 import asyncio
-from typing import List, Optional, Dict
-from datetime import datetime
+import heapq
+import itertools
+import logging
+import os
+import socket
+import uuid
+from typing import Any, Callable, Collection, List, Optional, Dict, Tuple
+from datetime import datetime, timedelta
 from .models import Job, JobStatus, JobType
+from .schedule import next_fire_time, to_utc_naive
+from .store import SQLiteJobStore
+
+logger = logging.getLogger(__name__)
+
 
 class JobManager:
-    def __init__(self):
+    """
+    Schedules jobs and hands due ones to workers under time-limited leases.
+
+    Without a store, jobs live in memory and due jobs are kept in a min-heap
+    keyed on ``next_run_at`` (or on ``lease_expires_at`` for running jobs, so
+    expired leases become claimable again); superseded heap entries are
+    skipped lazily when they reach the top. With a ``store`` the store is the
+    source of truth: the schedule survives restarts, due jobs come from its
+    ``(status, next_run_at)`` index and claims are atomic, so several workers
+    can share one schedule.
+    """
+
+    def __init__(
+        self,
+        store: Optional[SQLiteJobStore] = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 300.0,
+        clock: Callable[[], datetime] = datetime.utcnow
+    ):
+        self.store = store
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lease_duration = timedelta(seconds=lease_seconds)
+        self.clock = clock
         self._jobs: Dict[str, Job] = {}
-        
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._sequence = itertools.count()
+
+    def _push(self, job: Job) -> None:
+        if job.status == JobStatus.PENDING:
+            heapq.heappush(self._heap, (job.next_run_at, next(self._sequence), job.id))
+        elif job.status == JobStatus.RUNNING and job.lease_expires_at is not None:
+            heapq.heappush(self._heap, (job.lease_expires_at, next(self._sequence), job.id))
+
+    def _is_current(self, entry: Tuple[datetime, int, str]) -> bool:
+        due_at, _, job_id = entry
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        if job.status == JobStatus.PENDING:
+            return job.next_run_at == due_at
+        return job.status == JobStatus.RUNNING and job.lease_expires_at == due_at
+
+    def _save(self, job: Job) -> None:
+        if self.store is not None:
+            self.store.save(job)
+        else:
+            self._jobs[job.id] = job
+            self._push(job)
+
+    async def _update(self, job_id: str, update: Callable[[Job], bool]) -> bool:
+        """
+        Apply ``update`` to a job and save it, unless the job changed meanwhile.
+
+        ``update`` checks and mutates the job, returning False to leave it
+        alone. With a store the write only lands if the stored status and
+        owner are still the ones ``update`` saw, so a stale worker or a
+        concurrent cancel can't be overwritten. In memory the check and the
+        write happen without yielding to the event loop.
+        """
+        job = await self.get_job(job_id)
+        if job is None:
+            return False
+        status, claimed_by = job.status, job.claimed_by
+        if not update(job):
+            return False
+        if self.store is not None:
+            return self.store.save_if(job, status, claimed_by)
+        self._push(job)
+        return True
+
+    def _owned(self, job: Job) -> bool:
+        return job.status == JobStatus.RUNNING and job.claimed_by == self.worker_id
+
     async def schedule_job(self, job: Job) -> Job:
         """Schedule a new job."""
-        self._jobs[job.id] = job
+        job.next_run_at = to_utc_naive(job.next_run_at)
+        self._save(job)
         return job
-        
+
+    async def schedule_jobs(self, jobs: List[Job]) -> List[Job]:
+        """Schedule many jobs with a single store write."""
+        for job in jobs:
+            job.next_run_at = to_utc_naive(job.next_run_at)
+        if self.store is not None:
+            self.store.save_many(jobs)
+        else:
+            for job in jobs:
+                self._jobs[job.id] = job
+                self._push(job)
+        return jobs
+
     async def get_job(self, job_id: str) -> Optional[Job]:
+        if self.store is not None:
+            return self.store.get(job_id)
         return self._jobs.get(job_id)
-        
+
+    async def list_jobs(self) -> List[Job]:
+        if self.store is not None:
+            return self.store.list_jobs()
+        return list(self._jobs.values())
+
     async def cancel_job(self, job_id: str) -> bool:
-        job = self._jobs.get(job_id)
-        if job:
+        def cancel(job: Job) -> bool:
             job.status = JobStatus.CANCELLED
+            job.claimed_by = None
+            job.lease_expires_at = None
             return True
+
+        # A worker finishing the job at the same moment wins the race; retry on its result
+        for _ in range(3):
+            if await self._update(job_id, cancel):
+                return True
+            if await self.get_job(job_id) is None:
+                return False
         return False
-        
+
     async def get_due_jobs(self) -> List[Job]:
         """Get jobs that are due for execution."""
-        now = datetime.utcnow()
-        return [
-            job for job in self._jobs.values()
-            if job.status == JobStatus.PENDING 
-            and job.next_run_at <= now
-        ]
-        
-    async def mark_running(self, job_id: str):
-        if job := self._jobs.get(job_id):
+        now = self.clock()
+        if self.store is not None:
+            return self.store.get_due(now)
+
+        due, entries = [], []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if self._is_current(entry):
+                entries.append(entry)
+                job = self._jobs[entry[2]]
+                if job.status == JobStatus.PENDING:
+                    due.append(job)
+        # Peeking must not consume the schedule
+        for entry in entries:
+            heapq.heappush(self._heap, entry)
+        return due
+
+    async def claim_due_jobs(
+        self,
+        limit: Optional[int] = None,
+        job_type: Optional[JobType] = None,
+        exclude_agents: Collection[str] = ()
+    ) -> List[Job]:
+        """
+        Lease due jobs to this worker, earliest first.
+
+        Jobs whose previous lease expired are claimed again. A claimed job
+        stays RUNNING until it is completed or its lease runs out. With
+        ``job_type`` only jobs of that type are claimed, and jobs of agents
+        in ``exclude_agents`` are left for later.
+        """
+        now = self.clock()
+        lease_expires_at = now + self.lease_duration
+        if self.store is not None:
+            return self.store.claim_due(self.worker_id, now, lease_expires_at, limit, job_type, exclude_agents)
+
+        claimed, skipped = [], []
+        while self._heap and self._heap[0][0] <= now and (limit is None or len(claimed) < limit):
+            entry = heapq.heappop(self._heap)
+            if not self._is_current(entry):
+                continue
+            job = self._jobs[entry[2]]
+            if (job_type is not None and job.job_type != job_type) or job.agent_id in exclude_agents:
+                skipped.append(entry)
+                continue
+            job.status = JobStatus.RUNNING
+            job.claimed_by = self.worker_id
+            job.lease_expires_at = lease_expires_at
+            self._push(job)
+            claimed.append(job)
+        # Due jobs of other types stay scheduled for other consumers
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return claimed
+
+    async def extend_lease(self, job_id: str) -> bool:
+        """Renew this worker's lease on a long-running job."""
+        def extend(job: Job) -> bool:
+            if not self._owned(job):
+                return False
+            job.lease_expires_at = self.clock() + self.lease_duration
+            return True
+
+        return await self._update(job_id, extend)
+
+    async def mark_running(self, job_id: str) -> bool:
+        """Lease a pending job to this worker outside of ``claim_due_jobs``."""
+        def start(job: Job) -> bool:
+            if job.status != JobStatus.PENDING:
+                return False
             job.status = JobStatus.RUNNING
+            job.claimed_by = self.worker_id
+            job.lease_expires_at = self.clock() + self.lease_duration
+            return True
+
+        return await self._update(job_id, start)
+
+    async def mark_completed(self, job_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Finish a job this worker holds the lease on; recurring jobs are rescheduled.
 
-    async def mark_completed(self, job_id: str):
-        if job := self._jobs.get(job_id):
-            job.status = JobStatus.COMPLETED
-            job.last_run_at = datetime.utcnow()
+        Returns False, changing nothing, if the lease was lost (reclaimed by
+        another worker after expiring) or the job was cancelled meanwhile.
+        """
+        def complete(job: Job) -> bool:
+            if not self._owned(job):
+                return False
+            now = self.clock()
+            job.last_run_at = now
             job.execution_count += 1
+            job.claimed_by = None
+            job.lease_expires_at = None
+            if result is not None:
+                job.result = result
+
+            if job.job_type == JobType.RECURRING and job.schedule_expression:
+                try:
+                    job.next_run_at = next_fire_time(job.schedule_expression, now, anchor=job.next_run_at)
+                    job.status = JobStatus.PENDING
+                except ValueError as e:
+                    job.status = JobStatus.FAILED
+                    job.failure_reason = str(e)
+            else:
+                job.status = JobStatus.COMPLETED
+            return True
+
+        if await self._update(job_id, complete):
+            return True
+        logger.warning(f"Job {job_id} not completed: {self.worker_id} no longer holds its lease")
+        return False
+
+    async def mark_failed(self, job_id: str, reason: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """Fail a job this worker holds the lease on; returns False if the lease was lost."""
+        def fail(job: Job) -> bool:
+            if not self._owned(job):
+                return False
+            job.status = JobStatus.FAILED
+            job.failure_reason = reason
+            job.last_run_at = self.clock()
+            job.claimed_by = None
+            job.lease_expires_at = None
+            if result is not None:
+                job.result = result
+            return True
+
+        if await self._update(job_id, fail):
+            return True
+        logger.warning(f"Job {job_id} not failed: {self.worker_id} no longer holds its lease")
+        return False
 
 job_manager = JobManager()
@@ -36,3 +36,8 @@ class Job(BaseModel):
     max_retries: int = 3
     retry_count: int = 0
     failure_reason: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+
+    # Lease held by the worker currently executing the job
+    claimed_by: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
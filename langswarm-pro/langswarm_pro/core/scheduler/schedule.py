@@ -0,0 +1,145 @@
+"""
+Next fire time calculation for recurring job schedules.
+
+A schedule expression is either a five-field cron expression
+(``minute hour day-of-month month day-of-week``, with ``*``, lists, ranges
+and ``/step``, plus the ``@hourly``/``@daily``/``@weekly``/``@monthly``/
+``@yearly`` macros) or an ISO 8601 duration such as ``PT15M`` or ``P1D``.
+An ISO repeating interval (``R/<start>/PT1H``) uses its duration part.
+"""
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Set
+
+_CRON_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+_ISO_DURATION = re.compile(
+    r"^P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?$"
+)
+
+# Cron searches never need to look further ahead than this
+_MAX_LOOKAHEAD = timedelta(days=366 * 5)
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC, the convention used by Job timestamps"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def parse_iso_duration(expression: str) -> Optional[timedelta]:
+    """Parse an ISO 8601 duration (or the duration of a repeating interval)"""
+    if expression.startswith("R"):
+        expression = expression.rsplit("/", 1)[-1]
+    match = _ISO_DURATION.match(expression)
+    if not match or expression in ("P", "PT"):
+        return None
+    parts = {name: float(value) for name, value in match.groupdict().items() if value}
+    return timedelta(**parts)
+
+
+class CronSchedule:
+    """Parsed five-field cron expression"""
+
+    def __init__(self, expression: str):
+        expression = _CRON_MACROS.get(expression.strip().lower(), expression)
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron expression '{expression}': expected 5 fields")
+
+        self.expression = expression
+        self.minutes = self._parse_field(fields[0], 0, 59)
+        self.hours = self._parse_field(fields[1], 0, 23)
+        self.days = self._parse_field(fields[2], 1, 31)
+        self.months = self._parse_field(fields[3], 1, 12)
+        # Both 0 and 7 mean Sunday; stored in Python's weekday() numbering (Monday=0)
+        self.weekdays = {(day - 1) % 7 for day in self._parse_field(fields[4], 0, 7)}
+        self._days_restricted = fields[2] != "*"
+        self._weekdays_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"Invalid cron step '{step_text}'")
+            if part in ("*", ""):
+                start, end = low, high
+            elif "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron field value '{part}' outside {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = moment.weekday() in self.weekdays
+        # Standard cron: when both day fields are restricted either may match
+        if self._days_restricted and self._weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """First matching minute strictly after ``after``"""
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + _MAX_LOOKAHEAD
+        while moment <= limit:
+            if moment.month not in self.months:
+                year, month = (moment.year + 1, 1) if moment.month == 12 else (moment.year, moment.month + 1)
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron expression '{self.expression}' never fires")
+
+
+def next_fire_time(expression: str, after: datetime, anchor: Optional[datetime] = None) -> datetime:
+    """
+    Compute the next time a schedule fires strictly after ``after``.
+
+    Args:
+        expression: Cron expression or ISO 8601 duration
+        after: Reference time, usually "now"
+        anchor: For durations, the previous scheduled run; fire times stay on
+            ``anchor + k * duration`` so missed periods are skipped without drift
+
+    Raises:
+        ValueError: If the expression cannot be parsed
+    """
+    after = to_utc_naive(after)
+    interval = parse_iso_duration(expression.strip())
+    if interval is not None:
+        if interval <= timedelta(0):
+            raise ValueError(f"Schedule interval must be positive: '{expression}'")
+        if anchor is None:
+            return after + interval
+        anchor = to_utc_naive(anchor)
+        if anchor > after:
+            return anchor
+        periods = (after - anchor) // interval + 1
+        return anchor + periods * interval
+    return CronSchedule(expression).next_after(after)
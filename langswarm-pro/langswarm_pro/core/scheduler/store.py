@@ -0,0 +1,181 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Collection, Iterable, List, Optional
+
+from .models import Job, JobStatus, JobType
+from .schedule import to_utc_naive
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _ts(value: Optional[datetime]) -> Optional[float]:
+    return None if value is None else (to_utc_naive(value) - _EPOCH).total_seconds()
+
+
+class SQLiteJobStore:
+    """
+    Durable job schedule backed by a local SQLite database.
+
+    Status, next run time and lease fields are stored in indexed columns next
+    to the JSON-serialized job, so due-job lookups are index range scans and
+    several workers (processes or JobManager instances) can share one file.
+    Claims run inside ``BEGIN IMMEDIATE`` transactions, which serializes
+    writers and makes each claim atomic.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                next_run_at REAL NOT NULL,
+                claimed_by TEXT,
+                lease_expires_at REAL,
+                payload TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_next_run ON jobs (status, next_run_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_lease ON jobs (status, lease_expires_at)")
+
+    @staticmethod
+    def _row(job: Job) -> tuple:
+        return (
+            job.id, job.status.value, _ts(job.next_run_at), job.claimed_by,
+            _ts(job.lease_expires_at), job.model_dump_json(),
+        )
+
+    def save(self, job: Job) -> None:
+        self.save_many([job])
+
+    def save_many(self, jobs: Iterable[Job]) -> None:
+        rows = [self._row(job) for job in jobs]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def save_if(self, job: Job, status: JobStatus, claimed_by: Optional[str]) -> bool:
+        """
+        Write ``job`` only if its stored row still has ``status`` and ``claimed_by``.
+
+        Returns False, leaving the row untouched, when another writer changed
+        it since it was read: the lease was reclaimed, the job was cancelled,
+        or it already finished.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, next_run_at = ?, claimed_by = ?, lease_expires_at = ?, payload = ? "
+                "WHERE id = ? AND status = ? AND claimed_by IS ?",
+                (
+                    job.status.value, _ts(job.next_run_at), job.claimed_by, _ts(job.lease_expires_at),
+                    job.model_dump_json(), job.id, status.value, claimed_by,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.model_validate_json(row[0]) if row else None
+
+    def list_jobs(self, status: Optional[JobStatus] = None, limit: Optional[int] = None) -> List[Job]:
+        query = "SELECT payload FROM jobs"
+        params: list = []
+        if status is not None:
+            query += " WHERE status = ?"
+            params.append(status.value)
+        query += " ORDER BY next_run_at LIMIT ?"
+        params.append(-1 if limit is None else limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [Job.model_validate_json(row[0]) for row in rows]
+
+    def get_due(self, now: datetime, limit: Optional[int] = None) -> List[Job]:
+        """Pending jobs whose next run time has passed, earliest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM jobs WHERE status = ? AND next_run_at <= ? ORDER BY next_run_at LIMIT ?",
+                (JobStatus.PENDING.value, _ts(now), -1 if limit is None else limit),
+            ).fetchall()
+        return [Job.model_validate_json(row[0]) for row in rows]
+
+    def claim_due(
+        self,
+        worker_id: str,
+        now: datetime,
+        lease_expires_at: datetime,
+        limit: Optional[int] = None,
+        job_type: Optional[JobType] = None,
+        exclude_agents: Collection[str] = ()
+    ) -> List[Job]:
+        """
+        Atomically lease due jobs to ``worker_id``.
+
+        Claims pending jobs whose next run time has passed and running jobs
+        whose lease has expired (their worker is presumed dead), optionally
+        only those of ``job_type`` and not belonging to ``exclude_agents``.
+        """
+        now_ts = _ts(now)
+        sql_limit = -1 if limit is None else limit
+        filters, filter_params = "", []
+        if job_type is not None:
+            filters += " AND json_extract(payload, '$.job_type') = ?"
+            filter_params.append(job_type.value)
+        if exclude_agents:
+            filters += f" AND json_extract(payload, '$.agent_id') NOT IN ({','.join('?' for _ in exclude_agents)})"
+            filter_params.extend(exclude_agents)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Two index range scans, merged; a single ORDER BY over a UNION
+                # would sort every due row on each tick
+                pending = self._conn.execute(
+                    "SELECT next_run_at, payload FROM jobs WHERE status = ? AND next_run_at <= ?"
+                    f"{filters} ORDER BY next_run_at LIMIT ?",
+                    (JobStatus.PENDING.value, now_ts, *filter_params, sql_limit),
+                ).fetchall()
+                expired = self._conn.execute(
+                    "SELECT lease_expires_at, payload FROM jobs WHERE status = ? AND lease_expires_at <= ?"
+                    f"{filters} ORDER BY lease_expires_at LIMIT ?",
+                    (JobStatus.RUNNING.value, now_ts, *filter_params, sql_limit),
+                ).fetchall()
+                rows = sorted(pending + expired, key=lambda row: row[0])
+                if limit is not None:
+                    rows = rows[:limit]
+
+                claimed = []
+                for _, payload in rows:
+                    job = Job.model_validate_json(payload)
+                    job.status = JobStatus.RUNNING
+                    job.claimed_by = worker_id
+                    job.lease_expires_at = lease_expires_at
+                    claimed.append(job)
+
+                self._conn.executemany(
+                    "UPDATE jobs SET status = ?, claimed_by = ?, lease_expires_at = ?, payload = ? WHERE id = ?",
+                    [
+                        (job.status.value, worker_id, _ts(lease_expires_at), job.model_dump_json(), job.id)
+                        for job in claimed
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return claimed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
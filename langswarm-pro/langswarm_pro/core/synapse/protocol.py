@@ -1,10 +1,13 @@
-from typing import List, Optional, Any, Dict
+from typing import Callable, List, Optional, Any, Dict, Sequence
+import numpy as np
 from pydantic import BaseModel
 try:
-    from sentence_transformers import SentenceTransformer, util
+    from sentence_transformers import SentenceTransformer
 except ImportError:
     SentenceTransformer = None
-    util = None
+
+# Maps a batch of texts to one embedding row per text
+Encoder = Callable[[List[str]], Sequence[Sequence[float]]]
 
 class SwarmConfig(BaseModel):
     model_name: str = "all-MiniLM-L6-v2"
@@ -16,11 +19,16 @@ class SwarmProtocol:
     """
     Base protocol for Swarm Intelligence.
     Implements semantic similarity and consensus logic.
+
+    Texts are embedded by ``encoder`` when one is given (any callable mapping
+    a list of texts to an embedding matrix), otherwise by a lazily loaded
+    SentenceTransformer.
     """
-    def __init__(self, config: SwarmConfig = SwarmConfig()):
+    def __init__(self, config: SwarmConfig = SwarmConfig(), encoder: Optional[Encoder] = None):
         self.config = config
+        self.encoder = encoder
         self._model = None
-        
+
     @property
     def model(self):
         if self._model is None:
@@ -29,40 +37,70 @@ class SwarmProtocol:
             self._model = SentenceTransformer(self.config.model_name)
         return self._model
 
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as L2-normalized rows, so dot products are cosine similarities."""
+        if self.encoder is not None:
+            embeddings = self.encoder(list(texts))
+        else:
+            embeddings = self.model.encode(list(texts))
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def similarity_matrix(self, texts: List[str]) -> np.ndarray:
+        """Pairwise cosine similarities of all texts, computed as a single matrix product."""
+        embeddings = self.encode(texts)
+        return embeddings @ embeddings.T
+
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate cosine similarity between two texts."""
-        embeddings = self.model.encode([text1, text2])
-        return util.cos_sim(embeddings[0], embeddings[1]).item()
+        embeddings = self.encode([text1, text2])
+        return float(embeddings[0] @ embeddings[1])
 
     def detect_consensus(self, texts: List[str]) -> Dict[str, Any]:
         """
         Detect consensus among a list of texts (agent outputs).
         Returns the best text and its support score.
+
+        The winner has the most texts within the paraphrase threshold of it,
+        ties broken by the highest mean similarity to all texts.
         """
         if not texts:
             return {"consensus": None, "score": 0.0, "group_size": 0}
-            
-        embeddings = self.model.encode(texts)
-        
-        # Simple clustering based on paraphrase threshold
-        # Find the text with highest average similarity to all others
-        best_text = None
-        best_score = -1.0
-        best_group_size = 0
-        
-        for i, text in enumerate(texts):
-            similarities = util.cos_sim(embeddings[i], embeddings).squeeze()
-            # Count how many pass the paraphrase threshold
-            group_size = (similarities >= self.config.paraphrase_threshold).sum().item()
-            avg_score = similarities.mean().item()
-            
-            if group_size > best_group_size or (group_size == best_group_size and avg_score > best_score):
-                best_group_size = group_size
-                best_score = avg_score
-                best_text = text
-                
+
+        similarities = self.similarity_matrix(texts)
+        group_sizes = (similarities >= self.config.paraphrase_threshold).sum(axis=1)
+        mean_scores = similarities.mean(axis=1)
+
+        # lexsort is stable and sorts by the last key first; the earliest text wins exact ties
+        best = int(np.lexsort((-mean_scores, -group_sizes))[0])
+
         return {
-            "consensus": best_text,
-            "score": best_score,
-            "group_size": best_group_size
+            "consensus": texts[best],
+            "score": float(mean_scores[best]),
+            "group_size": int(group_sizes[best])
         }
+
+    def cluster(self, texts: List[str], threshold: Optional[float] = None) -> List[List[int]]:
+        """
+        Greedy threshold clustering on the similarity matrix.
+
+        Each not-yet-clustered text, in order, seeds a cluster that absorbs
+        every remaining text at least ``threshold`` similar to it. Returns the
+        member indices of each cluster, seed first.
+        """
+        if not texts:
+            return []
+        threshold = self.config.paraphrase_threshold if threshold is None else threshold
+        similar = self.similarity_matrix(texts) >= threshold
+        unassigned = np.ones(len(texts), dtype=bool)
+
+        clusters = []
+        for seed in range(len(texts)):
+            if not unassigned[seed]:
+                continue
+            members = np.flatnonzero(unassigned & similar[seed])
+            members = [seed] + [int(i) for i in members if i != seed]
+            unassigned[members] = False
+            clusters.append(members)
+        return clusters
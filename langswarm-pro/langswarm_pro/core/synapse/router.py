@@ -1,6 +1,6 @@
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Union
 from enum import Enum
-from .protocol import SwarmConfig
+from .protocol import Encoder, SwarmConfig
 from .strategies import VotingStrategy, AggregationStrategy
 
 class StrategyType(str, Enum):
@@ -11,10 +11,10 @@ class SynapseRouter:
     """
     Directs queries to the appropriate Swarm strategy.
     """
-    def __init__(self, config: SwarmConfig = SwarmConfig()):
+    def __init__(self, config: SwarmConfig = SwarmConfig(), encoder: Optional[Encoder] = None):
         self.config = config
-        self.voting = VotingStrategy(config)
-        self.aggregation = AggregationStrategy(config)
+        self.voting = VotingStrategy(config, encoder=encoder)
+        self.aggregation = AggregationStrategy(config, encoder=encoder)
 
     async def route(self, strategy: StrategyType, responses: List[str]) -> Union[Dict[str, Any], str]:
         """
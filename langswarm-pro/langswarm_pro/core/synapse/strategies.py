@@ -19,24 +19,10 @@ class AggregationStrategy(SwarmProtocol):
         """
         Aggregate unique responses into a single summary.
         """
-        # 1. Deduplicate based on semantic similarity
-        unique_responses = []
-        embeddings = self.model.encode(responses)
-        used_indices = set()
-        
-        for i in range(len(responses)):
-            if i in used_indices:
-                continue
-            
-            unique_responses.append(responses[i])
-            used_indices.add(i)
-            
-            # Mark similar responses as used
-            similarities = self.calculate_similarity(responses[i], responses)
-            # Todo: optimize this O(N^2) loop with matrix if needed, keeping simple for now
-            # Implementation details similar to legacy code
-            pass 
+        # 1. Deduplicate based on semantic similarity: keep one
+        # representative (the first response) per cluster of paraphrases
+        unique_responses = [responses[cluster[0]] for cluster in self.cluster(responses)]
         
         # In a real implementation, we would use an LLM to merge these.
         # For this port, we will just join them.
-        return "\n\n".join(set(responses)) # Simple set dedupe for now as MVP
+        return "\n\n".join(unique_responses)
@@ -4,7 +4,7 @@ from pydantic import BaseModel
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
-from .config import settings
+from ..core.config import settings
 
 class UserRole(str, Enum):
     ADMIN = "admin"
@@ -1,10 +1,30 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from ..core.config import settings
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Expire stale approval requests even when nobody tries to decide them
+    governance._queue.start_sweeper()
+    # Embedding applications provide the /ingest destination as app.state.memory_manager
+    memory_manager = getattr(app.state, "memory_manager", None)
+    if memory_manager is not None and memory.ingestion_pool is None:
+        memory.configure_ingestion(memory_manager)
+    memory.start_ingestion()
+    try:
+        yield
+    finally:
+        await memory.stop_ingestion()
+        await governance._queue.stop_sweeper()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS
@@ -1,7 +1,7 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Body
 from ..auth import get_current_user, get_current_admin, User
-from ...core.governance.queue import ApprovalQueue, InMemoryPersistence
+from ...core.governance.queue import ApprovalQueue, InMemoryPersistence, RequestAlreadyDecided
 from ...core.governance.models import ApprovalRequest
 
 # In a real app, this would be a singleton injected dependency
@@ -33,6 +33,8 @@ async def approve_request(
     """
     try:
         return await _queue.approve_request(request_id, current_user.id, notes)
+    except RequestAlreadyDecided as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -48,5 +50,7 @@ async def reject_request(
     """
     try:
         return await _queue.reject_request(request_id, current_user.id, notes)
+    except RequestAlreadyDecided as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -1,16 +1,49 @@
+import os
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from ..auth import get_current_user, User
+from ..auth import get_current_user, User, UserRole
+from ...core.config import settings
 from ...core.rag.optimizer import RAGOptimizer
-from ...core.rag.pipeline import IngestionPipeline
-# from ...core.memory.hybrid import HybridMemoryManager # Dependency injection needed in real app
+from ...core.rag.pipeline import IngestionPipeline, resolve_within
+from ...core.rag.workers import IngestionWorkerPool
+from ...core.scheduler.manager import JobManager, job_manager
 
 router = APIRouter()
 
 # Global instances for now (in production, use dependency injection)
 optimizer = RAGOptimizer()
-# ingestion_pipeline = IngestionPipeline(memory_manager=...) # Needs configured manager
+# Set by configure_ingestion once the application has a memory manager
+ingestion_pool: Optional[IngestionWorkerPool] = None
+
+def configure_ingestion(memory_manager, manager: JobManager = job_manager, **pipeline_kwargs) -> IngestionWorkerPool:
+    """Back /ingest with a worker pool writing to ``memory_manager``."""
+    global ingestion_pool
+    ingestion_pool = IngestionWorkerPool(
+        manager,
+        IngestionPipeline(
+            memory_manager=memory_manager, optimizer=optimizer,
+            allowed_root=settings.INGESTION_ROOT, **pipeline_kwargs
+        ),
+        max_workers=settings.INGESTION_MAX_WORKERS,
+        max_per_user=settings.INGESTION_MAX_JOBS_PER_USER
+    )
+    return ingestion_pool
+
+def start_ingestion() -> None:
+    """Start the configured worker pool on the running loop (called from the app lifespan)."""
+    if ingestion_pool is not None:
+        ingestion_pool.start()
+
+async def stop_ingestion() -> None:
+    """Stop the configured worker pool; unfinished jobs are retried once their leases expire."""
+    if ingestion_pool is not None:
+        await ingestion_pool.stop()
+
+async def get_ingestion_pool() -> IngestionWorkerPool:
+    if ingestion_pool is None:
+        raise HTTPException(status_code=503, detail="Ingestion is not configured")
+    return ingestion_pool
 
 class OptimizationRequest(BaseModel):
     documents: List[str]
@@ -18,6 +51,8 @@ class OptimizationRequest(BaseModel):
 class RerankRequest(BaseModel):
     query: str
     documents: List[Dict[str, Any]]
+    top_k: Optional[int] = None
+    mmr_lambda: Optional[float] = None
 
 class IngestionRequest(BaseModel):
     path: str
@@ -37,17 +72,43 @@ async def rerank_documents(
     current_user: User = Depends(get_current_user)
 ):
     """Rerank documents based on query relevance."""
-    return await optimizer.rerank(request.query, request.documents)
+    return await optimizer.rerank(
+        request.query, request.documents, top_k=request.top_k, mmr_lambda=request.mmr_lambda
+    )
 
 @router.post("/ingest")
 async def trigger_ingestion(
     request: IngestionRequest,
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    pool: IngestionWorkerPool = Depends(get_ingestion_pool)
 ):
     """
     Trigger background ingestion pipeline.
-    This would typically schedule a job in the JobManager.
+    Schedules an INGESTION job that the worker pool picks up.
+    Paths must resolve inside INGESTION_ROOT; without one, only admins may ingest.
     """
-    # For now, we stub the response as the pipeline requires a configured manager
-    return {"status": "queued", "job_id": "job_123", "message": "Ingestion scheduled"}
+    if settings.INGESTION_ROOT is not None:
+        path = resolve_within(request.path, settings.INGESTION_ROOT)
+        if path is None:
+            raise HTTPException(status_code=403, detail="Path is outside the ingestion root")
+    elif current_user.role == UserRole.ADMIN:
+        path = os.path.realpath(request.path)
+    else:
+        raise HTTPException(status_code=403, detail="Ingestion is restricted to admins")
+
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Path {request.path} not found")
+    job = await pool.submit(current_user.id, path, request.metadata)
+    return {"status": "queued", "job_id": job.id, "message": "Ingestion scheduled"}
+
+@router.get("/ingest/{job_id}")
+async def get_ingestion_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    pool: IngestionWorkerPool = Depends(get_ingestion_pool)
+):
+    """Report an ingestion job's status, chunks processed, bytes read and errors."""
+    status = await pool.status(job_id)
+    if status is None or (status["user_id"] != current_user.id and current_user.role != UserRole.ADMIN):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
@@ -13,10 +13,9 @@ async def list_jobs(
     """
     List all scheduled jobs.
     In a real implementation, this would support pagination and filtering.
-    For now, we just return values from in-memory dict.
     Requires Admin privileges.
     """
-    return list(job_manager._jobs.values())
+    return await job_manager.list_jobs()
 
 @router.get("/jobs/due", response_model=List[Job])
 async def list_due_jobs(
@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field
 from langswarm.tools.base import BaseTool
 from langswarm_pro.core.scheduler.manager import job_manager
 from langswarm_pro.core.scheduler.models import Job, JobType, JobStatus
+from langswarm_pro.core.scheduler.schedule import next_fire_time
 
 class RecurringTaskInput(BaseModel):
     task_name: str = Field(..., description="Name of the task to schedule")
@@ -27,8 +28,8 @@ class RecurringTaskTool(BaseTool):
     
     async def _run(self, task_name: str, schedule: str, arguments: Dict[str, Any] = None, start_time: str = None) -> str:
         try:
-            # Parse start time or default to now + interval (simplified)
-            next_run = datetime.utcnow() # In real impl, parse cron/interval
+            # Parse start time or default to the schedule's next fire time
+            next_run = next_fire_time(schedule, datetime.utcnow())
             if start_time:
                 next_run = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
             
@@ -1,7 +1,10 @@
+import asyncio
+import time
 import pytest
+from collections import Counter
 from datetime import datetime, timedelta
 from langswarm_pro.core.governance.models import ApprovalStatus, ActionPriority, ApprovalRequest
-from langswarm_pro.core.governance.queue import ApprovalQueue, InMemoryPersistence
+from langswarm_pro.core.governance.queue import ApprovalQueue, InMemoryPersistence, SQLitePersistence
 
 class TestApprovalQueue:
     @pytest.mark.asyncio
@@ -63,3 +66,72 @@ class TestApprovalQueue:
         
         pending = await queue.get_pending_requests()
         assert len(pending) == 1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime.utcnow()
+
+    def __call__(self):
+        return self.now
+
+
+class TestDecisions:
+    @pytest.mark.asyncio
+    async def test_wait_for_decision_times_out_and_rejects_late_decisions(self):
+        clock = FakeClock()
+        queue = ApprovalQueue(default_ttl=timedelta(minutes=5), clock=clock)
+        request = await queue.create_request("a1", "deploy", {})
+
+        with pytest.raises(asyncio.TimeoutError):
+            await queue.wait_for_decision(request.id, timeout=0.01)
+
+        clock.now += timedelta(minutes=6)
+        with pytest.raises(ValueError, match="expired"):
+            await queue.approve_request(request.id, "admin")
+        assert (await queue.wait_for_decision(request.id)).status == ApprovalStatus.EXPIRED
+        assert await queue.get_pending_requests() == []
+
+    @pytest.mark.asyncio
+    async def test_10k_requests_with_100_waiters_resolve_exactly_once(self, tmp_path):
+        clock = FakeClock()
+        queue = ApprovalQueue(
+            persistence=SQLitePersistence(str(tmp_path / "approvals.db")),
+            default_ttl=timedelta(hours=1), sweep_interval=0.01, clock=clock
+        )
+        requests = [await queue.create_request(f"agent-{i}", "deploy", {"i": i}) for i in range(10_000)]
+        watched = requests[::100]
+        resolutions = Counter()
+
+        async def wait(request_id):
+            decided = await queue.wait_for_decision(request_id, timeout=10)
+            resolutions[request_id] += 1
+            return decided.status
+
+        waiters = [asyncio.create_task(wait(request.id)) for request in watched]
+        await asyncio.sleep(0)
+
+        # A third approved, a third rejected, the rest left to the sweeper
+        for i, request in enumerate(watched):
+            if i % 3 == 0:
+                await queue.approve_request(request.id, "admin")
+            elif i % 3 == 1:
+                await queue.reject_request(request.id, "admin")
+        start = time.perf_counter()
+        pending = await queue.get_pending_requests()
+        assert time.perf_counter() - start < 1.0
+        assert len(pending) == 10_000 - 67
+
+        clock.now += timedelta(hours=2)
+        queue.start_sweeper()
+        statuses = await asyncio.gather(*waiters)
+        await queue.stop_sweeper()
+
+        assert Counter(statuses) == {
+            ApprovalStatus.APPROVED: 34, ApprovalStatus.REJECTED: 33, ApprovalStatus.EXPIRED: 33
+        }
+        assert set(resolutions.values()) == {1} and len(resolutions) == 100
+        assert await queue.get_pending_requests() == []
+        assert queue._waiters == {}
+        stored = await queue.persistence.get_request(watched[0].id)
+        assert stored.status == ApprovalStatus.APPROVED and stored.approved_at == clock.now - timedelta(hours=2)
@@ -1,5 +1,7 @@
+import asyncio
 import pytest
 import sys
+import types
 from unittest.mock import MagicMock
 from langswarm_pro.core.memory.hybrid import HybridMemoryManager
 
@@ -44,3 +46,104 @@ async def test_invalid_framework():
     manager = HybridMemoryManager([])
     with pytest.raises(ValueError, match="Unsupported framework"):
         manager.to_framework("invalid")
+
+
+class FakeAdapter:
+    """Async adapter bound to the loop it was first used on, like a client session"""
+
+    def __init__(self):
+        self.docs = []
+        self.loops = set()
+
+    async def add_documents(self, documents):
+        self.loops.add(asyncio.get_running_loop())
+        self.docs.extend(documents)
+
+    async def query(self, query, top_k=5, **kwargs):
+        self.loops.add(asyncio.get_running_loop())
+        return [dict(doc, score=1.0) for doc in self.docs if query in doc["text"]][:top_k]
+
+    async def delete(self, document_ids):
+        self.docs = [doc for doc in self.docs if doc["id"] not in document_ids]
+
+
+@pytest.fixture
+def frameworks(monkeypatch):
+    """Minimal stand-ins for the framework base classes the wrappers build on"""
+    class Document:
+        def __init__(self, page_content, metadata=None, id=None):
+            self.page_content, self.metadata, self.id = page_content, metadata or {}, id
+
+    class QueryBundle:
+        def __init__(self, query_str):
+            self.query_str = query_str
+
+    class BaseQueryEngine:
+        def __init__(self, callback_manager=None):
+            pass
+
+        def query(self, query):
+            return self._query(QueryBundle(query))
+
+        async def aquery(self, query):
+            return await self._aquery(QueryBundle(query))
+
+    class Record:
+        def __init__(self, **kwargs):
+            self.__dict__.update(kwargs)
+
+    modules = {
+        "langchain_core.vectorstores": {"VectorStore": type("VectorStore", (), {})},
+        "langchain_core.documents": {"Document": Document},
+        "llama_index.core.base.base_query_engine": {"BaseQueryEngine": BaseQueryEngine},
+        "llama_index.core.schema": {
+            "Response": type("Response", (Record,), {}),
+            "NodeWithScore": type("NodeWithScore", (Record,), {}),
+            "TextNode": type("TextNode", (Record,), {}),
+        },
+    }
+    for name, attrs in modules.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attrs)
+        monkeypatch.setitem(sys.modules, name, module)
+
+
+@pytest.mark.asyncio
+async def test_langchain_sync_and_async_apis_inside_running_loop(frameworks):
+    adapter = FakeAdapter()
+    store = HybridMemoryManager([adapter]).to_framework("langchain")
+
+    ids = await store.aadd_texts(["alpha one", "beta two"], metadatas=[{"n": 1}, {"n": 2}])
+    # Sync calls from a coroutine used to hit "this event loop is already running"
+    sync_ids = store.add_texts(["alpha three"], ids=["custom"])
+
+    assert ids == [doc["id"] for doc in adapter.docs[:2]] and ids != ["0", "1"]
+    assert sync_ids == ["custom"]
+
+    docs = await store.asimilarity_search("alpha", k=5)
+    assert [(d.page_content, d.id) for d in docs] == [("alpha one", ids[0]), ("alpha three", "custom")]
+    assert [d.page_content for d in store.similarity_search("beta")] == ["beta two"]
+
+    store.delete(["custom"])
+    assert [d.id for d in await store.asimilarity_search("alpha")] == [ids[0]]
+    # Every sync call reused the same background loop
+    assert len(adapter.loops - {asyncio.get_running_loop()}) == 1
+
+
+@pytest.mark.asyncio
+async def test_llamaindex_sync_and_async_queries_inside_running_loop(frameworks):
+    adapter = FakeAdapter()
+    manager = HybridMemoryManager([adapter])
+    [doc_id] = await manager.add_documents([{"text": "gamma ray", "metadata": {"src": "a"}}])
+    engine = manager.to_framework("llamaindex")
+
+    async_response = await engine.aquery("gamma")
+    sync_response = await asyncio.to_thread(engine.query, "gamma")
+    loop_response = engine.query("gamma")
+
+    for response in (async_response, sync_response, loop_response):
+        [node] = response.source_nodes
+        assert node.node.id_ == doc_id and node.node.text == "gamma ray"
+        assert node.score == pytest.approx(1 / 61)
+    # The running loop for aquery, one shared background loop for both sync calls
+    assert len(adapter.loops) == 2
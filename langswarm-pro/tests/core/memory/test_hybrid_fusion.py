@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from langswarm_pro.core.memory.hybrid import FusionMethod, HybridMemoryManager
+
+
+class VectorAdapter:
+    """Async adapter returning cosine similarities in [0, 1]"""
+
+    def __init__(self, results):
+        self.results = results
+        self.documents = []
+
+    async def add_documents(self, documents):
+        self.documents.extend(documents)
+
+    async def query(self, query, top_k=5, **kwargs):
+        return self.results[:top_k]
+
+    async def delete(self, document_ids):
+        self.documents = [d for d in self.documents if d["id"] not in document_ids]
+
+
+class KeywordAdapter:
+    """Sync adapter returning unbounded BM25 scores"""
+
+    def __init__(self, results):
+        self.results = results
+        self.documents = []
+        self.threads = set()
+
+    def add_documents(self, documents):
+        self.threads.add(threading.get_ident())
+        self.documents.extend(documents)
+
+    def query(self, query, top_k=5, **kwargs):
+        self.threads.add(threading.get_ident())
+        return self.results[:top_k]
+
+    def delete(self, document_ids):
+        self.documents = [d for d in self.documents if d["id"] not in document_ids]
+
+
+class SlowAdapter(VectorAdapter):
+    async def query(self, query, top_k=5, **kwargs):
+        await asyncio.sleep(5)
+        return self.results
+
+
+VECTOR = [
+    {"id": "b", "text": "beta", "score": 0.91},
+    {"id": "a", "text": "alpha", "score": 0.90},
+    {"id": "c", "text": "gamma", "score": 0.20},
+]
+KEYWORD = [
+    {"id": "c", "text": "gamma", "score": 18.0},
+    {"id": "b", "text": "beta", "score": 12.0},
+    {"id": "d", "text": "delta", "score": 2.0},
+]
+
+
+@pytest.mark.asyncio
+async def test_rrf_merges_sync_and_async_adapters_by_rank():
+    keyword = KeywordAdapter(KEYWORD)
+    manager = HybridMemoryManager([VectorAdapter(VECTOR), keyword])
+
+    results = await manager.query("q", top_k=4)
+
+    # Raw-score sorting would put every keyword hit first; RRF favours "b",
+    # ranked highly by both adapters
+    assert [r["id"] for r in results] == ["b", "c", "a", "d"]
+    assert results[0]["score"] == pytest.approx(1 / 61 + 1 / 62)
+    assert threading.get_ident() not in keyword.threads
+
+
+@pytest.mark.asyncio
+async def test_weighted_min_max_fusion():
+    manager = HybridMemoryManager(
+        [VectorAdapter(VECTOR), KeywordAdapter(KEYWORD)],
+        fusion=FusionMethod.MIN_MAX, weights=[2.0, 1.0]
+    )
+
+    results = await manager.query("q", top_k=4)
+
+    scores = {r["id"]: r["score"] for r in results}
+    assert scores["a"] == pytest.approx(2.0 * 0.70 / 0.71)
+    assert scores["b"] == pytest.approx(2.0 + 10 / 16)
+    assert scores["c"] == pytest.approx(1.0)
+    assert scores["d"] == pytest.approx(0.0)
+    assert [r["id"] for r in results] == ["b", "a", "c", "d"]
+
+
+@pytest.mark.asyncio
+async def test_slow_adapter_times_out_with_partial_results():
+    manager = HybridMemoryManager(
+        [SlowAdapter(VECTOR), KeywordAdapter(KEYWORD)], timeout=5.0, adapter_timeouts=[0.1, None]
+    )
+
+    start = time.perf_counter()
+    results = await manager.query("q", top_k=3)
+
+    assert time.perf_counter() - start < 1.0
+    assert [r["id"] for r in results] == ["c", "b", "d"]
+
+
+@pytest.mark.asyncio
+async def test_writes_reach_sync_and_async_adapters():
+    vector, keyword = VectorAdapter([]), KeywordAdapter([])
+    manager = HybridMemoryManager([vector, keyword])
+    documents = [{"id": "a", "text": "alpha"}, {"id": "b", "text": "beta"}]
+
+    await manager.add_documents(documents)
+    assert vector.documents == keyword.documents == documents
+    assert threading.get_ident() not in keyword.threads
+
+    await manager.delete(["a"])
+    assert vector.documents == keyword.documents == documents[1:]
@@ -1,7 +1,8 @@
+import random
 import pytest
 from datetime import datetime, timedelta, timezone
 from langswarm_pro.core.memory.models import ProMemoryRecord, PriorityTier
-from langswarm_pro.core.memory.algorithms import MemoryPrioritizer, MemoryFader
+from langswarm_pro.core.memory.algorithms import MemoryPrioritizer, MemoryFader, MemoryScoreArrays
 
 class TestMemoryPro:
     def test_pro_memory_record_creation(self):
@@ -69,3 +70,37 @@ class TestMemoryPro:
         
         assert len(candidates) == 1
         assert candidates[0].content == "fade"
+
+    def test_batch_scoring_matches_per_record_path(self):
+        rng = random.Random(7)
+        now = datetime(2025, 6, 1, tzinfo=timezone.utc)
+        memories = []
+        for i in range(2000):
+            record = ProMemoryRecord(
+                content=f"m{i}",
+                importance_score=rng.random(),
+                fading_rate=rng.choice([0.0, 0.05, 0.1, 0.5]),
+                priority_tier=rng.choice(list(PriorityTier)),
+                is_protected=rng.random() < 0.05,
+            )
+            record.last_accessed = now - timedelta(hours=rng.uniform(0, 24 * 60))
+            memories.append(record)
+
+        expected = [m.calculate_current_importance(now) for m in memories]
+        scores = MemoryScoreArrays.from_records(memories).current_importance(now)
+        assert scores.tolist() == pytest.approx(expected)
+
+        # Compare score sequences: NumPy's power can differ from Python's in the last bit
+        def ranked_scores(ranked):
+            return [m.calculate_current_importance(now) for m in ranked]
+        full = sorted(expected, reverse=True)
+        assert ranked_scores(MemoryPrioritizer.rank_memories(memories, now=now)) == pytest.approx(full)
+        assert ranked_scores(MemoryPrioritizer.rank_memories(memories, top_k=50, now=now)) == pytest.approx(full[:50])
+        # Pinned records all score 1.0; among ties the earliest come first, as with sorted()
+        pinned = [m for m in memories if m.is_protected or m.priority_tier == PriorityTier.CRITICAL]
+        assert MemoryPrioritizer.rank_memories(memories, top_k=20, now=now) == pinned[:20]
+
+        fader = MemoryFader(threshold=0.2)
+        assert fader.identify_fading_memories(memories, now=now) == [
+            m for m in memories if not m.is_protected and m.calculate_current_importance(now) < 0.2
+        ]
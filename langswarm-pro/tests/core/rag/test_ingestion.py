@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+
+import pytest
+
+from langswarm_pro.core.rag.pipeline import IngestionPipeline, SQLiteChunkHashStore
+
+CORPUS_BYTES = 1 << 30
+
+# Gigabyte-scale tests take minutes and several GB of disk; opt in explicitly
+RUN_SLOW = os.environ.get("LANGSWARM_RUN_SLOW_TESTS") == "1"
+
+
+class CountingManager:
+    """Counts writes without keeping documents, tracking concurrent sources"""
+
+    def __init__(self):
+        self.documents = 0
+        self.batch_sizes = []
+        self.active_sources = set()
+        self.peak_sources = 0
+
+    async def add_documents(self, documents):
+        source = documents[0]["metadata"]["source"]
+        self.active_sources.add(source)
+        self.peak_sources = max(self.peak_sources, len(self.active_sources))
+        await asyncio.sleep(0)
+        self.active_sources.discard(source)
+        self.batch_sizes.append(len(documents))
+        self.documents += len(documents)
+
+
+class ListManager:
+    def __init__(self):
+        self.docs = []
+
+    async def add_documents(self, documents):
+        self.docs.extend(documents)
+
+
+def _write_corpus(directory, total_bytes, files=8):
+    rng = random.Random(0)
+    words = ["".join(rng.choice("abcdefghijklmnop") for _ in range(rng.randint(3, 9))) for _ in range(5000)]
+    paragraphs = [
+        " ".join(" ".join(rng.choices(words, k=rng.randint(5, 20))) + "." for _ in range(rng.randint(2, 8)))
+        for _ in range(2000)
+    ]
+    counter = 0
+    for index in range(files):
+        with open(os.path.join(directory, f"part-{index}.txt"), "w") as f:
+            written = 0
+            while written < total_bytes // files:
+                # A numbered opening sentence keeps every paragraph unique
+                block = "\n\n".join(
+                    f"Paragraph {counter + i}. {paragraphs[(counter + i) % len(paragraphs)]}" for i in range(1000)
+                ) + "\n\n"
+                counter += 1000
+                f.write(block)
+                written += len(block)
+
+
+@pytest.mark.asyncio
+async def test_chunks_follow_sentence_and_paragraph_boundaries(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_text(
+        "Alpha beta gamma delta. Epsilon zeta eta theta iota.\n\n"
+        "Kappa lambda mu. Nu xi omicron pi rho sigma. Tau upsilon phi.\n\n"
+        + " ".join(f"w{i}" for i in range(30)) + "."
+    )
+    manager = ListManager()
+    pipeline = IngestionPipeline(manager, chunk_tokens=12, overlap_tokens=4, batch_size=2)
+
+    assert await pipeline.run(str(path)) == 6
+    # Chunks close at paragraph ends instead of cutting sentences
+    assert [doc["text"] for doc in manager.docs[:2]] == [
+        "Alpha beta gamma delta. Epsilon zeta eta theta iota.",
+        "Kappa lambda mu. Nu xi omicron pi rho sigma. Tau upsilon phi.",
+    ]
+    # A sentence longer than a chunk is split on words, overlapping by 4 words
+    windows = [doc["text"].split() for doc in manager.docs[2:]]
+    assert all(len(window) <= 12 for window in windows)
+    assert all(prev[-4:] == nxt[:4] for prev, nxt in zip(windows, windows[1:]))
+    assert [doc["metadata"]["chunk_index"] for doc in manager.docs] == list(range(6))
+
+    path.write_text(path.read_text().replace("Kappa", "Kappas"))
+    assert await pipeline.run(str(path)) == 1  # only the edited chunk is rewritten
+    assert manager.docs[-1]["metadata"]["chunk_index"] == 1
+
+
+async def _ingest_corpus(corpus, hash_db):
+    """Ingest twice in this process and report the counters, including peak RSS growth"""
+    manager = CountingManager()
+    pipeline = IngestionPipeline(
+        manager, batch_size=128, max_concurrency=4, hash_store=SQLiteChunkHashStore(hash_db)
+    )
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    written = await pipeline.run(corpus)
+    rss_growth_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+    calls = len(manager.batch_sizes)
+    rewritten = await pipeline.run(corpus)
+    return {
+        "written": written,
+        "documents": manager.documents,
+        "max_batch": max(manager.batch_sizes),
+        "peak_sources": manager.peak_sources,
+        "rss_growth_mb": rss_growth_mb,
+        "rewritten": rewritten,
+        "extra_calls": len(manager.batch_sizes) - calls,
+    }
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not RUN_SLOW, reason="set LANGSWARM_RUN_SLOW_TESTS=1 to run")
+def test_1gb_corpus_streams_in_bounded_memory_and_reingests_nothing(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    _write_corpus(str(corpus), CORPUS_BYTES)
+
+    # A fresh interpreter, so the peak RSS reflects this ingestion and not earlier tests
+    output = subprocess.run(
+        [sys.executable, __file__, str(corpus), str(tmp_path / "hashes.db")],
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result["written"] == result["documents"] > 500_000
+    assert result["max_batch"] == 128
+    assert 1 < result["peak_sources"] <= 4
+    assert result["rss_growth_mb"] < 256
+    assert result["rewritten"] == 0 and result["extra_calls"] == 0
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(_ingest_corpus(sys.argv[1], sys.argv[2]))))
@@ -0,0 +1,79 @@
+import asyncio
+import os
+from collections import Counter
+
+import pytest
+
+from langswarm_pro.core.rag.pipeline import IngestionPipeline
+from langswarm_pro.core.rag.workers import IngestionWorkerPool
+from langswarm_pro.core.scheduler.manager import JobManager
+from langswarm_pro.core.scheduler.models import Job, JobStatus, JobType
+
+
+class TrackingManager:
+    """Memory manager that records which users' files are being written concurrently"""
+
+    def __init__(self):
+        self.docs = []
+        self.active = Counter()
+        self.peak_per_user = Counter()
+        self.peak_total = 0
+
+    async def add_documents(self, documents):
+        user = documents[0]["metadata"]["user"]
+        self.active[user] += 1
+        self.peak_per_user[user] = max(self.peak_per_user[user], self.active[user])
+        self.peak_total = max(self.peak_total, sum(self.active.values()))
+        await asyncio.sleep(0.02)
+        self.docs.extend(documents)
+        self.active[user] -= 1
+
+
+def _write(path, paragraphs):
+    path.write_text("\n\n".join(f"Paragraph {i} of {path.stem} is about topic {i}." for i in range(paragraphs)))
+    return str(path)
+
+
+async def _wait_for(pool, job_ids, timeout=10):
+    async def finished():
+        while True:
+            statuses = [await pool.status(job_id) for job_id in job_ids]
+            if all(s["status"] in (JobStatus.COMPLETED.value, JobStatus.FAILED.value) for s in statuses):
+                return statuses
+            await asyncio.sleep(0.01)
+    return await asyncio.wait_for(finished(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_pool_caps_workers_per_user_and_reports_progress(tmp_path):
+    manager = TrackingManager()
+    job_manager = JobManager()
+    # Another consumer's job must be left alone
+    other = await job_manager.schedule_job(Job(agent_id="u1", task_name="report", next_run_at=job_manager.clock()))
+    pool = IngestionWorkerPool(
+        job_manager, IngestionPipeline(manager, chunk_tokens=8, overlap_tokens=0, batch_size=2),
+        max_workers=3, max_per_user=1, poll_interval=0.05
+    )
+    pool.start()
+
+    jobs = []
+    for user, count in (("u1", 4), ("u2", 1), ("u3", 1)):
+        for i in range(count):
+            path = _write(tmp_path / f"{user}-{i}.txt", paragraphs=10)
+            jobs.append(await pool.submit(user, path, {"user": user}))
+    missing = await pool.submit("u2", str(tmp_path / "missing.txt"), {"user": "u2"})
+
+    statuses = await _wait_for(pool, [job.id for job in jobs + [missing]])
+    await pool.stop()
+
+    assert manager.peak_per_user == {"u1": 1, "u2": 1, "u3": 1}
+    # u2 and u3 ran alongside u1 instead of queueing behind its four jobs
+    assert manager.peak_total >= 2
+    for status in statuses[:-1]:
+        assert status["status"] == "completed"
+        assert status["chunks_written"] == 10 and status["files_done"] == 1 and status["errors"] == []
+        assert status["bytes_read"] == os.path.getsize(status["path"])
+    assert statuses[-1]["status"] == "failed" and len(statuses[-1]["errors"]) == 1
+    assert len(manager.docs) == 60
+    assert (await job_manager.get_job(other.id)).status == JobStatus.PENDING
+    assert pool.progress == {}
@@ -49,15 +49,15 @@ async def test_hybrid_manager():
     assert results[0]["id"] == "1"
 
 @pytest.mark.asyncio
-async def test_ingestion_pipeline():
+async def test_ingestion_pipeline(tmp_path):
     # Mock manager
     manager = MockAdapter() 
     pipeline = IngestionPipeline(memory_manager=manager)
     
-    # We mock the loader logic by overriding the method for test
-    pipeline._load_content = lambda path: "This is some test content for chunking."
+    path = tmp_path / "test.txt"
+    path.write_text("This is some test content for chunking.")
     
-    count = await pipeline.run("test.txt")
+    count = await pipeline.run(str(path))
     assert count > 0
     assert len(manager.docs) > 0
     assert "source" in manager.docs[0]["metadata"]
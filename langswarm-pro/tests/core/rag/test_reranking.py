@@ -0,0 +1,84 @@
+import math
+import threading
+
+import pytest
+
+from langswarm_pro.core.rag.optimizer import RAGOptimizer
+
+# Candidates as a first-stage vector store might return them, with graded
+# relevance labels per query (2 = answers it, 1 = related, 0 = off topic)
+CORPUS = {
+    "d1": "Our office is closed on public holidays and weekends.",
+    "d2": "Employees accrue vacation days monthly; unused vacation days carry over up to ten days.",
+    "d3": "Submit expense reports within thirty days of purchase.",
+    "d4": "To request vacation, file a leave request in the HR portal two weeks in advance.",
+    "d5": "The cafeteria serves lunch between noon and two.",
+    "d6": "Parental leave is sixteen weeks at full pay.",
+    "d7": "Password resets are handled by the IT service desk.",
+    "d8": "Sick leave does not count against vacation days.",
+}
+QUERIES = {
+    "how many vacation days carry over": {"d2": 2, "d8": 1, "d4": 1},
+    "request leave in the hr portal": {"d4": 2, "d6": 1, "d8": 1},
+    "expense reports deadline": {"d3": 2},
+}
+
+
+def _ndcg(ranked_ids, labels, k=5):
+    dcg = sum(labels.get(doc_id, 0) / math.log2(rank + 2) for rank, doc_id in enumerate(ranked_ids[:k]))
+    ideal = sorted(labels.values(), reverse=True)[:k]
+    return dcg / sum(gain / math.log2(rank + 2) for rank, gain in enumerate(ideal))
+
+
+def _candidates():
+    return [{"id": doc_id, "text": text} for doc_id, text in CORPUS.items()]
+
+
+@pytest.mark.asyncio
+async def test_bm25_rerank_improves_ndcg_over_identity():
+    optimizer = RAGOptimizer()
+
+    identity, reranked = [], []
+    for query, labels in QUERIES.items():
+        results = await optimizer.rerank(query, _candidates(), top_k=5)
+        assert len(results) == 5
+        assert [r["rerank_score"] for r in results] == sorted((r["rerank_score"] for r in results), reverse=True)
+        identity.append(_ndcg(list(CORPUS), labels))
+        reranked.append(_ndcg([r["id"] for r in results], labels))
+
+    assert sum(reranked) / len(reranked) > 0.9
+    assert sum(reranked) / len(reranked) > sum(identity) / len(identity) + 0.3
+
+
+@pytest.mark.asyncio
+async def test_mmr_skips_near_duplicates_when_embeddings_are_present():
+    documents = [
+        {"id": "a", "text": "vacation days carry over", "embedding": [1.0, 0.0, 0.0]},
+        {"id": "a-copy", "text": "vacation days carry over yearly", "embedding": [0.99, 0.01, 0.0]},
+        {"id": "b", "text": "request vacation days in the portal", "embedding": [0.0, 1.0, 0.0]},
+    ]
+    optimizer = RAGOptimizer()
+
+    relevance_only = await optimizer.rerank("vacation days carry over", documents, top_k=2)
+    diverse = await optimizer.rerank("vacation days carry over", documents, top_k=2, mmr_lambda=0.5)
+
+    assert [r["id"] for r in relevance_only] == ["a", "a-copy"]
+    assert [r["id"] for r in diverse] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_cross_encoder_replaces_bm25_scores():
+    pairs_seen = []
+    threads = []
+
+    def cross_encoder(pairs):
+        pairs_seen.extend(pairs)
+        threads.append(threading.current_thread())
+        return [len(text) for _, text in pairs]
+
+    optimizer = RAGOptimizer(cross_encoder=cross_encoder)
+    results = await optimizer.rerank("q", [{"text": "short"}, {"content": "much longer text"}])
+
+    assert pairs_seen == [("q", "short"), ("q", "much longer text")]
+    assert threads != [threading.main_thread()]  # inference runs off the event loop
+    assert [r["rerank_score"] for r in results] == [16.0, 5.0]
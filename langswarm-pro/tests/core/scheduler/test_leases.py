@@ -0,0 +1,191 @@
+import asyncio
+import heapq
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from langswarm_pro.core.scheduler.manager import JobManager
+from langswarm_pro.core.scheduler.models import Job, JobStatus, JobType
+from langswarm_pro.core.scheduler.schedule import next_fire_time
+from langswarm_pro.core.scheduler.store import SQLiteJobStore
+
+START = datetime(2025, 1, 1)
+
+
+class FakeClock:
+    def __init__(self, now=START):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs)
+
+
+def _jobs(count, spacing_seconds=1):
+    return [
+        Job(agent_id="a1", task_name=f"task-{i}", next_run_at=START + timedelta(seconds=i * spacing_seconds))
+        for i in range(count)
+    ]
+
+
+class TestSchedule:
+    def test_cron_and_interval_fire_times(self):
+        assert next_fire_time("0 9 * * *", datetime(2025, 1, 1, 9, 0)) == datetime(2025, 1, 2, 9, 0)
+        assert next_fire_time("*/15 * * * *", datetime(2025, 1, 1, 9, 7)) == datetime(2025, 1, 1, 9, 15)
+        assert next_fire_time("30 8 * * 1-5", datetime(2025, 1, 3, 9, 0)) == datetime(2025, 1, 6, 8, 30)
+        assert next_fire_time("@monthly", datetime(2025, 1, 31, 12, 0)) == datetime(2025, 2, 1)
+        # Missed interval periods are skipped without drifting off the anchor
+        assert next_fire_time("PT15M", datetime(2025, 1, 1, 10, 7), anchor=datetime(2025, 1, 1, 9, 0)) \
+            == datetime(2025, 1, 1, 10, 15)
+        with pytest.raises(ValueError):
+            next_fire_time("not a schedule", START)
+
+
+class TestLeases:
+    @pytest.mark.asyncio
+    async def test_recurring_job_is_rescheduled_on_completion(self):
+        clock = FakeClock()
+        manager = JobManager(clock=clock)
+        job = Job(agent_id="a1", task_name="report", job_type=JobType.RECURRING,
+                  schedule_expression="0 9 * * *", next_run_at=START + timedelta(hours=9))
+        await manager.schedule_job(job)
+
+        clock.advance(hours=9, minutes=1)
+        [claimed] = await manager.claim_due_jobs()
+        assert claimed.claimed_by == manager.worker_id
+        await manager.mark_completed(job.id)
+
+        assert job.status == JobStatus.PENDING
+        assert job.next_run_at == START + timedelta(days=1, hours=9)
+        assert job.execution_count == 1 and job.claimed_by is None
+        assert await manager.claim_due_jobs() == []
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed_by_another_worker(self, tmp_path):
+        clock = FakeClock()
+        db_path = str(tmp_path / "jobs.db")
+        first = JobManager(store=SQLiteJobStore(db_path), worker_id="w1", lease_seconds=60, clock=clock)
+        second = JobManager(store=SQLiteJobStore(db_path), worker_id="w2", lease_seconds=60, clock=clock)
+        job = await first.schedule_job(Job(agent_id="a1", task_name="t", next_run_at=START))
+
+        assert [j.id for j in await first.claim_due_jobs()] == [job.id]
+        assert await second.claim_due_jobs() == []
+
+        clock.advance(seconds=61)
+        [reclaimed] = await second.claim_due_jobs()
+        assert reclaimed.claimed_by == "w2"
+        await second.mark_completed(job.id)
+        assert (await first.get_job(job.id)).status == JobStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_stale_worker_cannot_complete_a_reclaimed_job(self, tmp_path):
+        clock = FakeClock()
+        db_path = str(tmp_path / "jobs.db")
+        first = JobManager(store=SQLiteJobStore(db_path), worker_id="w1", lease_seconds=60, clock=clock)
+        second = JobManager(store=SQLiteJobStore(db_path), worker_id="w2", lease_seconds=60, clock=clock)
+        job = await first.schedule_job(Job(agent_id="a1", task_name="t", next_run_at=START))
+        await first.claim_due_jobs()
+
+        clock.advance(seconds=61)
+        await second.claim_due_jobs()
+        # w1 wakes up after its lease expired and reports in
+        assert await first.mark_completed(job.id, result={"by": "w1"}) is False
+        assert await first.mark_failed(job.id, "late") is False
+        assert await first.extend_lease(job.id) is False
+
+        stored = await second.get_job(job.id)
+        assert stored.status == JobStatus.RUNNING and stored.claimed_by == "w2" and stored.result is None
+        assert await second.mark_completed(job.id, result={"by": "w2"}) is True
+        assert (await first.get_job(job.id)).result == {"by": "w2"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("persistent", [False, True])
+    async def test_cancelled_recurring_job_stays_cancelled(self, tmp_path, persistent):
+        clock = FakeClock()
+        store = SQLiteJobStore(str(tmp_path / "jobs.db")) if persistent else None
+        manager = JobManager(store=store, clock=clock)
+        job = await manager.schedule_job(Job(agent_id="a1", task_name="report", job_type=JobType.RECURRING,
+                                             schedule_expression="PT1H", next_run_at=START))
+        await manager.claim_due_jobs()
+
+        assert await manager.cancel_job(job.id) is True
+        assert await manager.mark_completed(job.id) is False
+
+        stored = await manager.get_job(job.id)
+        assert stored.status == JobStatus.CANCELLED and stored.execution_count == 0
+        clock.advance(hours=2)
+        assert await manager.claim_due_jobs() == []
+        assert await manager.mark_running(job.id) is False
+
+    @pytest.mark.asyncio
+    async def test_schedule_survives_restart(self, tmp_path):
+        db_path = str(tmp_path / "jobs.db")
+        manager = JobManager(store=SQLiteJobStore(db_path), clock=FakeClock(START + timedelta(seconds=5)))
+        await manager.schedule_jobs(_jobs(10))
+        manager.store.close()
+
+        restarted = JobManager(store=SQLiteJobStore(db_path), clock=FakeClock(START + timedelta(seconds=5)))
+        assert [job.task_name for job in await restarted.get_due_jobs()] == [f"task-{i}" for i in range(6)]
+
+
+class TestScale:
+    @pytest.mark.asyncio
+    async def test_in_memory_ticks_only_touch_due_jobs_with_100k_jobs(self, monkeypatch):
+        clock = FakeClock(START - timedelta(seconds=1))
+        manager = JobManager(lease_seconds=3600, clock=clock)
+        await manager.schedule_jobs(_jobs(100_000))
+
+        pops = 0
+        heappop = heapq.heappop
+
+        def counting_heappop(heap):
+            nonlocal pops
+            pops += 1
+            return heappop(heap)
+
+        monkeypatch.setattr(heapq, "heappop", counting_heappop)
+
+        for _ in range(1000):
+            assert await manager.claim_due_jobs() == []
+        assert pops == 0  # an idle tick only peeks at the heap top
+
+        claimed = []
+        for _ in range(100):
+            clock.advance(seconds=10)
+            claimed.extend(await manager.claim_due_jobs())
+
+        assert len(claimed) == len({job.id for job in claimed}) == 1000
+        # One pop per claimed job, never a scan of the other 99,000
+        assert pops == 1000
+
+    @pytest.mark.asyncio
+    async def test_workers_sharing_a_store_never_claim_the_same_job(self, tmp_path):
+        clock = FakeClock()
+        db_path = str(tmp_path / "jobs.db")
+        workers = [
+            JobManager(store=SQLiteJobStore(db_path), worker_id=f"w{i}", clock=clock) for i in range(4)
+        ]
+        await workers[0].schedule_jobs(_jobs(100_000, spacing_seconds=0.01))
+        clock.advance(seconds=1000)
+
+        def drain(worker):
+            claimed, ticks = [], []
+            while True:
+                start = time.perf_counter()
+                batch = asyncio.run(worker.claim_due_jobs(limit=500))
+                ticks.append(time.perf_counter() - start)
+                if not batch:
+                    return claimed, ticks
+                claimed.extend(job.id for job in batch)
+
+        results = await asyncio.gather(*(asyncio.to_thread(drain, worker) for worker in workers))
+
+        claimed = [job_id for ids, _ in results for job_id in ids]
+        assert len(claimed) == len(set(claimed)) == 100_000
+        ticks = sorted(tick for _, worker_ticks in results for tick in worker_ticks)
+        assert statistics.median(ticks) < 0.1
+        assert await workers[0].get_due_jobs() == []
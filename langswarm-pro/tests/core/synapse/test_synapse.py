@@ -1,3 +1,8 @@
+import random
+import time
+import zlib
+
+import numpy as np
 import pytest
 import pytest_asyncio
 from langswarm_pro.core.synapse.protocol import SwarmProtocol, SwarmConfig
@@ -53,3 +58,71 @@ async def test_router():
     # basic mock test to ensure routing works
     # We rely on the strategies working (tested above)
     pass
+
+
+def hash_encoder(texts, dim=2048):
+    """Deterministic bag-of-words embedder: no model download needed"""
+    embeddings = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token in text.lower().strip(".").split():
+            embeddings[row, zlib.crc32(token.encode()) % dim] += 1.0
+    return embeddings
+
+
+def synthetic_responses(topics=10, variants=50):
+    # Variants of a topic share 5 of 6 words (similarity 0.83); topics share 4 (0.67)
+    rng = random.Random(0)
+    responses = [
+        f"topic{topic} answer is {topic * 7 + 100} units variant{variant}"
+        for topic in range(topics) for variant in range(variants)
+    ]
+    rng.shuffle(responses)
+    return responses
+
+
+def legacy_detect_consensus(protocol, texts):
+    """The previous per-row loop, with util.cos_sim expressed in NumPy"""
+    embeddings = np.asarray(protocol.encoder(texts), dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1)
+    best_text, best_score, best_group_size = None, -1.0, 0
+    for i, text in enumerate(texts):
+        similarities = embeddings @ embeddings[i] / np.maximum(norms * norms[i], 1e-12)
+        group_size = int((similarities >= protocol.config.paraphrase_threshold).sum())
+        avg_score = float(similarities.mean())
+        if group_size > best_group_size or (group_size == best_group_size and avg_score > best_score):
+            best_text, best_score, best_group_size = text, avg_score, group_size
+    return {"consensus": best_text, "score": best_score, "group_size": best_group_size}
+
+
+@pytest.mark.asyncio
+async def test_strategies_with_injected_encoder(mock_responses):
+    router = SynapseRouter(encoder=hash_encoder)
+
+    vote = await router.route(StrategyType.VOTING, mock_responses)
+    assert vote["consensus"] == "The sky is blue."
+    assert vote["group_size"] == 2
+
+    summary = await router.route(StrategyType.AGGREGATION, mock_responses + ["The sky is blue."])
+    assert summary.split("\n\n") == ["The sky is blue.", "The sky is green.", "I like apples."]
+
+
+def test_matrix_consensus_matches_legacy_loop_on_500_responses():
+    protocol = SwarmProtocol(encoder=hash_encoder)
+    responses = synthetic_responses()
+
+    start = time.perf_counter()
+    result = protocol.detect_consensus(responses)
+    matrix_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = legacy_detect_consensus(protocol, responses)
+    loop_time = time.perf_counter() - start
+
+    assert result["consensus"] == expected["consensus"]
+    assert result["group_size"] == expected["group_size"] == 50
+    assert result["score"] == pytest.approx(expected["score"], abs=1e-5)
+    assert matrix_time < loop_time
+
+    clusters = protocol.cluster(responses)
+    assert len(clusters) == 10
+    assert sorted(len(cluster) for cluster in clusters) == [50] * 10
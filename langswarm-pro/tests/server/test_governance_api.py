@@ -0,0 +1,36 @@
+import pytest
+
+jwt = pytest.importorskip("jwt")
+pytest.importorskip("pydantic_settings")
+
+from fastapi.testclient import TestClient
+
+from langswarm_pro.core.config import settings
+from langswarm_pro.server.main import app
+from langswarm_pro.server.routers import governance
+
+PREFIX = f"{settings.API_V1_STR}/governance"
+
+
+def _headers(user_id, role="admin"):
+    token = jwt.encode({"sub": user_id, "role": role}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_deciding_twice_conflicts_and_unknown_requests_are_missing():
+    with TestClient(app) as client:
+        request = client.portal.call(governance._queue.create_request, "agent", "deploy", {})
+
+        approved = client.post(f"{PREFIX}/approve/{request.id}", json={"notes": "ok"}, headers=_headers("a1"))
+        assert approved.status_code == 200 and approved.json()["status"] == "approved"
+
+        assert client.post(f"{PREFIX}/reject/{request.id}", json={}, headers=_headers("a1")).status_code == 409
+        assert client.post(f"{PREFIX}/approve/{request.id}", json={}, headers=_headers("a1")).status_code == 409
+        assert client.post(f"{PREFIX}/approve/missing", json={}, headers=_headers("a1")).status_code == 404
+
+
+def test_sweeper_runs_while_the_app_is_up():
+    with TestClient(app):
+        sweeper = governance._queue._sweeper
+        assert sweeper is not None and not sweeper.done()
+    assert governance._queue._sweeper is None
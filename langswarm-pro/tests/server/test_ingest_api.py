@@ -0,0 +1,133 @@
+import time
+
+import pytest
+
+jwt = pytest.importorskip("jwt")
+pytest.importorskip("pydantic_settings")
+
+from fastapi.testclient import TestClient
+
+from langswarm_pro.core.config import settings
+from langswarm_pro.core.scheduler.manager import JobManager
+from langswarm_pro.server.main import app
+from langswarm_pro.server.routers import memory
+
+PREFIX = f"{settings.API_V1_STR}/memory"
+
+
+class InMemoryManager:
+    def __init__(self):
+        self.docs = []
+
+    async def add_documents(self, documents):
+        self.docs.extend(documents)
+
+
+def _headers(user_id, role="user"):
+    token = jwt.encode({"sub": user_id, "role": role}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    root = tmp_path / "root"
+    root.mkdir()
+    monkeypatch.setattr(settings, "INGESTION_ROOT", str(root))
+    return root
+
+
+@pytest.fixture
+def store(root):
+    manager = InMemoryManager()
+    memory.configure_ingestion(manager, manager=JobManager())
+    yield manager
+    memory.ingestion_pool = None
+
+
+def _wait(client, job_id, headers):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        status = client.get(f"{PREFIX}/ingest/{job_id}", headers=headers).json()
+        if status["status"] in ("completed", "failed"):
+            return status
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_ingest_enqueues_job_and_reports_progress(store, root):
+    (root / "a.txt").write_text("First paragraph.\n\nSecond paragraph.")
+    (root / "b.txt").write_text("Another file entirely.")
+
+    with TestClient(app) as client:
+        response = client.post(f"{PREFIX}/ingest", json={"path": str(root)}, headers=_headers("u1"))
+        assert response.status_code == 200
+        job_id = response.json()["job_id"]
+
+        status = _wait(client, job_id, _headers("u1"))
+        assert status["status"] == "completed"
+        assert status["files_done"] == 2 and status["chunks_written"] == len(store.docs) > 0
+        assert status["bytes_read"] == sum(p.stat().st_size for p in root.iterdir())
+        assert status["errors"] == []
+
+        # Other users can't see the job; admins can
+        assert client.get(f"{PREFIX}/ingest/{job_id}", headers=_headers("u2")).status_code == 404
+        assert client.get(f"{PREFIX}/ingest/{job_id}", headers=_headers("admin", "admin")).status_code == 200
+
+
+def test_ingest_rejects_missing_paths(store, root):
+    with TestClient(app) as client:
+        response = client.post(f"{PREFIX}/ingest", json={"path": str(root / "nope")}, headers=_headers("u1"))
+        assert response.status_code == 404
+        assert client.get(f"{PREFIX}/ingest/unknown", headers=_headers("u1")).status_code == 404
+
+
+def test_ingest_rejects_paths_outside_the_root(store, root, tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("Not for ingestion.")
+    (root / "link.txt").symlink_to(secret)
+    (root / "outside").symlink_to(tmp_path)
+
+    with TestClient(app) as client:
+        for path in (str(secret), str(root / ".." / "secret.txt"), "../secret.txt",
+                     str(root / "link.txt"), str(root / "outside" / "secret.txt")):
+            response = client.post(f"{PREFIX}/ingest", json={"path": path}, headers=_headers("u1"))
+            assert response.status_code == 403, path
+
+        # A symlink inside an allowed directory is refused when the job reads it
+        (root / "docs").mkdir()
+        (root / "docs" / "ok.txt").write_text("Allowed paragraph.")
+        (root / "docs" / "leak.txt").symlink_to(secret)
+        response = client.post(f"{PREFIX}/ingest", json={"path": "docs"}, headers=_headers("u1"))
+        assert response.status_code == 200
+        status = _wait(client, response.json()["job_id"], _headers("u1"))
+
+    assert status["files_done"] == 2 and len(status["errors"]) == 1
+    assert "outside the ingestion root" in status["errors"][0]
+    assert [doc["text"] for doc in store.docs] == ["Allowed paragraph."]
+
+
+def test_without_a_root_only_admins_may_ingest(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "INGESTION_ROOT", None)
+    (tmp_path / "a.txt").write_text("Admin upload.")
+
+    with TestClient(app) as client:
+        body = {"path": str(tmp_path / "a.txt")}
+        assert client.post(f"{PREFIX}/ingest", json=body, headers=_headers("u1")).status_code == 403
+        assert client.post(f"{PREFIX}/ingest", json=body, headers=_headers("admin", "admin")).status_code == 200
+
+
+def test_lifespan_configures_and_runs_the_pool_from_app_state(root, monkeypatch):
+    manager = InMemoryManager()
+    monkeypatch.setattr(app.state, "memory_manager", manager, raising=False)
+    (root / "a.txt").write_text("Configured at startup.")
+    try:
+        with TestClient(app) as client:
+            pool = memory.ingestion_pool
+            assert pool is not None and pool._dispatcher is not None
+            headers = _headers("alice")
+            job_id = client.post(f"{PREFIX}/ingest", json={"path": str(root / "a.txt")}, headers=headers).json()["job_id"]
+            assert _wait(client, job_id, headers)["status"] == "completed"
+        assert pool._dispatcher is None  # stopped on shutdown
+        assert manager.docs
+    finally:
+        memory.ingestion_pool = None
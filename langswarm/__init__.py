@@ -18,6 +18,10 @@ Quick Start:
     agent = config.get_agent("assistant")
 """
 
+import os
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 # Dynamic version from package metadata (single source of truth: pyproject.toml)
 from importlib.metadata import version, PackageNotFoundError
 try:
@@ -25,8 +29,28 @@ try:
 except PackageNotFoundError:
     __version__ = "0.0.0.dev"  # Fallback for development/editable installs
 
-# Simple API - primary interface for most users
-try:
+# Public names are resolved lazily on first attribute access (PEP 562) so that
+# a bare ``import langswarm`` does not pull in every provider and subsystem.
+_LAZY_EXPORTS = {
+    # Simple API - primary interface for most users
+    'create_agent': 'langswarm.simple_api',
+    'create_workflow': 'langswarm.simple_api',
+    'load_config': 'langswarm.simple_api',
+    'Agent': 'langswarm.simple_api',
+    'Workflow': 'langswarm.simple_api',
+    'Config': 'langswarm.simple_api',
+
+    # Advanced API - for power users
+    'create_openai_agent': 'langswarm.core.agents',
+    'create_anthropic_agent': 'langswarm.core.agents',
+    'create_gemini_agent': 'langswarm.core.agents',
+    'AgentBuilder': 'langswarm.core.agents',
+    'LangSwarmConfig': 'langswarm.core.config',
+    'get_workflow_engine': 'langswarm.core.workflows',
+    'WorkflowBuilder': 'langswarm.core.workflows',
+}
+
+if TYPE_CHECKING:
     from langswarm.simple_api import (
         create_agent,
         create_workflow,
@@ -35,47 +59,45 @@ try:
         Workflow,
         Config
     )
-except ImportError:
-    # Fallback during development
-    pass
-
-# Advanced API - for power users
-try:
     from langswarm.core.agents import (
         create_openai_agent,
         create_anthropic_agent,
         create_gemini_agent,
         AgentBuilder
     )
-except (ImportError, AttributeError):
-    pass
+    from langswarm.core.config import LangSwarmConfig
+    from langswarm.core.workflows import get_workflow_engine, WorkflowBuilder
 
-try:
-    from langswarm.core.config import (
-        LangSwarmConfig
-    )
-except (ImportError, AttributeError):
+
+# Core session management placeholders; the session package exposes concrete
+# ISessionStorage implementations under langswarm.core.session.
+class SessionStorage:
     pass
 
-try:
-    from langswarm.core.workflows import (
-        get_workflow_engine,
-        WorkflowBuilder
-    )
-except (ImportError, AttributeError):
-    # Skip advanced workflows if there are import issues
+
+class SessionProvider:
     pass
 
-# Core session management
-try:
-    from langswarm.core.session.storage import SessionStorage
-    from langswarm.core.session.interfaces import SessionProvider
-except (ImportError, AttributeError):
-    # Define minimal fallbacks
-    class SessionStorage:
-        pass
-    class SessionProvider:
-        pass
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        value = getattr(import_module(module_name), name)
+    except (ImportError, AttributeError) as e:
+        raise AttributeError(
+            f"langswarm.{name} is unavailable: {module_name} could not be imported ({e})"
+        ) from e
+
+    # Cache on the module so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
 __all__ = [
     # Simple API (recommended)
@@ -94,9 +116,12 @@ __all__ = [
     '__version__'
 ]
 
-# Auto-configure observability if environment variables are present
-try:
-    from langswarm.core.observability.auto_config import auto_configure_langfuse
-    auto_configure_langfuse()
-except Exception:
-    pass
\ No newline at end of file
+# Auto-configure observability if environment variables are present. The
+# credentials are checked first so the observability package is only imported
+# when it will actually be used.
+if os.getenv("LANGFUSE_PUBLIC_KEY") and os.getenv("LANGFUSE_SECRET_KEY"):
+    try:
+        from langswarm.core.observability.auto_config import auto_configure_langfuse
+        auto_configure_langfuse()
+    except Exception:
+        pass
@@ -40,8 +40,8 @@ from .interfaces import (
     CollaborationState, RealtimeConfiguration,
     
     # Enums
-    RealtimeMessageType, EventType, StreamingType, VoiceState,
-    CollaborationRole, ConnectionStatus,
+    RealtimeMessageType, EventType, StreamingType, StreamOverflowPolicy,
+    SSEOverflowPolicy, VoiceState, CollaborationRole, ConnectionStatus,
     
     # Exceptions
     RealtimeError, ConnectionError, StreamingError, VoiceError
@@ -100,6 +100,8 @@ __all__ = [
     'RealtimeMessageType',
     'EventType',
     'StreamingType',
+    'StreamOverflowPolicy',
+    'SSEOverflowPolicy',
     'VoiceState',
     'CollaborationRole',
     'ConnectionStatus',
@@ -48,6 +48,20 @@ class StreamingType(Enum):
     COMPLETE = "complete"
 
 
+class StreamOverflowPolicy(Enum):
+    """What a stream does once its aggregated content reaches the size cap"""
+    TRUNCATE = "truncate"  # Drop content past the cap
+    SPILL = "spill"  # Move content to a temporary file and keep going
+    ERROR = "error"  # Fail the stream
+
+
+class SSEOverflowPolicy(Enum):
+    """What an SSE stream does when its outbound queue is full"""
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued frame
+    COALESCE = "coalesce"  # Merge text deltas into the newest queued delta
+    DISCONNECT = "disconnect"  # Close the slow client's stream
+
+
 class VoiceState(Enum):
     """Voice conversation states"""
     IDLE = "idle"
@@ -180,6 +194,9 @@ class RealtimeConfiguration:
     sse_enabled: bool = True
     sse_path: str = "/events"
     heartbeat_interval: int = 30
+    sse_queue_size: int = 256  # Outbound frames buffered per stream
+    sse_overflow_policy: SSEOverflowPolicy = SSEOverflowPolicy.DROP_OLDEST
+    sse_drain_timeout: float = 5.0  # Seconds stop_stream waits for queued frames to reach the client
     
     # Voice settings
     voice_enabled: bool = False
@@ -196,6 +213,9 @@ class RealtimeConfiguration:
     streaming_buffer_size: int = 4096
     streaming_timeout: int = 30
     chunk_size: int = 512
+    streaming_retain_chunks: bool = False  # Keep every StreamingChunk until completion
+    streaming_max_bytes: Optional[int] = None  # Per-stream cap on aggregated content
+    streaming_overflow_policy: StreamOverflowPolicy = StreamOverflowPolicy.TRUNCATE
 
 
 class IRealtimeAgent(ABC):
@@ -8,15 +8,38 @@ with support for live response streaming and event broadcasting.
 import asyncio
 import json
 import logging
-from typing import Dict, Optional, AsyncIterator, Any, List
+from collections import deque
+from dataclasses import replace
+from typing import Dict, Optional, AsyncIterator, Any, List, Awaitable, Callable, Deque, Union
 from datetime import datetime
 import uuid
 
 from .interfaces import (
     ISSEHandler, RealtimeEvent, StreamingChunk, RealtimeConfiguration,
-    ConnectionStatus, EventType, StreamingType, StreamingError
+    ConnectionStatus, EventType, StreamingType, StreamingError, SSEOverflowPolicy
 )
 
+# Items accepted by an SSE stream's outbound queue; str is a preformatted frame
+OutboundItem = Union[RealtimeEvent, StreamingChunk, str]
+
+
+def _format_sse(event_type: str, data: Dict[str, Any], event_id: Optional[str] = None) -> str:
+    """Format one SSE frame"""
+    frame = f"event: {event_type}\n"
+    if event_id:
+        frame += f"id: {event_id}\n"
+    return frame + f"data: {json.dumps(data)}\n\n"
+
+
+def format_sse_event(event: RealtimeEvent) -> str:
+    """Format a real-time event as an SSE frame"""
+    return _format_sse(event.type.value, event.to_dict(), event.id)
+
+
+def format_sse_chunk(chunk: StreamingChunk) -> str:
+    """Format a streaming chunk as an SSE frame"""
+    return _format_sse("chunk", chunk.to_dict(), chunk.id)
+
 
 class SSEHandler(ISSEHandler):
     """
@@ -24,15 +47,25 @@ class SSEHandler(ISSEHandler):
     
     Provides one-way real-time communication from agents to clients
     with support for streaming responses, events, and status updates.
+    
+    Outgoing frames go into a bounded queue drained by a dedicated writer
+    task, so producers never wait on the client. When the queue is full the
+    configured SSEOverflowPolicy decides what gives.
     """
     
-    def __init__(self, agent_id: str, config: RealtimeConfiguration):
+    def __init__(
+        self,
+        agent_id: str,
+        config: RealtimeConfiguration,
+        sender: Optional[Callable[[str], Awaitable[None]]] = None
+    ):
         """
         Initialize SSE handler.
         
         Args:
             agent_id: Agent identifier for this handler
             config: Real-time configuration
+            sender: Coroutine function writing one SSE frame to the client
         """
         self.agent_id = agent_id
         self.config = config
@@ -43,13 +76,19 @@ class SSEHandler(ISSEHandler):
         self._client_id: Optional[str] = None
         self._stream_id: Optional[str] = None
         
-        # Event streaming
-        self._event_queue = asyncio.Queue()
-        self._chunk_queue = asyncio.Queue()
+        # Outbound queue drained by the writer task
+        self._sender = sender or self._log_frame
+        self._queue_size = max(1, config.sse_queue_size)
+        self._overflow_policy = SSEOverflowPolicy(config.sse_overflow_policy)
+        self._outbound: Deque[OutboundItem] = deque()
+        self._has_outbound = asyncio.Event()
+        self._drained = asyncio.Event()  # Set while the writer is idle with an empty queue
+        self._drained.set()
         
         # Background tasks
         self._stream_task: Optional[asyncio.Task] = None
         self._heartbeat_task: Optional[asyncio.Task] = None
+        self._disconnect_task: Optional[asyncio.Task] = None
         
         # Statistics
         self._stats = {
@@ -57,7 +96,13 @@ class SSEHandler(ISSEHandler):
             "chunks_sent": 0,
             "stream_start_time": None,
             "last_activity": None,
-            "total_bytes_sent": 0
+            "total_bytes_sent": 0,
+            "frames_delivered": 0,
+            "frames_dropped": 0,
+            "frames_coalesced": 0,
+            "max_queue_depth": 0,
+            "send_errors": 0,
+            "disconnected_on_overflow": False
         }
         
         self._logger.debug(f"SSE handler initialized for agent: {agent_id}")
@@ -77,6 +122,11 @@ class SSEHandler(ISSEHandler):
         """Get current stream ID"""
         return self._stream_id
     
+    @property
+    def queue_depth(self) -> int:
+        """Frames waiting to be written to the client"""
+        return len(self._outbound)
+    
     async def start_stream(self, agent_id: str) -> None:
         """
         Start SSE stream.
@@ -92,6 +142,9 @@ class SSEHandler(ISSEHandler):
             self._logger.info(f"Starting SSE stream for agent: {agent_id}")
             
             self._active = True
+            self._outbound.clear()
+            self._drained.set()
+            self._stats["disconnected_on_overflow"] = False
             self._client_id = str(uuid.uuid4())
             self._stream_id = str(uuid.uuid4())
             self._stats["stream_start_time"] = datetime.utcnow()
@@ -122,16 +175,20 @@ class SSEHandler(ISSEHandler):
         try:
             self._logger.info("Stopping SSE stream")
             
-            # Stop background tasks
-            await self._stop_background_tasks()
-            
             # Send stream end event
             await self._send_stream_event("stream_end", {
                 "stream_id": self._stream_id,
                 "timestamp": datetime.utcnow().isoformat()
             })
             
+            # Stop accepting frames and let the writer flush the queue, stream_end
+            # included; frames a stalled client has not taken by the deadline are dropped
             self._active = False
+            await self._drain(self.config.sse_drain_timeout)
+            await self._stop_background_tasks()
+            self._stats["frames_dropped"] += len(self._outbound)
+            self._outbound.clear()
+            
             self._client_id = None
             self._stream_id = None
             
@@ -157,13 +214,7 @@ class SSEHandler(ISSEHandler):
         
         try:
             # Add event to queue for streaming
-            await self._event_queue.put(event)
-            
-            self._stats["events_sent"] += 1
-            self._stats["last_activity"] = datetime.utcnow()
-            
-            self._logger.debug(f"Queued event for SSE stream: {event.id}")
-            return True
+            return self.enqueue(event)
             
         except Exception as e:
             self._logger.error(f"Failed to send event via SSE: {e}")
@@ -185,19 +236,81 @@ class SSEHandler(ISSEHandler):
         
         try:
             # Add chunk to queue for streaming
-            await self._chunk_queue.put(chunk)
-            
-            self._stats["chunks_sent"] += 1
-            self._stats["last_activity"] = datetime.utcnow()
-            self._stats["total_bytes_sent"] += len(chunk.content.encode('utf-8'))
-            
-            self._logger.debug(f"Queued chunk for SSE stream: {chunk.id}")
-            return True
+            return self.enqueue(chunk)
             
         except Exception as e:
             self._logger.error(f"Failed to send chunk via SSE: {e}")
             return False
     
+    def enqueue(self, item: OutboundItem) -> bool:
+        """
+        Queue an event, chunk or preformatted frame without waiting.
+        
+        Args:
+            item: RealtimeEvent, StreamingChunk or SSE frame string
+            
+        Returns:
+            True if the item was queued (or merged into a queued delta)
+        """
+        if not self._active:
+            return False
+        
+        if len(self._outbound) >= self._queue_size:
+            if self._overflow_policy == SSEOverflowPolicy.DISCONNECT:
+                self._disconnect_on_overflow()
+                return False
+            if self._overflow_policy == SSEOverflowPolicy.COALESCE and self._coalesce(item):
+                self._record_enqueued(item)
+                return True
+            self._outbound.popleft()
+            self._stats["frames_dropped"] += 1
+        
+        self._outbound.append(item)
+        self._drained.clear()
+        self._has_outbound.set()
+        self._record_enqueued(item)
+        
+        depth = len(self._outbound)
+        if depth > self._stats["max_queue_depth"]:
+            self._stats["max_queue_depth"] = depth
+        return True
+    
+    def _record_enqueued(self, item: OutboundItem) -> None:
+        if isinstance(item, StreamingChunk):
+            self._stats["chunks_sent"] += 1
+            self._stats["total_bytes_sent"] += len(item.content.encode('utf-8'))
+        else:
+            self._stats["events_sent"] += 1
+        self._stats["last_activity"] = datetime.utcnow()
+    
+    def _coalesce(self, item: OutboundItem) -> bool:
+        """Merge a text delta into the newest queued delta of the same message"""
+        if not (isinstance(item, StreamingChunk) and item.type == StreamingType.TEXT_DELTA):
+            return False
+        tail = self._outbound[-1]
+        if not (
+            isinstance(tail, StreamingChunk)
+            and tail.type == StreamingType.TEXT_DELTA
+            and tail.metadata.get("message_id") == item.metadata.get("message_id")
+        ):
+            return False
+        self._outbound[-1] = replace(tail, content=tail.content + item.content, index=item.index)
+        self._stats["frames_coalesced"] += 1
+        return True
+    
+    def _disconnect_on_overflow(self) -> None:
+        """Drop a client that cannot keep up"""
+        self._logger.warning(
+            f"Disconnecting SSE client {self._client_id}: outbound queue full ({self._queue_size})"
+        )
+        self._active = False
+        self._stats["frames_dropped"] += len(self._outbound)
+        self._stats["disconnected_on_overflow"] = True
+        self._outbound.clear()
+        self._client_id = None
+        self._stream_id = None
+        self._disconnect_task = asyncio.create_task(self._stop_background_tasks())
+    
     async def stream_response(self, message_id: str, content_generator: AsyncIterator[str]) -> bool:
         """
         Stream a complete response via SSE.
@@ -271,9 +384,10 @@ class SSEHandler(ISSEHandler):
             "stream_id": self._stream_id,
             "is_active": self._active,
             "queue_sizes": {
-                "event_queue": self._event_queue.qsize(),
-                "chunk_queue": self._chunk_queue.qsize()
-            }
+                "outbound": len(self._outbound)
+            },
+            "queue_capacity": self._queue_size,
+            "overflow_policy": self._overflow_policy.value
         }
     
     async def _start_background_tasks(self) -> None:
@@ -284,9 +398,23 @@ class SSEHandler(ISSEHandler):
         # Start heartbeat task
         self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
     
+    async def _drain(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for the writer to deliver every queued frame"""
+        writer = self._stream_task
+        if writer is None or writer.done() or writer is asyncio.current_task():
+            return not self._outbound
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            self._logger.warning(
+                f"SSE client {self._client_id} did not drain {len(self._outbound)} frames within {timeout}s"
+            )
+            return False
+    
     async def _stop_background_tasks(self) -> None:
         """Stop background tasks"""
-        if self._stream_task:
+        if self._stream_task and self._stream_task is not asyncio.current_task():
             self._stream_task.cancel()
             try:
                 await self._stream_task
@@ -294,7 +422,7 @@ class SSEHandler(ISSEHandler):
                 pass
             self._stream_task = None
         
-        if self._heartbeat_task:
+        if self._heartbeat_task and self._heartbeat_task is not asyncio.current_task():
             self._heartbeat_task.cancel()
             try:
                 await self._heartbeat_task
@@ -303,31 +431,31 @@ class SSEHandler(ISSEHandler):
             self._heartbeat_task = None
     
     async def _stream_loop(self) -> None:
-        """Background task to stream events and chunks"""
-        while self._active:
+        """Writer task: drain the outbound queue to the client in order"""
+        outbound = self._outbound
+        while True:
             try:
-                # Check for events to stream
-                try:
-                    event = await asyncio.wait_for(self._event_queue.get(), timeout=0.1)
-                    await self._send_sse_event(event)
-                except asyncio.TimeoutError:
-                    pass
+                while not outbound:
+                    self._has_outbound.clear()
+                    self._drained.set()
+                    await self._has_outbound.wait()
                 
-                # Check for chunks to stream
-                try:
-                    chunk = await asyncio.wait_for(self._chunk_queue.get(), timeout=0.1)
-                    await self._send_sse_chunk(chunk)
-                except asyncio.TimeoutError:
-                    pass
+                item = outbound.popleft()
+                if isinstance(item, RealtimeEvent):
+                    frame = format_sse_event(item)
+                elif isinstance(item, StreamingChunk):
+                    frame = format_sse_chunk(item)
+                else:
+                    frame = item
                 
-                # Small delay to prevent busy waiting
-                await asyncio.sleep(0.01)
+                await self._sender(frame)
+                self._stats["frames_delivered"] += 1
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
+                self._stats["send_errors"] += 1
                 self._logger.error(f"Error in stream loop: {e}")
-                break
     
     async def _heartbeat_loop(self) -> None:
         """Background task to send heartbeat events"""
@@ -347,45 +475,17 @@ class SSEHandler(ISSEHandler):
                 self._logger.error(f"Error in heartbeat loop: {e}")
                 break
     
-    async def _send_sse_event(self, event: RealtimeEvent) -> None:
-        """Send event via SSE protocol"""
-        try:
-            # Format as SSE event
-            sse_data = f"event: {event.type.value}\n"
-            sse_data += f"id: {event.id}\n"
-            sse_data += f"data: {json.dumps(event.to_dict())}\n\n"
-            
-            # In real implementation, would send to SSE stream
-            self._logger.debug(f"SSE Event: {event.type.value}")
-            
-        except Exception as e:
-            self._logger.error(f"Failed to send SSE event: {e}")
-    
-    async def _send_sse_chunk(self, chunk: StreamingChunk) -> None:
-        """Send chunk via SSE protocol"""
-        try:
-            # Format as SSE event
-            sse_data = f"event: chunk\n"
-            sse_data += f"id: {chunk.id}\n"
-            sse_data += f"data: {json.dumps(chunk.to_dict())}\n\n"
-            
-            # In real implementation, would send to SSE stream
-            self._logger.debug(f"SSE Chunk: {chunk.type.value}")
-            
-        except Exception as e:
-            self._logger.error(f"Failed to send SSE chunk: {e}")
-    
     async def _send_stream_event(self, event_type: str, data: Dict[str, Any]) -> None:
         """Send stream control event"""
         try:
-            sse_data = f"event: {event_type}\n"
-            sse_data += f"data: {json.dumps(data)}\n\n"
-            
-            # In real implementation, would send to SSE stream
-            self._logger.debug(f"SSE Stream Event: {event_type}")
+            self.enqueue(_format_sse(event_type, data))
             
         except Exception as e:
             self._logger.error(f"Failed to send stream event: {e}")
+    
+    async def _log_frame(self, frame: str) -> None:
+        """Default sender when no client transport is attached"""
+        self._logger.debug(f"SSE frame: {frame.split(chr(10), 1)[0]}")
 
 
 class SSEStream:
@@ -471,6 +571,9 @@ class SSEStream:
         """
         Broadcast event to multiple streams.
         
+        The frame is formatted once and queued on each stream without
+        waiting, so a slow client cannot hold up the others.
+        
         Args:
             event: Event to broadcast
             agent_ids: List of agent IDs to broadcast to (None for all)
@@ -480,12 +583,14 @@ class SSEStream:
         """
         targets = agent_ids or list(self._streams.keys())
         sent_count = 0
+        frame = format_sse_event(event)
         
         for agent_id in targets:
-            if agent_id in self._streams:
+            stream = self._streams.get(agent_id)
+            if stream is not None:
                 try:
-                    await self._streams[agent_id].send_event(event)
-                    sent_count += 1
+                    if stream.enqueue(frame):
+                        sent_count += 1
                 except Exception as e:
                     self._logger.error(f"Failed to broadcast event to {agent_id}: {e}")
         
@@ -497,6 +602,9 @@ class SSEStream:
         return {
             **self._stats,
             "is_active": self._active,
+            "queued_frames": sum(stream.queue_depth for stream in self._streams.values()),
+            "max_queue_depth": max((stream._stats["max_queue_depth"] for stream in self._streams.values()), default=0),
+            "frames_dropped": sum(stream._stats["frames_dropped"] for stream in self._streams.values()),
             "stream_details": {
                 agent_id: await stream.get_statistics()
                 for agent_id, stream in self._streams.items()
@@ -505,6 +613,10 @@ class SSEStream:
 
 
 # Factory functions
-def create_sse_handler(agent_id: str, config: RealtimeConfiguration) -> SSEHandler:
+def create_sse_handler(
+    agent_id: str,
+    config: RealtimeConfiguration,
+    sender: Optional[Callable[[str], Awaitable[None]]] = None
+) -> SSEHandler:
     """Create a new SSE handler"""
-    return SSEHandler(agent_id, config)
+    return SSEHandler(agent_id, config, sender=sender)
@@ -6,17 +6,54 @@ with chunk processing, response aggregation, and streaming optimization.
 """
 
 import asyncio
+import io
 import logging
+import tempfile
+import time
 from typing import Dict, List, Optional, Any, AsyncIterator, Callable
 from datetime import datetime
 import uuid
 
 from .interfaces import (
     StreamingChunk, RealtimeMessage, RealtimeEvent, RealtimeConfiguration,
-    StreamingType, RealtimeMessageType, StreamingError
+    StreamingType, RealtimeMessageType, StreamingError, StreamOverflowPolicy
 )
 
 
+class _TextBuffer:
+    """Append-only text buffer that can move itself to a temporary file"""
+    
+    def __init__(self, spilled: bool = False):
+        self.spilled = False
+        self._file = io.StringIO()
+        if spilled:
+            self.spill()
+    
+    def write(self, text: str) -> None:
+        self._file.write(text)
+    
+    def spill(self) -> None:
+        """Move the buffered text to disk; later writes go there too"""
+        if self.spilled:
+            return
+        value = self._file.getvalue()
+        self._file = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+        self._file.write(value)
+        self.spilled = True
+    
+    def getvalue(self) -> str:
+        if not self.spilled:
+            return self._file.getvalue()
+        self._file.flush()
+        self._file.seek(0)
+        content = self._file.read()
+        self._file.seek(0, io.SEEK_END)
+        return content
+    
+    def close(self) -> None:
+        self._file.close()
+
+
 class StreamingResponseManager:
     """
     Manager for streaming response processing and delivery.
@@ -174,6 +211,11 @@ class StreamingResponseManager:
                 return False
             
             stream_info = self._active_streams[stream_id]
+            if stream_info["status"] == "overflow":
+                return False
+            
+            # Count bytes once; processor and aggregator reuse it
+            byte_size = len(content.encode('utf-8'))
             
             # Create chunk
             chunk = StreamingChunk(
@@ -185,24 +227,31 @@ class StreamingResponseManager:
             
             # Process chunk
             processor = self._chunk_processors[stream_id]
-            processed_chunk = await processor.process_chunk(chunk)
+            processed_chunk = await processor.process_chunk(chunk, byte_size=byte_size)
             
             # Add to aggregator
             aggregator = self._response_aggregators[stream_id]
-            await aggregator.add_chunk(processed_chunk)
+            await aggregator.add_chunk(processed_chunk, byte_size=byte_size)
             
             # Update stream info
             stream_info["chunk_count"] += 1
-            stream_info["total_bytes"] += len(content.encode('utf-8'))
+            stream_info["total_bytes"] += byte_size
             stream_info["last_activity"] = datetime.utcnow()
             
             # Update statistics
             self._stats["chunks_processed"] += 1
-            self._stats["total_bytes_streamed"] += len(content.encode('utf-8'))
+            self._stats["total_bytes_streamed"] += byte_size
             
-            self._logger.debug(f"Added chunk to stream {stream_id}: {len(content)} bytes")
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug(f"Added chunk to stream {stream_id}: {byte_size} bytes")
             return True
             
+        except StreamingError as e:
+            # Size cap hit under the ERROR overflow policy
+            self._logger.error(f"Stream {stream_id} failed: {e}")
+            self._active_streams[stream_id]["status"] = "overflow"
+            return False
+            
         except Exception as e:
             self._logger.error(f"Failed to add chunk to stream {stream_id}: {e}")
             return False
@@ -335,7 +384,7 @@ class StreamingResponseManager:
                 del self._chunk_processors[stream_id]
             
             if stream_id in self._response_aggregators:
-                del self._response_aggregators[stream_id]
+                self._response_aggregators.pop(stream_id).close()
             
             # Update statistics
             self._stats["active_streams"] = len(self._active_streams)
@@ -428,17 +477,18 @@ class ChunkProcessor:
         self._enable_deduplication = True
         self._enable_optimization = True
     
-    async def process_chunk(self, chunk: StreamingChunk) -> StreamingChunk:
+    async def process_chunk(self, chunk: StreamingChunk, byte_size: Optional[int] = None) -> StreamingChunk:
         """
         Process streaming chunk.
         
         Args:
             chunk: Chunk to process
+            byte_size: UTF-8 size of the chunk content, if already known
             
         Returns:
             Processed chunk
         """
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         
         try:
             processed_chunk = chunk
@@ -455,8 +505,10 @@ class ChunkProcessor:
             
             # Update statistics
             self._chunks_processed += 1
-            self._total_bytes += len(chunk.content.encode('utf-8'))
-            self._processing_time += (datetime.utcnow() - start_time).total_seconds()
+            if byte_size is None:
+                byte_size = len(chunk.content.encode('utf-8'))
+            self._total_bytes += byte_size
+            self._processing_time += time.perf_counter() - start_time
             
             return processed_chunk
             
@@ -503,6 +555,12 @@ class ResponseAggregator:
     
     Combines streaming chunks into final coherent responses
     with proper formatting and structure.
+    
+    By default only a running content builder and per-call tool output
+    deltas are kept; set ``streaming_retain_chunks`` to also keep every
+    chunk. ``streaming_max_bytes`` caps the aggregated text and tool output
+    together, with ``streaming_overflow_policy`` deciding whether content
+    past the cap is dropped, spilled to temporary files, or fails the stream.
     """
     
     def __init__(self, stream_id: str, config: RealtimeConfiguration):
@@ -517,42 +575,129 @@ class ResponseAggregator:
         self.config = config
         self._logger = logging.getLogger(f"{__name__}.{stream_id}")
         
+        self._retain_chunks = config.streaming_retain_chunks
+        self._max_bytes = config.streaming_max_bytes
+        self._overflow_policy = StreamOverflowPolicy(config.streaming_overflow_policy)
+        
         # Aggregation state
         self._chunks: List[StreamingChunk] = []
-        self._content_buffer = []
+        self._content = _TextBuffer()
+        self._content_bytes = 0
+        self._tool_outputs: Dict[str, _TextBuffer] = {}
+        self._tool_output_bytes = 0
         self._metadata_buffer = {}
+        self._spilled = False
+        self._truncated = False
         
         # Statistics
         self._chunks_aggregated = 0
         self._total_content_length = 0
     
-    async def add_chunk(self, chunk: StreamingChunk) -> None:
+    async def add_chunk(self, chunk: StreamingChunk, byte_size: Optional[int] = None) -> None:
         """
         Add chunk to aggregation.
         
         Args:
             chunk: Streaming chunk to add
+            byte_size: UTF-8 size of the chunk content, if already known
+            
+        Raises:
+            StreamingError: If the size cap is exceeded under the ERROR policy
         """
         try:
-            self._chunks.append(chunk)
+            if self._retain_chunks:
+                self._chunks.append(chunk)
             
             # Process chunk content based on type
-            if chunk.type == StreamingType.TEXT_DELTA:
-                self._content_buffer.append(chunk.content)
+            if chunk.type in (StreamingType.TEXT_DELTA, StreamingType.TOOL_OUTPUT):
+                if byte_size is None:
+                    byte_size = len(chunk.content.encode('utf-8'))
+                if chunk.type == StreamingType.TEXT_DELTA:
+                    self._content_bytes += self._append(self._content, chunk.content, byte_size)
+                else:
+                    call_id = chunk.metadata.get("tool_call_id", "default")
+                    buffer = self._tool_outputs.get(call_id)
+                    if buffer is None:
+                        buffer = self._tool_outputs[call_id] = _TextBuffer(spilled=self._spilled)
+                    self._tool_output_bytes += self._append(buffer, chunk.content, byte_size)
             elif chunk.type == StreamingType.COMPLETE:
                 # Mark as final chunk
                 chunk.is_final = True
             
             # Aggregate metadata
-            self._metadata_buffer.update(chunk.metadata)
+            if chunk.metadata:
+                self._metadata_buffer.update(chunk.metadata)
             
             # Update statistics
             self._chunks_aggregated += 1
             self._total_content_length += len(chunk.content)
             
+        except StreamingError:
+            raise
         except Exception as e:
             self._logger.error(f"Failed to add chunk to aggregation: {e}")
     
+    def _append(self, buffer: _TextBuffer, content: str, byte_size: int) -> int:
+        """Append text, applying the overflow policy once the cap is reached.
+        
+        Returns the number of bytes actually written.
+        """
+        buffered = self._content_bytes + self._tool_output_bytes
+        if (
+            self._max_bytes is not None
+            and not self._spilled
+            and buffered + byte_size > self._max_bytes
+        ):
+            if self._overflow_policy == StreamOverflowPolicy.ERROR:
+                raise StreamingError(
+                    f"Stream {self.stream_id} exceeded {self._max_bytes} bytes"
+                )
+            
+            if self._overflow_policy == StreamOverflowPolicy.TRUNCATE:
+                remaining = self._max_bytes - buffered
+                self._truncated = True
+                if remaining <= 0:
+                    return 0
+                # Cut on a character boundary
+                head = content.encode('utf-8')[:remaining].decode('utf-8', errors='ignore')
+                buffer.write(head)
+                return len(head.encode('utf-8'))
+            
+            # SPILL: move what we have to disk and keep appending there
+            self._spilled = True
+            self._content.spill()
+            for tool_buffer in self._tool_outputs.values():
+                tool_buffer.spill()
+            buffer.spill()
+            self._logger.debug(f"Stream {self.stream_id} spilled to disk at {buffered} bytes")
+        
+        buffer.write(content)
+        return byte_size
+    
+    def _get_content(self) -> str:
+        """Aggregated text so far"""
+        return self._content.getvalue()
+    
+    def _build_metadata(self, **extra) -> Dict[str, Any]:
+        metadata = {
+            **self._metadata_buffer,
+            "stream_id": self.stream_id,
+            "chunk_count": self._chunks_aggregated,
+            "content_bytes": self._content_bytes,
+            "tool_output_bytes": self._tool_output_bytes,
+            **extra,
+            "aggregated_at": datetime.utcnow().isoformat()
+        }
+        if self._tool_outputs:
+            metadata["tool_outputs"] = {
+                call_id: buffer.getvalue() for call_id, buffer in self._tool_outputs.items()
+            }
+        if self._truncated:
+            metadata["truncated"] = True
+        if self._spilled:
+            metadata["spilled"] = True
+        return metadata
+    
     async def get_final_response(self) -> RealtimeMessage:
         """
         Get final aggregated response message.
@@ -561,22 +706,14 @@ class ResponseAggregator:
             Final aggregated message
         """
         try:
-            # Combine all content
-            final_content = "".join(self._content_buffer)
-            
             # Create final message
             final_message = RealtimeMessage(
                 type=RealtimeMessageType.TEXT,
-                content=final_content,
-                metadata={
-                    **self._metadata_buffer,
-                    "stream_id": self.stream_id,
-                    "chunk_count": len(self._chunks),
-                    "aggregated_at": datetime.utcnow().isoformat()
-                }
+                content=self._get_content(),
+                metadata=self._build_metadata()
             )
             
-            self._logger.debug(f"Aggregated {len(self._chunks)} chunks into final message")
+            self._logger.debug(f"Aggregated {self._chunks_aggregated} chunks into final message")
             return final_message
             
         except Exception as e:
@@ -596,19 +733,10 @@ class ResponseAggregator:
             Partial aggregated message
         """
         try:
-            # Combine content so far
-            partial_content = "".join(self._content_buffer)
-            
             partial_message = RealtimeMessage(
                 type=RealtimeMessageType.TEXT,
-                content=partial_content,
-                metadata={
-                    **self._metadata_buffer,
-                    "stream_id": self.stream_id,
-                    "chunk_count": len(self._chunks),
-                    "is_partial": True,
-                    "aggregated_at": datetime.utcnow().isoformat()
-                }
+                content=self._get_content(),
+                metadata=self._build_metadata(is_partial=True)
             )
             
             return partial_message
@@ -626,10 +754,23 @@ class ResponseAggregator:
         return {
             "stream_id": self.stream_id,
             "chunks_aggregated": self._chunks_aggregated,
+            "chunks_retained": len(self._chunks),
             "total_content_length": self._total_content_length,
-            "content_buffer_size": len(self._content_buffer),
-            "metadata_keys": len(self._metadata_buffer)
+            "content_buffer_size": self._content_bytes,
+            "tool_output_buffer_size": self._tool_output_bytes,
+            "metadata_keys": len(self._metadata_buffer),
+            "overflow_policy": self._overflow_policy.value,
+            "truncated": self._truncated,
+            "spilled": self._spilled
         }
+    
+    def close(self) -> None:
+        """Release the buffers and any spill files"""
+        self._content.close()
+        for buffer in self._tool_outputs.values():
+            buffer.close()
+        self._content = _TextBuffer()
+        self._tool_outputs = {}
 
 
 # Factory functions
@@ -587,6 +587,15 @@ _global_registry = AgentRegistry()
 
 
 # Convenience functions
+def get_agent_registry() -> AgentRegistry:
+    """Get the global agent registry instance.
+    
+    Returns:
+        AgentRegistry: The process-wide registry used by the convenience functions
+    """
+    return _global_registry
+
+
 def register_agent(
     agent: IAgent, 
     metadata: Optional[Dict[str, Any]] = None,
@@ -7,7 +7,7 @@ with support for different deployment environments and custom settings.
 
 import os
 import yaml
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 import logging
 
@@ -29,7 +29,7 @@ class TokenTrackingConfig:
         """
         self._config = config_data or {}
         self._model_pricing = {}
-        self._context_limits = {}
+        self._context_limits = self._config.get('model_context_limits', {})
         
         # Load default configuration if not provided
         if not config_data:
@@ -7,7 +7,7 @@ Provides async execution, error handling, and comprehensive observability.
 
 import asyncio
 import time
-from typing import List, Dict, Optional, Callable, Any
+from typing import List, Dict, Optional, Callable, Any, Tuple
 import logging
 
 from langswarm.core.errors import handle_error, ErrorContext, MiddlewareError
@@ -30,6 +30,10 @@ class Pipeline(IMiddlewarePipeline):
     
     Executes interceptors in priority order, providing async support,
     error handling, and comprehensive observability.
+    
+    Chains are compiled once per set of applicable interceptors (keyed by a
+    bitmask of ``can_handle`` results) and reused until the interceptor list
+    changes.
     """
     
     def __init__(self, interceptors: Optional[List[IMiddlewareInterceptor]] = None):
@@ -42,6 +46,9 @@ class Pipeline(IMiddlewarePipeline):
         self._interceptors: List[IMiddlewareInterceptor] = []
         self._interceptor_map: Dict[str, IMiddlewareInterceptor] = {}
         
+        # can_handle bitmask -> (compiled chain, interceptor names)
+        self._chain_cache: Dict[int, Tuple[Callable, Tuple[str, ...]]] = {}
+        
         if interceptors:
             for interceptor in interceptors:
                 self.add_interceptor(interceptor)
@@ -65,6 +72,7 @@ class Pipeline(IMiddlewarePipeline):
         
         # Sort by priority (lower numbers execute first)
         self._interceptors.sort(key=lambda i: i.priority)
+        self._chain_cache.clear()
         
         logger.debug(f"Added interceptor: {interceptor.name} (priority: {interceptor.priority})")
         return self
@@ -83,6 +91,7 @@ class Pipeline(IMiddlewarePipeline):
             interceptor = self._interceptor_map[name]
             self._interceptors.remove(interceptor)
             del self._interceptor_map[name]
+            self._chain_cache.clear()
             logger.debug(f"Removed interceptor: {name}")
         else:
             logger.warning(f"Interceptor not found for removal: {name}")
@@ -102,13 +111,15 @@ class Pipeline(IMiddlewarePipeline):
         start_time = time.time()
         
         try:
-            # Filter interceptors that can handle this request
-            applicable_interceptors = [
-                interceptor for interceptor in self._interceptors
-                if interceptor.can_handle(context)
-            ]
+            # Signature of the interceptors that can handle this request
+            mask = 0
+            bit = 1
+            for interceptor in self._interceptors:
+                if interceptor.can_handle(context):
+                    mask |= bit
+                bit <<= 1
             
-            if not applicable_interceptors:
+            if not mask:
                 logger.warning(f"No interceptors can handle request: {context.action_id}")
                 return ResponseContext.not_found(
                     context.request_id,
@@ -117,8 +128,18 @@ class Pipeline(IMiddlewarePipeline):
                     pipeline_interceptors=0
                 )
             
-            # Create the interceptor chain
-            chain = self._create_interceptor_chain(applicable_interceptors, context)
+            cached = self._chain_cache.get(mask)
+            if cached is None:
+                applicable_interceptors = [
+                    interceptor for index, interceptor in enumerate(self._interceptors)
+                    if mask >> index & 1
+                ]
+                cached = (
+                    self._create_interceptor_chain(applicable_interceptors, context),
+                    tuple(i.name for i in applicable_interceptors)
+                )
+                self._chain_cache[mask] = cached
+            chain, chain_names = cached
             
             # Execute the chain
             response = await chain(context)
@@ -127,14 +148,15 @@ class Pipeline(IMiddlewarePipeline):
             processing_time = time.time() - start_time
             response = response.with_metadata(
                 pipeline_processing_time=processing_time,
-                pipeline_interceptors=len(applicable_interceptors),
-                interceptor_chain=[i.name for i in applicable_interceptors]
+                pipeline_interceptors=len(chain_names),
+                interceptor_chain=list(chain_names)
             )
             
-            logger.debug(
-                f"Pipeline processed request {context.request_id} in {processing_time:.3f}s "
-                f"through {len(applicable_interceptors)} interceptors"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Pipeline processed request {context.request_id} in {processing_time:.3f}s "
+                    f"through {len(chain_names)} interceptors"
+                )
             
             return response
             
@@ -180,31 +202,32 @@ class Pipeline(IMiddlewarePipeline):
                 )
             return empty_chain
         
-        # Build chain from end to beginning
-        def build_chain(index: int) -> Callable:
-            if index >= len(interceptors):
-                # End of chain, return success
-                async def end_chain(ctx):
-                    return ResponseContext.success(
-                        ctx.request_id,
-                        None,
-                        end_of_chain=True
-                    )
-                return end_chain
-            
-            interceptor = interceptors[index]
-            next_chain = build_chain(index + 1)
-            
-            async def interceptor_chain(ctx):
-                try:
-                    return await interceptor.intercept(ctx, next_chain)
-                except Exception as e:
-                    logger.error(f"Error in interceptor {interceptor.name}: {e}")
-                    return interceptor.on_error(ctx, e)
-            
-            return interceptor_chain
+        # End of chain, return success
+        async def end_chain(ctx):
+            return ResponseContext.success(
+                ctx.request_id,
+                None,
+                end_of_chain=True
+            )
+        
+        # Link handlers from the end to the beginning; each handler is built
+        # once here and reused by every request routed to this chain
+        chain = end_chain
+        for interceptor in reversed(interceptors):
+            chain = self._link_interceptor(interceptor, chain)
+        return chain
+    
+    @staticmethod
+    def _link_interceptor(interceptor: IMiddlewareInterceptor, next_chain: Callable) -> Callable:
+        """Wrap an interceptor so it hands off to ``next_chain``"""
+        async def interceptor_chain(ctx):
+            try:
+                return await interceptor.intercept(ctx, next_chain)
+            except Exception as e:
+                logger.error(f"Error in interceptor {interceptor.name}: {e}")
+                return interceptor.on_error(ctx, e)
         
-        return build_chain(0)
+        return interceptor_chain
     
     def get_interceptors(self) -> List[IMiddlewareInterceptor]:
         """
@@ -253,6 +276,7 @@ class Pipeline(IMiddlewarePipeline):
         """
         self._interceptors.clear()
         self._interceptor_map.clear()
+        self._chain_cache.clear()
         logger.debug("Pipeline cleared")
         return self
     
@@ -47,7 +47,9 @@ from .integrations import (
 from .token_tracking import (
     TokenUsageEvent, ContextSizeInfo, TokenBudgetConfig, BudgetCheckResult,
     TokenUsageAggregator, ContextSizeMonitor, TokenBudgetManager,
-    TokenEventType, CompressionUrgency
+    TokenEventType, CompressionUrgency, RollupGranularity, UsageRollup, UsageSeries,
+    TokenEventSink, SQLiteTokenEventSink, ParquetTokenEventSink,
+    Tokenizer, HeuristicTokenizer, TiktokenTokenizer, default_tokenizer
 )
 
 from .opentelemetry_exporter import (
@@ -135,6 +137,16 @@ __all__ = [
     'TokenBudgetManager',
     'TokenEventType',
     'CompressionUrgency',
+    'RollupGranularity',
+    'UsageRollup',
+    'UsageSeries',
+    'TokenEventSink',
+    'SQLiteTokenEventSink',
+    'ParquetTokenEventSink',
+    'Tokenizer',
+    'HeuristicTokenizer',
+    'TiktokenTokenizer',
+    'default_tokenizer',
     
     # OpenTelemetry Integration
     'OpenTelemetryConfig',
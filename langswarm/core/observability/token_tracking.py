@@ -6,15 +6,19 @@ with the V2 middleware pipeline and observability system.
 """
 
 import asyncio
+import json
 import logging
+import sqlite3
 import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Deque, Dict, Iterable, List, Optional, Any, Union
 from enum import Enum
 
 from .interfaces import IMetrics, MetricType
-from ..middleware.interfaces import IRequestContext, IResponseContext
+from ..utils.optional_imports import require_package
 from ..agents.interfaces import IAgentSession, IAgentResponse, AgentUsage
 
 logger = logging.getLogger(__name__)
@@ -156,113 +160,346 @@ class BudgetCheckResult:
     recommendations: List[str] = field(default_factory=list)
 
 
+class RollupGranularity(Enum):
+    """Bucket widths for windowed token usage rollups"""
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+
+
+_GRANULARITY_SECONDS = {
+    RollupGranularity.MINUTE: 60,
+    RollupGranularity.HOUR: 3600,
+    RollupGranularity.DAY: 86400,
+}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _epoch_seconds(timestamp: datetime) -> float:
+    """Seconds since the epoch; naive datetimes are treated as UTC like datetime.utcnow()"""
+    if timestamp.tzinfo is not None:
+        return timestamp.timestamp()
+    return (timestamp - _EPOCH).total_seconds()
+
+
+class UsageRollup:
+    """
+    Fixed-size ring of time buckets for one key at one granularity.
+
+    Bucket ``n`` covers ``[n * width, (n + 1) * width)`` seconds since the epoch
+    and lives in slot ``n % slots``. Writing to a slot that still holds an
+    older bucket resets it, so retention is enforced by bucket expiry and an
+    update is O(1) regardless of how many events have been recorded.
+    """
+
+    __slots__ = ("width", "slots", "_buckets")
+
+    def __init__(self, width: int, slots: int):
+        self.width = width
+        self.slots = slots
+        # Each bucket is [bucket_index, tokens, input_tokens, output_tokens, cost, events]
+        self._buckets: List[Optional[list]] = [None] * slots
+
+    def add(self, epoch: float, tokens: int, input_tokens: int, output_tokens: int, cost: float) -> bool:
+        """Add usage at ``epoch``; returns False if it is older than the retained window"""
+        index = int(epoch // self.width)
+        slot = index % self.slots
+        bucket = self._buckets[slot]
+        if bucket is None or bucket[0] != index:
+            if bucket is not None and bucket[0] > index:
+                return False
+            bucket = [index, 0, 0, 0, 0.0, 0]
+            self._buckets[slot] = bucket
+        bucket[1] += tokens
+        bucket[2] += input_tokens
+        bucket[3] += output_tokens
+        bucket[4] += cost
+        bucket[5] += 1
+        return True
+
+    def get(self, epoch: float) -> Dict[str, Any]:
+        """Totals of the bucket containing ``epoch`` (zeros if empty or expired)"""
+        index = int(epoch // self.width)
+        bucket = self._buckets[index % self.slots]
+        if bucket is None or bucket[0] != index:
+            return {"tokens": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0, "events": 0}
+        return self._as_dict(bucket)
+
+    def buckets(self, now_epoch: float) -> List[Dict[str, Any]]:
+        """Live buckets within the window ending at ``now_epoch``, oldest first"""
+        newest = int(now_epoch // self.width)
+        live = [
+            bucket for bucket in self._buckets
+            if bucket is not None and newest - self.slots < bucket[0] <= newest
+        ]
+        live.sort(key=lambda bucket: bucket[0])
+        return [
+            {"start": _EPOCH + timedelta(seconds=bucket[0] * self.width), **self._as_dict(bucket)}
+            for bucket in live
+        ]
+
+    @staticmethod
+    def _as_dict(bucket: list) -> Dict[str, Any]:
+        return {
+            "tokens": bucket[1],
+            "input_tokens": bucket[2],
+            "output_tokens": bucket[3],
+            "cost": bucket[4],
+            "events": bucket[5],
+        }
+
+
+class UsageSeries:
+    """Lifetime totals plus minute/hour/day rollups for one session, user or model"""
+
+    __slots__ = (
+        "total_tokens", "input_tokens", "output_tokens", "total_cost", "event_count",
+        "first_event", "last_event", "last_epoch", "models_used", "providers_used", "rollups",
+    )
+
+    def __init__(self, retention: Dict[RollupGranularity, int]):
+        self.total_tokens = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.total_cost = 0.0
+        self.event_count = 0
+        self.first_event: Optional[datetime] = None
+        self.last_event: Optional[datetime] = None
+        self.last_epoch = 0.0
+        # Distinct models/providers per key are few; tuples avoid a set per key
+        self.models_used: tuple = ()
+        self.providers_used: tuple = ()
+        self.rollups = {
+            granularity: UsageRollup(_GRANULARITY_SECONDS[granularity], slots)
+            for granularity, slots in retention.items()
+        }
+
+    def add(self, event: "TokenUsageEvent", epoch: float) -> None:
+        self.total_tokens += event.total_tokens
+        self.input_tokens += event.input_tokens
+        self.output_tokens += event.output_tokens
+        self.total_cost += event.cost_estimate
+        self.event_count += 1
+        if self.first_event is None:
+            self.first_event = event.timestamp
+        self.last_event = event.timestamp
+        self.last_epoch = max(self.last_epoch, epoch)
+        if event.model not in self.models_used:
+            self.models_used += (event.model,)
+        if event.provider not in self.providers_used:
+            self.providers_used += (event.provider,)
+        for rollup in self.rollups.values():
+            rollup.add(epoch, event.total_tokens, event.input_tokens, event.output_tokens, event.cost_estimate)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_tokens": self.total_tokens,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_cost": self.total_cost,
+            "event_count": self.event_count,
+            "first_event": self.first_event,
+            "last_event": self.last_event,
+            "models_used": set(self.models_used),
+            "providers_used": set(self.providers_used),
+        }
+
+
+class TokenEventSink(ABC):
+    """Destination for raw token usage events spilled out of memory"""
+
+    @abstractmethod
+    def write(self, event: "TokenUsageEvent") -> None:
+        """Buffer or persist a single event"""
+
+    def flush(self) -> None:
+        """Persist any buffered events"""
+
+    def close(self) -> None:
+        """Flush and release resources"""
+        self.flush()
+
+
+_SINK_COLUMNS = (
+    "event_id", "timestamp", "session_id", "agent_id", "user_id", "request_id", "model",
+    "provider", "event_type", "input_tokens", "output_tokens", "total_tokens",
+    "context_size", "max_context_size", "cost_estimate", "processing_time_ms",
+)
+
+
+def _event_row(event: "TokenUsageEvent") -> tuple:
+    return (
+        event.event_id, event.timestamp.isoformat(), event.session_id, event.agent_id,
+        event.user_id, event.request_id, event.model, event.provider, event.event_type.value,
+        event.input_tokens, event.output_tokens, event.total_tokens, event.context_size,
+        event.max_context_size, event.cost_estimate, event.processing_time_ms,
+    )
+
+
+class SQLiteTokenEventSink(TokenEventSink):
+    """Append raw events to a local SQLite table in batches"""
+
+    def __init__(self, db_path: str, batch_size: int = 1000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._buffer: List[tuple] = []
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS token_usage_events ("
+            "event_id TEXT, timestamp TEXT, session_id TEXT, agent_id TEXT, user_id TEXT, "
+            "request_id TEXT, model TEXT, provider TEXT, event_type TEXT, input_tokens INTEGER, "
+            "output_tokens INTEGER, total_tokens INTEGER, context_size INTEGER, "
+            "max_context_size INTEGER, cost_estimate REAL, processing_time_ms REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_token_usage_events_time ON token_usage_events (timestamp)"
+        )
+        self._conn.commit()
+
+    def write(self, event: "TokenUsageEvent") -> None:
+        self._buffer.append(_event_row(event))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        placeholders = ", ".join("?" for _ in _SINK_COLUMNS)
+        self._conn.executemany(f"INSERT INTO token_usage_events VALUES ({placeholders})", self._buffer)
+        self._conn.commit()
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+
+class ParquetTokenEventSink(TokenEventSink):
+    """Write raw events to a Parquet file, one row group per batch (requires pyarrow)"""
+
+    def __init__(self, path: str, batch_size: int = 50_000):
+        self._pa = require_package("pyarrow", "Parquet token usage spill")
+        self._pq = require_package("pyarrow.parquet", "Parquet token usage spill")
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[tuple] = []
+        self._writer = None
+
+    def write(self, event: "TokenUsageEvent") -> None:
+        self._buffer.append(_event_row(event))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        columns = {name: list(values) for name, values in zip(_SINK_COLUMNS, zip(*self._buffer))}
+        table = self._pa.table(columns)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
 class TokenUsageAggregator:
     """Aggregates and analyzes token usage across sessions and time"""
-    
-    def __init__(self, metrics: Optional[IMetrics] = None):
+
+    DEFAULT_ROLLUP_SLOTS = {
+        RollupGranularity.MINUTE: 120,  # two hours of minutes
+        RollupGranularity.HOUR: 48,  # two days of hours
+    }
+
+    def __init__(
+        self,
+        metrics: Optional[IMetrics] = None,
+        retention_days: int = 30,
+        max_events: int = 10_000,
+        max_series: int = 100_000,
+        event_sink: Optional[TokenEventSink] = None,
+    ):
         """
         Initialize token usage aggregator.
         
         Args:
             metrics: Metrics system for recording aggregated data
+            retention_days: Days of daily buckets kept per key; keys idle for
+                longer are dropped
+            max_events: Raw events kept in memory for ad-hoc analytics
+            max_series: Most recently active keys tracked per dimension
+                (session, user, model)
+            event_sink: Optional sink that receives every raw event, e.g.
+                SQLiteTokenEventSink or ParquetTokenEventSink
         """
+        if retention_days < 1:
+            raise ValueError("retention_days must be at least 1")
         self.metrics = metrics
-        self._usage_events: List[TokenUsageEvent] = []
-        self._session_totals: Dict[str, Dict[str, Any]] = {}
-        self._user_totals: Dict[str, Dict[str, Any]] = {}
-        
-        # Cleanup old events periodically
-        self._last_cleanup = datetime.utcnow()
-        self._retention_days = 30
+        self.event_sink = event_sink
+        self.max_series = max_series
+        self._retention_days = retention_days
+        self._retention_seconds = retention_days * 86400
+        self._rollup_slots = {**self.DEFAULT_ROLLUP_SLOTS, RollupGranularity.DAY: retention_days}
+
+        self._usage_events: Deque[TokenUsageEvent] = deque(maxlen=max_events)
+        self._events_recorded = 0
+        # Ordered by last activity so idle keys expire from the front in O(1)
+        self._session_totals: "OrderedDict[str, UsageSeries]" = OrderedDict()
+        self._user_totals: "OrderedDict[str, UsageSeries]" = OrderedDict()
+        self._model_totals: "OrderedDict[str, UsageSeries]" = OrderedDict()
+        self._newest_epoch = 0.0
     
     async def record_usage(self, event: TokenUsageEvent) -> None:
         """Record a token usage event"""
         try:
-            # Store event
+            epoch = _epoch_seconds(event.timestamp)
+            if epoch > self._newest_epoch:
+                self._newest_epoch = epoch
+
             self._usage_events.append(event)
-            
-            # Update session totals
-            await self._update_session_totals(event)
-            
-            # Update user totals
+            self._events_recorded += 1
+            if self.event_sink:
+                self.event_sink.write(event)
+
+            self._update_series(self._session_totals, event.session_id, event, epoch)
             if event.user_id:
-                await self._update_user_totals(event)
+                self._update_series(self._user_totals, event.user_id, event, epoch)
+            self._update_series(self._model_totals, event.model, event, epoch)
             
             # Record metrics
             if self.metrics:
                 await self._record_metrics(event)
             
-            # Periodic cleanup
-            await self._periodic_cleanup()
-            
         except Exception as e:
             logger.error(f"Error recording token usage: {e}")
     
-    async def _update_session_totals(self, event: TokenUsageEvent) -> None:
-        """Update session-level totals"""
-        if event.session_id not in self._session_totals:
-            self._session_totals[event.session_id] = {
-                "total_tokens": 0,
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "total_cost": 0.0,
-                "event_count": 0,
-                "first_event": event.timestamp,
-                "last_event": event.timestamp,
-                "models_used": set(),
-                "providers_used": set()
-            }
-        
-        totals = self._session_totals[event.session_id]
-        totals["total_tokens"] += event.total_tokens
-        totals["input_tokens"] += event.input_tokens
-        totals["output_tokens"] += event.output_tokens
-        totals["total_cost"] += event.cost_estimate
-        totals["event_count"] += 1
-        totals["last_event"] = event.timestamp
-        totals["models_used"].add(event.model)
-        totals["providers_used"].add(event.provider)
-    
-    async def _update_user_totals(self, event: TokenUsageEvent) -> None:
-        """Update user-level totals"""
-        if event.user_id not in self._user_totals:
-            self._user_totals[event.user_id] = {
-                "total_tokens": 0,
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "total_cost": 0.0,
-                "session_count": 0,
-                "event_count": 0,
-                "first_event": event.timestamp,
-                "last_event": event.timestamp,
-                "daily_usage": {},
-                "models_used": set(),
-                "providers_used": set()
-            }
-        
-        totals = self._user_totals[event.user_id]
-        totals["total_tokens"] += event.total_tokens
-        totals["input_tokens"] += event.input_tokens
-        totals["output_tokens"] += event.output_tokens
-        totals["total_cost"] += event.cost_estimate
-        totals["event_count"] += 1
-        totals["last_event"] = event.timestamp
-        totals["models_used"].add(event.model)
-        totals["providers_used"].add(event.provider)
-        
-        # Daily usage tracking
-        day_key = event.timestamp.strftime("%Y-%m-%d")
-        if day_key not in totals["daily_usage"]:
-            totals["daily_usage"][day_key] = {
-                "tokens": 0,
-                "cost": 0.0,
-                "events": 0
-            }
-        
-        daily = totals["daily_usage"][day_key]
-        daily["tokens"] += event.total_tokens
-        daily["cost"] += event.cost_estimate
-        daily["events"] += 1
+    def _update_series(
+        self,
+        series_by_key: "OrderedDict[str, UsageSeries]",
+        key: str,
+        event: TokenUsageEvent,
+        epoch: float
+    ) -> None:
+        """Fold an event into one dimension's series and expire idle keys"""
+        series = series_by_key.get(key)
+        if series is None:
+            series = series_by_key[key] = UsageSeries(self._rollup_slots)
+        else:
+            series_by_key.move_to_end(key)
+        series.add(event, epoch)
+
+        cutoff = self._newest_epoch - self._retention_seconds
+        while series_by_key:
+            oldest = next(iter(series_by_key.values()))
+            if oldest.last_epoch >= cutoff and len(series_by_key) <= self.max_series:
+                break
+            series_by_key.popitem(last=False)
     
     async def _record_metrics(self, event: TokenUsageEvent) -> None:
         """Record metrics for the token usage event"""
@@ -292,21 +529,57 @@ class TokenUsageAggregator:
             self.metrics.set_gauge("context.utilization", event.context_utilization, **tags)
             self.metrics.set_gauge("context.size", event.context_size, **tags)
     
-    async def _periodic_cleanup(self) -> None:
-        """Clean up old events periodically"""
-        now = datetime.utcnow()
-        if (now - self._last_cleanup).days >= 1:  # Daily cleanup
-            cutoff = now - timedelta(days=self._retention_days)
-            self._usage_events = [e for e in self._usage_events if e.timestamp > cutoff]
-            self._last_cleanup = now
-    
     async def get_session_usage(self, session_id: str) -> Dict[str, Any]:
         """Get usage totals for a session"""
-        return self._session_totals.get(session_id, {})
+        series = self._session_totals.get(session_id)
+        return series.to_dict() if series else {}
     
     async def get_user_usage(self, user_id: str) -> Dict[str, Any]:
         """Get usage totals for a user"""
-        return self._user_totals.get(user_id, {})
+        series = self._user_totals.get(user_id)
+        if not series:
+            return {}
+
+        usage = series.to_dict()
+        usage["session_count"] = 0
+        usage["daily_usage"] = {
+            bucket["start"].strftime("%Y-%m-%d"): {
+                "tokens": bucket["tokens"], "cost": bucket["cost"], "events": bucket["events"]
+            }
+            for bucket in series.rollups[RollupGranularity.DAY].buckets(self._newest_epoch)
+        }
+        return usage
+
+    def get_rollup(
+        self,
+        dimension: str,
+        key: str,
+        granularity: RollupGranularity = RollupGranularity.HOUR
+    ) -> List[Dict[str, Any]]:
+        """
+        Get windowed usage buckets for a key, oldest first.
+
+        Args:
+            dimension: "session", "user" or "model"
+            key: Session ID, user ID or model name
+            granularity: Bucket width (minute, hour or day)
+        """
+        series_by_dimension = {
+            "session": self._session_totals,
+            "user": self._user_totals,
+            "model": self._model_totals,
+        }
+        if dimension not in series_by_dimension:
+            raise ValueError(f"Unknown rollup dimension: {dimension}")
+        series = series_by_dimension[dimension].get(key)
+        if not series:
+            return []
+        return series.rollups[granularity].buckets(self._newest_epoch)
+
+    def close(self) -> None:
+        """Flush and close the raw event sink, if any"""
+        if self.event_sink:
+            self.event_sink.close()
     
     async def get_usage_analytics(
         self,
@@ -315,45 +588,75 @@ class TokenUsageAggregator:
         time_range: Optional[tuple] = None,
         group_by: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get comprehensive usage analytics"""
-        
-        # Filter events
-        filtered_events = self._usage_events
-        
-        if user_id:
-            filtered_events = [e for e in filtered_events if e.user_id == user_id]
-        
-        if session_id:
-            filtered_events = [e for e in filtered_events if e.session_id == session_id]
+        """
+        Get comprehensive usage analytics.
         
+        Lifetime queries for one user, one session or all usage are answered
+        from the per-key series and count every event recorded. Time ranges,
+        user+session filters, per-provider grouping and per-model grouping of a
+        single user or session need raw events, so they only see the last
+        ``max_events``; ``truncated`` is True when such a figure is missing
+        events that have rolled off, and ``oldest_event`` is the earliest
+        raw event still held.
+        """
+        start_time = end_time = None
         if time_range:
             start_time, end_time = time_range
             if isinstance(start_time, str):
                 start_time = datetime.fromisoformat(start_time)
             if isinstance(end_time, str):
                 end_time = datetime.fromisoformat(end_time)
-            
-            filtered_events = [
-                e for e in filtered_events
-                if start_time <= e.timestamp <= end_time
-            ]
         
-        if not filtered_events:
-            return {}
+        series = None
+        if time_range is None and not (user_id and session_id):
+            if user_id:
+                series = {user_id: self._user_totals[user_id]} if user_id in self._user_totals else {}
+            elif session_id:
+                series = {session_id: self._session_totals[session_id]} if session_id in self._session_totals else {}
+            else:
+                series = self._model_totals
+        
+        from_series_only = series is not None and (
+            group_by in (None, "day") or (group_by == "model" and not (user_id or session_id))
+        )
+        events = [] if from_series_only else self._window_events(user_id, session_id, start_time, end_time)
         
-        # Calculate analytics
-        total_tokens = sum(e.total_tokens for e in filtered_events)
-        total_cost = sum(e.cost_estimate for e in filtered_events)
-        total_events = len(filtered_events)
+        if series is not None:
+            if not series:
+                return {}
+            total_tokens = sum(s.total_tokens for s in series.values())
+            total_cost = sum(s.total_cost for s in series.values())
+            total_events = sum(s.event_count for s in series.values())
+            first_event = min(s.first_event for s in series.values())
+            last_event = max(s.last_event for s in series.values())
+            models_used = {m for s in series.values() for m in s.models_used}
+            providers_used = {p for s in series.values() for p in s.providers_used}
+        else:
+            if not events:
+                return {}
+            total_tokens = sum(e.total_tokens for e in events)
+            total_cost = sum(e.cost_estimate for e in events)
+            total_events = len(events)
+            first_event = min(e.timestamp for e in events)
+            last_event = max(e.timestamp for e in events)
+            models_used = {e.model for e in events}
+            providers_used = {e.provider for e in events}
         
         # Group by analysis
         grouped_data = {}
         if group_by == "model":
-            grouped_data = self._group_by_model(filtered_events)
+            grouped_data = self._series_by_model() if from_series_only else self._group_by_model(events)
         elif group_by == "provider":
-            grouped_data = self._group_by_provider(filtered_events)
+            grouped_data = self._group_by_provider(events)
         elif group_by == "day":
-            grouped_data = self._group_by_day(filtered_events)
+            grouped_data = self._series_by_day(series.values()) if series is not None else self._group_by_day(events)
+        
+        oldest_event = self._usage_events[0].timestamp if self._usage_events else None
+        rolled_off = self._events_recorded > len(self._usage_events)
+        truncated = (
+            not from_series_only and rolled_off
+            and (start_time is None or oldest_event is None or start_time < oldest_event)
+        )
         
         return {
             "total_tokens": total_tokens,
@@ -363,14 +666,51 @@ class TokenUsageAggregator:
             "avg_cost_per_event": total_cost / total_events if total_events > 0 else 0,
             "cost_per_token": total_cost / total_tokens if total_tokens > 0 else 0,
             "time_range": {
-                "start": min(e.timestamp for e in filtered_events),
-                "end": max(e.timestamp for e in filtered_events)
+                "start": first_event,
+                "end": last_event
             },
-            "models_used": list(set(e.model for e in filtered_events)),
-            "providers_used": list(set(e.provider for e in filtered_events)),
-            "grouped_data": grouped_data
+            "models_used": list(models_used),
+            "providers_used": list(providers_used),
+            "grouped_data": grouped_data,
+            "truncated": truncated,
+            "oldest_event": oldest_event
+        }
+    
+    def _window_events(
+        self,
+        user_id: Optional[str],
+        session_id: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime]
+    ) -> List[TokenUsageEvent]:
+        """Raw events still held in memory that match the filters"""
+        return [
+            e for e in self._usage_events
+            if (not user_id or e.user_id == user_id)
+            and (not session_id or e.session_id == session_id)
+            and (start_time is None or start_time <= e.timestamp <= end_time)
+        ]
+    
+    def _series_by_model(self) -> Dict[str, Any]:
+        """Lifetime per-model totals from the model series"""
+        return {
+            model: {"tokens": s.total_tokens, "cost": s.total_cost, "events": s.event_count}
+            for model, s in self._model_totals.items()
         }
     
+    def _series_by_day(self, series: Iterable[UsageSeries]) -> Dict[str, Any]:
+        """Per-day totals from the daily rollups (the last ``retention_days``)"""
+        daily_data = {}
+        for s in series:
+            for bucket in s.rollups[RollupGranularity.DAY].buckets(self._newest_epoch):
+                day = daily_data.setdefault(
+                    bucket["start"].strftime("%Y-%m-%d"), {"tokens": 0, "cost": 0.0, "events": 0}
+                )
+                day["tokens"] += bucket["tokens"]
+                day["cost"] += bucket["cost"]
+                day["events"] += bucket["events"]
+        return dict(sorted(daily_data.items()))
+    
     def _group_by_model(self, events: List[TokenUsageEvent]) -> Dict[str, Any]:
         """Group analytics by model"""
         model_data = {}
@@ -424,33 +764,147 @@ class TokenUsageAggregator:
         return daily_data
 
 
+class Tokenizer(ABC):
+    """Counts the tokens a model would see for a piece of text"""
+    
+    name: str = "tokenizer"
+    
+    @abstractmethod
+    def count_tokens(self, text: str) -> int:
+        """Number of tokens in text"""
+        pass
+
+
+class HeuristicTokenizer(Tokenizer):
+    """Approximates tokens as one per 4 characters; used when no BPE tokenizer is installed"""
+    
+    name = "heuristic"
+    
+    def __init__(self, chars_per_token: float = 4.0):
+        self.chars_per_token = chars_per_token
+    
+    def count_tokens(self, text: str) -> int:
+        return int(len(text) / self.chars_per_token)
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Exact BPE token counts from tiktoken, using the model's encoding when tiktoken knows it"""
+    
+    def __init__(self, model: Optional[str] = None, encoding_name: str = "cl100k_base"):
+        tiktoken = require_package("tiktoken", "BPE token counting")
+        try:
+            self._encoding = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(encoding_name)
+        except KeyError:
+            self._encoding = tiktoken.get_encoding(encoding_name)
+        self.name = f"tiktoken:{self._encoding.name}"
+    
+    def count_tokens(self, text: str) -> int:
+        # Special-token text in user content is counted as plain text, not rejected
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+def default_tokenizer(model: Optional[str] = None) -> Tokenizer:
+    """tiktoken for ``model`` when it is installed and its encoding loads, otherwise the heuristic"""
+    try:
+        return TiktokenTokenizer(model)
+    except Exception as e:
+        logger.debug(f"Falling back to heuristic token counting: {e}")
+        return HeuristicTokenizer()
+
+
 class ContextSizeMonitor:
-    """Monitor conversation context sizes and provide optimization recommendations"""
-    
-    def __init__(self):
-        """Initialize context size monitor"""
-        # Model context limits (tokens)
-        self._model_limits = {
-            # OpenAI models
-            "gpt-4o": 128000,
-            "gpt-4o-mini": 128000,
-            "gpt-4": 8192,
-            "gpt-4-turbo": 128000,
-            "gpt-4-vision-preview": 128000,
-            "gpt-3.5-turbo": 4096,
-            "gpt-3.5-turbo-16k": 16384,
-            "o1-preview": 128000,
-            "o1-mini": 128000,
-            
-            # Anthropic models
-            "claude-3-opus": 200000,
-            "claude-3-sonnet": 200000,
-            "claude-3-haiku": 200000,
-            "claude-3-5-sonnet": 200000,
-            
-            # Default
-            "default": 4096
-        }
+    """
+    Monitor conversation context sizes and provide optimization recommendations.
+    
+    Message token counts are cached by message ID, so each call only
+    tokenizes messages it has not seen before; messages are assumed not to
+    change after they are created (a changed content length is recounted).
+    """
+    
+    # Model context limits (tokens)
+    DEFAULT_MODEL_LIMITS = {
+        # OpenAI models
+        "gpt-4o": 128000,
+        "gpt-4o-mini": 128000,
+        "gpt-4": 8192,
+        "gpt-4-turbo": 128000,
+        "gpt-4-vision-preview": 128000,
+        "gpt-3.5-turbo": 4096,
+        "gpt-3.5-turbo-16k": 16384,
+        "o1-preview": 128000,
+        "o1-mini": 128000,
+        
+        # Anthropic models
+        "claude-3-opus": 200000,
+        "claude-3-sonnet": 200000,
+        "claude-3-haiku": 200000,
+        "claude-3-5-sonnet": 200000,
+        
+        # Default
+        "default": 4096
+    }
+    
+    def __init__(
+        self,
+        tokenizer: Optional[Tokenizer] = None,
+        model_limits: Optional[Dict[str, int]] = None,
+        message_overhead: int = 4,
+        max_cached_messages: int = 100_000
+    ):
+        """
+        Initialize context size monitor
+        
+        Args:
+            tokenizer: Tokenizer for every model (default: tiktoken per model, else heuristic)
+            model_limits: Context limits by model name, merged over the defaults
+            message_overhead: Tokens added per message for role and framing
+            max_cached_messages: Per-message token counts kept (least recently used evicted)
+        """
+        self._tokenizer = tokenizer
+        self._tokenizers: Dict[str, Tokenizer] = {}
+        self._model_limits = {**self.DEFAULT_MODEL_LIMITS, **(model_limits or {})}
+        self._resolved_limits: Dict[str, int] = {}
+        self.message_overhead = message_overhead
+        self.max_cached_messages = max_cached_messages
+        # (tokenizer name, message id) -> (content length, token count)
+        self._token_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    @classmethod
+    def from_config(cls, config: Any, **kwargs) -> "ContextSizeMonitor":
+        """
+        Build a monitor whose model limits come from a TokenTrackingConfig.
+        
+        The config's ``model_context_limits`` are keyed by provider and then
+        model; its top-level ``default`` becomes the fallback limit.
+        """
+        limits: Dict[str, int] = {}
+        for provider, models in config.to_dict().get("context_limits", {}).items():
+            if isinstance(models, dict):
+                limits.update(models)
+            else:
+                limits[provider] = models
+        return cls(model_limits=limits, **kwargs)
+    
+    def get_model_limit(self, model: str) -> int:
+        """Context limit for a model, matching dated variants (gpt-4o-2024-08-06) by longest prefix"""
+        limit = self._resolved_limits.get(model)
+        if limit is None:
+            limit = self._model_limits.get(model)
+            if limit is None:
+                prefixes = [name for name in self._model_limits if model.startswith(name)]
+                limit = self._model_limits[max(prefixes, key=len)] if prefixes else self._model_limits["default"]
+            self._resolved_limits[model] = limit
+        return limit
+    
+    def get_tokenizer(self, model: str) -> Tokenizer:
+        if self._tokenizer is not None:
+            return self._tokenizer
+        tokenizer = self._tokenizers.get(model)
+        if tokenizer is None:
+            tokenizer = self._tokenizers[model] = default_tokenizer(model)
+        return tokenizer
     
     async def calculate_context_info(
         self,
@@ -471,11 +925,11 @@ class ContextSizeMonitor:
             messages = await session.get_context()
             
             # Calculate current context size
-            current_size = await self._calculate_message_tokens(messages)
+            current_size = await self._calculate_message_tokens(messages, model)
             current_size += additional_tokens
             
             # Get model limit
-            max_size = self._model_limits.get(model, self._model_limits["default"])
+            max_size = self.get_model_limit(model)
             
             # Calculate utilization
             utilization_percent = (current_size / max_size) * 100 if max_size > 0 else 0
@@ -501,30 +955,49 @@ class ContextSizeMonitor:
             # Return safe defaults
             return ContextSizeInfo(
                 current_size=0,
-                max_size=self._model_limits.get(model, 4096),
+                max_size=self.get_model_limit(model),
                 utilization_percent=0.0,
                 messages_count=0
             )
     
-    async def _calculate_message_tokens(self, messages: List[Any]) -> int:
-        """
-        Calculate approximate token count for messages.
-        
-        This is a simplified calculation. For production use, you might want
-        to use model-specific tokenizers for accuracy.
-        """
+    async def _calculate_message_tokens(self, messages: List[Any], model: str = "default") -> int:
+        """Token count of messages, including per-message overhead"""
+        tokenizer = self.get_tokenizer(model)
         total_tokens = 0
-        
         for message in messages:
-            # Simple approximation: 1 token ~= 4 characters
-            content = getattr(message, 'content', str(message))
-            total_tokens += len(content) // 4
-            
-            # Add overhead for message structure
-            total_tokens += 10  # Message overhead
-        
+            total_tokens += self._message_tokens(message, tokenizer) + self.message_overhead
         return total_tokens
     
+    def _message_tokens(self, message: Any, tokenizer: Tokenizer) -> int:
+        content = getattr(message, 'content', None)
+        if content is None:
+            content = str(message)
+        tool_calls = getattr(message, 'tool_calls', None)
+        message_id = getattr(message, 'message_id', None)
+        if message_id is None:
+            return self._count(content, tool_calls, tokenizer)
+        
+        key = (tokenizer.name, message_id)
+        cached = self._token_cache.get(key)
+        if cached is not None and cached[0] == len(content):
+            self._token_cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached[1]
+        
+        self.cache_misses += 1
+        tokens = self._count(content, tool_calls, tokenizer)
+        self._token_cache[key] = (len(content), tokens)
+        if len(self._token_cache) > self.max_cached_messages:
+            self._token_cache.popitem(last=False)
+        return tokens
+    
+    @staticmethod
+    def _count(content: str, tool_calls: Optional[List[Dict[str, Any]]], tokenizer: Tokenizer) -> int:
+        tokens = tokenizer.count_tokens(content)
+        if tool_calls:
+            tokens += tokenizer.count_tokens(json.dumps(tool_calls, default=str))
+        return tokens
+    
     async def _get_compression_strategy(
         self,
         context_info: ContextSizeInfo,
@@ -83,6 +83,14 @@ from .retrospect import RetrospectRunner
 
 from .replay import ReplayManager
 
+# Execution history
+from .history import (
+    ExecutionHistoryStore,
+    RingBufferHistoryStore,
+    SQLiteHistoryStore,
+    create_history_store,
+)
+
 __all__ = [
     # Core data models
     "TaskBrief",
@@ -120,6 +128,12 @@ __all__ = [
     "compute_artifact_hash",
     "create_artifact_id",
     
+    # Execution history
+    "ExecutionHistoryStore",
+    "RingBufferHistoryStore",
+    "SQLiteHistoryStore",
+    "create_history_store",
+    
     # Configuration
     "DEFAULT_POLICIES",
     "PolicyConfig",
@@ -5,11 +5,13 @@ Orchestrates the complete control loop:
 brainstorm → verify → plan → execute → sense → act/replan
 """
 
+import asyncio
 import logging
 import uuid
 import time
+from collections import defaultdict, deque
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
 
 from .models import (
     TaskBrief, Plan, RunState, ActionContract, Observation,
@@ -24,6 +26,7 @@ from .patcher import PlanPatcher
 from .escalation import EscalationRouter
 from .contracts import ContractValidator
 from .policies import PolicyConfig, DEFAULT_POLICIES
+from .history import create_history_store
 from .lineage import LineageGraph, compute_artifact_hash, create_artifact_id
 from .retrospect import RetrospectRunner
 from .replay import ReplayManager
@@ -31,6 +34,51 @@ from .replay import ReplayManager
 logger = logging.getLogger(__name__)
 
 
+class _ReadySet:
+    """
+    Steps of one plan version whose dependencies have all completed.
+    
+    Keeps a count of unfinished dependencies per step, so completing a step
+    only touches its direct dependents instead of rescanning the plan.
+    """
+    
+    def __init__(
+        self,
+        plan: Plan,
+        order: List[ActionContract],
+        done: Set[str],
+        running: Set[str]
+    ):
+        self._plan = plan
+        self._dependents: Dict[str, List[str]] = defaultdict(list)
+        self._waiting: Dict[str, int] = {}
+        self._ready: deque = deque()
+        
+        pending = {step.id for step in order if step.id not in done}
+        for step in order:
+            if step.id not in pending:
+                continue
+            deps = [dep for dep in plan.get_dependencies(step.id) if dep in pending]
+            self._waiting[step.id] = len(deps)
+            for dep in deps:
+                self._dependents[dep].append(step.id)
+            if not deps and step.id not in running:
+                self._ready.append(step)
+    
+    def pop(self) -> Optional[ActionContract]:
+        return self._ready.popleft() if self._ready else None
+    
+    def requeue(self, step: ActionContract) -> None:
+        """Make a step that has to run again ready immediately"""
+        self._ready.append(step)
+    
+    def complete(self, step_id: str) -> None:
+        for dependent in self._dependents.pop(step_id, []):
+            self._waiting[dependent] -= 1
+            if self._waiting[dependent] == 0:
+                self._ready.append(self._plan.get_step(dependent))
+
+
 class Coordinator:
     """
     Main coordinator orchestrating the entire hierarchical planning system.
@@ -57,8 +105,14 @@ class Coordinator:
                 - llm: LLM provider for planning
                 - agents: Agent registry
                 - tools: Tool registry
-                - policies: PolicyConfig or dict
+                - policies: PolicyConfig or dict (limits.max_concurrent_steps
+                  caps how many independent steps run at once)
                 - escalation: Escalation config
+                - lineage_db_path: Optional SQLite file that persists artifact lineage
+                - history_store: Optional ExecutionHistoryStore for run records
+                - history_db_path: Optional SQLite file for run records (used when
+                  no history_store is given; default is an in-memory ring buffer)
+                - history_max_entries: Runs retained in history (default 10000)
         """
         # Initialize components
         self.planner = Planner(
@@ -69,7 +123,8 @@ class Coordinator:
         
         self.executor = Executor(
             agent_registry=config.get("agents"),
-            tool_registry=config.get("tools")
+            tool_registry=config.get("tools"),
+            history_max_entries=config.get("history_max_entries", 10_000)
         )
         
         policies = config.get("policies", DEFAULT_POLICIES)
@@ -86,13 +141,21 @@ class Coordinator:
         )
         
         # Retrospective validation components
-        self.lineage = LineageGraph()
+        self.lineage = LineageGraph(db_path=config.get("lineage_db_path"))
         self.retrospect_runner = RetrospectRunner(self.verifier)
         self.replay_manager = ReplayManager(self.lineage, self.patcher)
         
         self.policies = policies
-        self.execution_history = []
+        self.execution_history = create_history_store(
+            store=config.get("history_store"),
+            db_path=config.get("history_db_path"),
+            max_entries=config.get("history_max_entries", 10_000)
+        )
         self.enable_retrospects = config.get("enable_retrospects", True)
+        self.max_concurrent_steps = max(1, int(policies.limits.get("max_concurrent_steps", 1)))
+        
+        # (plan_id, version) -> topological order
+        self._order_cache: Dict[Tuple[str, int], List[ActionContract]] = {}
     
     async def execute_task(self, task_brief: TaskBrief) -> RunState:
         """
@@ -143,88 +206,101 @@ class Coordinator:
         state = self._init_state(run_id, task_brief, plan)
         
         # Phase 4-7: Execution loop
+        # Independent steps run concurrently (up to max_concurrent_steps); each
+        # completed step is observed, checkpointed and decided on in turn.
         logger.info("Phase 4-7: Executing plan with adaptive control...")
         replan_count = 0
         max_replans = self.policies.limits["max_replans"]
-        
-        while state.cursor < len(plan.steps) and state.status == "running":
-            # Check for halt
-            if self.escalation.is_halted(plan.plan_id):
-                logger.warning(f"Execution halted for plan {plan.plan_id}")
-                state.status = "halted"
-                break
-            
-            # Check execution time limit
-            elapsed = (datetime.now(timezone.utc) - state.created_at).total_seconds()
-            if elapsed > self.policies.limits["max_execution_time_sec"]:
-                logger.error("Execution time limit exceeded")
-                state.status = "timeout"
-                break
-            
-            # Get next step in topological order
-            ordered_steps = plan.get_topological_order()
-            if state.cursor >= len(ordered_steps):
-                break
-            
-            step = ordered_steps[state.cursor]
-            logger.info(f"Executing step {state.cursor + 1}/{len(ordered_steps)}: {step.id}")
-            
-            # Check preconditions
-            preconditions_met, failed_preconditions = self.validator.validate_preconditions(step, state)
-            if not preconditions_met:
-                logger.warning(f"Preconditions not met: {failed_preconditions}")
-                decision = Decision(
-                    action=DecisionAction.REPLAN,
-                    reason=f"preconditions_not_met: {', '.join(failed_preconditions)}"
-                )
-            else:
-                # Execute step
-                observation = await self.executor.execute_step(step, state)
+        max_execution_time = self.policies.limits["max_execution_time_sec"]
+        
+        completed: Set[str] = set()
+        ready = _ReadySet(plan, self._topological_order(plan), completed, set())
+        in_flight: Dict[asyncio.Task, ActionContract] = {}
+        
+        try:
+            while state.status == "running":
+                # Check for halt
+                if self.escalation.is_halted(plan.plan_id):
+                    logger.warning(f"Execution halted for plan {plan.plan_id}")
+                    state.status = "halted"
+                    break
                 
-                # Update state with observation
-                state.update_from_observation(observation)
+                # Check execution time limit
+                elapsed = (datetime.now(timezone.utc) - state.created_at).total_seconds()
+                if elapsed > max_execution_time:
+                    logger.error("Execution time limit exceeded")
+                    state.status = "timeout"
+                    break
                 
-                # Emit checkpoint for retrospective validation
-                if self.enable_retrospects:
-                    checkpoint = self._emit_checkpoint(step, observation, state)
-                    
-                    # Schedule retrospects if configured
-                    if step.retrospects:
-                        await self._schedule_retrospects(step, checkpoint)
+                # Dispatch every ready step the concurrency limit allows
+                while len(in_flight) < self.max_concurrent_steps:
+                    step = ready.pop()
+                    if step is None:
+                        break
+                    logger.info(f"Executing step {step.id} ({len(in_flight) + 1} in flight)")
+                    in_flight[asyncio.ensure_future(self._run_step(step, state))] = step
                 
-                # Verify (optional step-level validators)
-                if step.validators:
-                    validator_results = self.validator.check_validators(step, observation)
-                    state.test_results[step.id] = validator_results
+                if not in_flight:
+                    break
                 
-                # Decide next action
-                decision = self.controller.decide(step, observation, state, plan)
-            
-            # Handle decision
-            handled = await self._handle_decision(
-                decision, step, state, plan, version, replan_count, max_replans
-            )
-            
-            if not handled:
-                # Decision handling failed, abort
-                state.status = "failed"
-                break
-            
-            # Check if plan was patched
-            if decision.action == DecisionAction.REPLAN:
-                # Plan was patched, reload it
-                if decision.patch:
-                    plan = self.patcher.apply_patch(plan, decision.patch)
-                    version += 1
-                    replan_count += 1
-                    state.plan = plan
-                    # Reset cursor to appropriate point
-                    state.cursor = self._find_resume_point(plan, state)
-                    continue
-            
-            # Move to next step
-            if decision.action == DecisionAction.CONTINUE:
-                state.cursor += 1
+                finished, _ = await asyncio.wait(
+                    in_flight,
+                    timeout=max(0.0, max_execution_time - elapsed),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                # Handle completions in dispatch order
+                for task in [t for t in in_flight if t in finished]:
+                    step = in_flight.pop(task)
+                    if state.status != "running":
+                        break
+                    if plan.get_step(step.id) is None:
+                        logger.info(f"Discarding result of step '{step.id}' removed by replan")
+                        continue
+                    
+                    observation, failed_preconditions = task.result()
+                    decision = await self._observe_step(
+                        step, observation, failed_preconditions, state, plan
+                    )
+                    
+                    # Handle decision
+                    handled = await self._handle_decision(
+                        decision, step, state, plan, version, replan_count, max_replans
+                    )
+                    
+                    if not handled:
+                        # Decision handling failed, abort
+                        state.status = "failed"
+                        break
+                    
+                    if decision.action == DecisionAction.REPLAN and decision.patch:
+                        # Plan was patched, reload it
+                        plan = self.patcher.apply_patch(plan, decision.patch)
+                        version += 1
+                        replan_count += 1
+                        state.plan = plan
+                        # Resume from the first step without artifacts
+                        state.cursor = self._find_resume_point(plan, state)
+                        completed = {
+                            s.id for s in self._topological_order(plan) if s.id in state.artifacts
+                        } - {s.id for s in in_flight.values()}
+                        ready = _ReadySet(
+                            plan, self._topological_order(plan), completed,
+                            {s.id for s in in_flight.values()}
+                        )
+                    elif decision.action == DecisionAction.CONTINUE:
+                        # Move on to the steps this one unblocks
+                        completed.add(step.id)
+                        ready.complete(step.id)
+                        state.cursor = len(completed)
+                    else:
+                        # Retry, alternate, escalation or replan without a patch re-run the step
+                        ready.requeue(step)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
         
         # Final status
         if state.status == "running":
@@ -233,7 +309,7 @@ class Coordinator:
         logger.info(f"Task execution completed with status: {state.status}")
         
         # Record in history
-        self.execution_history.append({
+        self.execution_history.record({
             "run_id": run_id,
             "plan_id": plan.plan_id,
             "final_version": version,
@@ -246,6 +322,52 @@ class Coordinator:
         
         return state
     
+    async def _run_step(
+        self,
+        step: ActionContract,
+        state: RunState
+    ) -> Tuple[Optional[Observation], List[str]]:
+        """Check preconditions and execute a step; returns (observation, failed_preconditions)"""
+        preconditions_met, failed_preconditions = self.validator.validate_preconditions(step, state)
+        if not preconditions_met:
+            return None, failed_preconditions
+        return await self.executor.execute_step(step, state), []
+    
+    async def _observe_step(
+        self,
+        step: ActionContract,
+        observation: Optional[Observation],
+        failed_preconditions: List[str],
+        state: RunState,
+        plan: Plan
+    ) -> Decision:
+        """Record a finished step in the run state and decide what to do next"""
+        if observation is None:
+            logger.warning(f"Preconditions not met: {failed_preconditions}")
+            return Decision(
+                action=DecisionAction.REPLAN,
+                reason=f"preconditions_not_met: {', '.join(failed_preconditions)}"
+            )
+        
+        # Update state with observation
+        state.update_from_observation(observation)
+        
+        # Emit checkpoint for retrospective validation
+        if self.enable_retrospects:
+            checkpoint = self._emit_checkpoint(step, observation, state)
+            
+            # Schedule retrospects if configured
+            if step.retrospects:
+                await self._schedule_retrospects(step, checkpoint)
+        
+        # Verify (optional step-level validators)
+        if step.validators:
+            validator_results = self.validator.check_validators(step, observation)
+            state.test_results[step.id] = validator_results
+        
+        # Decide next action
+        return self.controller.decide(step, observation, state, plan)
+    
     async def _handle_decision(
         self,
         decision: Decision,
@@ -387,10 +509,20 @@ class Coordinator:
             status=status
         )
     
+    def _topological_order(self, plan: Plan) -> List[ActionContract]:
+        """Topological order of a plan, computed once per plan version"""
+        key = (plan.plan_id, plan.version)
+        order = self._order_cache.get(key)
+        if order is None:
+            if len(self._order_cache) >= 64:
+                self._order_cache.clear()
+            order = self._order_cache[key] = plan.get_topological_order()
+        return order
+    
     def _find_resume_point(self, plan: Plan, state: RunState) -> int:
         """Find appropriate cursor position after replan"""
         # Resume from first uncompleted step
-        for i, step in enumerate(plan.get_topological_order()):
+        for i, step in enumerate(self._topological_order(plan)):
             if step.id not in state.artifacts:
                 return i
         return len(plan.steps)
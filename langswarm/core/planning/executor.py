@@ -8,11 +8,12 @@ standardized Observations with metrics.
 import logging
 import time
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from .models import ActionContract, Observation, RunState, ObservationStatus
+from .history import ExecutionHistoryStore, create_history_store
 from ..agents.registry import get_agent_registry
-from ..tools.registry import ToolRegistry
+from ...tools.registry import ToolRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -28,17 +29,29 @@ class Executor:
     - Existing error handling
     """
     
-    def __init__(self, agent_registry=None, tool_registry=None):
+    def __init__(
+        self,
+        agent_registry=None,
+        tool_registry=None,
+        history_store: Optional[ExecutionHistoryStore] = None,
+        history_max_entries: int = 10_000
+    ):
         """
         Initialize executor with registries.
         
         Args:
             agent_registry: LangSwarm agent registry (uses global if None)
             tool_registry: LangSwarm tool registry (creates if None)
+            history_store: Store for step records (bounded ring buffer if None)
+            history_max_entries: Step records retained by the default store
         """
         self.agents = agent_registry or get_agent_registry()
         self.tools = tool_registry or ToolRegistry()
-        self.execution_history = []
+        self.execution_history = create_history_store(
+            store=history_store,
+            max_entries=history_max_entries,
+            success_statuses=(ObservationStatus.OK.value,)
+        )
     
     async def execute_step(
         self, 
@@ -120,7 +133,9 @@ class Executor:
             )
             
             # Track execution
-            self.execution_history.append({
+            self.execution_history.record({
+                "run_id": state.run_id,
+                "plan_id": state.plan.plan_id,
                 "step_id": step.id,
                 "trace_id": trace_id,
                 "status": status.value,
@@ -0,0 +1,372 @@
+"""
+Execution History Stores for the Hierarchical Planning System
+
+Bounded, queryable records of past runs (Coordinator) and step executions
+(Executor). Entries are plain dicts carrying at least ``run_id``,
+``plan_id`` and ``status``; stores index them by those fields and by the
+time they were recorded, and keep aggregates up to date as entries are
+added or evicted.
+
+Implementations:
+- RingBufferHistoryStore: in-memory, keeps the most recent N entries (default)
+- SQLiteHistoryStore: local SQLite file with optional retention limit
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionHistoryStore(ABC):
+    """
+    Interface for execution history storage.
+
+    ``success_statuses`` decides which statuses count towards success_rate;
+    runs finish as "completed", executor steps as "ok".
+    """
+
+    def __init__(self, success_statuses: Iterable[str] = ("completed",)):
+        self.success_statuses = frozenset(success_statuses)
+
+    @abstractmethod
+    def record(self, entry: Dict[str, Any]) -> None:
+        """Store an entry; ``recorded_at`` (epoch seconds) is added if missing"""
+
+    @abstractmethod
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent entry for a run"""
+
+    @abstractmethod
+    def query(
+        self,
+        run_id: Optional[str] = None,
+        plan_id: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Entries matching all given filters, oldest first (at most ``limit`` newest)"""
+
+    @abstractmethod
+    def status_counts(self, plan_id: Optional[str] = None) -> Dict[str, int]:
+        """Number of entries per status"""
+
+    @abstractmethod
+    def mean_replans_per_plan(self) -> float:
+        """Average of the total ``replans`` recorded for each plan"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        ...
+
+    def success_rate(self, plan_id: Optional[str] = None) -> float:
+        """Fraction of entries whose status is a success status"""
+        counts = self.status_counts(plan_id)
+        total = sum(counts.values())
+        if not total:
+            return 0.0
+        return sum(n for status, n in counts.items() if status in self.success_statuses) / total
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Aggregate statistics over everything currently retained"""
+        return {
+            "entries": len(self),
+            "by_status": self.status_counts(),
+            "success_rate": self.success_rate(),
+            "mean_replans_per_plan": self.mean_replans_per_plan(),
+        }
+
+    def close(self) -> None:
+        """Release any resources held by the store"""
+
+
+class RingBufferHistoryStore(ExecutionHistoryStore):
+    """
+    In-memory history keeping the most recent ``max_entries`` entries.
+
+    Per-run, per-plan and per-status indexes and the aggregates are updated
+    on every insert and eviction, so memory stays bounded and lookups avoid
+    scanning the buffer. Entries and their recorded_at column live in lists
+    read from a head offset (compacted once half is evicted), so time-range
+    queries bisect and slice in O(log n + k).
+    """
+
+    def __init__(self, max_entries: int = 10_000, success_statuses: Iterable[str] = ("completed",)):
+        super().__init__(success_statuses)
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+
+        self._entries: List[Dict[str, Any]] = []
+        self._times: List[float] = []
+        self._head = 0  # index of the oldest live entry in _entries/_times
+        self._by_run: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._by_plan: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._by_status: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._status_counts: Counter = Counter()
+        self._plan_replans: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        entry = dict(entry)
+        with self._lock:
+            # Keep recorded_at non-decreasing so time-range lookups can bisect
+            now = entry.get("recorded_at") or time.time()
+            if len(self._times) > self._head and now < self._times[-1]:
+                now = self._times[-1]
+            entry["recorded_at"] = now
+
+            if len(self._entries) - self._head >= self.max_entries:
+                self._evict_oldest()
+
+            self._entries.append(entry)
+            self._times.append(now)
+
+            self._by_run.setdefault(entry.get("run_id"), deque()).append(entry)
+            plan_id = entry.get("plan_id")
+            self._by_plan.setdefault(plan_id, deque()).append(entry)
+            self._plan_replans[plan_id] = self._plan_replans.get(plan_id, 0) + entry.get("replans", 0)
+            status = entry.get("status")
+            self._by_status.setdefault(status, deque()).append(entry)
+            self._status_counts[status] += 1
+
+    def _evict_oldest(self) -> None:
+        entry = self._entries[self._head]
+        self._entries[self._head] = None
+        self._head += 1
+        if self._head >= self.max_entries:
+            # Drop the evicted prefix in one go; amortised O(1) per eviction
+            del self._entries[:self._head]
+            del self._times[:self._head]
+            self._head = 0
+
+        # Index deques are in insertion order too, so the oldest is leftmost
+        run_id = entry.get("run_id")
+        run_entries = self._by_run[run_id]
+        run_entries.popleft()
+        if not run_entries:
+            del self._by_run[run_id]
+
+        plan_id = entry.get("plan_id")
+        plan_entries = self._by_plan[plan_id]
+        plan_entries.popleft()
+        self._plan_replans[plan_id] -= entry.get("replans", 0)
+        if not plan_entries:
+            del self._by_plan[plan_id]
+            del self._plan_replans[plan_id]
+
+        status = entry.get("status")
+        status_entries = self._by_status[status]
+        status_entries.popleft()
+        self._status_counts[status] -= 1
+        if not status_entries:
+            del self._by_status[status]
+            del self._status_counts[status]
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        run_entries = self._by_run.get(run_id)
+        return run_entries[-1] if run_entries else None
+
+    def query(
+        self,
+        run_id: Optional[str] = None,
+        plan_id: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            # Start from the narrowest index available
+            if run_id is not None:
+                candidates: Iterable[Dict[str, Any]] = self._by_run.get(run_id, ())
+            elif plan_id is not None:
+                candidates = self._by_plan.get(plan_id, ())
+            elif status is not None:
+                candidates = self._by_status.get(status, ())
+            elif since is not None or until is not None:
+                lo = bisect_left(self._times, since, self._head) if since is not None else self._head
+                hi = bisect_right(self._times, until, self._head) if until is not None else len(self._times)
+                candidates = self._entries[lo:hi]
+            else:
+                candidates = self._entries[self._head:]
+
+            results = [
+                entry for entry in candidates
+                if (plan_id is None or entry.get("plan_id") == plan_id)
+                and (status is None or entry.get("status") == status)
+                and (since is None or entry["recorded_at"] >= since)
+                and (until is None or entry["recorded_at"] <= until)
+            ]
+
+        if limit is not None:
+            results = results[-limit:] if limit > 0 else []
+        return results
+
+    def status_counts(self, plan_id: Optional[str] = None) -> Dict[str, int]:
+        if plan_id is None:
+            return dict(self._status_counts)
+        return dict(Counter(entry.get("status") for entry in self._by_plan.get(plan_id, ())))
+
+    def mean_replans_per_plan(self) -> float:
+        if not self._plan_replans:
+            return 0.0
+        return sum(self._plan_replans.values()) / len(self._plan_replans)
+
+    def __len__(self) -> int:
+        return len(self._entries) - self._head
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._entries[self._head:])
+
+
+class SQLiteHistoryStore(ExecutionHistoryStore):
+    """
+    History persisted to a local SQLite file.
+
+    Indexed on run_id, plan_id, status and recorded_at; aggregates are
+    computed in SQL. With ``max_entries`` the oldest rows are pruned as new
+    ones arrive.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_entries: Optional[int] = None,
+        success_statuses: Iterable[str] = ("completed",)
+    ):
+        super().__init__(success_statuses)
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS execution_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT,
+                plan_id TEXT,
+                status TEXT,
+                replans INTEGER DEFAULT 0,
+                recorded_at REAL NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_history_run ON execution_history (run_id);
+            CREATE INDEX IF NOT EXISTS idx_history_plan ON execution_history (plan_id);
+            CREATE INDEX IF NOT EXISTS idx_history_status ON execution_history (status);
+            CREATE INDEX IF NOT EXISTS idx_history_recorded ON execution_history (recorded_at);
+        ''')
+        self._conn.commit()
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        entry = dict(entry)
+        entry.setdefault("recorded_at", time.time())
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO execution_history (run_id, plan_id, status, replans, recorded_at, data) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (entry.get("run_id"), entry.get("plan_id"), entry.get("status"),
+                 entry.get("replans", 0), entry["recorded_at"], json.dumps(entry, default=str))
+            )
+            if self.max_entries:
+                self._conn.execute(
+                    'DELETE FROM execution_history WHERE id <= '
+                    '(SELECT MAX(id) FROM execution_history) - ?',
+                    (self.max_entries,)
+                )
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        results = self.query(run_id=run_id, limit=1)
+        return results[0] if results else None
+
+    def query(
+        self,
+        run_id: Optional[str] = None,
+        plan_id: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        conditions, params = [], []
+        for column, value in (("run_id", run_id), ("plan_id", plan_id), ("status", status)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("recorded_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("recorded_at <= ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT data FROM execution_history {where} ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(max(limit, 0))
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def status_counts(self, plan_id: Optional[str] = None) -> Dict[str, int]:
+        sql = "SELECT status, COUNT(*) FROM execution_history"
+        params: List[Any] = []
+        if plan_id is not None:
+            sql += " WHERE plan_id = ?"
+            params.append(plan_id)
+        with self._lock:
+            return dict(self._conn.execute(sql + " GROUP BY status", params).fetchall())
+
+    def mean_replans_per_plan(self) -> float:
+        with self._lock:
+            value = self._conn.execute(
+                "SELECT AVG(total) FROM "
+                "(SELECT SUM(replans) AS total FROM execution_history GROUP BY plan_id)"
+            ).fetchone()[0]
+        return float(value or 0.0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM execution_history").fetchone()[0]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.query())
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def create_history_store(
+    store: Optional[ExecutionHistoryStore] = None,
+    db_path: Optional[str] = None,
+    max_entries: Optional[int] = 10_000,
+    success_statuses: Iterable[str] = ("completed",)
+) -> ExecutionHistoryStore:
+    """
+    Resolve the history store for a component.
+
+    An explicit ``store`` wins; otherwise ``db_path`` selects SQLite and the
+    default is a ring buffer of ``max_entries``.
+    """
+    if store is not None:
+        return store
+    if db_path:
+        return SQLiteHistoryStore(db_path, max_entries=max_entries, success_statuses=success_statuses)
+    return RingBufferHistoryStore(max_entries=max_entries or 10_000, success_statuses=success_statuses)
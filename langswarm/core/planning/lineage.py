@@ -8,10 +8,13 @@ Tracks artifact dependencies and provenance to enable:
 - Reproducibility
 """
 
+import json
 import logging
 import hashlib
-from typing import Dict, List, Optional, Set
-from collections import deque
+import sqlite3
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+from collections import OrderedDict, deque
 
 from .models import Provenance, Checkpoint
 
@@ -31,13 +34,28 @@ class LineageGraph:
     - Impact analysis (downstream_of)
     - Replay point identification (find_earliest_valid_ancestor)
     - Audit trails
+    
+    Edges are kept as adjacency sets in both directions. Transitive closures
+    are memoized in a bounded LRU; adding an edge drops only the cached
+    closures it can change. With ``db_path`` the graph is written through to
+    a local SQLite file and reloaded from it on construction.
     """
     
-    def __init__(self):
+    def __init__(self, db_path: Optional[str] = None, cache_size: int = 256):
         self.nodes: Dict[str, Provenance] = {}  # artifact_id -> Provenance
-        self.edges: Dict[str, List[str]] = {}  # artifact_id -> [child_ids]
+        self.edges: Dict[str, Set[str]] = {}  # artifact_id -> {child_ids}
+        self.parents: Dict[str, Set[str]] = {}  # artifact_id -> {parent_ids}
         self.checkpoints: Dict[str, Checkpoint] = {}  # step_id -> Checkpoint
         self.invalid_artifacts: Set[str] = set()
+        
+        self.cache_size = cache_size
+        self._downstream_cache: "OrderedDict[str, FrozenSet[str]]" = OrderedDict()
+        self._upstream_cache: "OrderedDict[str, FrozenSet[str]]" = OrderedDict()
+        
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._open_store(db_path)
     
     def add_node(self, provenance: Provenance) -> None:
         """
@@ -48,18 +66,50 @@ class LineageGraph:
         """
         self.nodes[provenance.artifact_id] = provenance
         
-        # Build forward edges (parent -> children)
-        for parent_id in provenance.inputs:
-            if parent_id not in self.edges:
-                self.edges[parent_id] = []
-            if provenance.artifact_id not in self.edges[parent_id]:
-                self.edges[parent_id].append(provenance.artifact_id)
+        # Build forward edges (parent -> children) and the reverse index
+        new_edges = [
+            (parent_id, provenance.artifact_id)
+            for parent_id in provenance.inputs
+            if self._link(parent_id, provenance.artifact_id)
+        ]
+        
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO lineage_nodes (artifact_id, provenance) VALUES (?, ?)',
+                    (provenance.artifact_id, json.dumps(_provenance_to_dict(provenance), default=str))
+                )
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO lineage_edges (parent_id, child_id) VALUES (?, ?)',
+                    new_edges
+                )
         
         logger.debug(
             f"Added lineage node: {provenance.artifact_id} "
             f"with {len(provenance.inputs)} parents"
         )
     
+    def _link(self, parent_id: str, child_id: str) -> bool:
+        """Record a parent -> child edge; returns False if it already existed"""
+        children = self.edges.setdefault(parent_id, set())
+        if child_id in children:
+            return False
+        children.add(child_id)
+        self.parents.setdefault(child_id, set()).add(parent_id)
+        
+        # Only closures that reach the parent (or start below the child) change
+        if self._downstream_cache:
+            stale = [key for key, closure in self._downstream_cache.items()
+                     if key == parent_id or parent_id in closure]
+            for key in stale:
+                del self._downstream_cache[key]
+        if self._upstream_cache:
+            stale = [key for key, closure in self._upstream_cache.items()
+                     if key == child_id or child_id in closure]
+            for key in stale:
+                del self._upstream_cache[key]
+        return True
+    
     def add_checkpoint(self, checkpoint: Checkpoint) -> None:
         """
         Add checkpoint for replay capability.
@@ -70,6 +120,13 @@ class LineageGraph:
         self.checkpoints[checkpoint.step_id] = checkpoint
         self.add_node(checkpoint.provenance)
         
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO lineage_checkpoints (step_id, checkpoint) VALUES (?, ?)',
+                    (checkpoint.step_id, json.dumps(_checkpoint_to_dict(checkpoint), default=str))
+                )
+        
         logger.debug(f"Added checkpoint for step: {checkpoint.step_id}")
     
     def get_provenance(self, artifact_id: str) -> Optional[Provenance]:
@@ -94,27 +151,13 @@ class LineageGraph:
         Returns:
             List of downstream artifact IDs (excluding source)
         """
-        visited = set()
-        queue = deque([artifact_id])
-        
-        while queue:
-            current = queue.popleft()
-            if current in visited:
-                continue
-            visited.add(current)
-            
-            # Add children to queue
-            children = self.edges.get(current, [])
-            queue.extend(children)
-        
-        # Remove source artifact from results
-        visited.discard(artifact_id)
+        downstream = self._closure(artifact_id, self.edges, self._downstream_cache)
         
         logger.debug(
-            f"Found {len(visited)} downstream artifacts from {artifact_id}"
+            f"Found {len(downstream)} downstream artifacts from {artifact_id}"
         )
         
-        return list(visited)
+        return list(downstream)
     
     def upstream_of(self, artifact_id: str) -> List[str]:
         """
@@ -129,24 +172,44 @@ class LineageGraph:
         Returns:
             List of upstream artifact IDs (excluding target)
         """
-        visited = set()
-        queue = deque([artifact_id])
+        return list(self._closure(artifact_id, self.parents, self._upstream_cache))
+    
+    def _closure(
+        self,
+        artifact_id: str,
+        adjacency: Dict[str, Set[str]],
+        cache: "OrderedDict[str, FrozenSet[str]]"
+    ) -> FrozenSet[str]:
+        """BFS over adjacency from artifact_id, memoized in cache"""
+        cached = cache.get(artifact_id)
+        if cached is not None:
+            cache.move_to_end(artifact_id)
+            return cached
         
+        visited = {artifact_id}
+        queue = deque([artifact_id])
         while queue:
             current = queue.popleft()
-            if current in visited:
-                continue
-            visited.add(current)
-            
-            # Add parents to queue
-            provenance = self.nodes.get(current)
-            if provenance:
-                queue.extend(provenance.inputs)
+            for neighbour in adjacency.get(current, ()):
+                if neighbour not in visited:
+                    # Reuse a memoized closure instead of walking that subgraph again
+                    sub = cache.get(neighbour)
+                    if sub is not None:
+                        visited.add(neighbour)
+                        visited.update(sub)
+                    else:
+                        visited.add(neighbour)
+                        queue.append(neighbour)
         
-        # Remove target artifact from results
+        # Remove source artifact from results
         visited.discard(artifact_id)
+        result = frozenset(visited)
         
-        return list(visited)
+        if self.cache_size > 0:
+            cache[artifact_id] = result
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return result
     
     def find_earliest_valid_ancestor(self, invalid_ids: List[str]) -> Optional[str]:
         """
@@ -184,12 +247,26 @@ class LineageGraph:
     
     def mark_invalid(self, artifact_id: str) -> None:
         """Mark artifact as invalid"""
-        self.invalid_artifacts.add(artifact_id)
-        logger.debug(f"Marked artifact invalid: {artifact_id}")
+        self.mark_invalid_many([artifact_id])
+    
+    def mark_invalid_many(self, artifact_ids: Iterable[str]) -> None:
+        """Mark several artifacts invalid in one write"""
+        artifact_ids = list(artifact_ids)
+        self.invalid_artifacts.update(artifact_ids)
+        if self._conn is not None:
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO lineage_invalid (artifact_id) VALUES (?)',
+                    [(artifact_id,) for artifact_id in artifact_ids]
+                )
+        logger.debug(f"Marked {len(artifact_ids)} artifacts invalid")
     
     def mark_valid(self, artifact_id: str) -> None:
         """Mark artifact as valid"""
         self.invalid_artifacts.discard(artifact_id)
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute('DELETE FROM lineage_invalid WHERE artifact_id = ?', (artifact_id,))
         logger.debug(f"Marked artifact valid: {artifact_id}")
     
     def is_valid(self, artifact_id: str) -> bool:
@@ -234,6 +311,92 @@ class LineageGraph:
         return []  # No path found
 
 
+    # ===== SQLite persistence =====
+    
+    def _open_store(self, db_path: str) -> None:
+        """Open (or create) the lineage database and load its contents"""
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        # Every checkpoint is its own small transaction; WAL keeps those cheap
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS lineage_nodes (
+                artifact_id TEXT PRIMARY KEY,
+                provenance TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS lineage_edges (
+                parent_id TEXT NOT NULL,
+                child_id TEXT NOT NULL,
+                PRIMARY KEY (parent_id, child_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_lineage_edges_child ON lineage_edges (child_id);
+            CREATE TABLE IF NOT EXISTS lineage_checkpoints (
+                step_id TEXT PRIMARY KEY,
+                checkpoint TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS lineage_invalid (
+                artifact_id TEXT PRIMARY KEY
+            );
+        ''')
+        
+        for artifact_id, data in self._conn.execute('SELECT artifact_id, provenance FROM lineage_nodes'):
+            self.nodes[artifact_id] = _provenance_from_dict(json.loads(data))
+        for parent_id, child_id in self._conn.execute('SELECT parent_id, child_id FROM lineage_edges'):
+            self.edges.setdefault(parent_id, set()).add(child_id)
+            self.parents.setdefault(child_id, set()).add(parent_id)
+        for step_id, data in self._conn.execute('SELECT step_id, checkpoint FROM lineage_checkpoints'):
+            self.checkpoints[step_id] = _checkpoint_from_dict(json.loads(data))
+        self.invalid_artifacts.update(
+            row[0] for row in self._conn.execute('SELECT artifact_id FROM lineage_invalid')
+        )
+        
+        if self.nodes:
+            logger.info(f"Loaded lineage graph with {len(self.nodes)} nodes from {db_path}")
+    
+    def close(self) -> None:
+        """Close the SQLite store, if any"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _provenance_to_dict(provenance: Provenance) -> Dict:
+    return {
+        "artifact_id": provenance.artifact_id,
+        "from_step": provenance.from_step,
+        "inputs": provenance.inputs,
+        "tool": provenance.tool,
+        "params_hash": provenance.params_hash,
+        "metrics": provenance.metrics,
+        "timestamp": provenance.timestamp.isoformat(),
+        "metadata": provenance.metadata,
+    }
+
+
+def _provenance_from_dict(data: Dict) -> Provenance:
+    return Provenance(**{**data, "timestamp": datetime.fromisoformat(data["timestamp"])})
+
+
+def _checkpoint_to_dict(checkpoint: Checkpoint) -> Dict:
+    return {
+        "step_id": checkpoint.step_id,
+        "artifact_uri": checkpoint.artifact_uri,
+        "artifact_hash": checkpoint.artifact_hash,
+        "provenance": _provenance_to_dict(checkpoint.provenance),
+        "validated": checkpoint.validated,
+        "retro_status": checkpoint.retro_status,
+        "created_at": checkpoint.created_at.isoformat(),
+    }
+
+
+def _checkpoint_from_dict(data: Dict) -> Checkpoint:
+    return Checkpoint(**{
+        **data,
+        "provenance": _provenance_from_dict(data["provenance"]),
+        "created_at": datetime.fromisoformat(data["created_at"]),
+    })
+
+
 def compute_artifact_hash(artifact: Dict) -> str:
     """
     Compute content hash for artifact (SHA-256).
@@ -5,6 +5,7 @@ Defines all foundational data structures for task briefs, plans, observations,
 decisions, and state management.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Literal, Callable
@@ -145,31 +146,44 @@ class Plan:
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     
+    # step_id -> position in steps; rebuilt lazily when steps change
+    _step_positions: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
     def get_step(self, step_id: str) -> Optional[ActionContract]:
         """Get step by ID"""
-        for step in self.steps:
-            if step.id == step_id:
-                return step
-        return None
+        position = self._step_positions.get(step_id)
+        if position is None or position >= len(self.steps) or self.steps[position].id != step_id:
+            # Steps were inserted, removed or reordered since the index was built
+            self._step_positions = {}
+            for i, step in enumerate(self.steps):
+                self._step_positions.setdefault(step.id, i)
+            position = self._step_positions.get(step_id)
+            if position is None:
+                return None
+        return self.steps[position]
+    
+    def get_dependencies(self, step_id: str) -> List[str]:
+        """IDs of steps that must complete before step_id (ignores unknown IDs)"""
+        return [dep for dep in self.dag.get(step_id, []) if self.get_step(dep) is not None]
     
     def get_topological_order(self) -> List[ActionContract]:
         """Return steps in topological order respecting dependencies"""
-        # Kahn's algorithm
+        # Kahn's algorithm; ties keep the order of self.steps
+        dependents: Dict[str, List[str]] = {step.id: [] for step in self.steps}
         in_degree = {step.id: 0 for step in self.steps}
-        for deps in self.dag.values():
-            for dep in deps:
-                in_degree[dep] = in_degree.get(dep, 0) + 1
+        for step in self.steps:
+            for dep in self.get_dependencies(step.id):
+                dependents[dep].append(step.id)
+                in_degree[step.id] += 1
         
-        queue = [step.id for step in self.steps if in_degree[step.id] == 0]
+        queue = deque(step.id for step in self.steps if in_degree[step.id] == 0)
         result = []
         
         while queue:
-            step_id = queue.pop(0)
-            step = self.get_step(step_id)
-            if step:
-                result.append(step)
+            step_id = queue.popleft()
+            result.append(self.get_step(step_id))
             
-            for dependent in self.dag.get(step_id, []):
+            for dependent in dependents[step_id]:
                 in_degree[dependent] -= 1
                 if in_degree[dependent] == 0:
                     queue.append(dependent)
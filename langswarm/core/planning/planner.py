@@ -15,7 +15,7 @@ from .models import (
     CapabilityVerification, PlanPatch, Observation, RunState
 )
 from ..agents.registry import get_agent_registry
-from ..tools.registry import ToolRegistry
+from ...tools.registry import ToolRegistry
 
 logger = logging.getLogger(__name__)
 
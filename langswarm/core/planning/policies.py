@@ -35,7 +35,8 @@ DEFAULT_POLICIES = {
     "limits": {
         "max_consecutive_failures": 3,
         "max_replans": 5,
-        "max_execution_time_sec": 3600  # 1 hour
+        "max_execution_time_sec": 3600,  # 1 hour
+        "max_concurrent_steps": 4  # independent DAG steps executed at once
     }
 }
 
@@ -88,9 +88,7 @@ class ReplayManager:
         )
         
         # 3. Mark artifacts as invalid
-        self.lineage.mark_invalid(root)
-        for artifact_id in downstream:
-            self.lineage.mark_invalid(artifact_id)
+        self.lineage.mark_invalid_many([root] + downstream)
         
         logger.info(f"Marked {len(downstream) + 1} artifacts as invalid")
         
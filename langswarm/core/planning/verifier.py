@@ -6,7 +6,7 @@ various drift metrics for decision-making.
 """
 
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from simpleeval import simple_eval
 
 from .models import RunState
@@ -50,7 +50,11 @@ from .registry import (
 from .execution import (
     ToolExecutor,
     ExecutionContext,
-    ExecutionResult
+    ExecutionResult,
+    RetryPolicy,
+    CircuitBreakerPolicy,
+    CircuitBreaker,
+    CircuitState
 )
 
 from .adapters import (
@@ -86,6 +90,10 @@ __all__ = [
     'ToolExecutor',
     'ExecutionContext',
     'ExecutionResult',
+    'RetryPolicy',
+    'CircuitBreakerPolicy',
+    'CircuitBreaker',
+    'CircuitState',
     
     # Compatibility
     'SynapseToolAdapter',
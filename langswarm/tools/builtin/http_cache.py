@@ -0,0 +1,321 @@
+"""
+HTTP Response Cache - used by the built-in web request tool
+
+Implements the private-cache subset of RFC 9111:
+- Freshness from Cache-Control max-age, Expires, or the Last-Modified heuristic
+- Conditional revalidation with ETag (If-None-Match) and Last-Modified (If-Modified-Since)
+- Vary-aware lookups and no-store / no-cache handling
+- Invalidation of cached entries after unsafe methods
+
+Entries live in a bounded in-memory LRU tier, optionally backed by an
+on-disk tier that survives process restarts.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Mapping
+
+# Status codes a cache may store without explicit freshness (RFC 9110 §15.1)
+HEURISTICALLY_CACHEABLE = {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+
+# Upper bound for the Last-Modified heuristic (RFC 9111 §4.2.2 suggests 10%)
+MAX_HEURISTIC_LIFETIME = 24 * 3600
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into a directive -> argument dict"""
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '=' in part:
+            name, _, arg = part.partition('=')
+            directives[name.strip().lower()] = arg.strip().strip('"')
+        else:
+            directives[part.lower()] = None
+    return directives
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    """Case-insensitive header lookup on a plain dict"""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _delta_seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(0, int(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class CachedResponse:
+    """A stored response plus the metadata needed to judge its freshness"""
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+    vary: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    @property
+    def cache_control(self) -> Dict[str, Optional[str]]:
+        return parse_cache_control(_header(self.headers, 'Cache-Control'))
+
+    @property
+    def etag(self) -> Optional[str]:
+        return _header(self.headers, 'ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return _header(self.headers, 'Last-Modified')
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def freshness_lifetime(self) -> float:
+        """Seconds this response stays fresh after it was generated"""
+        cc = self.cache_control
+        if 'no-cache' in cc:
+            return 0.0
+
+        max_age = _delta_seconds(cc.get('max-age'))
+        if max_age is not None:
+            return float(max_age)
+
+        date = _http_date(_header(self.headers, 'Date')) or self.stored_at
+        expires = _header(self.headers, 'Expires')
+        if expires is not None:
+            expires_at = _http_date(expires)
+            # Invalid Expires values (e.g. "0") mean "already expired"
+            return max(0.0, expires_at - date) if expires_at else 0.0
+
+        last_modified = _http_date(self.last_modified)
+        if last_modified and self.status_code in HEURISTICALLY_CACHEABLE:
+            return min(max(0.0, (date - last_modified) * 0.1), MAX_HEURISTIC_LIFETIME)
+
+        return 0.0
+
+    def current_age(self, now: float) -> float:
+        age_header = _delta_seconds(_header(self.headers, 'Age')) or 0
+        return age_header + max(0.0, now - self.stored_at)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return self.freshness_lifetime() > self.current_age(now)
+
+    def matches_vary(self, request_headers: Mapping[str, str]) -> bool:
+        return all(
+            _header(request_headers, name) == value
+            for name, value in self.vary.items()
+        )
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validators to send when revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def refresh(self, not_modified_headers: Mapping[str, str], now: Optional[float] = None):
+        """Apply a 304 response: merge its headers and restart the age clock"""
+        for key, value in not_modified_headers.items():
+            # Content framing headers of a 304 describe an empty body
+            if key.lower() in ('content-length', 'content-encoding', 'transfer-encoding'):
+                continue
+            existing = next((k for k in self.headers if k.lower() == key.lower()), key)
+            self.headers[existing] = value
+        self.stored_at = time.time() if now is None else now
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'url': self.url,
+            'status_code': self.status_code,
+            'headers': self.headers,
+            'stored_at': self.stored_at,
+            'vary': self.vary,
+        }
+
+
+def is_storable(method: str, status_code: int, response_headers: Mapping[str, str],
+                request_cache_control: Dict[str, Optional[str]]) -> bool:
+    """Whether a private cache may store this response"""
+    if method != 'GET' or 'no-store' in request_cache_control:
+        return False
+    if status_code not in HEURISTICALLY_CACHEABLE:
+        return False
+
+    cc = parse_cache_control(_header(response_headers, 'Cache-Control'))
+    if 'no-store' in cc:
+        return False
+    if (_header(response_headers, 'Vary') or '').strip() == '*':
+        return False
+
+    # Only worth keeping if it can be served fresh or revalidated later
+    return any([
+        'max-age' in cc,
+        _header(response_headers, 'Expires') is not None,
+        _header(response_headers, 'ETag') is not None,
+        _header(response_headers, 'Last-Modified') is not None,
+    ])
+
+
+def vary_values(response_headers: Mapping[str, str],
+                request_headers: Mapping[str, str]) -> Dict[str, Optional[str]]:
+    """Capture the request header values named by the response's Vary header"""
+    vary = _header(response_headers, 'Vary') or ''
+    return {
+        name.strip(): _header(request_headers, name.strip())
+        for name in vary.split(',') if name.strip()
+    }
+
+
+class HTTPCache:
+    """
+    Two-tier response cache.
+
+    The memory tier is an LRU bounded by entry count and total body bytes.
+    When ``disk_path`` is set, entries are also written there and promoted
+    back into memory on a memory miss. Disk I/O runs in the default executor
+    so lookups never block the event loop.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024,
+                 max_entry_bytes: int = 1024 * 1024, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.disk_path = disk_path
+
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._memory_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+
+        if disk_path:
+            os.makedirs(disk_path, exist_ok=True)
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return f"GET {url}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+
+        if self.disk_path:
+            entry = await self._run_io(self._read_disk, key)
+            if entry is not None:
+                self._store_memory(key, entry)
+        return entry
+
+    async def put(self, key: str, entry: CachedResponse):
+        if entry.size > self.max_entry_bytes:
+            return
+        self._store_memory(key, entry)
+        self.stats['stores'] += 1
+        if self.disk_path:
+            await self._run_io(self._write_disk, key, entry)
+
+    async def invalidate(self, key: str):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry.size
+        if self.disk_path:
+            await self._run_io(self._remove_disk, key)
+
+    def clear(self):
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    # ===== Memory tier =====
+
+    def _store_memory(self, key: str, entry: CachedResponse):
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.size
+
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+
+        while self._memory and (len(self._memory) > self.max_entries or
+                                self._memory_bytes > self.max_bytes):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            self.stats['evictions'] += 1
+
+    # ===== Disk tier =====
+
+    async def _run_io(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, fn, *args)
+
+    def _disk_paths(self, key: str):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        base = os.path.join(self.disk_path, digest)
+        return base + '.json', base + '.body'
+
+    def _read_disk(self, key: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._disk_paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(body=body, **meta)
+
+    def _write_disk(self, key: str, entry: CachedResponse):
+        meta_path, body_path = self._disk_paths(key)
+        try:
+            # Body first, metadata last: a reader never sees metadata without its body
+            with open(body_path + '.tmp', 'wb') as f:
+                f.write(entry.body)
+            os.replace(body_path + '.tmp', body_path)
+            with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(entry.to_dict(), f)
+            os.replace(meta_path + '.tmp', meta_path)
+        except OSError:
+            pass
+
+    def _remove_disk(self, key: str):
+        for path in self._disk_paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
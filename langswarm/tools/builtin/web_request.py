@@ -11,8 +11,23 @@ import time
 from typing import Dict, Any, Optional, List, Union
 from urllib.parse import urlparse, urljoin
 
+import aiohttp
+from yarl import URL
+
 from langswarm.tools.base import BaseTool, ToolResult, create_tool_metadata, create_method_schema
 from langswarm.tools.interfaces import ToolType, ToolCapability
+from .http_cache import HTTPCache, CachedResponse, parse_cache_control, is_storable, vary_values
+
+# Methods after which cached representations of the target URL are stale
+UNSAFE_METHODS = {'POST', 'PUT', 'DELETE', 'PATCH'}
+
+
+async def _close_on_loop_shutdown(session: "aiohttp.ClientSession"):
+    """Suspend until the owning loop shuts down its async generators, then close the session"""
+    try:
+        yield
+    finally:
+        await session.close()
 
 
 class WebRequestTool(BaseTool):
@@ -25,9 +40,14 @@ class WebRequestTool(BaseTool):
     - Header management
     - Response parsing
     - Timeout and security controls
+    - Pooled keep-alive connections with per-host limits
+    - RFC 9111 response caching with conditional revalidation
     """
     
-    def __init__(self, timeout: int = 30, max_response_size: int = 10 * 1024 * 1024, allowed_domains: Optional[List[str]] = None):
+    def __init__(self, timeout: int = 30, max_response_size: int = 10 * 1024 * 1024, allowed_domains: Optional[List[str]] = None,
+                 max_connections: int = 100, max_connections_per_host: int = 10,
+                 cache_enabled: bool = True, cache: Optional[HTTPCache] = None,
+                 cache_dir: Optional[str] = None):
         """
         Initialize web request tool
         
@@ -35,10 +55,23 @@ class WebRequestTool(BaseTool):
             timeout: Request timeout in seconds
             max_response_size: Maximum response size in bytes
             allowed_domains: List of allowed domains (None for no restrictions)
+            max_connections: Total size of the shared connection pool
+            max_connections_per_host: Concurrent connections allowed to a single host
+            cache_enabled: Whether GET responses are cached per Cache-Control/ETag/Last-Modified
+            cache: Cache instance to use (shared between tools if desired)
+            cache_dir: Directory for the optional on-disk cache tier
         """
         self.timeout = timeout
         self.max_response_size = max_response_size
         self.allowed_domains = allowed_domains or []
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.cache = (cache or HTTPCache(disk_path=cache_dir)) if cache_enabled else None
+        
+        # One pooled session per event loop (aiohttp sessions are loop-bound)
+        self._session = None
+        self._session_loop = None
+        self._session_guard = None
         
         metadata = create_tool_metadata(
             tool_id="builtin_web_request",
@@ -152,63 +185,161 @@ class WebRequestTool(BaseTool):
         
         return default_headers
     
-    def _parse_response(self, response, include_content: bool = True) -> Dict[str, Any]:
+    def _parse_response(self, status_code: int, headers: Dict[str, str], url: str, body: bytes,
+                        elapsed: Optional[float], cache_status: str, include_content: bool = True) -> Dict[str, Any]:
         """Parse HTTP response into standard format"""
         result = {
-            "status_code": response.status_code,
-            "headers": dict(response.headers),
-            "url": str(response.url),
-            "elapsed_seconds": response.elapsed.total_seconds() if hasattr(response, 'elapsed') else None,
-            "size_bytes": len(response.content) if include_content else None
+            "status_code": status_code,
+            "headers": headers,
+            "url": url,
+            "elapsed_seconds": elapsed,
+            "size_bytes": len(body) if include_content else None,
+            "cache_status": cache_status
         }
         
         if include_content:
             # Try to parse as JSON first
             try:
-                result["json"] = response.json()
+                result["json"] = json.loads(body)
                 result["content_type"] = "json"
-            except:
+            except (ValueError, UnicodeDecodeError):
                 # Fall back to text
                 try:
-                    result["text"] = response.text
+                    result["text"] = body.decode('utf-8')
                     result["content_type"] = "text"
-                except:
+                except UnicodeDecodeError:
                     # Binary content
-                    result["content"] = f"<binary data: {len(response.content)} bytes>"
+                    result["content"] = f"<binary data: {len(body)} bytes>"
                     result["content_type"] = "binary"
         
         return result
     
-    async def _make_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
-        """Make HTTP request with error handling"""
-        import requests
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the pooled session for the running loop, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            await self._discard_session()
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            # Registered with the loop's async-generator shutdown, so asyncio.run()
+            # closes the pool on its own loop before that loop goes away
+            guard = _close_on_loop_shutdown(session)
+            await guard.__anext__()
+            self._session, self._session_loop, self._session_guard = session, loop, guard
+        return self._session
+    
+    async def _discard_session(self):
+        """Close a session created on another event loop before it is replaced"""
+        session, loop, guard = self._session, self._session_loop, self._session_guard
+        self._session = None
+        self._session_loop = None
+        self._session_guard = None
+        if session is None or session.closed:
+            return
+        if loop.is_running():
+            # Still serving another thread: close it there
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(guard.aclose(), loop))
+        elif not loop.is_closed():
+            # Stopped but still usable: finish the close on it from a worker thread
+            await asyncio.to_thread(loop.run_until_complete, guard.aclose())
+        # A loop closed without shutting down its async generators cannot run the
+        # close any more; its transports went with it
+    
+    async def close(self):
+        """Close pooled connections held by this tool"""
+        if self._session_guard is not None and self._session_loop is asyncio.get_running_loop():
+            await self._session_guard.aclose()
+        await self._discard_session()
+    
+    async def _read_body(self, response) -> bytes:
+        """Stream the body, aborting as soon as it exceeds max_response_size"""
+        if response.content_length and response.content_length > self.max_response_size:
+            raise ValueError(f"Response too large: {response.content_length} bytes > {self.max_response_size}")
         
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            size += len(chunk)
+            if size > self.max_response_size:
+                raise ValueError(f"Response too large: {size} bytes > {self.max_response_size}")
+            chunks.append(chunk)
+        return b"".join(chunks)
+    
+    async def _make_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+        """Make HTTP request with connection pooling, caching and error handling"""
         validated_url = self._validate_url(url)
         timeout = kwargs.pop('timeout', self.timeout)
         headers = self._prepare_headers(kwargs.pop('headers', None))
+        params = kwargs.pop('params', None)
+        
+        full_url = str(URL(validated_url).update_query(params)) if params else validated_url
+        request_cc = parse_cache_control(headers.get('Cache-Control'))
+        cache_key = HTTPCache.key_for(full_url)
+        use_cache = self.cache is not None and method == 'GET' and 'no-store' not in request_cc
+        
+        entry = None
+        if use_cache:
+            entry = await self.cache.get(cache_key)
+            if entry is not None and not entry.matches_vary(headers):
+                entry = None
+            if entry is not None:
+                if entry.is_fresh() and 'no-cache' not in request_cc:
+                    self.cache.stats['hits'] += 1
+                    return self._parse_response(entry.status_code, dict(entry.headers), entry.url,
+                                                entry.body, 0.0, "hit")
+                headers.update(entry.conditional_headers())
+            else:
+                self.cache.stats['misses'] += 1
         
         try:
             start_time = time.time()
-            response = requests.request(
-                method=method,
-                url=validated_url,
+            session = await self._get_session()
+            async with session.request(
+                method,
+                full_url,
                 headers=headers,
-                timeout=timeout,
+                timeout=aiohttp.ClientTimeout(total=timeout),
                 **kwargs
-            )
-            
-            # Check response size
-            if len(response.content) > self.max_response_size:
-                raise ValueError(f"Response too large: {len(response.content)} bytes > {self.max_response_size}")
+            ) as response:
+                body = await self._read_body(response)
+                response_headers = dict(response.headers)
+                status_code = response.status
+                response_url = str(response.url)
+            elapsed = time.time() - start_time
             
-            return self._parse_response(response)
-            
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             raise ValueError(f"Request timed out after {timeout} seconds")
-        except requests.exceptions.ConnectionError as e:
+        except aiohttp.ClientConnectionError as e:
             raise ValueError(f"Connection error: {e}")
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             raise ValueError(f"Request failed: {e}")
+        
+        if entry is not None and status_code == 304:
+            # Revalidated: serve the stored body with refreshed metadata
+            entry.refresh(response_headers)
+            await self.cache.put(cache_key, entry)
+            self.cache.stats['revalidated'] += 1
+            return self._parse_response(entry.status_code, dict(entry.headers), entry.url,
+                                        entry.body, elapsed, "revalidated")
+        
+        if use_cache and is_storable(method, status_code, response_headers, request_cc):
+            await self.cache.put(cache_key, CachedResponse(
+                url=response_url,
+                status_code=status_code,
+                headers=response_headers,
+                body=body,
+                stored_at=time.time(),
+                vary=vary_values(response_headers, headers)
+            ))
+        
+        if self.cache is not None and method in UNSAFE_METHODS and status_code < 400:
+            await self.cache.invalidate(HTTPCache.key_for(full_url))
+        
+        return self._parse_response(status_code, response_headers, response_url, body, elapsed,
+                                    "miss" if use_cache else "bypass")
     
     async def get(self, url: str, headers: Optional[Dict[str, str]] = None, 
                   params: Optional[Dict[str, Any]] = None, timeout: Optional[int] = None) -> Dict[str, Any]:
@@ -289,15 +420,21 @@ class WebRequestTool(BaseTool):
         method = input_data.get('method', 'get')
         method_args = {k: v for k, v in input_data.items() if k != 'method'}
         
-        if method == 'get':
-            return asyncio.run(self.get(**method_args))
-        elif method == 'post':
-            return asyncio.run(self.post(**method_args))
-        elif method == 'put':
-            return asyncio.run(self.put(**method_args))
-        elif method == 'delete':
-            return asyncio.run(self.delete(**method_args))
-        elif method == 'head':
-            return asyncio.run(self.head(**method_args))
-        else:
+        handlers = {
+            'get': self.get,
+            'post': self.post,
+            'put': self.put,
+            'delete': self.delete,
+            'head': self.head,
+        }
+        if method not in handlers:
             raise ValueError(f"Unknown method: {method}")
+        
+        return asyncio.run(self._run_once(handlers[method](**method_args)))
+    
+    async def _run_once(self, coro):
+        """Run a request on a throwaway loop, closing the loop-bound session afterwards"""
+        try:
+            return await coro
+        finally:
+            await self.close()
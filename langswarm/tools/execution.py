@@ -6,11 +6,13 @@ Provides async execution, context management, and comprehensive observability.
 """
 
 import asyncio
+import random
 import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, AsyncIterator
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, AsyncIterator
 import logging
 
 from langswarm.core.errors import handle_error, ToolError, ErrorContext
@@ -142,13 +144,153 @@ class ExecutionResult:
         )
 
 
+@dataclass
+class RetryPolicy:
+    """
+    Retry behaviour for a tool.
+    
+    Delays use decorrelated jitter: each one is drawn uniformly between
+    ``base_delay`` and three times the previous delay, capped at
+    ``max_delay``, so concurrent callers spread out instead of retrying in
+    lockstep. The retry budget lets retries make up at most ``budget_ratio``
+    of calls (plus ``budget_min_retries`` of headroom for low traffic).
+    """
+    max_retries: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 10.0
+    budget_ratio: float = 0.2
+    budget_min_retries: int = 10
+    
+    def next_delay(self, previous: float, rng: random.Random) -> float:
+        """Delay before the next attempt given the previous delay"""
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, rng.uniform(self.base_delay, upper))
+
+
+@dataclass
+class CircuitBreakerPolicy:
+    """When a tool's circuit opens and how it recovers"""
+    failure_threshold: int = 5  # Consecutive failures that open the circuit
+    recovery_timeout: float = 30.0  # Seconds open before probing
+    half_open_max_calls: int = 1  # Concurrent probes while half-open
+
+
+class CircuitState(Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of calls.
+    
+    Every call deposits ``ratio`` tokens and every retry withdraws one.
+    """
+    
+    def __init__(self, ratio: float, min_retries: int):
+        self.ratio = ratio
+        self.capacity = float(max(min_retries, 1))
+        self.tokens = self.capacity
+        self.denied = 0
+    
+    def deposit(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+    
+    def try_withdraw(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        self.denied += 1
+        return False
+
+
+class CircuitBreaker:
+    """
+    Per-tool circuit breaker.
+    
+    Closed: calls flow and consecutive failures are counted. Open: calls
+    fail fast until ``recovery_timeout`` has passed. Half-open: a limited
+    number of probe calls go through; a success closes the circuit and a
+    failure opens it again.
+    """
+    
+    def __init__(self, policy: CircuitBreakerPolicy, clock: Callable[[], float] = time.monotonic):
+        self.policy = policy
+        self._clock = clock
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probes_in_flight = 0
+        self.times_opened = 0
+        self.rejected = 0
+    
+    def allow_request(self) -> bool:
+        """Whether a call may proceed; moves OPEN to HALF_OPEN once the timeout passes"""
+        if self.state == CircuitState.OPEN:
+            if self._clock() - self.opened_at < self.policy.recovery_timeout:
+                self.rejected += 1
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self.probes_in_flight = 0
+        
+        if self.state == CircuitState.HALF_OPEN:
+            if self.probes_in_flight >= self.policy.half_open_max_calls:
+                self.rejected += 1
+                return False
+            self.probes_in_flight += 1
+        
+        return True
+    
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        if self.state == CircuitState.HALF_OPEN:
+            self.state = CircuitState.CLOSED
+            self.probes_in_flight = 0
+            self.opened_at = None
+    
+    def record_cancelled(self) -> None:
+        """Give back a half-open probe slot for a call that never finished"""
+        if self.state == CircuitState.HALF_OPEN and self.probes_in_flight:
+            self.probes_in_flight -= 1
+    
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == CircuitState.HALF_OPEN or (
+            self.state == CircuitState.CLOSED
+            and self.consecutive_failures >= self.policy.failure_threshold
+        ):
+            self._open()
+    
+    def _open(self) -> None:
+        self.state = CircuitState.OPEN
+        self.opened_at = self._clock()
+        self.probes_in_flight = 0
+        self.times_opened += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current breaker state for statistics"""
+        retry_in = None
+        if self.state == CircuitState.OPEN:
+            retry_in = max(0.0, self.opened_at + self.policy.recovery_timeout - self._clock())
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected_calls": self.rejected,
+            "retry_in_seconds": retry_in
+        }
+
+
 class ToolExecutor:
     """
     Advanced tool execution engine with middleware integration.
     
     Features:
     - Async execution with timeout handling
-    - Retry logic with exponential backoff
+    - Per-tool retry policies with decorrelated-jitter backoff and retry budgets
+    - Per-tool circuit breakers that fail fast while a tool is unhealthy
     - Integration with V2 middleware pipeline
     - Comprehensive error handling
     - Execution statistics and monitoring
@@ -159,12 +301,28 @@ class ToolExecutor:
         self,
         default_timeout: float = 30.0,
         default_retries: int = 3,
-        enable_statistics: bool = True
+        enable_statistics: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker_policy: Optional[CircuitBreakerPolicy] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Optional[random.Random] = None
     ):
         self.default_timeout = default_timeout
         self.default_retries = default_retries
         self.enable_statistics = enable_statistics
         
+        # Resilience policies; per-tool overrides via configure_tool()
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=default_retries)
+        self.breaker_policy = breaker_policy or CircuitBreakerPolicy()
+        self._tool_retry_policies: Dict[str, RetryPolicy] = {}
+        self._tool_breaker_policies: Dict[str, CircuitBreakerPolicy] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        
         # Execution statistics
         self._stats = {
             "total_executions": 0,
@@ -172,7 +330,9 @@ class ToolExecutor:
             "failed_executions": 0,
             "retried_executions": 0,
             "timeout_executions": 0,
-            "total_execution_time": 0.0
+            "total_execution_time": 0.0,
+            "retries_denied_by_budget": 0,
+            "circuit_rejections": 0
         }
         
         # Per-tool statistics
@@ -180,6 +340,39 @@ class ToolExecutor:
         
         self._logger = logging.getLogger("tool_executor")
     
+    def configure_tool(
+        self,
+        tool_id: str,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker_policy: Optional[CircuitBreakerPolicy] = None
+    ) -> None:
+        """Override the retry and/or circuit breaker policy for one tool"""
+        if retry_policy is not None:
+            self._tool_retry_policies[tool_id] = retry_policy
+            self._budgets.pop(tool_id, None)
+        if breaker_policy is not None:
+            self._tool_breaker_policies[tool_id] = breaker_policy
+            self._breakers.pop(tool_id, None)
+    
+    def get_retry_policy(self, tool_id: str) -> RetryPolicy:
+        """Retry policy in effect for a tool"""
+        return self._tool_retry_policies.get(tool_id, self.retry_policy)
+    
+    def get_circuit_breaker(self, tool_id: str) -> CircuitBreaker:
+        """Circuit breaker for a tool, created on first use"""
+        breaker = self._breakers.get(tool_id)
+        if breaker is None:
+            policy = self._tool_breaker_policies.get(tool_id, self.breaker_policy)
+            breaker = self._breakers[tool_id] = CircuitBreaker(policy, clock=self._clock)
+        return breaker
+    
+    def _get_retry_budget(self, tool_id: str) -> RetryBudget:
+        budget = self._budgets.get(tool_id)
+        if budget is None:
+            policy = self.get_retry_policy(tool_id)
+            budget = self._budgets[tool_id] = RetryBudget(policy.budget_ratio, policy.budget_min_retries)
+        return budget
+    
     async def execute(
         self,
         tool: IToolInterface,
@@ -247,10 +440,30 @@ class ToolExecutor:
         parameters: Dict[str, Any],
         context: ExecutionContext
     ) -> ExecutionResult:
-        """Execute with retry logic"""
+        """Execute with circuit breaker, retry budget and jittered backoff"""
+        tool_id = tool.metadata.id
+        policy = self.get_retry_policy(tool_id)
+        breaker = self.get_circuit_breaker(tool_id)
+        budget = self._get_retry_budget(tool_id)
+        budget.deposit()
+        
+        max_retries = min(context.max_retries, policy.max_retries)
+        delay = policy.base_delay
         last_error = None
         
-        for attempt in range(context.max_retries + 1):
+        for attempt in range(max_retries + 1):
+            if not breaker.allow_request():
+                if self.enable_statistics:
+                    self._stats["circuit_rejections"] += 1
+                return ExecutionResult.error_result(
+                    tool_id=tool_id,
+                    method=method,
+                    error=last_error or f"Circuit open for tool {tool_id}",
+                    context=context,
+                    circuit_open=True,
+                    circuit_state=breaker.state.value
+                )
+            
             try:
                 # Update context for retry
                 if attempt > 0:
@@ -259,12 +472,9 @@ class ToolExecutor:
                         self._stats["retried_executions"] += 1
                     
                     self._logger.debug(
-                        f"Retrying tool execution: {tool.metadata.id}.{method} "
-                        f"(attempt {attempt + 1}/{context.max_retries + 1})"
+                        f"Retrying tool execution: {tool_id}.{method} "
+                        f"(attempt {attempt + 1}/{max_retries + 1})"
                     )
-                    
-                    # Exponential backoff
-                    await asyncio.sleep(min(2 ** attempt, 10))
                 
                 # Execute with timeout
                 result = await asyncio.wait_for(
@@ -272,40 +482,58 @@ class ToolExecutor:
                     timeout=context.timeout
                 )
                 
+                # Failed results and non-retryable errors are returned as-is, but
+                # still count against the tool's health
+                if result.success:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
                 return result
                 
+            except asyncio.CancelledError:
+                breaker.record_cancelled()
+                raise
+                
             except asyncio.TimeoutError:
                 last_error = f"Tool execution timeout after {context.timeout}s"
                 if self.enable_statistics:
                     self._stats["timeout_executions"] += 1
                 
                 self._logger.warning(
-                    f"Tool execution timeout: {tool.metadata.id}.{method} "
+                    f"Tool execution timeout: {tool_id}.{method} "
                     f"(attempt {attempt + 1})"
                 )
                 
-                # Don't retry timeouts on final attempt
-                if attempt >= context.max_retries:
-                    break
-                    
             except Exception as e:
                 last_error = str(e)
                 self._logger.warning(
-                    f"Tool execution error: {tool.metadata.id}.{method} "
+                    f"Tool execution error: {tool_id}.{method} "
                     f"(attempt {attempt + 1}): {e}"
                 )
-                
-                # Check if error is retryable
-                if not self._is_retryable_error(e):
-                    break
+            
+            # Timeouts and retryable errors count against the tool's health
+            breaker.record_failure()
+            
+            if attempt >= max_retries:
+                break
+            if not budget.try_withdraw():
+                if self.enable_statistics:
+                    self._stats["retries_denied_by_budget"] += 1
+                self._logger.warning(f"Retry budget exhausted for tool {tool_id}")
+                break
+            
+            # Decorrelated jitter backoff
+            delay = policy.next_delay(delay, self._rng)
+            await self._sleep(delay)
         
         # All retries exhausted
         return ExecutionResult.error_result(
-            tool_id=tool.metadata.id,
+            tool_id=tool_id,
             method=method,
             error=last_error or "Unknown error",
             context=context,
-            retries_exhausted=True
+            retries_exhausted=True,
+            circuit_state=breaker.state.value
         )
     
     async def _execute_tool_method(
@@ -363,6 +591,10 @@ class ToolExecutor:
             # Use V2 error handling
             handle_error(e, f"tool_{tool.metadata.id}_{method}")
             
+            # Transient failures go back to the retry loop
+            if self._is_retryable_error(e):
+                raise
+            
             return ExecutionResult.error_result(
                 tool_id=tool.metadata.id,
                 method=method,
@@ -484,7 +716,14 @@ class ToolExecutor:
         
         return {
             "global": global_stats,
-            "per_tool": self._tool_stats.copy()
+            "per_tool": self._tool_stats.copy(),
+            "circuit_breakers": {
+                tool_id: breaker.snapshot() for tool_id, breaker in self._breakers.items()
+            },
+            "retry_budgets": {
+                tool_id: {"tokens": budget.tokens, "denied": budget.denied}
+                for tool_id, budget in self._budgets.items()
+            }
         }
     
     def reset_statistics(self):
@@ -495,7 +734,9 @@ class ToolExecutor:
             "failed_executions": 0,
             "retried_executions": 0,
             "timeout_executions": 0,
-            "total_execution_time": 0.0
+            "total_execution_time": 0.0,
+            "retries_denied_by_budget": 0,
+            "circuit_rejections": 0
         }
         self._tool_stats.clear()
         self._logger.info("Tool executor statistics reset")
@@ -362,15 +362,16 @@ class IToolRegistry(ABC):
         pass
     
     @abstractmethod
-    def search_tools(self, query: str) -> List[IToolInterface]:
+    def search_tools(self, query: str, limit: Optional[int] = None) -> List[IToolInterface]:
         """
         Search tools by description or functionality
         
         Args:
             query: Search query
+            limit: Maximum number of results
             
         Returns:
-            List of matching tools
+            List of matching tools, most relevant first
         """
         pass
     
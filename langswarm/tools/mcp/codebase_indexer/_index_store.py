@@ -0,0 +1,342 @@
+"""
+Persistent incremental index for the codebase indexer.
+
+Files are keyed on their path relative to the indexed root and fingerprinted
+by mtime, size and content hash, so repeat scans only re-parse files that
+actually changed. Re-parsing is fanned out across a process pool once enough
+files are dirty. The same SQLite database holds a BM25 inverted index over
+file names, symbols, docstrings and imports, which backs ``semantic_search``.
+"""
+
+import os
+import json
+import math
+import heapq
+import sqlite3
+import hashlib
+import logging
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = "1"
+
+# Index files live outside the analysed tree so scans never pick them up
+DEFAULT_INDEX_DIR = os.path.join("~", ".langswarm", "codebase_index")
+
+# Below this many dirty files the process pool start-up costs more than it saves
+PARALLEL_PARSE_THRESHOLD = 64
+
+# BM25 parameters and per-field term weights (name > symbols > docstrings > imports)
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'symbol': 2.0,
+    'docstring': 1.0,
+    'import': 0.5,
+}
+
+_WORD_RE = re.compile(r'[A-Za-z0-9]+')
+_CAMEL_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case search terms.
+
+    Identifiers are broken on underscores and camelCase boundaries, and the
+    whole identifier is kept as well so exact symbol queries still rank first.
+    """
+    tokens = []
+    for word in _WORD_RE.findall(text or ""):
+        tokens.append(word.lower())
+        parts = _CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return tokens
+
+
+def weighted_terms(rel_path: str, info: Dict[str, Any]) -> Counter:
+    """Build the weighted term frequencies indexed for one file"""
+    terms: Counter = Counter()
+
+    stem = os.path.splitext(os.path.basename(rel_path))[0]
+    for token in tokenize(stem):
+        terms[token] += FIELD_WEIGHTS['name']
+
+    for symbol in list(info.get('functions') or []) + list(info.get('classes') or []):
+        for token in tokenize(symbol):
+            terms[token] += FIELD_WEIGHTS['symbol']
+
+    for docstring in info.get('docstrings') or []:
+        for token in tokenize(docstring):
+            terms[token] += FIELD_WEIGHTS['docstring']
+
+    for module in info.get('imports') or []:
+        for token in tokenize(module):
+            terms[token] += FIELD_WEIGHTS['import']
+
+    return terms
+
+
+def default_index_path(root_path: str) -> str:
+    """Per-root index location, overridable with LANGSWARM_CODEBASE_INDEX_DIR"""
+    index_dir = os.getenv('LANGSWARM_CODEBASE_INDEX_DIR') or DEFAULT_INDEX_DIR
+    digest = hashlib.sha1(os.path.abspath(root_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(os.path.expanduser(index_dir), f"{digest}.sqlite")
+
+
+def _hash_file(file_path: str) -> Optional[str]:
+    """Content hash used to skip re-parsing files that were only touched"""
+    try:
+        with open(file_path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _parse_or_error(parse_file: Callable[[str], Dict[str, Any]],
+                    path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Run ``parse_file`` in a worker, returning the error instead of raising it"""
+    try:
+        return parse_file(path), None
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+
+
+class CodebaseIndex:
+    """SQLite-backed file index with incremental refresh and BM25 search.
+
+    ``parse_file`` receives an absolute path and returns a JSON-serialisable
+    dict describing the file. It must be a module-level function so it can be
+    shipped to worker processes.
+    """
+
+    def __init__(self, root_path: str, parse_file: Callable[[str], Dict[str, Any]],
+                 index_path: Optional[str] = None, max_workers: Optional[int] = None,
+                 parallel_threshold: int = PARALLEL_PARSE_THRESHOLD):
+        self.root_path = os.path.abspath(root_path)
+        self.parse_file = parse_file
+        self.index_path = index_path or default_index_path(self.root_path)
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
+        self.last_refresh_stats: Dict[str, int] = {}
+
+        if self.index_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        conn = self._conn
+        if self.index_path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row and row[0] != SCHEMA_VERSION:
+            # Stored FileInfo payloads are versioned with the parser; rebuild from scratch
+            conn.execute("DROP TABLE IF EXISTS files")
+            conn.execute("DROP TABLE IF EXISTS postings")
+
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT,
+                doc_length REAL NOT NULL DEFAULT 0,
+                info TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                path TEXT NOT NULL,
+                weight REAL NOT NULL,
+                PRIMARY KEY (term, path)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_path ON postings(path);
+        """)
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+            (SCHEMA_VERSION,)
+        )
+        conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    # ===== Refresh =====
+
+    def refresh(self, rel_paths: Iterable[str], prune: bool = False) -> List[str]:
+        """Bring the index up to date for ``rel_paths``.
+
+        Unchanged files cost a single ``stat``. Files whose mtime or size moved
+        are hashed, and only files whose content actually changed are parsed.
+        With ``prune`` the given paths are treated as the complete tree and
+        rows for anything else are dropped. Returns the paths that exist.
+        """
+        stored = {
+            path: (mtime_ns, size, content_hash)
+            for path, mtime_ns, size, content_hash in self._conn.execute(
+                "SELECT path, mtime_ns, size, content_hash FROM files"
+            )
+        }
+
+        present: List[str] = []
+        touched: List[Tuple[int, int, str]] = []
+        dirty: List[Tuple[str, os.stat_result, Optional[str]]] = []
+
+        for rel_path in rel_paths:
+            try:
+                st = os.stat(os.path.join(self.root_path, rel_path))
+            except OSError:
+                continue
+            present.append(rel_path)
+
+            previous = stored.get(rel_path)
+            if previous and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+                continue
+
+            content_hash = _hash_file(os.path.join(self.root_path, rel_path))
+            if previous and content_hash is not None and previous[2] == content_hash:
+                touched.append((st.st_mtime_ns, st.st_size, rel_path))
+            else:
+                dirty.append((rel_path, st, content_hash))
+
+        parsed = self._parse_all([rel_path for rel_path, _, _ in dirty])
+
+        removed: Set[str] = set()
+        if prune:
+            removed = set(stored) - set(present)
+
+        with self._conn:
+            if touched:
+                self._conn.executemany(
+                    "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?", touched
+                )
+            for rel_path, st, content_hash in dirty:
+                info = parsed.get(rel_path)
+                if info is None:
+                    continue
+                self._write_file(rel_path, st, content_hash, info)
+            for rel_path in removed:
+                self._conn.execute("DELETE FROM postings WHERE path = ?", (rel_path,))
+                self._conn.execute("DELETE FROM files WHERE path = ?", (rel_path,))
+
+        self.last_refresh_stats = {
+            'files': len(present),
+            'parsed': len(parsed),
+            'touched': len(touched),
+            'removed': len(removed),
+        }
+        return present
+
+    def _parse_all(self, rel_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Parse dirty files, fanning out across processes for large batches"""
+        if not rel_paths:
+            return {}
+
+        abs_paths = [os.path.join(self.root_path, p) for p in rel_paths]
+
+        if len(abs_paths) >= self.parallel_threshold and self.max_workers != 1:
+            try:
+                workers = self.max_workers or os.cpu_count() or 1
+                chunksize = max(1, len(abs_paths) // (workers * 4))
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(partial(_parse_or_error, self.parse_file),
+                                            abs_paths, chunksize=chunksize))
+            except Exception as e:
+                # Sandboxes without fork/semaphores, unpicklable parsers, ...
+                logger.warning(f"Parallel parsing unavailable, falling back to serial: {e}")
+            else:
+                # A file that fails to parse is skipped on its own; the rest of the batch stands
+                parsed = {}
+                for rel_path, (info, error) in zip(rel_paths, results):
+                    if error is not None:
+                        logger.debug(f"Skipping {rel_path}: {error}")
+                    else:
+                        parsed[rel_path] = info
+                return parsed
+
+        parsed = {}
+        for rel_path, abs_path in zip(rel_paths, abs_paths):
+            try:
+                parsed[rel_path] = self.parse_file(abs_path)
+            except Exception as e:
+                logger.debug(f"Skipping {rel_path}: {e}")
+        return parsed
+
+    def _write_file(self, rel_path: str, st: os.stat_result, content_hash: Optional[str],
+                    info: Dict[str, Any]):
+        terms = weighted_terms(rel_path, info)
+        self._conn.execute("DELETE FROM postings WHERE path = ?", (rel_path,))
+        self._conn.executemany(
+            "INSERT INTO postings (term, path, weight) VALUES (?, ?, ?)",
+            [(term, rel_path, weight) for term, weight in terms.items()]
+        )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, size, content_hash, doc_length, info) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (rel_path, st.st_mtime_ns, st.st_size, content_hash,
+             float(sum(terms.values())), json.dumps(info))
+        )
+
+    # ===== Lookup =====
+
+    def load(self, rel_paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the stored info dicts for ``rel_paths`` (in the given order)"""
+        wanted = list(rel_paths)
+        found: Dict[str, Dict[str, Any]] = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(wanted), 500):
+            batch = wanted[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            for path, info in self._conn.execute(
+                f"SELECT path, info FROM files WHERE path IN ({placeholders})", batch
+            ):
+                found[path] = json.loads(info)
+        return {path: found[path] for path in wanted if path in found}
+
+    def search(self, query: str, max_results: int = 10,
+               candidates: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """Rank indexed files against ``query`` with BM25.
+
+        ``candidates`` restricts results to a subset of paths, e.g. the files
+        that survived the current scan filters.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        total_docs, avg_length = self._conn.execute(
+            "SELECT COUNT(*), AVG(doc_length) FROM files"
+        ).fetchone()
+        if not total_docs:
+            return []
+        avg_length = avg_length or 1.0
+
+        scores: Dict[str, float] = defaultdict(float)
+        for term in terms:
+            rows = self._conn.execute(
+                "SELECT p.path, p.weight, f.doc_length FROM postings p "
+                "JOIN files f ON f.path = p.path WHERE p.term = ?",
+                (term,)
+            ).fetchall()
+            if not rows:
+                continue
+
+            doc_freq = len(rows)
+            idf = math.log(1.0 + (total_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+            for path, tf, doc_length in rows:
+                if candidates is not None and path not in candidates:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_length / avg_length)
+                scores[path] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        return heapq.nlargest(max_results, scores.items(), key=lambda item: item[1])
@@ -10,9 +10,10 @@ import ast
 import json
 import hashlib
 import re
+from contextlib import closing
 from typing import Dict, List, Optional, Any, Set, Tuple
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field, asdict
 from collections import defaultdict, Counter
 
 try:
@@ -26,6 +27,8 @@ from langswarm.tools.base import BaseTool
 from langswarm.tools.mcp.protocol_interface import MCPProtocolMixin
 from pydantic import BaseModel
 
+from ._index_store import CodebaseIndex
+
 # ===== MCP Tool Server Configuration =====
 server = BaseMCPToolServer(
     name="Enhanced Codebase Indexer",
@@ -102,6 +105,7 @@ class FileInfo:
     classes: List[str]
     imports: List[str]
     complexity: Optional[int] = None
+    docstrings: List[str] = field(default_factory=list)
     
 @dataclass
 class CodePattern:
@@ -126,11 +130,17 @@ class Dependency:
 class CodebaseAnalyzer:
     """Core engine for codebase analysis and intelligence"""
     
-    def __init__(self, root_path: str = "."):
+    def __init__(self, root_path: str = ".", index_path: Optional[str] = None,
+                 max_workers: Optional[int] = None):
         self.root_path = Path(root_path).resolve()
         self.file_cache: Dict[str, FileInfo] = {}
         self.dependency_cache: Dict[str, List[Dependency]] = {}
         
+        # Persistent index is opened lazily; ":memory:" keeps it process-local
+        self.index_path = index_path
+        self.max_workers = max_workers
+        self._index: Optional[CodebaseIndex] = None
+        
         # Supported file extensions for analysis
         self.code_extensions = {
             '.py', '.js', '.ts', '.java', '.cpp', '.c', '.h', 
@@ -180,29 +190,30 @@ class CodebaseAnalyzer:
                        max_results: int = 10) -> Dict[str, Any]:
         """Search codebase semantically by meaning and context"""
         
-        # Get relevant files
-        files = self._get_files_by_type(file_types)
+        # Refresh the index; unchanged files only cost a stat call
+        paths = self.index.refresh(self._collect_paths(), prune=True)
+        if file_types:
+            paths = [p for p in paths if Path(p).suffix in file_types]
         
-        # Perform semantic matching
-        results = []
-        query_lower = query.lower()
-        query_tokens = set(re.findall(r'\w+', query_lower))
+        # Rank with BM25 over names, symbols, docstrings and imports
+        ranked = self.index.search(query, max_results, candidates=set(paths))
+        infos = self.index.load(path for path, _ in ranked)
         
-        for file_path, file_info in files.items():
-            score = self._calculate_semantic_score(file_info, query_tokens, query_lower)
-            if score > 0:
-                results.append({
-                    'file': file_path,
-                    'score': score,
-                    'relevance_reason': self._explain_relevance(file_info, query_tokens),
-                    'preview': self._get_relevant_preview(file_path, query_tokens),
-                    'functions': file_info.functions,
-                    'classes': file_info.classes
-                })
+        results = []
+        query_tokens = set(re.findall(r'\w+', query.lower()))
         
-        # Sort by relevance
-        results.sort(key=lambda x: x['score'], reverse=True)
-        results = results[:max_results]
+        for file_path, score in ranked:
+            if file_path not in infos:
+                continue
+            file_info = FileInfo(**infos[file_path])
+            results.append({
+                'file': file_path,
+                'score': score,
+                'relevance_reason': self._explain_relevance(file_info, query_tokens),
+                'preview': self._get_relevant_preview(file_info.path, query_tokens),
+                'functions': file_info.functions,
+                'classes': file_info.classes
+            })
         
         return {
             'results': results,
@@ -313,58 +324,89 @@ class CodebaseAnalyzer:
     
     # ===== Helper Methods =====
     
+    @property
+    def index(self) -> CodebaseIndex:
+        """Persistent file index for this root, opened on first use"""
+        if self._index is None:
+            self._index = CodebaseIndex(
+                str(self.root_path),
+                parse_file=_parse_file_for_index,
+                index_path=self.index_path,
+                max_workers=self.max_workers
+            )
+        return self._index
+    
+    def close(self):
+        """Close the index database connection, if it was opened"""
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+    
     def _scan_files(self, max_depth: Optional[int] = None,
                    include_patterns: Optional[List[str]] = None,
                    exclude_patterns: Optional[List[str]] = None) -> Dict[str, FileInfo]:
-        """Scan and analyze all relevant files in the codebase"""
-        files = {}
+        """Scan all relevant files, re-analyzing only those changed since the last scan"""
+        full_scan = max_depth is None and include_patterns is None and exclude_patterns is None
+        paths = self._collect_paths(max_depth, include_patterns, exclude_patterns)
+        paths = self.index.refresh(paths, prune=full_scan)
+        
+        return {
+            rel_path: FileInfo(**info)
+            for rel_path, info in self.index.load(paths).items()
+        }
+    
+    def _collect_paths(self, max_depth: Optional[int] = None,
+                      include_patterns: Optional[List[str]] = None,
+                      exclude_patterns: Optional[List[str]] = None) -> List[str]:
+        """Walk the tree and return relative paths of code files passing the filters"""
+        paths = []
         
         exclude_patterns = exclude_patterns or [
             '__pycache__', '.git', 'node_modules', '.venv', 'venv',
             '*.pyc', '*.pyo', '*.pyd', '.DS_Store'
         ]
+        is_excluded = self._compile_patterns(exclude_patterns)
+        is_included = self._compile_patterns(include_patterns) if include_patterns else None
         
         for root, dirs, filenames in os.walk(self.root_path):
             # Apply depth limit
-            depth = len(Path(root).relative_to(self.root_path).parts)
+            rel_root = os.path.relpath(root, self.root_path)
+            depth = 0 if rel_root == '.' else len(Path(rel_root).parts)
             if max_depth and depth > max_depth:
                 continue
             
             # Filter directories
-            dirs[:] = [d for d in dirs if not any(
-                self._matches_pattern(d, pattern) for pattern in exclude_patterns
-            )]
+            dirs[:] = [d for d in dirs if not is_excluded(d)]
             
             for filename in filenames:
-                file_path = os.path.join(root, filename)
-                rel_path = os.path.relpath(file_path, self.root_path)
+                # Cheap extension check first; most files in large trees are not code
+                if os.path.splitext(filename)[1].lower() not in self.code_extensions:
+                    continue
+                
+                rel_path = filename if rel_root == '.' else os.path.join(rel_root, filename)
                 
                 # Apply inclusion/exclusion patterns
-                if exclude_patterns and any(
-                    self._matches_pattern(rel_path, pattern) for pattern in exclude_patterns
-                ):
+                if is_excluded(rel_path):
                     continue
                 
-                if include_patterns and not any(
-                    self._matches_pattern(rel_path, pattern) for pattern in include_patterns
-                ):
+                if is_included and not is_included(rel_path):
                     continue
                 
-                # Analyze file if it's a code file
-                if Path(filename).suffix.lower() in self.code_extensions:
-                    try:
-                        files[rel_path] = self._analyze_file(file_path)
-                    except Exception:
-                        # Skip files that can't be analyzed
-                        continue
+                paths.append(rel_path)
         
-        return files
+        return paths
     
     def _analyze_file(self, file_path: str) -> FileInfo:
         """Analyze a single file and extract metadata"""
         if file_path in self.file_cache:
             return self.file_cache[file_path]
         
+        file_info = self._parse_file(file_path)
+        self.file_cache[file_path] = file_info
+        return file_info
+    
+    def _parse_file(self, file_path: str) -> FileInfo:
+        """Read and parse a single file without consulting any cache"""
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
@@ -388,15 +430,16 @@ class CodebaseAnalyzer:
         functions = []
         classes = []
         imports = []
+        docstrings = []
         complexity = None
         
         if file_path.endswith('.py'):
-            functions, classes, imports, complexity = self._analyze_python_file(content)
+            functions, classes, imports, complexity, docstrings = self._analyze_python_file(content)
         elif file_path.endswith(('.js', '.ts')):
             functions, classes, imports = self._analyze_javascript_file(content)
         # Add more language analyzers as needed
         
-        file_info = FileInfo(
+        return FileInfo(
             path=file_path,
             name=os.path.basename(file_path),
             extension=Path(file_path).suffix,
@@ -405,22 +448,25 @@ class CodebaseAnalyzer:
             functions=functions,
             classes=classes,
             imports=imports,
-            complexity=complexity
+            complexity=complexity,
+            docstrings=docstrings
         )
-        
-        self.file_cache[file_path] = file_info
-        return file_info
     
-    def _analyze_python_file(self, content: str) -> Tuple[List[str], List[str], List[str], Optional[int]]:
-        """Analyze Python file for functions, classes, imports, and complexity"""
+    def _analyze_python_file(self, content: str) -> Tuple[List[str], List[str], List[str], Optional[int], List[str]]:
+        """Analyze Python file for functions, classes, imports, complexity, and docstrings"""
         functions = []
         classes = []
         imports = []
+        docstrings = []
         complexity = 0
         
         try:
             tree = ast.parse(content)
             
+            module_doc = ast.get_docstring(tree)
+            if module_doc:
+                docstrings.append(module_doc)
+            
             for node in ast.walk(tree):
                 if isinstance(node, ast.FunctionDef):
                     functions.append(node.name)
@@ -432,11 +478,16 @@ class CodebaseAnalyzer:
                         imports.extend([alias.name for alias in node.names])
                     else:
                         imports.append(node.module or '')
+                
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    doc = ast.get_docstring(node)
+                    if doc:
+                        docstrings.append(doc)
         except SyntaxError:
             # Handle files with syntax errors
             pass
         
-        return functions, classes, imports, complexity
+        return functions, classes, imports, complexity, docstrings
     
     def _analyze_javascript_file(self, content: str) -> Tuple[List[str], List[str], List[str]]:
         """Basic JavaScript/TypeScript analysis using regex patterns"""
@@ -483,43 +534,6 @@ class CodebaseAnalyzer:
         
         return complexity
     
-    def _calculate_semantic_score(self, file_info: FileInfo, query_tokens: Set[str], 
-                                query_lower: str) -> float:
-        """Calculate semantic relevance score for a file"""
-        score = 0.0
-        
-        # Check filename
-        filename_lower = file_info.name.lower()
-        if query_lower in filename_lower:
-            score += 0.5
-        
-        # Check function names
-        for func in file_info.functions:
-            func_lower = func.lower()
-            if query_lower in func_lower:
-                score += 0.3
-            # Token overlap
-            func_tokens = set(re.findall(r'\w+', func_lower))
-            overlap = len(query_tokens & func_tokens)
-            score += overlap * 0.1
-        
-        # Check class names
-        for cls in file_info.classes:
-            cls_lower = cls.lower()
-            if query_lower in cls_lower:
-                score += 0.3
-            # Token overlap
-            cls_tokens = set(re.findall(r'\w+', cls_lower))
-            overlap = len(query_tokens & cls_tokens)
-            score += overlap * 0.1
-        
-        # Check imports
-        for imp in file_info.imports:
-            if query_lower in imp.lower():
-                score += 0.2
-        
-        return score
-    
     def _explain_relevance(self, file_info: FileInfo, query_tokens: Set[str]) -> str:
         """Explain why a file is relevant to the search query"""
         reasons = []
@@ -850,16 +864,19 @@ class CodebaseAnalyzer:
         
         return entry_points
     
-    def _get_files_by_type(self, file_types: Optional[List[str]]) -> Dict[str, FileInfo]:
-        """Get files filtered by type"""
-        if not hasattr(self, '_all_files'):
-            self._all_files = self._scan_files()
-        
-        if not file_types:
-            return self._all_files
-        
-        return {path: info for path, info in self._all_files.items() 
-                if any(info.extension == ext for ext in file_types)}
+    def _compile_patterns(self, patterns: List[str]):
+        """Compile patterns into one matcher with the same semantics as _matches_pattern"""
+        import fnmatch
+        wildcards = [p for p in patterns if '*' in p]
+        substrings = [p for p in patterns if '*' not in p]
+        wildcard_re = re.compile('|'.join(fnmatch.translate(p) for p in wildcards)) if wildcards else None
+        
+        def matches(text: str) -> bool:
+            if any(p in text for p in substrings):
+                return True
+            return bool(wildcard_re and wildcard_re.match(text))
+        
+        return matches
     
     def _matches_pattern(self, text: str, pattern: str) -> bool:
         """Check if text matches a pattern (supports basic wildcards)"""
@@ -951,36 +968,41 @@ class CodebaseAnalyzer:
 
 # ===== MCP Handler Functions =====
 
+def _parse_file_for_index(file_path: str) -> Dict[str, Any]:
+    """Parse one file into a plain dict; module-level so process pools can pickle it"""
+    analyzer = CodebaseAnalyzer(os.path.dirname(file_path))
+    return asdict(analyzer._parse_file(file_path))
+
 def get_codebase_overview(root_path: str = ".", max_depth: Optional[int] = None,
                          include_patterns: Optional[List[str]] = None,
                          exclude_patterns: Optional[List[str]] = None) -> Dict[str, Any]:
     """Get comprehensive overview of the codebase"""
-    analyzer = CodebaseAnalyzer(root_path)
-    return analyzer.get_codebase_overview(max_depth, include_patterns, exclude_patterns)
+    with closing(CodebaseAnalyzer(root_path)) as analyzer:
+        return analyzer.get_codebase_overview(max_depth, include_patterns, exclude_patterns)
 
 def semantic_search(query: str, root_path: str = ".", file_types: Optional[List[str]] = None,
                    max_results: int = 10) -> Dict[str, Any]:
     """Search codebase semantically by meaning and context"""
-    analyzer = CodebaseAnalyzer(root_path)
-    return analyzer.semantic_search(query, file_types, max_results)
+    with closing(CodebaseAnalyzer(root_path)) as analyzer:
+        return analyzer.semantic_search(query, file_types, max_results)
 
 def analyze_patterns(root_path: str = ".", target_files: Optional[List[str]] = None,
                     pattern_types: Optional[List[str]] = None) -> Dict[str, Any]:
     """Detect architectural and design patterns"""
-    analyzer = CodebaseAnalyzer(root_path)
-    return analyzer.analyze_patterns(target_files, pattern_types)
+    with closing(CodebaseAnalyzer(root_path)) as analyzer:
+        return analyzer.analyze_patterns(target_files, pattern_types)
 
 def get_dependencies(file_path: str, include_external: bool = True, 
                     max_depth: int = 3, root_path: str = ".") -> Dict[str, Any]:
     """Analyze dependencies and relationships for a file"""
-    analyzer = CodebaseAnalyzer(root_path)
-    return analyzer.get_dependencies(file_path, include_external, max_depth)
+    with closing(CodebaseAnalyzer(root_path)) as analyzer:
+        return analyzer.get_dependencies(file_path, include_external, max_depth)
 
 def get_code_metrics(root_path: str = ".", target_files: Optional[List[str]] = None,
                     include_complexity: bool = True) -> Dict[str, Any]:
     """Calculate comprehensive code metrics"""
-    analyzer = CodebaseAnalyzer(root_path)
-    return analyzer.get_code_metrics(target_files, include_complexity)
+    with closing(CodebaseAnalyzer(root_path)) as analyzer:
+        return analyzer.get_code_metrics(target_files, include_complexity)
 
 # ===== MCP Server Task Registration =====
 
@@ -12,6 +12,7 @@ import time
 import uuid
 import asyncio
 import threading
+from collections import deque
 from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
@@ -58,6 +59,9 @@ class StartConsumerInput(BaseModel):
     poll_interval: int = Field(default=1, description="Polling interval in seconds")
     retry_attempts: int = Field(default=3, description="Number of retry attempts for failed tasks")
     task_timeout: int = Field(default=300, description="Task execution timeout in seconds")
+    batch_size: int = Field(default=10, description="Maximum messages pulled per broker receive")
+    prefetch_count: Optional[int] = Field(default=None, description="Messages buffered ahead of workers (defaults to batch_size)")
+    ack_batch_size: int = Field(default=50, description="Acks/nacks accumulated before flushing to the broker")
 
 
 class StartConsumerOutput(BaseModel):
@@ -154,6 +158,41 @@ class MessageBroker:
     async def get_queue_info(self, queue_name: str) -> Dict[str, Any]:
         """Get information about the queue"""
         raise NotImplementedError
+    
+    async def consume_batch(self, queue_name: str, max_messages: int = 10,
+                            timeout: int = 30) -> List[Dict[str, Any]]:
+        """Consume up to max_messages, waiting at most timeout for the first one.
+        
+        Brokers with a native batch receive should override this; the default
+        drains additional messages one at a time without blocking.
+        """
+        first = await self.consume_message(queue_name, timeout=timeout)
+        if first is None:
+            return []
+        
+        messages = [first]
+        while len(messages) < max_messages:
+            message = await self.consume_message(queue_name, timeout=0)
+            if message is None:
+                break
+            messages.append(message)
+        return messages
+    
+    async def acknowledge_batch(self, messages: List[Dict[str, Any]]) -> int:
+        """Acknowledge several messages, returning how many succeeded"""
+        acked = 0
+        for message in messages:
+            if await self.acknowledge_message(message):
+                acked += 1
+        return acked
+    
+    async def reject_batch(self, messages: List[Dict[str, Any]], requeue: bool = True) -> int:
+        """Reject several messages, returning how many succeeded"""
+        rejected = 0
+        for message in messages:
+            if await self.reject_message(message, requeue=requeue):
+                rejected += 1
+        return rejected
 
 
 class RedisBroker(MessageBroker):
@@ -189,10 +228,14 @@ class RedisBroker(MessageBroker):
             return None
         
         try:
-            # Use BLPOP for blocking pop with timeout
-            result = await self.redis_client.blpop(queue_name, timeout=timeout)
-            if result:
-                _, message_data = result
+            if timeout <= 0:
+                # BLPOP treats 0 as "block forever"; a zero timeout means don't wait
+                message_data = await self.redis_client.lpop(queue_name)
+            else:
+                # Use BLPOP for blocking pop with timeout
+                result = await self.redis_client.blpop(queue_name, timeout=timeout)
+                message_data = result[1] if result else None
+            if message_data:
                 message = json.loads(message_data.decode('utf-8'))
                 
                 # Add Redis-specific metadata
@@ -205,6 +248,33 @@ class RedisBroker(MessageBroker):
         
         return None
     
+    async def consume_batch(self, queue_name: str, max_messages: int = 10,
+                            timeout: int = 30) -> List[Dict[str, Any]]:
+        if not self.is_connected:
+            return []
+        
+        messages = []
+        if timeout > 0:
+            first = await self.consume_message(queue_name, timeout=timeout)
+            if first is None:
+                return []
+            messages.append(first)
+        
+        if len(messages) < max_messages:
+            try:
+                # LPOP with count drains the rest of the batch in one round-trip without blocking
+                raw = await self.redis_client.lpop(queue_name, max_messages - len(messages)) or []
+                consumed_at = time.time()
+                for message_data in raw:
+                    message = json.loads(message_data.decode('utf-8'))
+                    message['_redis_queue'] = queue_name
+                    message['_consumed_at'] = consumed_at
+                    messages.append(message)
+            except Exception as e:
+                print(f"Redis batch consume error: {e}")
+        
+        return messages
+    
     async def acknowledge_message(self, message: Dict[str, Any]) -> bool:
         # Redis list-based queues don't need explicit acknowledgment
         # Message is already removed from queue when consumed
@@ -267,51 +337,89 @@ class GCPPubSubBroker(MessageBroker):
             self.subscriber.close()
             self.is_connected = False
     
+    # Pull has no non-blocking mode and rejects a zero deadline, so "don't wait"
+    # is sent as this short deadline instead
+    NON_BLOCKING_PULL_DEADLINE = 1.0
+    
+    def _pull(self, queue_name: str, max_messages: int, timeout: float) -> list:
+        from google.api_core import exceptions as gcp_exceptions
+        
+        subscription_path = self.subscriber.subscription_path(self.project_id, queue_name)
+        try:
+            response = self.subscriber.pull(
+                request={"subscription": subscription_path, "max_messages": max_messages},
+                timeout=timeout if timeout > 0 else self.NON_BLOCKING_PULL_DEADLINE
+            )
+        except gcp_exceptions.DeadlineExceeded:
+            # Nothing arrived before the deadline: an empty subscription, not an error
+            return []
+        return list(response.received_messages)
+    
     async def consume_message(self, queue_name: str, timeout: int = 30) -> Optional[Dict[str, Any]]:
         if not self.is_connected:
             return None
         
         try:
-            subscription_path = self.subscriber.subscription_path(self.project_id, queue_name)
-            
-            # Pull a single message
-            response = self.subscriber.pull(
-                request={"subscription": subscription_path, "max_messages": 1},
-                timeout=timeout
-            )
-            
-            if response.received_messages:
-                received_message = response.received_messages[0]
-                message_data = json.loads(received_message.message.data.decode('utf-8'))
-                
-                # Add Pub/Sub specific metadata
-                message_data['_pubsub_ack_id'] = received_message.ack_id
-                message_data['_pubsub_message_id'] = received_message.message.message_id
-                message_data['_consumed_at'] = time.time()
-                
-                return message_data
+            received = self._pull(queue_name, 1, timeout)
+            if received:
+                return self._decode_message(received[0], queue_name)
                 
         except Exception as e:
             print(f"GCP Pub/Sub consume error: {e}")
         
         return None
     
-    async def acknowledge_message(self, message: Dict[str, Any]) -> bool:
+    async def consume_batch(self, queue_name: str, max_messages: int = 10,
+                            timeout: int = 30) -> List[Dict[str, Any]]:
+        if not self.is_connected:
+            return []
+        
         try:
+            return [self._decode_message(received, queue_name)
+                    for received in self._pull(queue_name, max_messages, timeout)]
+        except Exception as e:
+            print(f"GCP Pub/Sub consume error: {e}")
+        
+        return []
+    
+    def _decode_message(self, received_message, queue_name: str) -> Dict[str, Any]:
+        message_data = json.loads(received_message.message.data.decode('utf-8'))
+        
+        # Add Pub/Sub specific metadata
+        message_data['_pubsub_ack_id'] = received_message.ack_id
+        message_data['_pubsub_message_id'] = received_message.message.message_id
+        message_data['_pubsub_subscription'] = queue_name
+        message_data['_consumed_at'] = time.time()
+        
+        return message_data
+    
+    async def acknowledge_message(self, message: Dict[str, Any]) -> bool:
+        return await self.acknowledge_batch([message]) == 1
+    
+    async def acknowledge_batch(self, messages: List[Dict[str, Any]]) -> int:
+        if not self.is_connected:
+            return 0
+        
+        # One acknowledge RPC per subscription instead of one per message
+        ack_ids_by_subscription: Dict[str, List[str]] = {}
+        for message in messages:
             ack_id = message.get('_pubsub_ack_id')
-            if ack_id and self.is_connected:
-                subscription_path = self.subscriber.subscription_path(
-                    self.project_id, 
-                    message.get('_pubsub_subscription', 'default')
-                )
+            if ack_id:
+                subscription = message.get('_pubsub_subscription', 'default')
+                ack_ids_by_subscription.setdefault(subscription, []).append(ack_id)
+        
+        acked = 0
+        for subscription, ack_ids in ack_ids_by_subscription.items():
+            try:
+                subscription_path = self.subscriber.subscription_path(self.project_id, subscription)
                 self.subscriber.acknowledge(
-                    request={"subscription": subscription_path, "ack_ids": [ack_id]}
+                    request={"subscription": subscription_path, "ack_ids": ack_ids}
                 )
-                return True
-        except Exception as e:
-            print(f"GCP Pub/Sub ack error: {e}")
+                acked += len(ack_ids)
+            except Exception as e:
+                print(f"GCP Pub/Sub ack error: {e}")
         
-        return False
+        return acked
     
     async def reject_message(self, message: Dict[str, Any], requeue: bool = True) -> bool:
         # GCP Pub/Sub automatically requeues unacknowledged messages
@@ -337,12 +445,22 @@ class GCPPubSubBroker(MessageBroker):
 
 
 class InMemoryBroker(MessageBroker):
-    """In-memory message broker for testing and development"""
+    """In-memory message broker for testing and development
+    
+    Consumers wait on a per-queue event instead of polling, so an idle
+    consumer costs no CPU and wakes as soon as a message is published.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.queues = {}
-        self.queue_lock = asyncio.Lock()
+        self.queues: Dict[str, deque] = {}
+        self._not_empty: Dict[str, asyncio.Event] = {}
+    
+    def _queue(self, queue_name: str) -> deque:
+        if queue_name not in self.queues:
+            self.queues[queue_name] = deque()
+            self._not_empty[queue_name] = asyncio.Event()
+        return self.queues[queue_name]
     
     async def connect(self) -> bool:
         self.is_connected = True
@@ -351,60 +469,80 @@ class InMemoryBroker(MessageBroker):
     async def disconnect(self):
         self.is_connected = False
     
+    async def publish(self, queue_name: str, message: Dict[str, Any]):
+        """Append a message to the queue and wake waiting consumers"""
+        await self.publish_batch(queue_name, [message])
+    
+    async def publish_batch(self, queue_name: str, messages: List[Dict[str, Any]]):
+        """Append several messages to the queue and wake waiting consumers"""
+        queue = self._queue(queue_name)
+        queue.extend(messages)
+        if queue:
+            self._not_empty[queue_name].set()
+    
     async def consume_message(self, queue_name: str, timeout: int = 30) -> Optional[Dict[str, Any]]:
+        messages = await self.consume_batch(queue_name, max_messages=1, timeout=timeout)
+        return messages[0] if messages else None
+    
+    async def consume_batch(self, queue_name: str, max_messages: int = 10,
+                            timeout: int = 30) -> List[Dict[str, Any]]:
         if not self.is_connected:
-            return None
+            return []
         
-        # Poll for messages with timeout
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            async with self.queue_lock:
-                if queue_name not in self.queues:
-                    self.queues[queue_name] = []
-                
-                if self.queues[queue_name]:
-                    message = self.queues[queue_name].pop(0)
-                    message['_memory_queue'] = queue_name
-                    message['_consumed_at'] = time.time()
-                    return message
-            
-            # Wait a bit before next poll
-            await asyncio.sleep(0.1)
+        queue = self._queue(queue_name)
+        if not queue:
+            if timeout <= 0:
+                return []
+            not_empty = self._not_empty[queue_name]
+            not_empty.clear()
+            try:
+                await asyncio.wait_for(not_empty.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return []
         
-        return None
+        consumed_at = time.time()
+        messages = []
+        while queue and len(messages) < max_messages:
+            message = queue.popleft()
+            message['_memory_queue'] = queue_name
+            message['_consumed_at'] = consumed_at
+            messages.append(message)
+        return messages
     
     async def acknowledge_message(self, message: Dict[str, Any]) -> bool:
         # In-memory broker doesn't need explicit acknowledgment
         return True
     
+    async def acknowledge_batch(self, messages: List[Dict[str, Any]]) -> int:
+        return len(messages)
+    
     async def reject_message(self, message: Dict[str, Any], requeue: bool = True) -> bool:
-        if requeue and self.is_connected:
-            async with self.queue_lock:
-                queue_name = message.get('_memory_queue')
-                if queue_name:
-                    message_copy = message.copy()
-                    message_copy.pop('_memory_queue', None)
-                    message_copy.pop('_consumed_at', None)
-                    
-                    if queue_name not in self.queues:
-                        self.queues[queue_name] = []
-                    
-                    # Re-add to front for immediate retry
-                    self.queues[queue_name].insert(0, message_copy)
-                    return True
+        return await self.reject_batch([message], requeue=requeue) == 1
+    
+    async def reject_batch(self, messages: List[Dict[str, Any]], requeue: bool = True) -> int:
+        if not (requeue and self.is_connected):
+            return 0
         
-        return False
+        requeued = 0
+        # Re-add to front for immediate retry, preserving the batch order
+        for message in reversed(messages):
+            queue_name = message.get('_memory_queue')
+            if not queue_name:
+                continue
+            message_copy = message.copy()
+            message_copy.pop('_memory_queue', None)
+            message_copy.pop('_consumed_at', None)
+            self._queue(queue_name).appendleft(message_copy)
+            self._not_empty[queue_name].set()
+            requeued += 1
+        return requeued
     
     async def get_queue_info(self, queue_name: str) -> Dict[str, Any]:
-        async with self.queue_lock:
-            if queue_name not in self.queues:
-                self.queues[queue_name] = []
-            
-            return {
-                "queue_name": queue_name,
-                "message_count": len(self.queues[queue_name]),
-                "broker_type": "in_memory"
-            }
+        return {
+            "queue_name": queue_name,
+            "message_count": len(self._queue(queue_name)),
+            "broker_type": "in_memory"
+        }
 
 
 class TaskProcessor:
@@ -594,7 +732,9 @@ class MessageQueueConsumer:
     
     def __init__(self, consumer_id: str, broker: MessageBroker, queue_name: str, 
                  max_workers: int = 5, poll_interval: int = 1, retry_attempts: int = 3,
-                 task_timeout: int = 300):
+                 task_timeout: int = 300, batch_size: int = 10,
+                 prefetch_count: Optional[int] = None, ack_batch_size: int = 50,
+                 ack_flush_interval: float = 0.5):
         self.consumer_id = consumer_id
         self.broker = broker
         self.queue_name = queue_name
@@ -602,6 +742,10 @@ class MessageQueueConsumer:
         self.poll_interval = poll_interval
         self.retry_attempts = retry_attempts
         self.task_timeout = task_timeout
+        self.batch_size = max(1, batch_size)
+        self.prefetch_count = max(1, prefetch_count or self.batch_size)
+        self.ack_batch_size = max(1, ack_batch_size)
+        self.ack_flush_interval = ack_flush_interval
         
         self.status = ConsumerStatus.STOPPED
         self.start_time = None
@@ -610,6 +754,17 @@ class MessageQueueConsumer:
         self.active_workers = set()
         self.processor = TaskProcessor(consumer_id)
         
+        # Worker slots: the loop blocks on acquire and wakes exactly when one frees
+        self._capacity = asyncio.Semaphore(max_workers)
+        # Set while running; pause clears it so the loop sleeps without polling
+        self._running = asyncio.Event()
+        # Messages received ahead of worker capacity
+        self._prefetch: deque = deque()
+        # Outcomes waiting to be flushed to the broker in batches
+        self._pending_acks: List[Dict[str, Any]] = []
+        self._pending_rejects: List[Dict[str, Any]] = []
+        self._ack_flusher = None
+        
         # Statistics
         self.stats = {
             "tasks_processed": 0,
@@ -635,7 +790,9 @@ class MessageQueueConsumer:
         # Start consumer loop
         self.start_time = time.time()
         self.stop_event.clear()
+        self._running.set()
         self.consumer_task = asyncio.create_task(self._consume_loop())
+        self._ack_flusher = asyncio.create_task(self._ack_flush_loop())
         self.status = ConsumerStatus.RUNNING
         
         return True
@@ -647,17 +804,23 @@ class MessageQueueConsumer:
         
         self.stop_event.set()
         
+        for task in (self.consumer_task, self._ack_flusher):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        
         if graceful and self.active_workers:
             # Wait for active workers to complete
-            while self.active_workers:
-                await asyncio.sleep(0.1)
+            await asyncio.gather(*list(self.active_workers), return_exceptions=True)
         
-        if self.consumer_task:
-            self.consumer_task.cancel()
-            try:
-                await self.consumer_task
-            except asyncio.CancelledError:
-                pass
+        # Hand prefetched but unprocessed messages back to the broker
+        if self._prefetch:
+            self._pending_rejects.extend(self._prefetch)
+            self._prefetch.clear()
+        await self._flush_acks()
         
         await self.broker.disconnect()
         self.status = ConsumerStatus.STOPPED
@@ -668,46 +831,104 @@ class MessageQueueConsumer:
         """Pause the consumer"""
         if self.status == ConsumerStatus.RUNNING:
             self.status = ConsumerStatus.PAUSED
+            self._running.clear()
     
     async def resume(self):
         """Resume the consumer"""
         if self.status == ConsumerStatus.PAUSED:
             self.status = ConsumerStatus.RUNNING
+            self._running.set()
     
     async def _consume_loop(self):
         """Main consumer loop"""
         while not self.stop_event.is_set():
             try:
-                if self.status != ConsumerStatus.RUNNING:
-                    await asyncio.sleep(self.poll_interval)
-                    continue
+                await self._running.wait()
                 
-                # Check if we have capacity for more workers
-                if len(self.active_workers) >= self.max_workers:
-                    await asyncio.sleep(0.1)
-                    continue
+                # Block until a worker slot frees up
+                await self._capacity.acquire()
                 
-                # Try to consume a message
-                message = await self.broker.consume_message(self.queue_name, timeout=self.poll_interval)
+                try:
+                    message = await self._next_message()
+                except BaseException:
+                    self._capacity.release()
+                    raise
                 
-                if message:
-                    # Process message in a separate worker
-                    worker_task = asyncio.create_task(self._process_message_worker(message))
-                    self.active_workers.add(worker_task)
+                if message is None:
+                    self._capacity.release()
+                    continue
                 
-                # Clean up completed workers
-                completed_workers = [w for w in self.active_workers if w.done()]
-                for worker in completed_workers:
-                    self.active_workers.remove(worker)
-                    try:
-                        await worker  # Ensure exceptions are handled
-                    except Exception as e:
-                        print(f"Worker error: {e}")
+                # Process message in a separate worker; the done-callback reaps it
+                worker_task = asyncio.create_task(self._process_message_worker(message))
+                self.active_workers.add(worker_task)
+                worker_task.add_done_callback(self._on_worker_done)
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 print(f"Consumer loop error: {e}")
                 await asyncio.sleep(self.poll_interval)
     
+    async def _next_message(self) -> Optional[Dict[str, Any]]:
+        """Pop from the prefetch buffer, topping it up to prefetch_count in batch receives.
+        
+        The buffer is refilled once it is empty or has room for a whole batch;
+        only a receive into an empty buffer waits for messages.
+        """
+        if not self._prefetch or len(self._prefetch) + self.batch_size <= self.prefetch_count:
+            while len(self._prefetch) < self.prefetch_count:
+                wanted = min(self.batch_size, self.prefetch_count - len(self._prefetch))
+                messages = await self.broker.consume_batch(
+                    self.queue_name,
+                    max_messages=wanted,
+                    timeout=0 if self._prefetch else self.poll_interval
+                )
+                self._prefetch.extend(messages)
+                if len(messages) < wanted:
+                    break
+        
+        return self._prefetch.popleft() if self._prefetch else None
+    
+    def _on_worker_done(self, worker: asyncio.Task):
+        """Release the worker's slot and surface unexpected errors"""
+        self.active_workers.discard(worker)
+        self._capacity.release()
+        
+        if not worker.cancelled() and worker.exception() is not None:
+            print(f"Worker error: {worker.exception()}")
+    
+    async def _ack_flush_loop(self):
+        """Flush partially filled ack/nack batches on a fixed interval"""
+        while not self.stop_event.is_set():
+            await asyncio.sleep(self.ack_flush_interval)
+            await self._flush_acks()
+    
+    async def _flush_acks(self):
+        """Send pending acknowledgements and rejections to the broker in batches"""
+        if self._pending_acks:
+            acks, self._pending_acks = self._pending_acks, []
+            try:
+                await self.broker.acknowledge_batch(acks)
+            except Exception as e:
+                print(f"Batch acknowledge error: {e}")
+        
+        if self._pending_rejects:
+            rejects, self._pending_rejects = self._pending_rejects, []
+            try:
+                await self.broker.reject_batch(rejects, requeue=True)
+            except Exception as e:
+                print(f"Batch reject error: {e}")
+    
+    async def _settle(self, message: Dict[str, Any], success: bool):
+        """Queue a message outcome, flushing once a full batch has accumulated"""
+        if success:
+            self._pending_acks.append(message)
+        else:
+            self._pending_rejects.append(message)
+        
+        if len(self._pending_acks) + len(self._pending_rejects) >= self.ack_batch_size:
+            await self._flush_acks()
+    
     async def _process_message_worker(self, message: Dict[str, Any]):
         """Worker that processes a single message"""
         start_time = time.time()
@@ -721,23 +942,21 @@ class MessageQueueConsumer:
             )
             
             if result.get("status") == "completed":
-                await self.broker.acknowledge_message(message)
                 success = True
                 self.stats["tasks_processed"] += 1
             else:
-                await self.broker.reject_message(message, requeue=True)
                 self.stats["tasks_failed"] += 1
             
         except asyncio.TimeoutError:
             print(f"Task timeout for consumer {self.consumer_id}")
-            await self.broker.reject_message(message, requeue=True)
             self.stats["tasks_failed"] += 1
             
         except Exception as e:
             print(f"Task processing error: {e}")
-            await self.broker.reject_message(message, requeue=True)
             self.stats["tasks_failed"] += 1
         
+        await self._settle(message, success)
+        
         # Update statistics
         processing_time = time.time() - start_time
         self.stats["total_processing_time"] += processing_time
@@ -761,7 +980,9 @@ def create_broker(broker_type: BrokerType, config: Dict[str, Any]) -> MessageBro
 
 async def start_consumer(consumer_id: str, broker_type: BrokerType, broker_config: Dict[str, Any],
                         queue_name: str, max_workers: int = 5, poll_interval: int = 1,
-                        retry_attempts: int = 3, task_timeout: int = 300) -> Dict[str, Any]:
+                        retry_attempts: int = 3, task_timeout: int = 300, batch_size: int = 10,
+                        prefetch_count: Optional[int] = None,
+                        ack_batch_size: int = 50) -> Dict[str, Any]:
     """Start a message queue consumer"""
     
     if consumer_id in ACTIVE_CONSUMERS:
@@ -784,7 +1005,10 @@ async def start_consumer(consumer_id: str, broker_type: BrokerType, broker_confi
             max_workers=max_workers,
             poll_interval=poll_interval,
             retry_attempts=retry_attempts,
-            task_timeout=task_timeout
+            task_timeout=task_timeout,
+            batch_size=batch_size,
+            prefetch_count=prefetch_count,
+            ack_batch_size=ack_batch_size
         )
         
         # Start consumer
@@ -984,8 +1208,8 @@ server.add_task(
     description="Start a message queue consumer for polling and processing tasks",
     input_model=StartConsumerInput,
     output_model=StartConsumerOutput,
-    handler=async_handler(lambda consumer_id, broker_type, broker_config, queue_name, max_workers=5, poll_interval=1, retry_attempts=3, task_timeout=300:
-        start_consumer(consumer_id, broker_type, broker_config, queue_name, max_workers, poll_interval, retry_attempts, task_timeout))
+    handler=async_handler(lambda consumer_id, broker_type, broker_config, queue_name, max_workers=5, poll_interval=1, retry_attempts=3, task_timeout=300, batch_size=10, prefetch_count=None, ack_batch_size=50:
+        start_consumer(consumer_id, broker_type, broker_config, queue_name, max_workers, poll_interval, retry_attempts, task_timeout, batch_size, prefetch_count, ack_batch_size))
 )
 
 server.add_task(
@@ -6,10 +6,14 @@ and comprehensive tool management capabilities.
 """
 
 import os
+import bisect
+import heapq
 import importlib
 import inspect
 import json
-from typing import Any, Dict, List, Optional, Set
+import math
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
 from pathlib import Path
 from datetime import datetime
 import logging
@@ -29,6 +33,137 @@ from .adapters.mcp_adapter import auto_adapt_mcp_tools
 logger = logging.getLogger(__name__)
 
 
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z]|\d|\b)|[A-Z]?[a-z]+|\d+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens; camelCase and snake_case words are also split into parts"""
+    if not text:
+        return []
+    tokens = _WORD_RE.findall(text.lower())
+    parts = [part.lower() for part in _CAMEL_RE.findall(text)]
+    if parts != tokens:
+        tokens.extend(part for part in parts if part not in tokens)
+    return tokens
+
+
+class ToolSearchIndex:
+    """
+    Inverted index over tool metadata, ranked with BM25F.
+    
+    Each tool is indexed under four fields whose term frequencies are
+    weighted by FIELD_BOOSTS before BM25 saturation, so a hit in the name
+    outranks one in the description, which outranks one in a method schema.
+    Query terms also match indexed terms they are a prefix of, at a discount.
+    """
+    
+    FIELD_BOOSTS = {"name": 3.0, "tags": 2.0, "description": 1.5, "methods": 1.0}
+    K1 = 1.2
+    B = 0.75
+    PREFIX_WEIGHT = 0.5
+    MAX_PREFIX_EXPANSIONS = 50
+    
+    def __init__(self):
+        # term -> tool_id -> field -> term frequency
+        self._postings: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._doc_lengths: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Set[str]] = {}
+        self._field_totals: Dict[str, int] = {field: 0 for field in self.FIELD_BOOSTS}
+        self._vocabulary: List[str] = []  # sorted, for prefix lookups
+    
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+    
+    @staticmethod
+    def _fields(tool: IToolInterface) -> Dict[str, List[str]]:
+        metadata = tool.metadata
+        method_tokens: List[str] = []
+        for schema in metadata.methods.values():
+            method_tokens.extend(tokenize(schema.name))
+            method_tokens.extend(tokenize(schema.description))
+        return {
+            "name": tokenize(metadata.name) + tokenize(metadata.id),
+            "tags": [token for tag in metadata.tags for token in tokenize(tag)],
+            "description": tokenize(metadata.description),
+            "methods": method_tokens,
+        }
+    
+    def add(self, tool: IToolInterface) -> None:
+        tool_id = tool.metadata.id
+        if tool_id in self._doc_lengths:
+            self.remove(tool_id)
+        
+        lengths = {}
+        terms = set()
+        for field, tokens in self._fields(tool).items():
+            lengths[field] = len(tokens)
+            self._field_totals[field] += len(tokens)
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    bisect.insort(self._vocabulary, token)
+                fields = postings.setdefault(tool_id, {})
+                fields[field] = fields.get(field, 0) + 1
+                terms.add(token)
+        self._doc_lengths[tool_id] = lengths
+        self._doc_terms[tool_id] = terms
+    
+    def remove(self, tool_id: str) -> None:
+        lengths = self._doc_lengths.pop(tool_id, None)
+        if lengths is None:
+            return
+        for field, length in lengths.items():
+            self._field_totals[field] -= length
+        
+        for term in self._doc_terms.pop(tool_id):
+            postings = self._postings[term]
+            del postings[tool_id]
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+    
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Indexed terms matching a query token: exact match plus prefix matches"""
+        matches = []
+        if token in self._postings:
+            matches.append((token, 1.0))
+        start = bisect.bisect_right(self._vocabulary, token)
+        for term in self._vocabulary[start:start + self.MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            matches.append((term, self.PREFIX_WEIGHT))
+        return matches
+    
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Return (tool_id, score) pairs, best first"""
+        n_docs = len(self._doc_lengths)
+        if not n_docs:
+            return []
+        
+        avg_lengths = {
+            field: (total / n_docs) or 1.0 for field, total in self._field_totals.items()
+        }
+        scores: Dict[str, float] = {}
+        
+        for token in dict.fromkeys(tokenize(query)):
+            for term, weight in self._expand(token):
+                postings = self._postings[term]
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for tool_id, fields in postings.items():
+                    lengths = self._doc_lengths[tool_id]
+                    tf = 0.0
+                    for field, freq in fields.items():
+                        norm = 1 - self.B + self.B * lengths[field] / avg_lengths[field]
+                        tf += self.FIELD_BOOSTS[field] * freq / norm
+                    scores[tool_id] = scores.get(tool_id, 0.0) + weight * idf * tf / (self.K1 + tf)
+        
+        if limit is not None:
+            return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
 class ToolRegistry(IToolRegistry):
     """
     Modern tool registry with auto-discovery and service management (Singleton).
@@ -63,6 +198,7 @@ class ToolRegistry(IToolRegistry):
         self._tool_types: Dict[ToolType, Set[str]] = {tool_type: set() for tool_type in ToolType}
         self._capabilities: Dict[ToolCapability, Set[str]] = {cap: set() for cap in ToolCapability}
         self._tags: Dict[str, Set[str]] = {}
+        self._search_index = ToolSearchIndex()
         self._logger = logging.getLogger(f"registry.{name}")
         
         # Statistics
@@ -103,6 +239,8 @@ class ToolRegistry(IToolRegistry):
                     self._tags[tag] = set()
                 self._tags[tag].add(tool_id)
             
+            self._search_index.add(tool)
+            
             self._successful_registrations += 1
             self._logger.info(f"Registered tool: {tool_id} ({tool.metadata.tool_type.value})")
             return True
@@ -145,6 +283,8 @@ class ToolRegistry(IToolRegistry):
                     if not self._tags[tag]:
                         del self._tags[tag]
             
+            self._search_index.remove(tool_id)
+            
             # Cleanup tool
             try:
                 if hasattr(tool, 'cleanup'):
@@ -216,31 +356,18 @@ class ToolRegistry(IToolRegistry):
         
         return [self._tools[tool_id] for tool_id in tool_ids]
     
-    def search_tools(self, query: str) -> List[IToolInterface]:
-        """Search tools by description or functionality"""
-        query_lower = query.lower()
-        matching_tools = []
+    def search_tools(self, query: str, limit: Optional[int] = None) -> List[IToolInterface]:
+        """
+        Search tools by name, tags, description or method schemas.
         
-        for tool in self._tools.values():
-            # Search in name and description
-            if (query_lower in tool.metadata.name.lower() or 
-                query_lower in tool.metadata.description.lower()):
-                matching_tools.append(tool)
-                continue
-            
-            # Search in tags
-            if any(query_lower in tag.lower() for tag in tool.metadata.tags):
-                matching_tools.append(tool)
-                continue
-            
-            # Search in method names and descriptions
-            for method_schema in tool.metadata.methods.values():
-                if (query_lower in method_schema.name.lower() or
-                    query_lower in method_schema.description.lower()):
-                    matching_tools.append(tool)
-                    break
+        Results are ranked by BM25 relevance (see ToolSearchIndex). An empty
+        query returns every tool.
+        """
+        if not query.strip():
+            tools = list(self._tools.values())
+            return tools[:limit] if limit is not None else tools
         
-        return matching_tools
+        return [self._tools[tool_id] for tool_id, _ in self._search_index.search(query, limit)]
     
     @property
     def tool_count(self) -> int:
@@ -418,11 +545,11 @@ class ServiceRegistry:
         
         return None
     
-    def search_all_tools(self, query: str) -> Dict[str, List[IToolInterface]]:
+    def search_all_tools(self, query: str, limit: Optional[int] = None) -> Dict[str, List[IToolInterface]]:
         """Search tools across all registries"""
         results = {}
         for registry_name, registry in self._registries.items():
-            tools = registry.search_tools(query)
+            tools = registry.search_tools(query, limit=limit)
             if tools:
                 results[registry_name] = tools
         
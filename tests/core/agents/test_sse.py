@@ -0,0 +1,139 @@
+import asyncio
+import time
+
+import pytest
+
+from langswarm.core.agents.realtime import (
+    RealtimeConfiguration, RealtimeEvent, SSEHandler, SSEOverflowPolicy, SSEStream,
+    StreamingChunk, StreamingType,
+)
+
+
+class RecordingClient:
+    def __init__(self):
+        self.frames = []
+        self.received_at = []
+
+    async def __call__(self, frame):
+        self.frames.append(frame)
+        self.received_at.append(time.perf_counter())
+
+
+class StalledClient:
+    """Accepts the first frame, then never returns"""
+
+    def __init__(self):
+        self.frames = []
+        self._never = asyncio.Event()
+
+    async def __call__(self, frame):
+        self.frames.append(frame)
+        await self._never.wait()
+
+
+async def _handler(sender, **config):
+    handler = SSEHandler("agent", RealtimeConfiguration(**config), sender=sender)
+    await handler.start_stream("agent")
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_stalled_client_does_not_delay_other_subscribers():
+    manager = SSEStream(RealtimeConfiguration())
+    clients = [RecordingClient() for _ in range(999)]
+    stalled = StalledClient()
+    handlers = []
+    for i, client in enumerate([stalled] + clients):
+        handler = await _handler(client, sse_queue_size=16, sse_drain_timeout=0.1)
+        manager.add_stream(f"agent-{i}", handler)
+        handlers.append(handler)
+
+    start = time.perf_counter()
+    for n in range(50):
+        sent = await manager.broadcast_event(RealtimeEvent(data={"n": n}))
+        assert sent == 1000
+        await asyncio.sleep(0)
+    broadcast_time = time.perf_counter() - start
+
+    deadline = time.perf_counter() + 2.0
+    while any(len(c.frames) < 51 for c in clients) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+
+    # stream_start + 50 events, in order, for every healthy client
+    assert all(len(c.frames) == 51 for c in clients)
+    assert all('"n": 49' in c.frames[-1] for c in clients)
+    assert max(c.received_at[-1] for c in clients) - start < 1.0
+    assert broadcast_time < 1.0
+
+    stats = await handlers[0].get_statistics()
+    assert stats["queue_sizes"]["outbound"] == 16
+    assert stats["max_queue_depth"] == 16
+    assert stats["frames_dropped"] == 51 - 1 - 16
+    manager_stats = await manager.get_statistics()
+    assert manager_stats["frames_dropped"] == stats["frames_dropped"]
+
+    await asyncio.gather(*(handler.stop_stream() for handler in handlers))
+    assert all(c.frames[-1].startswith("event: stream_end") for c in clients)
+    assert all(handler._stream_task is None for handler in handlers)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_merges_text_deltas_when_full():
+    stalled = StalledClient()
+    handler = await _handler(stalled, sse_queue_size=2, sse_overflow_policy=SSEOverflowPolicy.COALESCE,
+                             sse_drain_timeout=0.05)
+    await asyncio.sleep(0)  # writer takes stream_start and stalls
+
+    for i, text in enumerate(["Hel", "lo", ", ", "world"]):
+        await handler.send_chunk(StreamingChunk(
+            type=StreamingType.TEXT_DELTA, content=text, index=i, metadata={"message_id": "m1"}
+        ))
+
+    assert handler.queue_depth == 2
+    assert [chunk.content for chunk in handler._outbound] == ["Hel", "lo, world"]
+    assert handler._stats["frames_coalesced"] == 2
+    assert handler._stats["frames_dropped"] == 0
+
+    # stream_end pushes out the oldest delta; the stalled client never takes the rest
+    await handler.stop_stream()
+    assert handler._stream_task is None and handler.queue_depth == 0
+    assert handler._stats["frames_dropped"] == 3
+
+
+@pytest.mark.asyncio
+async def test_disconnect_policy_closes_slow_client():
+    stalled = StalledClient()
+    handler = await _handler(stalled, sse_queue_size=3, sse_overflow_policy=SSEOverflowPolicy.DISCONNECT)
+    await asyncio.sleep(0)
+    writer = handler._stream_task
+
+    results = [await handler.send_event(RealtimeEvent(data={"n": n})) for n in range(5)]
+    assert results == [True, True, True, False, False]
+    assert not handler.is_active
+    assert handler._stats["disconnected_on_overflow"] is True
+    await handler._disconnect_task
+    assert writer.done()
+
+
+class SlowClient(RecordingClient):
+    async def __call__(self, frame):
+        await asyncio.sleep(0.005)
+        await super().__call__(frame)
+
+
+@pytest.mark.asyncio
+async def test_stop_stream_flushes_queued_frames_and_stream_end():
+    client = SlowClient()
+    handler = await _handler(client, sse_queue_size=64)
+    for n in range(20):
+        await handler.send_event(RealtimeEvent(data={"n": n}))
+    assert handler.queue_depth > 0
+
+    await handler.stop_stream()
+
+    # stream_start, 20 events and stream_end, in order
+    assert len(client.frames) == 22
+    assert '"n": 19' in client.frames[-2]
+    assert client.frames[-1].startswith("event: stream_end")
+    assert handler._stats["frames_dropped"] == 0
+    assert not handler.is_active and handler._stream_task is None
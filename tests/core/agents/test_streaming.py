@@ -0,0 +1,147 @@
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from langswarm.core.agents.realtime import (
+    RealtimeConfiguration, RealtimeMessage, StreamingType, StreamOverflowPolicy,
+    StreamingResponseManager,
+)
+
+
+async def _stream(config, chunks, chunk_type=StreamingType.TEXT_DELTA):
+    manager = StreamingResponseManager(config)
+    stream_id = await manager.create_stream(RealtimeMessage(content="hi"), agent_id="agent")
+    accepted = 0
+    for content in chunks:
+        accepted += await manager.add_chunk(stream_id, content, chunk_type)
+    return manager, stream_id, accepted
+
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+MILLION_CHUNKS = textwrap.dedent("""
+    import asyncio, json, resource
+
+    from langswarm.core.agents.realtime import RealtimeConfiguration, RealtimeMessage, StreamingResponseManager
+
+    async def scenario():
+        manager = StreamingResponseManager(RealtimeConfiguration(streaming_max_bytes=64 * 1024))
+        stream_id = await manager.create_stream(RealtimeMessage(content="hi"), agent_id="agent")
+        accepted = 0
+        for _ in range(1_000_000):
+            accepted += await manager.add_chunk(stream_id, "tok ")
+        final = await manager.complete_stream(stream_id)
+        status = await manager.get_stream_status(stream_id)
+        return accepted, final, status
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    accepted, final, status = asyncio.run(scenario())
+    print(json.dumps({
+        "growth_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) / 1024,
+        "accepted": accepted,
+        "content_bytes": len(final.content.encode("utf-8")),
+        "truncated": final.metadata["truncated"],
+        "chunk_count": final.metadata["chunk_count"],
+        "total_bytes": status["total_bytes"],
+        "chunks_retained": status["aggregator_stats"]["chunks_retained"],
+    }))
+""")
+
+
+def test_million_chunks_stream_in_bounded_memory():
+    # A fresh interpreter, so the peak RSS reflects this stream and not earlier tests
+    # (tracemalloc would slow a million chunks down ~10x)
+    output = subprocess.run(
+        [sys.executable, "-c", MILLION_CHUNKS], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result["accepted"] == 1_000_000
+    assert result["growth_mb"] < 32  # retaining every chunk costs several hundred MB
+    assert result["content_bytes"] == 64 * 1024
+    assert result["truncated"] is True
+    assert result["chunk_count"] == 1_000_000
+    assert result["total_bytes"] == 4_000_000
+    assert result["chunks_retained"] == 0
+
+
+@pytest.mark.asyncio
+async def test_truncate_cuts_on_character_boundary():
+    config = RealtimeConfiguration(streaming_max_bytes=5)
+    manager, stream_id, _ = await _stream(config, ["ab", "cé", "€z"])
+    final = await manager.complete_stream(stream_id)
+    assert final.content == "abcé"  # "€" (3 bytes) does not fit in the last byte
+
+
+@pytest.mark.asyncio
+async def test_spill_keeps_full_content_on_disk():
+    config = RealtimeConfiguration(streaming_max_bytes=100, streaming_overflow_policy=StreamOverflowPolicy.SPILL)
+    manager, stream_id, _ = await _stream(config, [f"{i:04d}" for i in range(1000)])
+    aggregator = manager._response_aggregators[stream_id]
+    assert aggregator._spilled and aggregator._content.spilled
+
+    final = await manager.complete_stream(stream_id)
+    assert final.content == "".join(f"{i:04d}" for i in range(1000))
+    assert final.metadata["spilled"] is True
+    await manager.stop_stream(stream_id)
+    assert not aggregator._content.spilled
+
+
+@pytest.mark.asyncio
+async def test_error_policy_fails_the_stream():
+    config = RealtimeConfiguration(streaming_max_bytes=8, streaming_overflow_policy=StreamOverflowPolicy.ERROR)
+    manager, stream_id, accepted = await _stream(config, ["1234", "5678", "9", "0"])
+    assert accepted == 2
+    assert (await manager.get_stream_status(stream_id))["status"] == "overflow"
+
+
+@pytest.mark.asyncio
+async def test_tool_output_deltas_are_kept_per_call():
+    manager = StreamingResponseManager(RealtimeConfiguration())
+    stream_id = await manager.create_stream(RealtimeMessage(content="hi"), agent_id="agent")
+    await manager.add_chunk(stream_id, "Looking up ")
+    await manager.add_chunk(stream_id, '{"city":', StreamingType.TOOL_OUTPUT, {"tool_call_id": "call-1"})
+    await manager.add_chunk(stream_id, ' "Oslo"}', StreamingType.TOOL_OUTPUT, {"tool_call_id": "call-1"})
+    await manager.add_chunk(stream_id, "the weather")
+
+    final = await manager.complete_stream(stream_id)
+    assert final.content == "Looking up the weather"
+    assert final.metadata["tool_outputs"] == {"call-1": '{"city": "Oslo"}'}
+
+
+@pytest.mark.asyncio
+async def test_tool_output_counts_toward_the_cap():
+    config = RealtimeConfiguration(streaming_max_bytes=10)
+    manager, stream_id, _ = await _stream(config, ["abcd"])
+    accepted = 0
+    for content in ["123", "456", "789"]:
+        accepted += await manager.add_chunk(stream_id, content, StreamingType.TOOL_OUTPUT, {"tool_call_id": "call-1"})
+
+    final = await manager.complete_stream(stream_id)
+    assert accepted == 3
+    assert final.metadata["tool_outputs"] == {"call-1": "123456"}
+    assert final.metadata["truncated"] is True
+    assert final.metadata["content_bytes"] + final.metadata["tool_output_bytes"] == 10
+
+
+@pytest.mark.asyncio
+async def test_tool_output_spills_and_fails_with_the_stream():
+    spill = RealtimeConfiguration(streaming_max_bytes=8, streaming_overflow_policy=StreamOverflowPolicy.SPILL)
+    manager, stream_id, _ = await _stream(spill, ["text"])
+    for i in range(5):
+        await manager.add_chunk(stream_id, f"out{i}", StreamingType.TOOL_OUTPUT, {"tool_call_id": f"call-{i % 2}"})
+    aggregator = manager._response_aggregators[stream_id]
+    assert aggregator._spilled and all(buffer.spilled for buffer in aggregator._tool_outputs.values())
+    final = await manager.complete_stream(stream_id)
+    assert final.content == "text"
+    assert final.metadata["tool_outputs"] == {"call-0": "out0out2out4", "call-1": "out1out3"}
+
+    error = RealtimeConfiguration(streaming_max_bytes=8, streaming_overflow_policy=StreamOverflowPolicy.ERROR)
+    manager, stream_id, _ = await _stream(error, ["text"])
+    assert await manager.add_chunk(stream_id, "1234", StreamingType.TOOL_OUTPUT)
+    assert not await manager.add_chunk(stream_id, "5", StreamingType.TOOL_OUTPUT)
+    assert (await manager.get_stream_status(stream_id))["status"] == "overflow"
@@ -0,0 +1,53 @@
+import pytest
+
+from langswarm.core.middleware import Pipeline, RequestContext
+from langswarm.core.middleware.interceptors.base import BaseInterceptor
+
+
+class Tag(BaseInterceptor):
+    """Pass-through interceptor, optionally limited to one action"""
+
+    def __init__(self, name, priority, action=None):
+        super().__init__(name=name, priority=priority)
+        self.action = action
+
+    def can_handle(self, context):
+        return self.action is None or context.action_id == self.action
+
+    async def _process(self, context, next_interceptor):
+        return await next_interceptor(context)
+
+
+def _request(action="echo"):
+    return RequestContext(action_id=action, method="call")
+
+
+@pytest.mark.asyncio
+async def test_chains_are_cached_per_applicable_set_and_invalidated():
+    pipeline = Pipeline([Tag("first", 10), Tag("only_search", 20, action="search"), Tag("last", 30)])
+
+    response = await pipeline.process(_request())
+    assert response.metadata["interceptor_chain"] == ["first", "last"]
+    assert response.metadata["pipeline_interceptors"] == 2
+
+    await pipeline.process(_request())
+    await pipeline.process(_request("search"))
+    assert len(pipeline._chain_cache) == 2
+    chain = pipeline._chain_cache[0b101][0]
+    await pipeline.process(_request())
+    assert pipeline._chain_cache[0b101][0] is chain
+
+    pipeline.add_interceptor(Tag("middle", 15))
+    assert pipeline._chain_cache == {}
+    response = await pipeline.process(_request("search"))
+    assert response.metadata["interceptor_chain"] == ["first", "middle", "only_search", "last"]
+
+    pipeline.remove_interceptor("first")
+    assert pipeline._chain_cache == {}
+    response = await pipeline.process(_request())
+    assert response.metadata["interceptor_chain"] == ["middle", "last"]
+
+    pipeline.clear()
+    assert pipeline._chain_cache == {}
+    response = await pipeline.process(_request())
+    assert response.metadata["pipeline_interceptors"] == 0
@@ -0,0 +1,95 @@
+import importlib.util
+
+import pytest
+
+from langswarm.core.agents.interfaces import AgentMessage
+from langswarm.core.config.token_config import TokenTrackingConfig
+from langswarm.core.observability.token_tracking import (
+    ContextSizeMonitor, HeuristicTokenizer, Tokenizer, default_tokenizer,
+)
+
+
+class WordTokenizer(Tokenizer):
+    """Fixture tokenizer: one token per whitespace-separated word, counting calls"""
+
+    name = "words"
+
+    def __init__(self):
+        self.calls = 0
+
+    def count_tokens(self, text):
+        self.calls += 1
+        return len(text.split())
+
+
+class FakeSession:
+    def __init__(self):
+        self.messages = []
+
+    async def get_context(self, max_tokens=None):
+        return list(self.messages)
+
+
+@pytest.mark.asyncio
+async def test_each_turn_only_tokenizes_new_messages():
+    tokenizer = WordTokenizer()
+    monitor = ContextSizeMonitor(tokenizer=tokenizer, message_overhead=4)
+    session = FakeSession()
+
+    expected = 0
+    for turn in range(50):
+        for role in ("user", "assistant"):
+            content = " ".join(f"w{turn}" for _ in range(turn + 1))
+            session.messages.append(AgentMessage(role=role, content=content))
+            expected += turn + 1 + 4
+        calls_before = tokenizer.calls
+        info = await monitor.calculate_context_info(session, "gpt-4o", additional_tokens=7)
+
+        assert info.current_size == expected + 7
+        assert info.messages_count == len(session.messages)
+        assert tokenizer.calls - calls_before == 2
+
+    assert monitor.cache_misses == 100
+    assert monitor.cache_hits == sum(2 * turn for turn in range(50))
+
+
+@pytest.mark.asyncio
+async def test_edited_messages_and_tool_calls_are_recounted():
+    tokenizer = WordTokenizer()
+    monitor = ContextSizeMonitor(tokenizer=tokenizer, message_overhead=0)
+    session = FakeSession()
+    message = AgentMessage(role="assistant", content="one two", tool_calls=[{"name": "search"}])
+    session.messages.append(message)
+
+    first = await monitor.calculate_context_info(session, "gpt-4o")
+    message.content = "one two three four"
+    second = await monitor.calculate_context_info(session, "gpt-4o")
+
+    assert second.current_size == first.current_size + 2
+
+
+def test_model_limits_from_config_and_dated_variants():
+    config = TokenTrackingConfig.from_dict({
+        "enabled": True,
+        "model_context_limits": {
+            "openai": {"gpt-4o": 64000},
+            "local": {"llama-3-8b": 8192},
+            "default": 2048,
+        },
+    })
+    monitor = ContextSizeMonitor.from_config(config, tokenizer=WordTokenizer())
+
+    assert monitor.get_model_limit("gpt-4o") == 64000
+    assert monitor.get_model_limit("gpt-4o-2024-08-06") == 64000
+    assert monitor.get_model_limit("gpt-4o-mini") == 128000
+    assert monitor.get_model_limit("llama-3-8b-instruct") == 8192
+    assert monitor.get_model_limit("unknown-model") == 2048
+
+
+def test_default_tokenizer_falls_back_to_heuristic():
+    tokenizer = default_tokenizer("gpt-4o")
+    if importlib.util.find_spec("tiktoken") is None:
+        assert isinstance(tokenizer, HeuristicTokenizer)
+        assert tokenizer.count_tokens("a" * 40) == 10
+    else:
+        assert tokenizer.count_tokens("hello world") == 2
@@ -0,0 +1,143 @@
+import asyncio
+import sqlite3
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pytest
+
+from langswarm.core.observability.token_tracking import (
+    RollupGranularity, SQLiteTokenEventSink, TokenUsageAggregator, TokenUsageEvent,
+)
+
+START = datetime(2025, 1, 1)
+
+
+def _event(offset_seconds, session_id="s1", user_id="u1", model="gpt-4o", tokens=10):
+    return TokenUsageEvent(
+        event_id="e", session_id=session_id, user_id=user_id, model=model, provider="openai",
+        input_tokens=tokens // 2, output_tokens=tokens - tokens // 2, total_tokens=tokens,
+        cost_estimate=0.001, timestamp=START + timedelta(seconds=offset_seconds)
+    )
+
+
+def test_rollups_bucket_usage_and_expire_old_days():
+    aggregator = TokenUsageAggregator(retention_days=2)
+
+    async def record():
+        for day in range(4):
+            for minute in range(3):
+                await aggregator.record_usage(_event(day * 86400 + minute * 60, tokens=100))
+
+    asyncio.run(record())
+
+    user = asyncio.run(aggregator.get_user_usage("u1"))
+    assert user["total_tokens"] == 1200  # lifetime totals survive bucket expiry
+    assert user["models_used"] == {"gpt-4o"}
+    assert user["daily_usage"] == {
+        "2025-01-03": {"tokens": 300, "cost": 0.003, "events": 3},
+        "2025-01-04": {"tokens": 300, "cost": 0.003, "events": 3},
+    }
+
+    minutes = aggregator.get_rollup("model", "gpt-4o", RollupGranularity.MINUTE)
+    assert [bucket["start"] for bucket in minutes] == [
+        START + timedelta(days=3, minutes=m) for m in range(3)
+    ]
+    assert aggregator.get_rollup("session", "s1", RollupGranularity.HOUR)[-1]["events"] == 3
+    assert aggregator.get_rollup("user", "missing") == []
+
+
+def test_idle_and_excess_series_are_dropped():
+    aggregator = TokenUsageAggregator(retention_days=1, max_series=3)
+
+    async def record():
+        for i in range(5):
+            await aggregator.record_usage(_event(i, session_id=f"s{i}"))
+        await aggregator.record_usage(_event(2 * 86400, session_id="late"))
+
+    asyncio.run(record())
+
+    assert list(aggregator._session_totals) == ["late"]
+    assert asyncio.run(aggregator.get_session_usage("s4")) == {}
+
+
+def test_sqlite_sink_receives_raw_events(tmp_path):
+    db_path = str(tmp_path / "usage.db")
+    aggregator = TokenUsageAggregator(max_events=10, event_sink=SQLiteTokenEventSink(db_path, batch_size=64))
+
+    async def record():
+        for i in range(1000):
+            await aggregator.record_usage(_event(i))
+
+    asyncio.run(record())
+    aggregator.close()
+
+    assert len(aggregator._usage_events) == 10
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*), SUM(total_tokens) FROM token_usage_events").fetchone() == (1000, 10000)
+
+
+def test_memory_and_per_event_cost_stay_flat():
+    aggregator = TokenUsageAggregator(max_events=1000)
+    events = [_event(i * 7, session_id=f"s{i % 500}", user_id=f"u{i % 50}", model=f"m{i % 5}")
+              for i in range(50_000)]
+
+    async def record(batch):
+        for event in batch:
+            await aggregator.record_usage(event)
+
+    asyncio.run(record(events))  # warm up every key and bucket ring
+    tracemalloc.start()
+    try:
+        retained = []
+        for _ in range(3):
+            for event in events:
+                event.timestamp += timedelta(days=1)
+            asyncio.run(record(events))
+            retained.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+
+    assert len(aggregator._usage_events) == 1000
+    assert len(aggregator._session_totals) == 500
+    # The first traced pass replaces untraced state; later ones only fill day slots
+    assert retained[2] - retained[1] < 1024 * 1024
+    # Each event updates fixed-size rings, so its cost does not grow with history
+    series = [*aggregator._session_totals.values(), *aggregator._user_totals.values(),
+              *aggregator._model_totals.values()]
+    assert all(len(rollup._buckets) == rollup.slots for s in series for rollup in s.rollups.values())
+    assert asyncio.run(aggregator.get_user_usage("u0"))["event_count"] == 4 * 1000
+
+
+def test_retention_must_cover_a_day():
+    with pytest.raises(ValueError):
+        TokenUsageAggregator(retention_days=0)
+
+
+def test_usage_analytics_count_events_that_rolled_off():
+    aggregator = TokenUsageAggregator(max_events=10)
+
+    async def record():
+        for i in range(100):
+            await aggregator.record_usage(_event(i * 3600, model=f"m{i % 2}"))
+
+    asyncio.run(record())
+
+    overall = asyncio.run(aggregator.get_usage_analytics(group_by="model"))
+    assert overall["total_events"] == 100 and overall["total_tokens"] == 1000
+    assert overall["time_range"]["start"] == START
+    assert overall["grouped_data"]["m0"]["events"] == 50
+    assert overall["truncated"] is False
+
+    daily = asyncio.run(aggregator.get_usage_analytics(user_id="u1", group_by="day"))
+    assert sum(day["events"] for day in daily["grouped_data"].values()) == 100
+    assert daily["truncated"] is False
+
+    # Provider grouping needs raw events, so it says only the window was seen
+    by_provider = asyncio.run(aggregator.get_usage_analytics(group_by="provider"))
+    assert by_provider["grouped_data"]["openai"]["events"] == 10
+    assert by_provider["truncated"] is True
+    assert by_provider["oldest_event"] == START + timedelta(hours=90)
+
+    recent = asyncio.run(aggregator.get_usage_analytics(
+        time_range=(START + timedelta(hours=95), START + timedelta(hours=99))))
+    assert recent["total_events"] == 5 and recent["truncated"] is False
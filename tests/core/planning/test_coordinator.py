@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+import pytest
+
+from langswarm.core.planning import Coordinator
+from langswarm.core.planning.models import (
+    ActionContract, CapabilityVerification, BrainstormResult, Observation,
+    ObservationStatus, Plan, PlanPatch, TaskBrief,
+)
+
+
+def _brief():
+    return TaskBrief(
+        objective="fan out and join", inputs={}, required_outputs={},
+        acceptance_tests=[], constraints={}
+    )
+
+
+def _plan(dag, plan_id="plan-1"):
+    steps = [
+        ActionContract(id=step_id, intent=step_id, agent_or_tool="stub", inputs={}, outputs={})
+        for step_id in dag
+    ]
+    return Plan(plan_id=plan_id, version=0, task_brief=_brief(), steps=steps, dag=dag)
+
+
+class StubPlanner:
+    def __init__(self, plan):
+        self.plan = plan
+
+    async def brainstorm_actions(self, brief):
+        return BrainstormResult(suggested_actions=[], reasoning="", alternatives=[], estimated_steps=0)
+
+    async def verify_capabilities(self, brainstorm, brief):
+        return CapabilityVerification(
+            verified=True, available_capabilities={}, missing_capabilities=[],
+            suggested_workarounds=[], escalation_required=False
+        )
+
+    async def generate_plan(self, brief, brainstorm, capabilities):
+        return self.plan
+
+
+class SleepingExecutor:
+    """Executes every step by sleeping, recording start/end times and overlap"""
+
+    def __init__(self, duration=0.1):
+        self.duration = duration
+        self.running = 0
+        self.peak = 0
+        self.spans = {}
+
+    async def execute_step(self, step, state):
+        start = time.perf_counter()
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(self.duration)
+        self.running -= 1
+        self.spans[step.id] = (start, time.perf_counter())
+        return Observation(
+            action_id=step.id, status=ObservationStatus.OK, artifacts={"out": step.id},
+            metrics={}, quality={"confidence": 1.0}, policy={"violations": []}
+        )
+
+
+def _coordinator(plan, executor, max_concurrent_steps=8):
+    coordinator = Coordinator({
+        "llm": object(), "agents": object(), "tools": object(),
+        "policies": {"limits": {"max_concurrent_steps": max_concurrent_steps}},
+    })
+    coordinator.planner = StubPlanner(plan)
+    coordinator.executor = executor
+    return coordinator
+
+
+def test_topological_order_follows_dependencies():
+    plan = _plan({"load": [], "clean": ["load"], "report": ["clean", "load"], "notify": []})
+    order = [step.id for step in plan.get_topological_order()]
+    assert order.index("load") < order.index("clean") < order.index("report")
+    assert plan.get_step("report").id == "report"
+    assert plan.get_step("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_wall_time_tracks_critical_path():
+    # 10 independent 100ms steps feeding a single join: critical path is 2 steps
+    dag = {f"fetch_{i}": [] for i in range(10)}
+    dag["join"] = list(dag)
+    executor = SleepingExecutor(duration=0.1)
+    coordinator = _coordinator(_plan(dag), executor, max_concurrent_steps=10)
+
+    start = time.perf_counter()
+    state = await coordinator.execute_task(_brief())
+    elapsed = time.perf_counter() - start
+
+    assert state.status == "completed"
+    assert set(state.artifacts) == set(dag)
+    assert elapsed < 0.5  # sequential execution would take ~1.1s
+    assert executor.spans["join"][0] >= max(end for step_id, (_, end) in executor.spans.items()
+                                            if step_id != "join")
+    assert len(coordinator.lineage.checkpoints) == len(dag)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_is_respected():
+    dag = {f"step_{i}": [] for i in range(9)}
+    executor = SleepingExecutor(duration=0.05)
+    coordinator = _coordinator(_plan(dag), executor, max_concurrent_steps=3)
+
+    start = time.perf_counter()
+    state = await coordinator.execute_task(_brief())
+    elapsed = time.perf_counter() - start
+
+    assert state.status == "completed"
+    assert executor.peak == 3
+    assert 0.14 < elapsed < 0.4
+
+
+@pytest.mark.asyncio
+async def test_replan_patches_plan_while_other_steps_run():
+    plan = _plan({"a": [], "slow": [], "b": ["a"], "c": ["b"]})
+    plan.get_step("b").preconditions = ["1 == 2"]
+
+    class ReplanningPlanner(StubPlanner):
+        async def generate_patch(self, plan, state, observation):
+            return PlanPatch(
+                patch_id="drop-b", plan_id=plan.plan_id, from_version=plan.version,
+                to_version=plan.version + 1, reason="b cannot run",
+                ops=[{"op": "remove", "target": "b"}]
+            )
+
+    executor = SleepingExecutor(duration=0.05)
+    coordinator = _coordinator(plan, executor)
+    coordinator.planner = ReplanningPlanner(plan)
+
+    state = await coordinator.execute_task(_brief())
+
+    assert state.status == "completed"
+    assert state.plan.version == 1
+    assert set(executor.spans) == {"a", "slow", "c"}
+    assert executor.spans["c"][0] >= executor.spans["a"][1]
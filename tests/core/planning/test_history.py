@@ -0,0 +1,129 @@
+import tracemalloc
+
+import pytest
+
+from langswarm.core.planning import Coordinator, RingBufferHistoryStore, SQLiteHistoryStore
+from langswarm.core.planning.models import (
+    ActionContract, BrainstormResult, CapabilityVerification, Observation,
+    ObservationStatus, Plan, TaskBrief,
+)
+
+
+def _run(i, plan_count=100):
+    return {
+        "run_id": f"run-{i}",
+        "plan_id": f"plan-{i % plan_count}",
+        "status": "completed" if i % 4 else "failed",
+        "replans": i % 3,
+        "steps_completed": 5,
+        "cost_usd": 0.01,
+        "latency_sec": 1.5,
+    }
+
+
+@pytest.mark.parametrize("make_store", [
+    lambda tmp_path: RingBufferHistoryStore(max_entries=100),
+    lambda tmp_path: SQLiteHistoryStore(str(tmp_path / "history.db"), max_entries=100),
+])
+def test_queries_and_aggregates_follow_retention(tmp_path, make_store):
+    store = make_store(tmp_path)
+    for i in range(150):
+        store.record(dict(_run(i, plan_count=10), recorded_at=1000.0 + i))
+
+    # Only the newest 100 runs (50..149) are retained
+    assert len(store) == 100
+    assert store.get("run-10") is None
+    assert store.get("run-120")["plan_id"] == "plan-0"
+    assert [e["run_id"] for e in store.query(plan_id="plan-3")] == [f"run-{i}" for i in range(53, 150, 10)]
+    assert len(store.query(status="failed")) == 25
+    assert [e["run_id"] for e in store.query(since=1140.0, until=1142.0)] == ["run-140", "run-141", "run-142"]
+    assert [e["run_id"] for e in store.query(plan_id="plan-4", status="failed", limit=1)] == ["run-144"]
+
+    assert store.success_rate() == 0.75
+    assert store.success_rate("plan-2") == 0.5  # 52, 72, 92, ... fail; 62, 82, ... complete
+    stats = store.get_stats()
+    assert stats["entries"] == 100
+    assert stats["mean_replans_per_plan"] == sum(i % 3 for i in range(50, 150)) / 10
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_and_executor_record_into_bounded_stores():
+    brief = TaskBrief(objective="noop", inputs={}, required_outputs={}, acceptance_tests=[], constraints={})
+    plan = Plan(
+        plan_id="plan-1", version=0, task_brief=brief, dag={"only": []},
+        steps=[ActionContract(id="only", intent="only", agent_or_tool="stub", inputs={}, outputs={})]
+    )
+
+    class Planner:
+        async def brainstorm_actions(self, brief):
+            return BrainstormResult(suggested_actions=[], reasoning="", alternatives=[], estimated_steps=0)
+
+        async def verify_capabilities(self, brainstorm, brief):
+            return CapabilityVerification(
+                verified=True, available_capabilities={}, missing_capabilities=[],
+                suggested_workarounds=[], escalation_required=False
+            )
+
+        async def generate_plan(self, brief, brainstorm, capabilities):
+            return plan
+
+    coordinator = Coordinator({
+        "llm": object(), "agents": object(), "tools": object(), "history_max_entries": 3,
+    })
+    coordinator.planner = Planner()
+
+    async def execute_step(step, state):
+        coordinator.executor.execution_history.record({
+            "run_id": state.run_id, "plan_id": state.plan.plan_id, "step_id": step.id, "status": "ok"
+        })
+        return Observation(
+            action_id=step.id, status=ObservationStatus.OK, artifacts={}, metrics={},
+            quality={"confidence": 1.0}, policy={"violations": []}
+        )
+
+    coordinator.executor.execute_step = execute_step
+
+    for _ in range(5):
+        state = await coordinator.execute_task(brief)
+        assert state.status == "completed"
+
+    assert len(coordinator.execution_history) == 3
+    assert coordinator.execution_history.get(state.run_id)["steps_completed"] == 1
+    assert coordinator.execution_history.success_rate() == 1.0
+    assert coordinator.executor.execution_history.query(run_id=state.run_id)[0]["step_id"] == "only"
+    assert coordinator.executor.execution_history.success_rate() == 1.0
+
+
+def test_ring_buffer_memory_is_flat_over_50k_runs():
+    store = RingBufferHistoryStore(max_entries=5_000)
+
+    tracemalloc.start()
+    try:
+        for i in range(10_000):
+            store.record(_run(i, plan_count=10_000))
+        warm, _ = tracemalloc.get_traced_memory()
+        for i in range(10_000, 50_000):
+            store.record(_run(i, plan_count=10_000))
+        final, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(store) == 5_000
+    assert len(store._by_plan) == 5_000
+    assert final < warm * 1.1
+    assert store.query(run_id="run-44999") == []
+    assert store.query(run_id="run-49999")[0]["plan_id"] == "plan-9999"
+
+
+def test_ring_buffer_time_range_matches_scan_across_evictions():
+    store = RingBufferHistoryStore(max_entries=50)
+    for i in range(237):
+        store.record({**_run(i), "recorded_at": 1000.0 + i // 2})
+
+    entries = list(store)
+    assert len(entries) == 50 and entries[0]["run_id"] == "run-187"
+    for since, until in ((1000.0, 1200.0), (1095.0, 1100.0), (1117.5, 1117.5), (1118.0, None), (None, 1094.0)):
+        expected = [e for e in entries
+                    if (since is None or e["recorded_at"] >= since) and (until is None or e["recorded_at"] <= until)]
+        assert store.query(since=since, until=until) == expected
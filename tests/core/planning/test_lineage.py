@@ -0,0 +1,72 @@
+from langswarm.core.planning.lineage import LineageGraph
+from langswarm.core.planning.models import Checkpoint, Provenance
+
+
+def _node(artifact_id, *inputs):
+    return Provenance(
+        artifact_id=artifact_id, from_step=artifact_id, inputs=list(inputs),
+        tool={"name": "stub"}, params_hash="", metrics={}
+    )
+
+
+def _chain(graph):
+    # a -> b -> c, a -> d
+    graph.add_node(_node("a"))
+    graph.add_node(_node("b", "a"))
+    graph.add_node(_node("c", "b"))
+    graph.add_node(_node("d", "a"))
+
+
+def test_reverse_index_and_closures():
+    graph = LineageGraph()
+    _chain(graph)
+
+    assert sorted(graph.downstream_of("a")) == ["b", "c", "d"]
+    assert sorted(graph.upstream_of("c")) == ["a", "b"]
+    assert graph.parents["c"] == {"b"}
+    assert graph.get_stats()["edges"] == 3
+
+    # Re-adding a node does not duplicate edges
+    graph.add_node(_node("c", "b"))
+    assert graph.get_stats()["edges"] == 3
+
+
+def test_new_edges_invalidate_only_affected_closures():
+    graph = LineageGraph()
+    _chain(graph)
+    graph.add_node(_node("x"))
+    for artifact_id in ("a", "b", "d", "x"):
+        graph.downstream_of(artifact_id)
+    graph.upstream_of("c")
+    graph.upstream_of("d")
+
+    graph.add_node(_node("e", "c"))
+
+    # Ancestors of c are recomputed, unrelated closures stay cached
+    assert set(graph._downstream_cache) == {"d", "x"}
+    assert set(graph._upstream_cache) == {"c", "d"}
+    assert sorted(graph.downstream_of("a")) == ["b", "c", "d", "e"]
+    assert sorted(graph.downstream_of("b")) == ["c", "e"]
+    assert sorted(graph.upstream_of("e")) == ["a", "b", "c"]
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    db_path = str(tmp_path / "lineage.db")
+    graph = LineageGraph(db_path=db_path)
+    _chain(graph)
+    graph.add_checkpoint(Checkpoint(
+        step_id="step-c", artifact_uri="memory://run/step-c", artifact_hash="abc",
+        provenance=_node("c", "b"), validated=True, retro_status={"r1": "ok"}
+    ))
+    graph.mark_invalid_many(["c", "d"])
+    graph.mark_valid("d")
+    graph.close()
+
+    reloaded = LineageGraph(db_path=db_path)
+    assert sorted(reloaded.downstream_of("a")) == ["b", "c", "d"]
+    assert sorted(reloaded.upstream_of("c")) == ["a", "b"]
+    checkpoint = reloaded.get_checkpoint("step-c")
+    assert checkpoint.provenance.inputs == ["b"]
+    assert checkpoint.all_retro_green()
+    assert not reloaded.is_valid("c") and reloaded.is_valid("d")
+    reloaded.close()
@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+
+import langswarm
+
+HEAVY_MODULES = [
+    "langswarm.simple_api",
+    "langswarm.core.agents",
+    "langswarm.core.agents.providers",
+    "langswarm.core.config",
+    "langswarm.core.workflows",
+    "langswarm.core.observability",
+    "langswarm.core.middleware",
+    "openai",
+    "anthropic",
+    "yaml",
+]
+
+
+def _loaded_after(code):
+    script = f"import json, sys\n{code}\nprint(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return set(json.loads(output.splitlines()[-1]))
+
+
+def test_bare_import_skips_heavy_modules():
+    loaded = _loaded_after("import langswarm")
+    assert [name for name in HEAVY_MODULES if name in loaded] == []
+
+
+def test_public_names_resolve_on_first_access():
+    loaded = _loaded_after("import langswarm; langswarm.LangSwarmConfig")
+    assert "langswarm.core.config" in loaded
+    assert "langswarm.core.agents.providers" not in loaded
+
+    from langswarm.core.agents import AgentBuilder
+
+    assert langswarm.AgentBuilder is AgentBuilder
+    assert "AgentBuilder" in vars(langswarm)  # cached after first lookup
+    assert set(langswarm.__all__) <= set(dir(langswarm))
+
+
+def test_unknown_attribute_raises_attribute_error():
+    try:
+        langswarm.not_a_public_name
+    except AttributeError as e:
+        assert "not_a_public_name" in str(e)
+    else:
+        raise AssertionError("expected AttributeError")
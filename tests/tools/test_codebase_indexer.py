@@ -0,0 +1,133 @@
+import os
+
+import pytest
+
+from langswarm.tools.mcp.codebase_indexer import _index_store
+from langswarm.tools.mcp.codebase_indexer._index_store import CodebaseIndex
+from langswarm.tools.mcp.codebase_indexer.main import CodebaseAnalyzer, semantic_search
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    _write(root / "auth" / "login.py", '''
+"""User authentication helpers."""
+
+class LoginManager:
+    """Validates user credentials and issues sessions."""
+
+    def validate_password(self, user, password):
+        return user and password
+''')
+    _write(root / "billing" / "invoice.py", '''
+def render_invoice(order):
+    """Render an invoice for an order."""
+    return str(order)
+''')
+    _write(root / "utils.py", "import os\n\ndef helper():\n    return os.getcwd()\n")
+    return root
+
+
+def _analyzer(root, tmp_path):
+    return CodebaseAnalyzer(str(root), index_path=str(tmp_path / "index.sqlite"))
+
+
+def test_second_scan_reparses_nothing(tree, tmp_path):
+    first = _analyzer(tree, tmp_path)
+    files = first._scan_files()
+    assert set(files) == {os.path.join("auth", "login.py"), os.path.join("billing", "invoice.py"), "utils.py"}
+    assert first.index.last_refresh_stats["parsed"] == 3
+
+    # A fresh analyzer (as every MCP handler call creates) reuses the on-disk index
+    second = _analyzer(tree, tmp_path)
+    files = second._scan_files()
+    assert len(files) == 3
+    assert second.index.last_refresh_stats["parsed"] == 0
+    assert files["utils.py"].functions == ["helper"]
+
+
+def test_changed_and_deleted_files_are_tracked(tree, tmp_path):
+    _analyzer(tree, tmp_path)._scan_files()
+
+    # Touching without a content change only refreshes the fingerprint
+    stat = os.stat(tree / "utils.py")
+    os.utime(tree / "utils.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+    analyzer = _analyzer(tree, tmp_path)
+    analyzer._scan_files()
+    assert analyzer.index.last_refresh_stats["parsed"] == 0
+    assert analyzer.index.last_refresh_stats["touched"] == 1
+
+    _write(tree / "utils.py", "def helper():\n    pass\n\ndef another():\n    pass\n")
+    os.remove(tree / "billing" / "invoice.py")
+    analyzer = _analyzer(tree, tmp_path)
+    files = analyzer._scan_files()
+    assert analyzer.index.last_refresh_stats["parsed"] == 1
+    assert analyzer.index.last_refresh_stats["removed"] == 1
+    assert files["utils.py"].functions == ["helper", "another"]
+
+
+def test_semantic_search_ranks_with_bm25(tree, tmp_path):
+    result = _analyzer(tree, tmp_path).semantic_search("user password validation")
+    assert result["results"][0]["file"] == os.path.join("auth", "login.py")
+    assert "LoginManager" in result["results"][0]["classes"]
+
+    # Docstrings are indexed too
+    result = _analyzer(tree, tmp_path).semantic_search("invoice order")
+    assert result["results"][0]["file"] == os.path.join("billing", "invoice.py")
+
+    result = _analyzer(tree, tmp_path).semantic_search("nothing matches this")
+    assert result["total_found"] == 0
+
+
+def test_parallel_parse_matches_serial(tree, tmp_path):
+    for i in range(20):
+        _write(tree / "pkg" / f"mod_{i}.py", f"def func_{i}():\n    pass\n")
+
+    analyzer = CodebaseAnalyzer(str(tree), index_path=":memory:", max_workers=2)
+    analyzer.index.parallel_threshold = 1
+    files = analyzer._scan_files()
+    assert len(files) == 23
+    assert files[os.path.join("pkg", "mod_7.py")].functions == ["func_7"]
+
+
+def _parse_or_raise(path):
+    if os.path.basename(path).startswith("bad"):
+        raise SyntaxError(f"cannot parse {path}")
+    return {"path": path, "functions": [], "classes": [], "imports": [], "docstrings": []}
+
+
+def test_parse_error_skips_only_that_file(tree, caplog):
+    for i in range(10):
+        _write(tree / "pkg" / f"mod_{i}.py", f"def func_{i}():\n    pass\n")
+    _write(tree / "pkg" / "bad_mod.py", "def broken(:\n")
+
+    index = CodebaseIndex(str(tree), parse_file=_parse_or_raise, index_path=":memory:",
+                          max_workers=2, parallel_threshold=1)
+    rel_paths = sorted(os.path.relpath(p, tree) for p in tree.rglob("*.py"))
+    with caplog.at_level("WARNING"):
+        parsed = index._parse_all(rel_paths)
+    index.close()
+
+    assert set(parsed) == set(rel_paths) - {os.path.join("pkg", "bad_mod.py")}
+    # The parallel batch was kept, not re-parsed serially
+    assert "falling back to serial" not in caplog.text
+
+
+def test_handlers_close_their_index(tree, tmp_path, monkeypatch):
+    closed = []
+    real_close = CodebaseIndex.close
+
+    def close(self):
+        closed.append(self.root_path)
+        real_close(self)
+
+    monkeypatch.setattr(CodebaseIndex, "close", close)
+    monkeypatch.setattr(_index_store, "default_index_path", lambda root: str(tmp_path / "index.sqlite"))
+
+    assert semantic_search("password", root_path=str(tree))["total_found"] >= 1
+    assert closed == [str(tree)]
@@ -0,0 +1,203 @@
+import asyncio
+import time
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from google.api_core import exceptions as gcp_exceptions
+
+from langswarm.tools.mcp.message_queue_consumer.main import (
+    GCPPubSubBroker,
+    InMemoryBroker,
+    MessageQueueConsumer,
+    RedisBroker,
+)
+
+
+class CountingBroker(InMemoryBroker):
+    """In-memory broker that records how acks and receives are batched"""
+
+    def __init__(self):
+        super().__init__({})
+        self.receive_calls = 0
+        self.ack_calls = 0
+        self.acked = 0
+
+    async def consume_batch(self, queue_name, max_messages=10, timeout=30):
+        self.receive_calls += 1
+        return await super().consume_batch(queue_name, max_messages, timeout)
+
+    async def acknowledge_batch(self, messages):
+        self.ack_calls += 1
+        self.acked += len(messages)
+        return len(messages)
+
+
+async def _wait_for(predicate, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_drains_10k_messages_with_batched_receive_and_ack():
+    broker = CountingBroker()
+    await broker.publish_batch("jobs", [{"type": "noop", "data": {"i": i}} for i in range(10_000)])
+
+    consumer = MessageQueueConsumer(
+        "bench-consumer", broker, "jobs",
+        max_workers=50, poll_interval=1, batch_size=100, ack_batch_size=100
+    )
+    started = time.perf_counter()
+    await consumer.start()
+    await _wait_for(lambda: consumer.stats["tasks_processed"] == 10_000)
+    throughput = 10_000 / (time.perf_counter() - started)
+
+    # Idle consumers block on the broker instead of spinning
+    cpu_before = time.process_time()
+    await asyncio.sleep(0.5)
+    idle_cpu = time.process_time() - cpu_before
+
+    await consumer.stop()
+
+    assert broker.acked == 10_000
+    assert broker.ack_calls <= 10_000 // 100 + 10
+    assert broker.receive_calls < 1_000
+    assert consumer.active_workers == set()
+    assert idle_cpu < 0.1
+    assert throughput > 2_000, f"{throughput:.0f} msgs/sec"
+
+
+@pytest.mark.asyncio
+async def test_capacity_limits_concurrency_and_frees_slots():
+    broker = InMemoryBroker({})
+    consumer = MessageQueueConsumer("slot-consumer", broker, "jobs", max_workers=3, batch_size=10)
+
+    running = 0
+    peak = 0
+
+    async def slow_task(task):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return {"status": "completed"}
+
+    consumer.processor.process_task = slow_task
+    await broker.publish_batch("jobs", [{"type": "noop"} for _ in range(12)])
+    await consumer.start()
+    await _wait_for(lambda: consumer.stats["tasks_processed"] == 12)
+    await consumer.stop()
+
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_tasks_are_requeued_and_prefetch_returned_on_stop():
+    broker = InMemoryBroker({})
+    consumer = MessageQueueConsumer("fail-consumer", broker, "jobs", max_workers=1, batch_size=5)
+
+    attempts = []
+
+    async def failing_task(task):
+        attempts.append(task["id"])
+        if len(attempts) == 1:
+            return {"status": "failed"}
+        await asyncio.sleep(10)
+
+    consumer.processor.process_task = failing_task
+    await broker.publish_batch("jobs", [{"id": i} for i in range(5)])
+    await consumer.start()
+    await _wait_for(lambda: len(attempts) == 2)
+    await consumer.stop(graceful=False)
+
+    # The failed message and the untouched prefetched ones go back on the queue
+    queued_ids = [m["id"] for m in broker.queues["jobs"]]
+    assert 0 in queued_ids
+    assert set(range(2, 5)) <= set(queued_ids)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_buffer_fills_to_prefetch_count_in_batches():
+    broker = CountingBroker()
+    await broker.connect()
+    await broker.publish_batch("jobs", [{"id": i} for i in range(200)])
+    consumer = MessageQueueConsumer("prefetch-consumer", broker, "jobs", batch_size=50, prefetch_count=100)
+
+    assert (await consumer._next_message())["id"] == 0
+    assert broker.receive_calls == 2 and len(consumer._prefetch) == 99
+
+    # Topped up only once a whole batch fits
+    for _ in range(49):
+        await consumer._next_message()
+    assert broker.receive_calls == 2 and len(consumer._prefetch) == 50
+    assert (await consumer._next_message())["id"] == 50
+    assert broker.receive_calls == 3 and len(consumer._prefetch) == 99
+
+
+class FakeRedis:
+    def __init__(self, items):
+        self.items = [f'{{"id": {i}}}'.encode() for i in items]
+        self.blpop_calls = 0
+
+    async def blpop(self, queue_name, timeout=0):
+        self.blpop_calls += 1
+        return (queue_name.encode(), self.items.pop(0)) if self.items else None
+
+    async def lpop(self, queue_name, count=None):
+        if count is None:
+            return self.items.pop(0) if self.items else None
+        taken, self.items = self.items[:count], self.items[count:]
+        return taken or None
+
+
+@pytest.mark.asyncio
+async def test_redis_zero_timeout_batch_never_blocks():
+    broker = RedisBroker({})
+    broker.redis_client = FakeRedis(range(3))
+    broker.is_connected = True
+
+    assert [m["id"] for m in await broker.consume_batch("jobs", max_messages=2, timeout=0)] == [0, 1]
+    assert (await broker.consume_message("jobs", timeout=0))["id"] == 2
+    assert await broker.consume_batch("jobs", max_messages=2, timeout=0) == []
+    assert broker.redis_client.blpop_calls == 0
+
+
+class FakeSubscriber:
+    """Pub/Sub pull stub that, like the real RPC, rejects a zero deadline"""
+
+    def __init__(self, items):
+        self.items = list(items)
+        self.deadlines = []
+
+    def subscription_path(self, project_id, subscription):
+        return f"projects/{project_id}/subscriptions/{subscription}"
+
+    def pull(self, request, timeout):
+        self.deadlines.append(timeout)
+        if timeout <= 0 or not self.items:
+            raise gcp_exceptions.DeadlineExceeded("Deadline Exceeded")
+        taken = self.items[:request["max_messages"]]
+        self.items = self.items[request["max_messages"]:]
+        return SimpleNamespace(received_messages=[
+            SimpleNamespace(ack_id=f"ack-{i}", message=SimpleNamespace(
+                data=json.dumps({"id": i}).encode(), message_id=str(i)))
+            for i in taken
+        ])
+
+
+@pytest.mark.asyncio
+async def test_pubsub_top_up_refills_without_deadline_errors(capsys):
+    broker = GCPPubSubBroker({"project_id": "p"})
+    broker.subscriber = FakeSubscriber(range(25))
+    broker.is_connected = True
+    consumer = MessageQueueConsumer("pubsub", broker, "jobs", batch_size=10, prefetch_count=20)
+
+    assert [(await consumer._next_message())["id"] for _ in range(25)] == list(range(25))
+    assert await broker.consume_batch("jobs", max_messages=10, timeout=0) == []
+    assert all(deadline > 0 for deadline in broker.subscriber.deadlines)
+    assert "consume error" not in capsys.readouterr().out
@@ -0,0 +1,178 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from langswarm.tools.base import ToolResult
+from langswarm.tools.execution import (
+    CircuitBreakerPolicy, CircuitState, ExecutionContext, RetryPolicy, ToolExecutor,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FlakyTool:
+    """Raises ConnectionError for the first ``failures`` calls, then succeeds"""
+
+    def __init__(self, failures, tool_id="flaky"):
+        self.failures = failures
+        self.calls = 0
+        self.metadata = SimpleNamespace(id=tool_id, tool_type=SimpleNamespace(value="utility"))
+        self.execution = self
+
+    async def execute(self, method, parameters, context):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError(f"upstream unavailable (call {self.calls})")
+        return {"ok": self.calls}
+
+
+class FailingResultTool(FlakyTool):
+    """Reports failure through ToolResult(success=False) instead of raising"""
+
+    async def execute(self, method, parameters, context):
+        self.calls += 1
+        return ToolResult(success=False, error="quota exceeded")
+
+
+def _executor(clock, **kwargs):
+    return ToolExecutor(clock=clock, sleep=clock.sleep, rng=random.Random(7), **kwargs)
+
+
+def _context(max_retries):
+    return ExecutionContext(timeout=5.0, max_retries=max_retries)
+
+
+def test_decorrelated_jitter_stays_within_bounds():
+    policy = RetryPolicy(base_delay=0.1, max_delay=2.0)
+    rng = random.Random(1)
+    delay = policy.base_delay
+    delays = []
+    for _ in range(50):
+        upper = max(policy.base_delay, delay * 3)
+        delay = policy.next_delay(delay, rng)
+        assert policy.base_delay <= delay <= min(policy.max_delay, upper)
+        delays.append(delay)
+    assert len(set(delays)) > 40  # jittered, not a fixed schedule
+    assert max(delays) == pytest.approx(2.0, abs=0.5)
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_recovers_through_half_open():
+    clock = FakeClock()
+    executor = _executor(
+        clock,
+        retry_policy=RetryPolicy(max_retries=2, base_delay=0.5, max_delay=4.0, budget_min_retries=100),
+        breaker_policy=CircuitBreakerPolicy(failure_threshold=3, recovery_timeout=30.0),
+    )
+    tool = FlakyTool(failures=4)
+    breaker = executor.get_circuit_breaker("flaky")
+
+    # Three failed attempts (1 call + 2 retries) trip the breaker
+    result = await executor.execute(tool, "run", {}, _context(max_retries=2))
+    assert not result.success
+    assert tool.calls == 3
+    assert breaker.state == CircuitState.OPEN
+    assert len(clock.sleeps) == 2 and all(0.5 <= s <= 4.0 for s in clock.sleeps)
+
+    # While open, calls are rejected without touching the tool
+    clock.now += 10
+    result = await executor.execute(tool, "run", {}, _context(max_retries=2))
+    assert result.metadata["circuit_open"] is True
+    assert tool.calls == 3
+
+    # After the recovery timeout one probe goes through; it fails (call 4) and reopens
+    clock.now += 25
+    result = await executor.execute(tool, "run", {}, _context(max_retries=2))
+    assert tool.calls == 4
+    assert breaker.state == CircuitState.OPEN
+    assert not result.success
+
+    # Next probe succeeds and closes the circuit
+    clock.now += 31
+    result = await executor.execute(tool, "run", {}, _context(max_retries=2))
+    assert result.success and result.data == {"ok": 5}
+    assert breaker.state == CircuitState.CLOSED
+
+    stats = executor.get_statistics()
+    assert stats["circuit_breakers"]["flaky"]["state"] == "closed"
+    assert stats["circuit_breakers"]["flaky"]["times_opened"] == 2
+    assert stats["global"]["circuit_rejections"] == 2
+
+
+@pytest.mark.asyncio
+async def test_half_open_allows_a_single_concurrent_probe():
+    clock = FakeClock()
+    executor = _executor(clock, breaker_policy=CircuitBreakerPolicy(failure_threshold=1, recovery_timeout=5.0))
+    breaker = executor.get_circuit_breaker("flaky")
+    breaker.record_failure()
+    clock.now += 5
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+    breaker.record_cancelled()
+    assert breaker.allow_request()
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_caps_retries_to_a_fraction_of_calls():
+    clock = FakeClock()
+    executor = _executor(
+        clock,
+        retry_policy=RetryPolicy(max_retries=3, budget_ratio=0.1, budget_min_retries=2),
+        breaker_policy=CircuitBreakerPolicy(failure_threshold=10_000),
+    )
+    tool = FlakyTool(failures=10_000)
+
+    for _ in range(100):
+        await executor.execute(tool, "run", {}, _context(max_retries=3))
+
+    stats = executor.get_statistics()["global"]
+    # 2 tokens of headroom + 0.1 per call, instead of 3 retries per call
+    assert stats["retried_executions"] <= 2 + 0.1 * 100
+    assert stats["retries_denied_by_budget"] > 80
+    assert tool.calls == 100 + stats["retried_executions"]
+
+
+@pytest.mark.asyncio
+async def test_per_tool_policies_override_defaults():
+    clock = FakeClock()
+    executor = _executor(clock)
+    executor.configure_tool("fragile", breaker_policy=CircuitBreakerPolicy(failure_threshold=1))
+    fragile, sturdy = FlakyTool(1, "fragile"), FlakyTool(1, "sturdy")
+
+    await executor.execute(fragile, "run", {}, _context(max_retries=0))
+    await executor.execute(sturdy, "run", {}, _context(max_retries=0))
+
+    breakers = executor.get_statistics()["circuit_breakers"]
+    assert breakers["fragile"]["state"] == "open"
+    assert breakers["sturdy"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_failed_tool_results_count_against_the_breaker():
+    clock = FakeClock()
+    executor = _executor(clock, breaker_policy=CircuitBreakerPolicy(failure_threshold=2))
+    tool = FailingResultTool(failures=0)
+
+    for _ in range(3):
+        result = await executor.execute(tool, "run", {}, _context(max_retries=2))
+        assert not result.success
+
+    # Returned failures are not retried, but two of them open the circuit
+    assert tool.calls == 2
+    assert result.metadata["circuit_open"] is True
+    assert executor.get_circuit_breaker("flaky").state == CircuitState.OPEN
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import pytest
+
+from langswarm.tools.interfaces import ToolType
+from langswarm.tools.registry import ToolRegistry, ToolSearchIndex, tokenize
+
+
+def _tool(tool_id, name, description="", tags=(), methods=None):
+    methods = {
+        method: SimpleNamespace(name=method, description=text)
+        for method, text in (methods or {}).items()
+    }
+    return SimpleNamespace(metadata=SimpleNamespace(
+        id=tool_id, name=name, description=description, tags=list(tags),
+        tool_type=ToolType.UTILITY, capabilities=[], methods=methods, version="1.0"
+    ))
+
+
+@pytest.fixture
+def registry():
+    registry = ToolRegistry()
+    registry.clear()
+    yield registry
+    registry.clear()
+
+
+def test_tokenize_splits_snake_and_camel_case():
+    assert tokenize("web_request") == ["web", "request"]
+    assert tokenize("BigQueryVectorSearch") == ["bigqueryvectorsearch", "big", "query", "vector", "search"]
+
+
+def test_results_are_ranked_with_field_boosts(registry):
+    registry.register(_tool("weather", "Weather", "Current conditions", methods={"forecast": "Daily outlook"}))
+    registry.register(_tool("calendar", "Calendar", "Shows the weather forecast next to events"))
+    registry.register(_tool("planner", "Trip planner", "Plans trips", methods={"arrival_conditions": "Weather on arrival"}))
+    registry.register(_tool("files", "Filesystem", "Read and write files"))
+
+    assert [t.metadata.id for t in registry.search_tools("weather")] == ["weather", "calendar", "planner"]
+    assert [t.metadata.id for t in registry.search_tools("forecast")] == ["calendar", "weather"]
+    assert [t.metadata.id for t in registry.search_tools("weather forecast", limit=1)] == ["weather"]
+    assert registry.search_tools("spreadsheet") == []
+    assert len(registry.search_tools("")) == 4
+
+
+def test_prefix_queries_and_unregister_keep_index_consistent(registry):
+    registry.register(_tool("web_request", "WebRequest", "HTTP client", tags=["network"]))
+    registry.register(_tool("webhook", "Webhook receiver", "Receive callbacks"))
+
+    assert {t.metadata.id for t in registry.search_tools("web")} == {"web_request", "webhook"}
+    assert [t.metadata.id for t in registry.search_tools("netw")] == ["web_request"]
+
+    registry.unregister("webhook")
+    assert [t.metadata.id for t in registry.search_tools("web")] == ["web_request"]
+    assert "receiver" not in registry._search_index._postings
+    assert "receiver" not in registry._search_index._vocabulary
+
+    registry.unregister("web_request")
+    index = registry._search_index
+    assert len(index) == 0 and index._postings == {} and index._vocabulary == []
+    assert all(total == 0 for total in index._field_totals.values())
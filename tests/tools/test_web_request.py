@@ -0,0 +1,297 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from aiohttp import web
+
+from langswarm.tools.builtin.web_request import WebRequestTool
+from langswarm.tools.builtin.http_cache import HTTPCache
+
+
+class LocalServer:
+    """aiohttp test server that records which client connection served each request"""
+
+    def __init__(self):
+        self.peers = []
+        self.hits = {}
+        self.conditional = []
+
+    def _record(self, request):
+        self.peers.append(request.transport.get_extra_info("peername"))
+        self.hits[request.path] = self.hits.get(request.path, 0) + 1
+
+    async def fresh(self, request):
+        self._record(request)
+        return web.json_response({"n": self.hits[request.path]},
+                                 headers={"Cache-Control": "max-age=60"})
+
+    async def etag(self, request):
+        self._record(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            self.conditional.append("etag")
+            return web.Response(status=304, headers={"ETag": '"v1"', "Cache-Control": "no-cache"})
+        return web.Response(text="versioned body", headers={"ETag": '"v1"', "Cache-Control": "no-cache"})
+
+    async def last_modified(self, request):
+        self._record(request)
+        stamp = "Wed, 21 Oct 2015 07:28:00 GMT"
+        if request.headers.get("If-Modified-Since") == stamp:
+            self.conditional.append("last-modified")
+            return web.Response(status=304)
+        return web.Response(text="dated body", headers={"Last-Modified": stamp, "Cache-Control": "max-age=0"})
+
+    async def no_store(self, request):
+        self._record(request)
+        return web.Response(text="secret", headers={"Cache-Control": "no-store"})
+
+    async def slow(self, request):
+        self._record(request)
+        await asyncio.sleep(0.2)
+        return web.Response(text="slow")
+
+    async def item(self, request):
+        self._record(request)
+        return web.Response(text="item", headers={"Cache-Control": "max-age=60"})
+
+
+@asynccontextmanager
+async def serve():
+    handlers = LocalServer()
+    app = web.Application()
+    app.router.add_get("/fresh", handlers.fresh)
+    app.router.add_get("/etag", handlers.etag)
+    app.router.add_get("/last-modified", handlers.last_modified)
+    app.router.add_get("/no-store", handlers.no_store)
+    app.router.add_get("/slow", handlers.slow)
+    app.router.add_route("*", "/item", handlers.item)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    handlers.base = f"http://127.0.0.1:{port}"
+    handlers.netloc = f"127.0.0.1:{port}"
+    try:
+        yield handlers
+    finally:
+        await runner.cleanup()
+
+
+def make_tool(server, **kwargs):
+    return WebRequestTool(allowed_domains=[server.netloc], **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused():
+    async with serve() as server:
+        tool = make_tool(server, cache_enabled=False)
+        for _ in range(5):
+            result = await tool.get(server.base + "/no-store")
+            assert result["text"] == "secret"
+        await tool.close()
+
+        assert len(server.peers) == 5
+        assert len(set(server.peers)) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_overlap():
+    async with serve() as server:
+        tool = make_tool(server, cache_enabled=False)
+        start = time.perf_counter()
+        results = await asyncio.gather(*[tool.get(server.base + "/slow") for _ in range(5)])
+        elapsed = time.perf_counter() - start
+        await tool.close()
+
+        assert all(r["text"] == "slow" for r in results)
+        # Sequential blocking requests would take ~1s
+        assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_fresh_response_served_from_cache():
+    async with serve() as server:
+        tool = make_tool(server)
+        first = await tool.get(server.base + "/fresh")
+        second = await tool.get(server.base + "/fresh")
+        await tool.close()
+
+        assert first["cache_status"] == "miss"
+        assert second["cache_status"] == "hit"
+        assert second["json"] == {"n": 1}
+        assert server.hits["/fresh"] == 1
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidation_uses_304():
+    async with serve() as server:
+        tool = make_tool(server)
+        first = await tool.get(server.base + "/etag")
+        second = await tool.get(server.base + "/etag")
+        await tool.close()
+
+        assert first["text"] == second["text"] == "versioned body"
+        assert second["cache_status"] == "revalidated"
+        assert second["status_code"] == 200
+        assert server.conditional == ["etag"]
+
+
+@pytest.mark.asyncio
+async def test_last_modified_revalidation_uses_304():
+    async with serve() as server:
+        tool = make_tool(server)
+        await tool.get(server.base + "/last-modified")
+        second = await tool.get(server.base + "/last-modified")
+        await tool.close()
+
+        assert second["text"] == "dated body"
+        assert second["cache_status"] == "revalidated"
+        assert server.conditional == ["last-modified"]
+
+
+@pytest.mark.asyncio
+async def test_no_store_and_unsafe_methods():
+    async with serve() as server:
+        tool = make_tool(server)
+        await tool.get(server.base + "/no-store")
+        await tool.get(server.base + "/no-store")
+        assert server.hits["/no-store"] == 2
+
+        await tool.get(server.base + "/item")
+        assert (await tool.get(server.base + "/item"))["cache_status"] == "hit"
+        await tool.post(server.base + "/item", data={"x": 1})
+        assert (await tool.get(server.base + "/item"))["cache_status"] == "miss"
+        await tool.close()
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_new_tool(tmp_path):
+    async with serve() as server:
+        tool = make_tool(server, cache_dir=str(tmp_path))
+        await tool.get(server.base + "/fresh")
+        await tool.close()
+
+        fresh_tool = make_tool(server, cache_dir=str(tmp_path))
+        result = await fresh_tool.get(server.base + "/fresh")
+        await fresh_tool.close()
+
+        assert result["cache_status"] == "hit"
+        assert server.hits["/fresh"] == 1
+
+
+def test_memory_tier_is_bounded():
+    from langswarm.tools.builtin.http_cache import CachedResponse
+
+    async def fill():
+        cache = HTTPCache(max_entries=100, max_bytes=1000)
+        for i in range(50):
+            await cache.put(f"GET /{i}", CachedResponse(
+                url=f"/{i}", status_code=200, headers={}, body=b"x" * 100, stored_at=time.time()
+            ))
+        return cache
+
+    cache = asyncio.run(fill())
+    assert len(cache) == 10
+    assert cache.memory_bytes == 1000
+
+
+class KeepAliveServer(ThreadingHTTPServer):
+    """Threaded HTTP/1.1 server that counts client connections still open"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.open_connections = 0
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), KeepAliveHandler)
+        self.netloc = "127.0.0.1:%d" % self.server_address[1]
+
+    def process_request_thread(self, request, client_address):
+        with self.lock:
+            self.open_connections += 1
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            with self.lock:
+                self.open_connections -= 1
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"pooled"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.mark.filterwarnings("error")
+def test_session_from_another_loop_is_closed_when_replaced():
+    server = KeepAliveServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        tool = WebRequestTool(allowed_domains=[server.netloc], cache_enabled=False)
+
+        async def fetch():
+            result = await tool.get(f"http://{server.netloc}/")
+            assert result["text"] == "pooled"
+            return tool._session, tool._session.connector
+
+        # The pooled keep-alive connection is closed when asyncio.run() winds the
+        # loop down, not left open for the garbage collector
+        first, connector = asyncio.run(fetch())
+        assert first.closed and connector.closed
+        assert wait_for(lambda: server.open_connections == 0)
+
+        # Same tool on a fresh loop gets a new session rather than the dead one
+        async def replace():
+            current = await tool._get_session()
+            await tool.close()
+            return current
+
+        second = asyncio.run(replace())
+        assert second.closed and second is not first
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_session_on_a_stopped_loop_is_closed_on_that_loop():
+    server = KeepAliveServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    old_loop = asyncio.new_event_loop()
+    try:
+        tool = WebRequestTool(allowed_domains=[server.netloc], cache_enabled=False)
+        result = old_loop.run_until_complete(tool.get(f"http://{server.netloc}/"))
+        assert result["text"] == "pooled"
+        first, connector = tool._session, tool._session.connector
+        assert server.open_connections == 1
+
+        async def replace():
+            current = await tool._get_session()
+            await tool.close()
+            return current
+
+        second = asyncio.run(replace())
+        assert first.closed and connector.closed and second is not first
+        assert wait_for(lambda: server.open_connections == 0)
+    finally:
+        old_loop.close()
+        server.shutdown()
+        server.server_close()